@@ -3,19 +3,39 @@ from api.common.base import Api
 from api.common.errors import register_errors, register_errors_from_third_parties
 from api.common.logging import configure_logging
 from api.cors import configure_cors
+from api.compression import configure_compression
+from api.ingestion import configure_ingestion
+from api.caching import configure_results_caching
+from api.jobs import configure_jobs
+from api.samples import configure_samples_store
+from api.datasets import configure_datasets
 from api.resources import configure_routes
 from api.authentication import configure_authentication
+from api.authentication.database import db
+from api.authentication.database.models import User
 from api.authorization import configure_authorization
-from api.featurization import configure_features_extraction_library_injection
-from api.featurization.library_injection import (
-    validate_features_library,
-    inject_features_extractor,
-    inject_features_extractor_exceptions
+from api.featurization import configure_features_extraction_library_injection, configure_features_extraction_library_manifest
+from api.featurization.execution import (
+    configure_features_extraction_execution,
+    configure_features_extraction_batching,
+    configure_features_extraction_supervision,
+    configure_features_extraction_scheduling
 )
+from api.featurization.library_injection import inject_features_extraction_library
+from api.featurization.libraries import configure_features_extraction_libraries
 
 
-def prepare_app(app_name):
-    """Prepares the application"""
+def prepare_app(app_name, start_background_workers=True):
+    """
+    Prepares the application.
+
+    :param app_name: name of the application
+    :type app_name: str
+    :param start_background_workers: start the background workers in this process, defaults to True
+    :type start_background_workers: bool, optional
+    :return: application
+    :rtype: flask.Flask
+    """
 
     # Initialize the Flask object
     app = Flask(app_name)
@@ -23,6 +43,12 @@ def prepare_app(app_name):
     # Initialize the cross origin resource sharing object
     configure_cors(app)
 
+    # Configure the compression of the request and response bodies
+    configure_compression(app)
+
+    # Configure the ingestion of the request bodies (per-route and per-user size limits)
+    configure_ingestion(app)
+
     # Configure the logging and error-handling
     configure_logging(app)
     register_errors(app)
@@ -34,6 +60,10 @@ def prepare_app(app_name):
     # Prepare the API
     prepare_api(app)
 
+    # Start the background workers (features extraction pool, featurization jobs workers)
+    if start_background_workers:
+        start_workers(app)
+
     # Return the app
     return app
 
@@ -47,16 +77,163 @@ def prepare_api(app):
     # Get the features extractor library
     injected_library_name = configure_features_extraction_library_injection()
 
-    # Validate the ability to import the features extractor library
-    validate_features_library(injected_library_name)
-
-    # Get the injected features extractor and exceptions
-    feature_extractor_interface = inject_features_extractor(injected_library_name)
-    feature_extractor_exceptions = inject_features_extractor_exceptions(injected_library_name)
+    # Inject the features extractor, its exceptions and the library version (resolved from the manifest if valid)
+    injected_library = inject_features_extraction_library(
+        injected_library_name,
+        manifest=configure_features_extraction_library_manifest())
+    feature_extractor_interface = injected_library["extractor"]
+    feature_extractor_exceptions = injected_library["exceptions"]
 
     # Register the injected features extractor exceptions as client-side errors
     if feature_extractor_exceptions:
         register_errors_from_third_parties(app, feature_extractor_exceptions)
 
+    # Prepare the features extraction scheduler (cost model of the features persisted across the restarts)
+    feature_extraction_scheduler = configure_features_extraction_scheduling(injected_library_name)
+
+    # Prepare the features extraction execution (pool of workers for the parallel execution)
+    feature_extraction_pool = configure_features_extraction_execution(
+        injected_library_name,
+        scheduler=feature_extraction_scheduler)
+
+    # Prepare the features extraction supervisor (time budgets of the features, deadlines of the requests)
+    feature_extraction_supervisor = configure_features_extraction_supervision(
+        injected_library_name,
+        scheduler=feature_extraction_scheduler)
+
+    # Prepare the features extraction batch executor (batches of featurization requests)
+    feature_extraction_batch = configure_features_extraction_batching()
+
+    # Prepare the features results cache (per-subject, per-feature)
+    feature_extraction_cache = configure_results_caching(
+        injected_library_name,
+        injected_library["version"])
+
+    # Prepare the features extraction libraries served at /featurize/<library> (injected on their first use)
+    feature_extraction_libraries = configure_features_extraction_libraries(app)
+
+    # Prepare the store of the uploaded sample values (sample handles)
+    sample_store = configure_samples_store()
+
+    # Prepare the featurizer of the server-side datasets (out-of-core featurization)
+    dataset_featurizer = configure_datasets()
+
+    # Prepare the asynchronous featurization jobs (persistent queue and local worker pool)
+    featurization_jobs = configure_jobs(
+        feature_extractor_interface,
+        pool=feature_extraction_pool,
+        cache=feature_extraction_cache,
+        supervisor=feature_extraction_supervisor)
+
     # Register the routes
-    configure_routes(api, feature_extractor_interface)
+    configure_routes(
+        api,
+        feature_extractor_interface,
+        feature_extraction_pool,
+        feature_extraction_cache,
+        featurization_jobs,
+        feature_extraction_batch,
+        sample_store,
+        dataset_featurizer,
+        feature_extraction_libraries,
+        feature_extraction_supervisor,
+        feature_extraction_scheduler)
+
+    # Register the featurization components (to be started/stopped per process)
+    app.extensions["featurizer"] = {
+        "pool": feature_extraction_pool,
+        "cache": feature_extraction_cache,
+        "supervisor": feature_extraction_supervisor,
+        "scheduler": feature_extraction_scheduler,
+        "jobs": featurization_jobs,
+        "batch": feature_extraction_batch,
+        "libraries": feature_extraction_libraries,
+        "samples": sample_store,
+        "datasets": dataset_featurizer
+    }
+
+
+def start_workers(app):
+    """
+    Starts the background workers of the application in the current process.
+
+    The features extraction pool and supervisor are warmed-up (the worker
+    processes are started with the injected library imported, if configured),
+    and the featurization jobs worker threads are started (the accepted jobs
+    are resumed). When the application is prepared once and then forked by a
+    pre-fork server, this is called in each of the forked processes (see:
+    ``gunicorn.conf.py``).
+
+    :param app: application
+    :type app: flask.Flask
+    :return: None
+    :rtype: None type
+    """
+    featurizer = app.extensions.get("featurizer", {})
+
+    # Warm-up the features extraction pool
+    if featurizer.get("pool") and featurizer["pool"].warm_up_workers:
+        featurizer["pool"].warm_up()
+
+    # Warm-up the features extraction supervisor
+    if featurizer.get("supervisor") and featurizer["supervisor"].warm_up_workers:
+        featurizer["supervisor"].warm_up()
+
+    # Start the featurization jobs worker threads
+    if featurizer.get("jobs"):
+        featurizer["jobs"].start()
+
+
+def stop_workers(app):
+    """Stops the background workers of the application in the current process"""
+    featurizer = app.extensions.get("featurizer", {})
+
+    # Stop the featurization jobs worker threads (the running jobs are queued again)
+    if featurizer.get("jobs"):
+        featurizer["jobs"].stop()
+
+    # Shut down the features extraction pool
+    if featurizer.get("pool"):
+        featurizer["pool"].shutdown()
+
+    # Shut down the features extraction supervisor (kill its worker processes)
+    if featurizer.get("supervisor"):
+        featurizer["supervisor"].shutdown()
+
+    # Shut down the features extraction batch executor
+    if featurizer.get("batch"):
+        featurizer["batch"].shutdown()
+
+    # Save the cost model of the features extraction scheduler
+    if featurizer.get("scheduler"):
+        featurizer["scheduler"].save()
+
+    # Unload the features extraction libraries (shut down their pools, save their cost models)
+    if featurizer.get("libraries"):
+        featurizer["libraries"].shutdown()
+
+    # Shut down the password hashing threads
+    if User.hasher is not None:
+        User.hasher.shutdown()
+
+
+def prepare_forked_app(app):
+    """
+    Prepares the application in the process forked by a pre-fork server.
+
+    The database connections inherited from the parent process are released
+    (each of the processes opens its own), and the background workers are
+    started in the forked process.
+
+    :param app: application (prepared in the parent process)
+    :type app: flask.Flask
+    :return: None
+    :rtype: None type
+    """
+
+    # Release the inherited database connections
+    with app.app_context():
+        db.engine.dispose()
+
+    # Start the background workers
+    start_workers(app)
@@ -3,6 +3,9 @@ from pathlib import Path
 from flask_bcrypt import Bcrypt
 from api.configuration import application_path, load_configuration
 from api.authentication.database import initialize_database
+from api.authentication.database.cache import ModelCache
+from api.authentication.database.models import BaseModel, User
+from api.authentication.hashing import PasswordHasher
 
 
 # ------------------------------------------------ #
@@ -12,11 +15,29 @@ from api.authentication.database import initialize_database
 def configure_authentication(app):
     """Configures the authentication"""
 
+    # Load the authentication configuration
+    configuration = load_configuration("authentication.json")
+
     # Initialize the encryption object
     Bcrypt(app)
 
+    # Configure the password hashing (bounded pool of threads, cost of the new hashes)
+    hashing = configuration.get("hashing", {})
+    User.hasher = PasswordHasher(
+        rounds=hashing.get("rounds"),
+        workers=hashing.get("workers"),
+        max_pending=hashing.get("max_pending"),
+        timeout=hashing.get("timeout_in_seconds"))
+    app.config["BCRYPT_LOG_ROUNDS"] = User.hasher.rounds
+
+    # Configure the caching of the user records
+    caching = configuration.get("cache", {})
+    BaseModel.cache = ModelCache(
+        expiration_time=caching.get("expiration_time_in_seconds"),
+        max_size=caching.get("max_size")) if caching.get("enabled") else None
+
     # Configure the authentication database
-    for key, value in load_configuration("authentication.json").get("database", {}).items():
+    for key, value in configuration.get("database", {}).items():
         app.config[key] = value
 
     # Get the database path
@@ -25,5 +46,5 @@ def configure_authentication(app):
     # Prepare the database path and make sure the database directory exists
     Path(os.path.join(application_path, "..", *path)).mkdir(parents=True, exist_ok=True)
 
-    # Initialize the authentication database
-    initialize_database(app)
+    # Initialize the authentication database (SQLite pragmas, schema and migrations)
+    initialize_database(app, sqlite_configuration=configuration.get("sqlite"))
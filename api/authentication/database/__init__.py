@@ -1,3 +1,4 @@
+import sqlalchemy
 from flask_sqlalchemy import SQLAlchemy
 
 
@@ -7,16 +8,34 @@ from flask_sqlalchemy import SQLAlchemy
 db = SQLAlchemy()
 
 
+# --------------------------------------------- #
+# Authentication database attributes definition #
+# --------------------------------------------- #
+
+# Supported values of the SQLite pragmas (the pragmas do not support the bound parameters)
+SQLITE_JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+SQLITE_SYNCHRONOUS_MODES = ("off", "normal", "full", "extra")
+
+
 # -------------------------------------- #
 # Authentication database initialization #
 # -------------------------------------- #
 
-def initialize_database(app):
+def initialize_database(app, sqlite_configuration=None):
     """
     Prepares and registers the authentication database supported by the API.
 
+    The SQLite connections are set up with the configured pragmas (the WAL
+    journal mode lets the readers run concurrently with the writer of the other
+    worker processes, and the busy timeout makes the concurrent writers wait for
+    the lock instead of failing). The tables are created if needed, and the
+    existing databases are migrated to the current schema (e.g. the unique
+    index on the username).
+
     :param app: app instance
     :type app: flask.Flask
+    :param sqlite_configuration: SQLite pragmas (journal_mode, synchronous, busy_timeout_in_ms), defaults to None
+    :type sqlite_configuration: dict, optional
     :return: None
     :rtype: None type
     """
@@ -24,6 +43,97 @@ def initialize_database(app):
     # Register the initialize the authentication database object to the application
     db.init_app(app)
 
-    # Create the tables if needed
     with app.app_context():
+
+        # Set up the SQLite connections (pragmas)
+        if db.engine.dialect.name == "sqlite":
+            configure_sqlite_pragmas(db.engine, sqlite_configuration or {})
+
+        # Create the tables if needed
         db.create_all()
+
+        # Migrate the existing database
+        migrate_database(app)
+
+
+def configure_sqlite_pragmas(engine, configuration):
+    """
+    Sets the pragmas of each of the SQLite connections of the engine.
+
+    :param engine: database engine
+    :type engine: sqlalchemy.engine.Engine
+    :param configuration: SQLite pragmas (journal_mode, synchronous, busy_timeout_in_ms)
+    :type configuration: dict
+    :return: None
+    :rtype: None type
+    """
+
+    # Prepare the pragmas
+    pragmas = []
+    if configuration.get("journal_mode"):
+        if str(configuration["journal_mode"]).lower() not in SQLITE_JOURNAL_MODES:
+            raise ValueError(f"Unsupported SQLite journal mode: {configuration['journal_mode']}")
+        pragmas.append(f"PRAGMA journal_mode={str(configuration['journal_mode']).lower()}")
+    if configuration.get("synchronous"):
+        if str(configuration["synchronous"]).lower() not in SQLITE_SYNCHRONOUS_MODES:
+            raise ValueError(f"Unsupported SQLite synchronous mode: {configuration['synchronous']}")
+        pragmas.append(f"PRAGMA synchronous={str(configuration['synchronous']).lower()}")
+    if configuration.get("busy_timeout_in_ms") is not None:
+        pragmas.append(f"PRAGMA busy_timeout={int(configuration['busy_timeout_in_ms'])}")
+
+    @sqlalchemy.event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(connection, _):
+        """Sets the pragmas of the new SQLite connection"""
+        cursor = connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def migrate_database(app):
+    """
+    Migrates the existing authentication database to the current schema.
+
+    The migrations are idempotent (each of them checks the schema first), so
+    they can be run on every start (and by more processes at once).
+
+    :param app: app instance
+    :type app: flask.Flask
+    :return: None
+    :rtype: None type
+    """
+    with db.engine.begin() as connection:
+        migrate_user_username_index(app, connection)
+
+
+def migrate_user_username_index(app, connection):
+    """Adds the unique index on the username of the users (the databases created before the index)"""
+    table = db.metadata.tables.get("user")
+    if table is None:
+        return
+
+    # Check the indexes on the username
+    indexes = [
+        index for index in sqlalchemy.inspect(connection).get_indexes(table.name)
+        if index.get("column_names") == ["username"]
+    ]
+    if any(index.get("unique") for index in indexes):
+        return
+
+    # Check the duplicate usernames (the unique index cannot be created)
+    duplicates = connection.execute(
+        sqlalchemy.select(table.c.username)
+        .group_by(table.c.username)
+        .having(sqlalchemy.func.count() > 1)).scalars().all()
+    if duplicates:
+        app.logger.warning(f"The unique index on the username cannot be created (duplicate usernames: {duplicates})")
+        return
+
+    # Replace the non-unique indexes with the unique index
+    for index in indexes:
+        connection.execute(sqlalchemy.text(f'DROP INDEX IF EXISTS "{index["name"]}"'))
+    for index in table.indexes:
+        if [column.name for column in index.columns] == ["username"] and index.unique:
+            index.create(connection, checkfirst=True)
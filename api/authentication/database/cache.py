@@ -0,0 +1,111 @@
+import time
+import threading
+from collections import OrderedDict
+from sqlalchemy.orm import make_transient_to_detached
+from api.authentication.database import db
+
+
+# ----------------------------------------- #
+# Default model cache attributes definition #
+# ----------------------------------------- #
+DEFAULT_MODEL_CACHE_EXPIRATION_TIME = 30
+DEFAULT_MODEL_CACHE_MAX_SIZE = 1024
+
+
+# ---------------------------- #
+# Model cache class definition #
+# ---------------------------- #
+
+class ModelCache(object):
+    """
+    Class implementing the short-lived cache of the model records (per process).
+
+    The records are cached as the column values keyed by the model, the lookup
+    field and its value (e.g. ``User``, ``username``, ``user123``), so the
+    repeated look-ups (log-ins, token checks) do not query the database. The
+    cached records are merged into the current database session without
+    loading them. The records expire after the expiration time (the records
+    changed by the other processes are stale at most this long), the least
+    recently used records are evicted above the maximum size, and the records
+    are invalidated when the instance is saved or deleted in this process.
+    """
+
+    def __init__(self, expiration_time=None, max_size=None):
+        """
+        Initializes the ModelCache.
+
+        :param expiration_time: seconds a record is cached, defaults to None (30)
+        :type expiration_time: float, optional
+        :param max_size: maximum number of the cached records, defaults to None (1024)
+        :type max_size: int, optional
+        """
+        self.expiration_time = expiration_time if expiration_time else DEFAULT_MODEL_CACHE_EXPIRATION_TIME
+        self.max_size = max_size if max_size else DEFAULT_MODEL_CACHE_MAX_SIZE
+
+        # Set the cached records (key: (expiration, column values))
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"expiration_time": self.expiration_time, "max_size": self.max_size, "records": len(self._records)})
+
+    def __str__(self):
+        return repr(self)
+
+    @staticmethod
+    def get_key(model, field, value):
+        """Returns the key of the record (model, lookup field and value)"""
+        return model.__name__, field, str(value)
+
+    def get(self, model, field, value):
+        """
+        Gets the cached instance of the model given the lookup field value.
+
+        :param model: model class
+        :type model: api.authentication.database.models.BaseModel
+        :param field: lookup field
+        :type field: str
+        :param value: lookup value
+        :type value: Any
+        :return: instance merged into the current session (None if it is not cached or expired)
+        :rtype: api.authentication.database.models.BaseModel or None type
+        """
+        key = self.get_key(model, field, value)
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return None
+            if record[0] < time.monotonic():
+                del self._records[key]
+                return None
+            self._records.move_to_end(key)
+
+        # Merge the instance into the current session (without loading it)
+        instance = model(**record[1])
+        make_transient_to_detached(instance)
+        return db.session.merge(instance, load=False)
+
+    def set(self, instance, field, value):
+        """Caches the column values of the instance given the lookup field value"""
+        values = {column.key: getattr(instance, column.key) for column in instance.__table__.columns}
+        with self._lock:
+            self._records[self.get_key(type(instance), field, value)] = (
+                time.monotonic() + self.expiration_time,
+                values)
+            while len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+
+    def invalidate(self, instance):
+        """Invalidates the cached records of the instance (all lookup fields)"""
+        model = type(instance).__name__
+        with self._lock:
+            for key in [
+                key for key, (_, values) in self._records.items()
+                if key[0] == model and values.get("id") == instance.id
+            ]:
+                del self._records[key]
+
+    def clear(self):
+        """Clears the cached records"""
+        with self._lock:
+            self._records.clear()
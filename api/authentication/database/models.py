@@ -13,6 +13,9 @@ class BaseModel(db.Model):
     # Set the class to be abstract
     __abstract__ = True
 
+    # Set the cache of the records (see: api.authentication.database.cache.ModelCache; None: no caching)
+    cache = None
+
     # Common fields
     #
     #  1. id, mandatory, primary key
@@ -22,19 +25,50 @@ class BaseModel(db.Model):
     created_on = db.Column(db.DateTime, server_default=db.func.now(), nullable=False)
     updated_on = db.Column(db.DateTime, nullable=False, server_default=db.func.now(), onupdate=db.func.now())
 
+    @classmethod
+    def get_by(cls, field, value):
+        """Returns an instance given the field value (the cached record if the cache is set)"""
+
+        # Get the cached record
+        if cls.cache is not None:
+            instance = cls.cache.get(cls, field, value)
+            if instance is not None:
+                return instance
+
+        # Get the record from the database (and cache it)
+        instance = cls.query.filter_by(**{field: value}).first()
+        if instance is not None and cls.cache is not None:
+            cls.cache.set(instance, field, value)
+
+        # Return the instance
+        return instance
+
+    def invalidate(self):
+        """Invalidates the cached records of the instance"""
+        if self.cache is not None:
+            self.cache.invalidate(self)
+
     def save(self):
-        """Saves an instance of the model from the database"""
+        """Saves an instance of the model from the database (returns False if it was not saved)"""
         try:
             db.session.add(self)
             db.session.commit()
+            return True
         except IntegrityError:
             db.session.rollback()
+            return False
         except SQLAlchemyError:
             db.session.rollback()
+            return False
+        finally:
+            self.invalidate()
 
     def update(self):
         """Updates an instance of the model from the database"""
-        return db.session.commit()
+        try:
+            return db.session.commit()
+        finally:
+            self.invalidate()
 
     def delete(self):
         """Deletes an instance of the model from the database"""
@@ -43,6 +77,8 @@ class BaseModel(db.Model):
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
+        finally:
+            self.invalidate()
 
 
 class User(BaseModel):
@@ -50,29 +86,44 @@ class User(BaseModel):
 
     # User fields
     #
-    #  1. username, mandatory
+    #  1. username, mandatory, unique (indexed)
     #  2. password, mandatory
-    username = db.Column(db.String(100))
+    username = db.Column(db.String(100), unique=True, index=True)
     password = db.Column(db.String(100))
 
+    # Set the password hasher (see: api.authentication.hashing.PasswordHasher; None: on the request thread)
+    hasher = None
+
     @classmethod
     def get_by_username(cls, username):
         """Returns a user instance given the username"""
-        return cls.query.filter_by(username=username).first()
+        return cls.get_by("username", username)
 
     @classmethod
     def get_by_identifier(cls, uid):
         """Returns a user instance given the identifier"""
-        return cls.query.filter_by(id=uid).first()
+        return cls.get_by("id", uid)
 
     def hash_password(self):
         """Generates the password hash"""
-        self.password = generate_password_hash(str(self.password)).decode("utf8")
+        if self.hasher is not None:
+            self.password = self.hasher.hash(str(self.password))
+        else:
+            self.password = generate_password_hash(str(self.password)).decode("utf8")
 
     def check_password(self, password):
         """Checks if the password hashes are equal"""
+        if self.hasher is not None:
+            return self.hasher.check(str(self.password), password)
         return check_password_hash(str(self.password), password)
 
+    def rehash_password(self, password):
+        """Rehashes the (verified) password if its hash has a different cost than the configured one"""
+        if self.hasher is not None and self.hasher.needs_rehash(self.password):
+            self.password = password
+            self.hash_password()
+            self.save()
+
     @classmethod
     def authenticate(cls, **kwargs):
         """Authenticates a user given the provided arguments"""
@@ -84,9 +135,12 @@ class User(BaseModel):
             return None
 
         # Get the user and authenticate the provided passwords
-        user = cls.query.filter_by(username=username).first()
-        if not user or not check_password_hash(user.password, password):
+        user = cls.get_by_username(username)
+        if not user or not user.check_password(password):
             return None
 
+        # Rehash the password with the configured cost (if needed)
+        user.rehash_password(password)
+
         # Return the user instance
         return user
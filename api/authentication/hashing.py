@@ -0,0 +1,132 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask_bcrypt import generate_password_hash, check_password_hash
+
+
+# ------------------------------------- #
+# Password hasher exceptions definition #
+# ------------------------------------- #
+class PasswordHasherBusyException(Exception): pass
+
+
+# ------------------------------------- #
+# Password hasher attributes definition #
+# ------------------------------------- #
+
+# Default cost (log2 rounds) of the new password hashes
+DEFAULT_PASSWORD_HASHING_ROUNDS = 12
+
+# Default number of the threads hashing/verifying the passwords
+DEFAULT_PASSWORD_HASHING_WORKERS = 2
+
+
+# -------------------------------- #
+# Password hasher class definition #
+# -------------------------------- #
+
+class PasswordHasher(object):
+    """
+    Class implementing the password hashing and verification (bcrypt) on the bounded pool of threads.
+
+    The bcrypt hashing is CPU-heavy, and it is designed to be slow. Therefore,
+    the passwords are hashed and verified by the dedicated pool of threads (the
+    bcrypt releases the GIL), so at most ``workers`` hashes are computed at once
+    regardless of the number of the concurrent log-ins, and the rest of the CPU
+    is left to the featurization. At most ``max_pending`` hashes are waiting for
+    the pool, the others are rejected (``PasswordHasherBusyException``). The
+    new hashes are computed with the configured cost (``rounds``), and the
+    hashes of a different cost can be rehashed on the next successful log-in
+    (``needs_rehash``).
+    """
+
+    def __init__(self, rounds=None, workers=None, max_pending=None, timeout=None):
+        """
+        Initializes the PasswordHasher.
+
+        :param rounds: cost (log2 rounds) of the new password hashes, defaults to None (12)
+        :type rounds: int, optional
+        :param workers: number of the threads hashing the passwords, defaults to None (2)
+        :type workers: int, optional
+        :param max_pending: maximum number of the hashes waiting for the threads, defaults to None (unlimited)
+        :type max_pending: int, optional
+        :param timeout: seconds to wait for the pool (if ``max_pending`` are waiting), defaults to None (no wait)
+        :type timeout: float, optional
+        """
+
+        # Set the hashing configuration
+        self.rounds = rounds if rounds else DEFAULT_PASSWORD_HASHING_ROUNDS
+        self.workers = workers if workers else DEFAULT_PASSWORD_HASHING_WORKERS
+        self.max_pending = max_pending if max_pending else None
+        self.timeout = timeout if timeout else None
+
+        # Set the bound of the pending hashes
+        self._pending = threading.BoundedSemaphore(self.workers + self.max_pending) if self.max_pending else None
+
+        # Set the thread pool (created lazily per process)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"rounds": self.rounds, "workers": self.workers, "max_pending": self.max_pending})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def executor(self):
+        """Returns the thread pool of the current process (creates it if needed)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hashing")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def shutdown(self):
+        """Shuts down the thread pool of the current process"""
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def hash(self, password):
+        """
+        Hashes the password (with the configured cost).
+
+        :param password: password to be hashed
+        :type password: str
+        :return: password hash
+        :rtype: str
+        """
+        return self._execute(generate_password_hash, str(password), self.rounds).decode("utf8")
+
+    def check(self, password_hash, password):
+        """
+        Checks if the password matches the password hash.
+
+        :param password_hash: password hash
+        :type password_hash: str
+        :param password: password to be checked
+        :type password: str
+        :return: True if the password matches
+        :rtype: bool
+        """
+        return bool(self._execute(check_password_hash, str(password_hash), password))
+
+    def needs_rehash(self, password_hash):
+        """Checks if the password hash has a different cost than the configured one (``$2b$<cost>$...``)"""
+        try:
+            return int(str(password_hash).split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def _execute(self, function, *args):
+        """Executes the hashing function on the thread pool (waits for the result)"""
+        if self._pending is not None and not self._pending.acquire(blocking=bool(self.timeout), timeout=self.timeout):
+            raise PasswordHasherBusyException("Too many concurrent log-ins, please try again later")
+        try:
+            return self.executor.submit(function, *args).result()
+        finally:
+            if self._pending is not None:
+                self._pending.release()
@@ -1,4 +1,19 @@
+import hashlib
+from functools import wraps
+from flask import request, g
+from flask_api_cache import ApiCache
+from flask_jwt_extended import get_jwt_identity
 from api.configuration import load_configuration
+from api.wrappers.media import BINARY_HEADER_NAME, get_response_media_type, is_streaming_media_type
+from api.wrappers.request import RequestWrapper
+from api.caching.results import FeaturesResultCache
+from api.metrics import response_cache_requests
+
+
+# --------------------------------------------- #
+# Content-aware API cache exceptions definition #
+# --------------------------------------------- #
+class ResponseCacheBypassException(Exception): pass
 
 
 # ------------------------------------- #
@@ -14,3 +29,124 @@ DEFAULT_CACHING_TIME = 60
 def configure_caching():
     """Configures the response caching"""
     return {key: value for key, value in load_configuration("caching.json").get("cache", {}).items()}
+
+
+def configure_results_caching(library_name, library_version=""):
+    """
+    Configures the per-subject, per-feature caching of the extracted features.
+
+    :param library_name: import name of the injected features extraction library
+    :type library_name: str
+    :param library_version: version of the injected library, defaults to ""
+    :type library_version: str, optional
+    :return: features results cache (None if the caching is disabled)
+    :rtype: api.caching.results.FeaturesResultCache or None type
+    """
+
+    # Load the results caching configuration
+    configuration = load_configuration("caching.json").get("results", {})
+
+    # Prepare the features results cache
+    if not configuration.get("enabled"):
+        return None
+    return FeaturesResultCache(
+        library_name,
+        library_version=library_version,
+        max_size_in_bytes=configuration.get("max_size_in_bytes"))
+
+
+# ---------------------------------- #
+# Content-aware API cache definition #
+# ---------------------------------- #
+
+class RequestCache(ApiCache):
+    """
+    Class extending the request-response cache to be aware of the content negotiation.
+
+    The base cache keys the responses by the request path and the JSON body,
+    which is not sufficient when the body is binary (.npy/.npz buffer), and
+    when the media type of the response is negotiated via the Accept header.
+    Therefore, the key is extended with the negotiated response media type,
+    and the bodies are keyed by their digest (computed while the body is read
+    once by the request unwrapping, so the body is neither re-read nor kept
+    in the key). The requests referencing the stored sample values (sample
+    handles) are keyed by the user identity as well (the handles are resolved
+    per user). The streaming responses are not cached (they can be consumed
+    only once), and neither are the responses to the featurization of the
+    server-side datasets (the features are written to the output files). The
+    partial responses (the handler sets ``g.response_cache_bypass``, e.g. if
+    some of the features timed out) are returned but not cached.
+    """
+
+    def _cache_in_memory(self):
+        """Caches the responses in memory (the streaming/partial responses are bypassed, the hits/misses are counted)"""
+        func = self.func
+
+        @wraps(func)
+        def computed(*args, **kwargs):
+            g.response_cache_miss = True
+            response = func(*args, **kwargs)
+            if g.pop("response_cache_bypass", False):
+                raise ResponseCacheBypassException(response)  # the raised responses are not memoized
+            return response
+
+        # Cache the computed responses
+        self.func = computed
+        cached = super()._cache_in_memory()
+        self.func = func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if is_streaming_media_type(get_response_media_type(request)) or self.has_dataset():
+                return func(*args, **kwargs)
+            g.response_cache_miss = False
+            try:
+                response = cached(*args, **kwargs)
+            except ResponseCacheBypassException as e:
+                response = e.args[0]
+            response_cache_requests.inc(result="miss" if g.pop("response_cache_miss", False) else "hit")
+            return response
+        return wrapper
+
+    @staticmethod
+    def _set_params():
+        """Gets the request params as dict (the payloads are keyed by the digest)"""
+        if request.method == "GET":
+            return dict(request.args)
+        return dict()
+
+    def _get_data_key(self, **kwargs):
+        """Generates the key (negotiated media type, request path and payload)"""
+
+        # Prepare the key from the request path and the params
+        key = super()._get_data_key(**kwargs)
+
+        # Extend the key with the digest of the payload (and of the JSON header of the binary payload)
+        if request.method != "GET":
+            digest = hashlib.sha256(RequestWrapper.get_body_digest(request).encode("utf8"))
+            digest.update(request.headers.get(BINARY_HEADER_NAME, "").encode("utf8"))
+            key = f"{key}{digest.hexdigest()}"
+
+        # Extend the key with the user identity (the sample handles are resolved per user)
+        if self.has_sample_handle():
+            key = f"{key}{get_jwt_identity()}"
+
+        # Return the key with the negotiated media type
+        return f"{get_response_media_type(request)}:{key}"
+
+    @staticmethod
+    def get_samples():
+        """Returns the samples of the payload (None if there are no samples)"""
+        payload = RequestWrapper.unwrap_request(request) if request.method != "GET" else None
+        samples = payload.get("samples") if isinstance(payload, dict) else None
+        return samples if isinstance(samples, dict) else None
+
+    @classmethod
+    def has_sample_handle(cls):
+        """Checks if the JSON payload references the stored sample values (sample handle)"""
+        return (cls.get_samples() or {}).get("handle") is not None
+
+    @classmethod
+    def has_dataset(cls):
+        """Checks if the JSON payload references the server-side dataset (its features are written to a file)"""
+        return (cls.get_samples() or {}).get("dataset") is not None
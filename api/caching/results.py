@@ -0,0 +1,159 @@
+import hashlib
+import threading
+import numpy
+from collections import OrderedDict
+from api.common.utilities import canonicalize
+
+
+# --------------------------------------- #
+# Features results cache class definition #
+# --------------------------------------- #
+
+# Estimated overhead of one cached cell (key, tuple, array header, etc.)
+CELL_OVERHEAD_IN_BYTES = 256
+
+
+class FeaturesResultCache(object):
+    """
+    Class implementing the content-addressed cache of the extracted features.
+
+    The cache stores the features of one subject computed by one element of
+    the features pipeline (one cell of the output matrix). The cells are keyed
+    by the digest of (a) the subject's sample bytes (including the dtype and
+    the shape), (b) the feature name and the canonicalized args, (c) the sample
+    labels and the canonicalized extractor configuration, and (d) the name and
+    the version of the features extraction library. The cache is in-memory,
+    bounded by the size of the cached values, with the LRU eviction policy.
+    """
+
+    def __init__(self, library_name, library_version="", max_size_in_bytes=None):
+        """
+        Initializes the FeaturesResultCache.
+
+        :param library_name: import name of the injected features extraction library
+        :type library_name: str
+        :param library_version: version of the injected library, defaults to ""
+        :type library_version: str, optional
+        :param max_size_in_bytes: maximum size of the cached values, defaults to None (unbounded)
+        :type max_size_in_bytes: int, optional
+        """
+
+        # Set the features extraction library
+        self.library = f"{library_name}=={library_version}"
+
+        # Set the cache bounds
+        self.max_size_in_bytes = max_size_in_bytes
+
+        # Set the cache storage (cell key: (values, labels))
+        self._cells = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # Set the cache statistics
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return str({"library": self.library, "cells": len(self), "size": self.size})
+
+    def __str__(self):
+        return repr(self)
+
+    def __len__(self):
+        return len(self._cells)
+
+    @property
+    def size(self):
+        """Returns the size of the cached values (in bytes)"""
+        return self._size
+
+    @staticmethod
+    def get_cell_size(cell):
+        """Returns the (estimated) size of the cell in bytes"""
+        return cell[0].nbytes + CELL_OVERHEAD_IN_BYTES
+
+    def get_context_digest(self, labels, configuration):
+        """Returns the digest of the extraction context (library, sample labels and extractor configuration)"""
+        return hashlib.sha256(canonicalize([self.library, labels, configuration]).encode("utf8")).digest()
+
+    @staticmethod
+    def get_subject_digests(values):
+        """Returns the digests of the subjects' sample bytes (subjects in the first dimension)"""
+        digests = []
+        for subject in values:
+            digest = hashlib.sha256(f"{subject.dtype.str}{subject.shape}".encode("utf8"))
+            digest.update(numpy.ascontiguousarray(subject).data)
+            digests.append(digest.digest())
+        return digests
+
+    @staticmethod
+    def get_element_digest(element):
+        """Returns the digest of the features pipeline element (feature name and canonicalized args)"""
+        element = canonicalize([element.get("name"), element.get("args") or {}])
+        return hashlib.sha256(element.encode("utf8")).digest()
+
+    @staticmethod
+    def get_key(context_digest, subject_digest, element_digest):
+        """Returns the key of the cell"""
+        return hashlib.sha256(context_digest + subject_digest + element_digest).hexdigest()
+
+    def get(self, key):
+        """
+        Gets the cell from the cache.
+
+        :param key: key of the cell
+        :type key: str
+        :return: cached cell (values, labels) or None if it is missing
+        :rtype: tuple or None type
+        """
+        with self._lock:
+            cell = self._cells.get(key)
+            if cell is None:
+                self.misses += 1
+                return None
+            self._cells.move_to_end(key)
+            self.hits += 1
+            return cell
+
+    def set(self, key, values, labels):
+        """
+        Sets the cell into the cache (evicts the least recently used cells if needed).
+
+        :param key: key of the cell
+        :type key: str
+        :param values: features of the subject computed by the pipeline element
+        :type values: numpy.ndarray
+        :param labels: labels of the features computed by the pipeline element
+        :type labels: list
+        :return: None
+        :rtype: None type
+        """
+
+        # Prepare the cell (the values are copied to not keep the whole matrix alive)
+        values = numpy.array(values, copy=True)
+        values.setflags(write=False)
+        cell = (values, tuple(labels))
+
+        # Do not cache the cells exceeding the cache size
+        if self.max_size_in_bytes and self.get_cell_size(cell) > self.max_size_in_bytes:
+            return
+
+        with self._lock:
+
+            # Replace the existing cell
+            if key in self._cells:
+                self._size -= self.get_cell_size(self._cells.pop(key))
+
+            # Set the cell
+            self._cells[key] = cell
+            self._size += self.get_cell_size(cell)
+
+            # Evict the least recently used cells
+            while self.max_size_in_bytes and self._size > self.max_size_in_bytes:
+                self._size -= self.get_cell_size(self._cells.popitem(last=False)[1])
+
+    def clear(self):
+        """Clears the cache"""
+        with self._lock:
+            self._cells.clear()
+            self._size = 0
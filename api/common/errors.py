@@ -9,6 +9,10 @@ from marshmallow import ValidationError
 from api.wrappers.request import RequestWrappingException, RequestUnwrappingException
 from api.wrappers.response import ResponseWrappingException, ResponseUnwrappingException
 from api.wrappers.data import DataUnwrappingException, DataWrappingException
+from api.featurization.execution.batch import FeaturesExtractionBatchItemException
+from api.datasets.featurizer import FeaturesExtractionDatasetException
+from api.featurization.execution.deadline import FeaturesExtractionCancelledException
+from api.featurization.execution.deadline import FeaturesExtractionStoppedException
 
 
 # -------------------------------------------------- #
@@ -22,6 +26,21 @@ errors_client_side = (
     ResponseUnwrappingException,
     DataWrappingException,
     DataUnwrappingException,
+    FeaturesExtractionBatchItemException,
+    FeaturesExtractionDatasetException,
+)
+
+# Client-side errors registered from third parties (e.g. the injected features extractor exceptions)
+errors_client_side_from_third_parties = []
+
+# Errors of the requests closed by the clients (e.g. the featurization cancelled when the client disconnected)
+errors_client_closed = (
+    FeaturesExtractionCancelledException,
+)
+
+# Errors of the requests stopped by the server (e.g. the featurization workers shut down during the request)
+errors_service_unavailable = (
+    FeaturesExtractionStoppedException,
 )
 
 
@@ -55,30 +74,84 @@ def handle_404_errors(error):
     return generate_error(error, 404)
 
 
+def handle_413_errors(error):
+    """Handles 413 errors in resources"""
+    return generate_error(error, 413, message="Request body is too large")
+
+
+def handle_415_errors(error):
+    """Handles 415 errors in resources"""
+    return generate_error(error, 415, message="Unsupported request body")
+
+
+def handle_499_errors(error):
+    """Handles 499 errors in resources (the client closed the request; the response is not received)"""
+    return generate_error(error, 499, message="Client closed request")
+
+
+def handle_503_errors(error):
+    """Handles 503 errors in resources (the server is shutting down the featurization)"""
+    return generate_error(error, 503, message="Service unavailable")
+
+
 def handle_server_errors(error):
     """Handles all internal server errors"""
     return generate_error(error, 500, message="Internal server error: we are working to resolve the issue")
 
 
+def get_error_status_code(error):
+    """Returns the HTTP status code of the error (the same as returned by the registered error handlers)"""
+    if isinstance(error, exceptions.HTTPException):
+        return error.code
+    if isinstance(error, errors_client_side + tuple(errors_client_side_from_third_parties)):
+        return 400
+    if isinstance(error, errors_client_closed):
+        return 499
+    if isinstance(error, errors_service_unavailable):
+        return 503
+    return 500
+
+
 def register_errors_from_third_parties(app, third_party_errors=None):
-    """Registers the client-side errors from third parties"""
+    """
+    Registers the client-side errors from third parties.
+
+    The errors can be registered also after the application started handling
+    the requests (the libraries served at ``/featurize/<library>`` are injected
+    on their first use), therefore, their handlers are set directly in the
+    error handlers of the application (``register_error_handler`` is allowed
+    only during the setup of the application).
+    """
     if third_party_errors:
         for error in third_party_errors:
-            app.register_error_handler(error, handle_400_errors)
+            if error in errors_client_side_from_third_parties:
+                continue
+            app.error_handler_spec[None][None][error] = handle_400_errors
+            errors_client_side_from_third_parties.append(error)
 
 
 def register_errors(app):
     """Registers the application errors"""
 
-    # Register the 400 and 404 errors, and internal server errors
+    # Register the 400, 404, 413 and 415 errors, and internal server errors
     app.register_error_handler(exceptions.BadRequest, handle_400_errors)
     app.register_error_handler(exceptions.NotFound, handle_404_errors)
+    app.register_error_handler(exceptions.RequestEntityTooLarge, handle_413_errors)
+    app.register_error_handler(exceptions.UnsupportedMediaType, handle_415_errors)
     app.register_error_handler(exceptions.InternalServerError, handle_server_errors)
 
     # Register the specifically handled client-side errors
     for error in errors_client_side:
         app.register_error_handler(error, handle_400_errors)
 
+    # Register the errors of the requests closed by the clients
+    for error in errors_client_closed:
+        app.register_error_handler(error, handle_499_errors)
+
+    # Register the errors of the requests stopped by the server
+    for error in errors_service_unavailable:
+        app.register_error_handler(error, handle_503_errors)
+
     @app.errorhandler(422)
     def handle_error(err):
         """Registers handling of 422 errors (handles webargs exceptions)"""
@@ -1,15 +1,33 @@
 import os
 import time
-import copy
+import json
+import queue
 import flask
+import atexit
+import random
+import hashlib
 import logging
 import importlib
+import threading
+import numpy
+import json_tricks
 from pathlib import Path
+from collections.abc import Mapping
+from logging.handlers import QueueHandler, QueueListener
 from flask import has_request_context, request
 from flask.logging import default_handler
 from api.configuration import load_configuration, application_path
 
 
+# ------------------------------------- #
+# Default logging attributes definition #
+# ------------------------------------- #
+DEFAULT_LOGGING_QUEUE_SIZE = 10000
+DEFAULT_PAYLOAD_MAX_STRING_LENGTH = 256
+DEFAULT_PAYLOAD_MAX_SEQUENCE_LENGTH = 64
+DEFAULT_PAYLOAD_SAMPLING_RATE = 0.0
+
+
 # ------------------------- #
 # Logger getting definition #
 # ------------------------- #
@@ -50,20 +68,231 @@ def configure_logging(app):
     set_application_logger(app)
 
 
+def configure_payload_logging():
+    """Configures the logging of the request/response payloads"""
+    return load_configuration("logging.json").get("payload", {})
+
+
+# --------------------------------------------- #
+# Non-blocking logging handler class definition #
+# --------------------------------------------- #
+
+class NonBlockingHandler(QueueHandler):
+    """
+    Class implementing the non-blocking (queued) logging handler.
+
+    The records are put into a bounded in-memory queue and handed over to the
+    wrapped handler by a background listener thread, so the request threads
+    never wait for the formatting or the disk. The records are formatted by
+    the listener (the payloads are summarized off the request thread), and
+    they are dropped (counted) if the queue is full. The listener is started
+    lazily in each process (i.e. also after a fork).
+    """
+
+    def __init__(self, handler, queue_size=DEFAULT_LOGGING_QUEUE_SIZE):
+        """
+        Initializes the NonBlockingHandler.
+
+        :param handler: wrapped (blocking) logging handler
+        :type handler: logging.Handler
+        :param queue_size: maximum number of the queued records, defaults to DEFAULT_LOGGING_QUEUE_SIZE
+        :type queue_size: int, optional
+        """
+
+        # Initialize the super-class
+        super().__init__(queue.Queue(max(int(queue_size or 0), 0)))
+
+        # Set the wrapped handler
+        self.handler = handler
+        self.queue_size = queue_size
+
+        # Set the listener (started lazily per process)
+        self.listener = None
+        self.listener_pid = None
+        self.listener_lock = threading.Lock()
+
+        # Set the number of the dropped records
+        self.dropped = 0
+
+    def start(self):
+        """Starts the listener thread in the current process (if it is not running)"""
+        with self.listener_lock:
+            if self.listener_pid == os.getpid():
+                return
+            self.queue = queue.Queue(max(int(self.queue_size or 0), 0))
+            self.listener = QueueListener(self.queue, self.handler, respect_handler_level=True)
+            self.listener.start()
+            self.listener_pid = os.getpid()
+
+            # Flush the queued records at the exit
+            atexit.register(self.listener.stop)
+
+    def prepare(self, record):
+        """Prepares the record for queuing (the formatting is deferred to the listener)"""
+        return record
+
+    def enqueue(self, record):
+        """Enqueues the record (the record is dropped if the queue is full)"""
+        if self.listener_pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RequestContextFilter(logging.Filter):
+    """Class implementing the filter adding the request context (on the request thread)"""
+
+    def filter(self, record):
+        """Adds the URL and the remote address of the request to the record"""
+        if has_request_context():
+            record.url = request.url
+            record.remote_addr = request.remote_addr
+        else:
+            record.url = None
+            record.remote_addr = None
+        return True
+
+
+# ----------------------------------------- #
+# Loggable payload summary class definition #
+# ----------------------------------------- #
+
+class LoggablePayload(object):
+    """
+    Class implementing the loggable request/response payload.
+
+    The payload is logged as a bounded summary: the arrays and the binary data
+    are replaced by their shapes, dtypes, byte counts and content hashes, the
+    long strings and sequences by their lengths and content hashes, and the
+    features pipeline by the feature names. A sampled fraction of the payloads
+    is logged in full. The payload is referenced (not copied), and it is only
+    summarized when the record is formatted (by the listener thread).
+    """
+
+    def __init__(self, instance, identifier, max_string_length=None, max_sequence_length=None, full=False):
+        """
+        Initializes the LoggablePayload.
+
+        :param instance: request/response payload
+        :type instance: dict
+        :param identifier: identifier of the request/response
+        :type identifier: str
+        :param max_string_length: maximum length of the logged strings, defaults to None (default)
+        :type max_string_length: int, optional
+        :param max_sequence_length: maximum length of the logged sequences, defaults to None (default)
+        :type max_sequence_length: int, optional
+        :param full: log the full payload, defaults to False
+        :type full: bool, optional
+        """
+        self.instance = instance
+        self.identifier = identifier
+        self.max_string_length = max_string_length or DEFAULT_PAYLOAD_MAX_STRING_LENGTH
+        self.max_sequence_length = max_sequence_length or DEFAULT_PAYLOAD_MAX_SEQUENCE_LENGTH
+        self.full = full
+
+    def __repr__(self):
+        if self.full:
+            try:
+                return json_tricks.dumps({**self.instance, "identifier": self.identifier})
+            except (TypeError, ValueError):
+                pass
+        return str(self.summarize())
+
+    def __str__(self):
+        return repr(self)
+
+    @staticmethod
+    def get_digest(data):
+        """Returns the content hash of the data"""
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def summarize(self):
+        """
+        Summarizes the payload.
+
+        :return: bounded summary of the payload (with the identifier)
+        :rtype: dict
+        """
+
+        # Summarize the payload
+        summary = self.summarize_value(self.instance)
+        if not isinstance(summary, dict):
+            summary = {"payload": summary}
+
+        # Summarize the features pipeline (feature names)
+        features = self.instance.get("features") if isinstance(self.instance, Mapping) else None
+        if isinstance(features, Mapping) and isinstance(features.get("pipeline"), (list, tuple)):
+            summary["features"]["pipeline"] = [
+                element.get("name") if isinstance(element, Mapping) else element for element in features["pipeline"]
+            ]
+
+        # Add the identifier
+        summary.update({"identifier": self.identifier})
+
+        # Return the summary
+        return summary
+
+    def summarize_value(self, value):
+        """Summarizes the (nested) value of the payload"""
+
+        # Summarize the arrays
+        if isinstance(value, numpy.ndarray):
+            return {
+                "shape": list(value.shape),
+                "dtype": str(value.dtype),
+                "bytes": int(value.nbytes),
+                "hash": self.get_digest(numpy.ascontiguousarray(value).data) if value.dtype != object else None
+            }
+
+        # Summarize the binary data
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return {"bytes": len(value), "hash": self.get_digest(value)}
+
+        # Summarize the strings
+        if isinstance(value, str):
+            if len(value) <= self.max_string_length:
+                return value
+            return {"length": len(value), "hash": self.get_digest(value.encode("utf8"))}
+
+        # Summarize the mappings
+        if isinstance(value, Mapping):
+            return {str(key): self.summarize_value(item) for key, item in value.items()}
+
+        # Summarize the sequences
+        if isinstance(value, (list, tuple)):
+            if len(value) <= self.max_sequence_length:
+                return [self.summarize_value(item) for item in value]
+            return {
+                "length": len(value),
+                "hash": self.get_digest(json.dumps(value, default=str).encode("utf8"))
+            }
+
+        # Return the other values as they are
+        return value
+
+
 # --------------------------- #
 # Logging routines definition #
 # --------------------------- #
 
-def set_application_logger(app):
-    """Sets the application logger"""
+def get_logging_handler(config):
+    """
+    Gets the logging handler from its configuration.
 
-    # Load the configuration
-    config = load_configuration("logging.json")["werkzeug"]
-    logger = logging.getLogger("werkzeug")
+    :param config: handler configuration (class and kwargs)
+    :type config: dict
+    :return: logging handler
+    :rtype: logging.Handler
+    """
+
+    # Prepare the handler kwargs (the configuration is not modified)
+    kwargs = dict(config.get("kwargs", {}))
 
     # Update the filename of the logging directory to reflect the full path
-    if config.get("kwargs", {}).get("filename"):
-        config["kwargs"]["filename"] = time.strftime(os.path.join("logs", f"%Y_%m_%d_{config['kwargs']['filename']}"))
+    if kwargs.get("filename"):
+        kwargs["filename"] = time.strftime(os.path.join("logs", f"%Y_%m_%d_{kwargs['filename']}"))
 
     # Prepare the logging module and logger class name
     logger_path = config["class"].split(".")
@@ -72,8 +301,19 @@ def set_application_logger(app):
     # Prepare the logging class
     logger_class = getattr(importlib.import_module(logger_module), logger_class)
 
+    # Return the handler
+    return logger_class(**kwargs)
+
+
+def set_application_logger(app):
+    """Sets the application logger"""
+
+    # Load the configuration
+    config = load_configuration("logging.json")["werkzeug"]
+    logger = logging.getLogger("werkzeug")
+
     # Prepare the handler
-    handler = logger_class(**config["kwargs"])
+    handler = get_logging_handler(config)
 
     # Set the level and the formatter
     handler.setLevel(logging.INFO)
@@ -93,46 +333,25 @@ def get_application_logger(app=None):
 def get_request_logger():
     """Gets the request logger"""
 
-    class RequestFormatter(logging.Formatter):
-        """Class extending the default formatter"""
-
-        def format(self, record):
-            """Formats the input record"""
-            if has_request_context():
-                record.url = request.url
-                record.remote_addr = request.remote_addr
-            else:
-                record.url = None
-                record.remote_addr = None
-            return super().format(record)
-
     # Load the configuration
-    config = load_configuration("logging.json")["request"]
+    configuration = load_configuration("logging.json")
+    config = configuration["request"]
     logger = logging.getLogger("request_logger")
     logger.setLevel(logging.DEBUG)
 
-    # Update the filename of the logging directory to reflect the full path
-    if config.get("kwargs", {}).get("filename"):
-        config["kwargs"]["filename"] = time.strftime(
-            os.path.join("logs", f"%Y_%m_%d_{config['kwargs']['filename']}"))
-
-    # Prepare the logging module and logger class name
-    logger_path = config["class"].split(".")
-    logger_module, logger_class = ".".join(logger_path[:-1]), logger_path[-1]
-
-    # Prepare the logging class
-    logger_class = getattr(importlib.import_module(logger_module), logger_class)
-
     # Prepare the handler
-    handler = logger_class(**config["kwargs"])
+    handler = get_logging_handler(config)
 
     # Configure the formatter
-    formatter = RequestFormatter("[%(asctime)s] %(remote_addr)s requested %(url)s in %(module)s: %(message)s")
+    formatter = logging.Formatter("[%(asctime)s] %(remote_addr)s requested %(url)s in %(module)s: %(message)s")
     handler.setFormatter(formatter)
 
+    # Prepare the non-blocking handler (the request context is added on the request thread)
+    queue_handler = NonBlockingHandler(handler, configuration.get("queue", {}).get("size", DEFAULT_LOGGING_QUEUE_SIZE))
+    queue_handler.addFilter(RequestContextFilter())
+
     # Register the logger
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    logger.addHandler(queue_handler)
 
     # Return the logger
     return logger
@@ -142,45 +361,50 @@ def get_response_logger():
     """Gets the response logger"""
 
     # Load the configuration
-    config = load_configuration("logging.json")["response"]
+    configuration = load_configuration("logging.json")
+    config = configuration["response"]
     logger = logging.getLogger("response_logger")
     logger.setLevel(logging.DEBUG)
 
-    # Update the filename of the logging directory to reflect the full path
-    if config.get("kwargs", {}).get("filename"):
-        config["kwargs"]["filename"] = time.strftime(
-            os.path.join("logs", f"%Y_%m_%d_{config['kwargs']['filename']}"))
-
-    # Prepare the logging module and logger class name
-    logger_path = config["class"].split(".")
-    logger_module, logger_class = ".".join(logger_path[:-1]), logger_path[-1]
-
-    # Prepare the logging class
-    logger_class = getattr(importlib.import_module(logger_module), logger_class)
-
     # Prepare the handler
-    handler = logger_class(**config["kwargs"])
+    handler = get_logging_handler(config)
 
     # Configure the formatter
     formatter = logging.Formatter("%(asctime)s, %(message)s")
     handler.setFormatter(formatter)
 
+    # Prepare the non-blocking handler
+    queue_handler = NonBlockingHandler(handler, configuration.get("queue", {}).get("size", DEFAULT_LOGGING_QUEUE_SIZE))
+
     # Register the logger
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    logger.addHandler(queue_handler)
 
     # Return the logger
     return logger
 
 
-def get_loggable_object(instance, identifier):
-    """Returns the loggable request/response objects"""
-
-    # Make a copy of the instance
-    loggable = copy.deepcopy(instance)
+def get_loggable_object(instance, identifier, configuration=None):
+    """
+    Returns the loggable request/response objects.
+
+    :param instance: request/response payload
+    :type instance: dict
+    :param identifier: identifier of the request/response
+    :type identifier: str
+    :param configuration: payload logging configuration, defaults to None
+    :type configuration: dict, optional
+    :return: loggable payload (summarized when logged)
+    :rtype: api.common.logging.LoggablePayload
+    """
 
-    # Add the identifier
-    loggable.update({"identifier": identifier})
+    # Prepare the configuration
+    configuration = configuration or {}
+    sampling_rate = configuration.get("full_body_sampling_rate", DEFAULT_PAYLOAD_SAMPLING_RATE)
 
     # Return the loggable object
-    return loggable
+    return LoggablePayload(
+        instance,
+        identifier,
+        max_string_length=configuration.get("max_string_length"),
+        max_sequence_length=configuration.get("max_sequence_length"),
+        full=bool(sampling_rate) and random.random() < sampling_rate)
@@ -0,0 +1,99 @@
+import io
+import sys
+import time
+import pstats
+import cProfile
+import subprocess
+
+
+# ----------------------------------------------- #
+# Default startup profiling attributes definition #
+# ----------------------------------------------- #
+DEFAULT_STARTUP_PROFILE_TOP = 20
+
+
+# ------------------------------------- #
+# Startup profiling routines definition #
+# ------------------------------------- #
+
+def get_import_times(module="api", top=DEFAULT_STARTUP_PROFILE_TOP):
+    """
+    Measures the import times of the modules imported by the module (in a fresh interpreter, -X importtime).
+
+    :param module: name of the imported module, defaults to "api"
+    :type module: str, optional
+    :param top: number of the slowest imports to return, defaults to DEFAULT_STARTUP_PROFILE_TOP
+    :type top: int, optional
+    :return: total import time (seconds) and the slowest imports (cumulative seconds, module name)
+    :rtype: tuple (float, list of tuple (float, str))
+    """
+
+    # Import the module in a fresh interpreter (the import times are written to stderr)
+    s = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True)
+    total = time.perf_counter() - s
+
+    # Parse the import times (import time: <self us> | <cumulative us> | <module>)
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        imports.append((int(parts[1]) / 1e6, parts[2]))
+
+    # Return the total import time and the slowest imports
+    return total, sorted(imports, reverse=True)[:top]
+
+
+def profile_startup(app_name, top=DEFAULT_STARTUP_PROFILE_TOP, budget=None, stream=None):
+    """
+    Profiles the startup of the API (the imports and the preparation of the application) and prints the report.
+
+    :param app_name: name of the application
+    :type app_name: str
+    :param top: number of the slowest imports/functions to report, defaults to DEFAULT_STARTUP_PROFILE_TOP
+    :type top: int, optional
+    :param budget: startup time budget in seconds, defaults to None (not checked)
+    :type budget: float, optional
+    :param stream: output stream of the report, defaults to None (sys.stdout)
+    :type stream: io.TextIOBase, optional
+    :return: True if the startup fits the budget (or the budget is not set)
+    :rtype: bool
+    """
+    stream = stream or sys.stdout
+
+    # Measure the import times (fresh interpreter)
+    imports_time, imports = get_import_times("api", top=top)
+
+    # Profile the preparation of the application (the background workers are not started)
+    from api import prepare_app
+    profiler = cProfile.Profile()
+    s = time.perf_counter()
+    profiler.enable()
+    prepare_app(app_name, start_background_workers=False)
+    profiler.disable()
+    preparation_time = time.perf_counter() - s
+
+    # Print the report
+    total = imports_time + preparation_time
+    print(f"Startup: {total:.3f} s (imports: {imports_time:.3f} s, preparation: {preparation_time:.3f} s)", file=stream)
+    print("\nSlowest imports (cumulative):", file=stream)
+    for duration, module in imports:
+        print(f"  {duration:8.3f} s  {module}", file=stream)
+    print("\nSlowest preparation functions (cumulative):", file=stream)
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    print(report.getvalue(), file=stream)
+
+    # Check the startup time budget
+    if budget is not None:
+        fits = total <= budget
+        print(f"Startup budget: {budget:.3f} s ({'met' if fits else 'exceeded'})", file=stream)
+        return fits
+    return True
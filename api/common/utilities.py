@@ -1,5 +1,7 @@
+import json
+import time
 from functools import wraps
-from datetime import datetime
+from api.metrics import function_duration
 
 
 # -------------------- #
@@ -10,6 +12,9 @@ def measure_runtime(method):
     """
     Decorator that measures the runtime of the <method>.
 
+    The runtime is measured by the monotonic high-resolution clock, and it is
+    observed by the function duration histogram served at ``/metrics``.
+
     :param method: method to decorate
     :type method: callable
     :return: decorated method
@@ -18,11 +23,26 @@ def measure_runtime(method):
 
     @wraps(method)
     def measure(*args, **kwargs):
-        s = datetime.now()
-        r = method(*args, **kwargs)
-        f = datetime.now()
-        d = (f - s)
-        if d.microseconds > 0.0000:
-            print(f"Execution of <{method.__name__}> finished (runtime): {d}")
-        return r
+        s = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            function_duration.observe(time.perf_counter() - s, function=method.__qualname__)
     return measure
+
+
+def canonicalize(instance):
+    """
+    Returns the canonical (JSON-string) representation of the instance.
+
+    The keys of the dicts are sorted and the separators are compact, so the
+    equal instances (e.g. feature args given in a different order) have the
+    equal canonical representation. Non-serializable values are converted to
+    strings.
+
+    :param instance: instance to be canonicalized
+    :type instance: Any
+    :return: canonical representation
+    :rtype: str
+    """
+    return json.dumps(instance, sort_keys=True, separators=(",", ":"), default=str)
@@ -0,0 +1,120 @@
+from flask import request
+from api.configuration import load_configuration
+from api.wrappers.media import MEDIA_TYPE_JSON, MEDIA_TYPE_NDJSON, MEDIA_TYPE_NPZ
+from api.compression.encoding import (
+    RequestDecompressionMiddleware,
+    get_response_content_encoding,
+    compress_body,
+    compress_stream
+)
+
+
+# ----------------------------------------- #
+# Default compression attributes definition #
+# ----------------------------------------- #
+DEFAULT_MAX_DECOMPRESSED_SIZE = 1024 * 1024 * 1024
+DEFAULT_DECOMPRESSION_CHUNK_SIZE = 64 * 1024
+DEFAULT_COMPRESSION_LEVEL = 6
+DEFAULT_COMPRESSION_MIN_SIZE = 1024
+DEFAULT_COMPRESSIBLE_MEDIA_TYPES = (MEDIA_TYPE_JSON, MEDIA_TYPE_NDJSON, MEDIA_TYPE_NPZ)
+
+
+# --------------------------------------------- #
+# Compression configuration routines definition #
+# --------------------------------------------- #
+
+def configure_compression(app):
+    """
+    Configures the compression of the request and response bodies.
+
+    The request bodies with the ``Content-Encoding: gzip/deflate`` header are
+    decompressed incrementally while they are read (up to the configured
+    maximum decompressed size, HTTP 413 is returned above it). The response
+    bodies of the compressible media types are compressed with the content
+    coding negotiated via the ``Accept-Encoding`` header (at the configured
+    compression level; the streamed responses are compressed per chunk).
+
+    :param app: application
+    :type app: flask.Flask
+    :return: None
+    :rtype: None type
+    """
+
+    # Load the compression configuration
+    configuration = load_configuration("compression.json")
+    request_configuration = configuration.get("request", {})
+    response_configuration = configuration.get("response", {})
+
+    # Configure the decompression of the request bodies
+    if request_configuration.get("enabled"):
+        app.wsgi_app = RequestDecompressionMiddleware(
+            app.wsgi_app,
+            max_size=request_configuration.get("max_decompressed_size_in_bytes", DEFAULT_MAX_DECOMPRESSED_SIZE),
+            chunk_size=request_configuration.get("chunk_size_in_bytes", DEFAULT_DECOMPRESSION_CHUNK_SIZE))
+
+    # Configure the compression of the response bodies
+    if response_configuration.get("enabled"):
+        level = response_configuration.get("level", DEFAULT_COMPRESSION_LEVEL)
+        min_size = response_configuration.get("min_size_in_bytes", DEFAULT_COMPRESSION_MIN_SIZE)
+        media_types = tuple(response_configuration.get("media_types", DEFAULT_COMPRESSIBLE_MEDIA_TYPES))
+
+        @app.after_request
+        def compress_response(response):
+            """Compresses the response body (if negotiated via the Accept-Encoding header)"""
+            return compress_flask_response(response, level, min_size, media_types)
+
+
+def compress_flask_response(response, level, min_size, media_types):
+    """
+    Compresses the response body with the content coding negotiated via the Accept-Encoding header.
+
+    The compressed body is returned as a new response object (the original
+    response can be held by the request-response cache, so it must not be
+    modified). The streamed responses are compressed chunk by chunk.
+
+    :param response: response to be compressed
+    :type response: flask.Response
+    :param level: compression level (1: fastest, 9: smallest)
+    :type level: int
+    :param min_size: minimum size of the compressed (not streamed) bodies in bytes
+    :type min_size: int
+    :param media_types: compressible media types
+    :type media_types: tuple
+    :return: compressed response (or the original response)
+    :rtype: flask.Response
+    """
+
+    # Check the media type, the status, and the current content coding
+    if response.mimetype not in media_types or response.status_code < 200 or response.status_code in (204, 304):
+        return response
+    if "Content-Encoding" in response.headers or response.direct_passthrough and not response.is_streamed:
+        return response
+
+    # Negotiate the content coding (the response varies by the Accept-Encoding header)
+    response.vary.add("Accept-Encoding")
+    encoding = get_response_content_encoding(request)
+    if not encoding:
+        return response
+
+    # Compress the streamed body (chunk by chunk)
+    if response.is_streamed:
+        compressed = response.__class__(
+            compress_stream(response.iter_encoded(), encoding, level),
+            status=response.status,
+            headers=response.headers.copy())
+        compressed.call_on_close(response.close)
+        compressed.headers.pop("Content-Length", None)
+
+    # Compress the body
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        compressed = response.__class__(
+            compress_body(body, encoding, level),
+            status=response.status,
+            headers=response.headers.copy())
+
+    # Return the compressed response
+    compressed.headers["Content-Encoding"] = encoding
+    return compressed
@@ -0,0 +1,211 @@
+import io
+import zlib
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.wsgi import LimitedStream, get_content_length
+
+
+# ------------------------------------ #
+# Supported content codings definition #
+# ------------------------------------ #
+CONTENT_ENCODING_GZIP = "gzip"
+CONTENT_ENCODING_DEFLATE = "deflate"
+CONTENT_ENCODING_IDENTITY = "identity"
+
+# Content codings supported in the requests and in the responses (in the order of preference)
+CONTENT_ENCODINGS = (CONTENT_ENCODING_GZIP, CONTENT_ENCODING_DEFLATE)
+
+# Window bits of the content codings (gzip: gzip header/trailer, deflate: zlib header/trailer)
+CONTENT_ENCODING_WBITS = {
+    CONTENT_ENCODING_GZIP: 16 + zlib.MAX_WBITS,
+    CONTENT_ENCODING_DEFLATE: zlib.MAX_WBITS
+}
+
+# WSGI environment key holding the size of the encoded (compressed) request body
+ENCODED_CONTENT_LENGTH_KEY = "featurizer.encoded_content_length"
+
+
+# ------------------------------------------ #
+# Streaming request decompression definition #
+# ------------------------------------------ #
+
+class DecompressingStream(io.RawIOBase):
+    """
+    Class implementing the (read-only) stream decompressing the encoded request body.
+
+    The encoded body is read from the source stream in chunks and decompressed
+    incrementally (the decompressed data are never larger than the requested
+    read size plus one chunk). If the decompressed size exceeds the limit, the
+    reading is stopped and HTTP 413 is raised (protection against the
+    decompression bombs). The malformed or truncated bodies raise HTTP 400,
+    and the unsupported content codings raise HTTP 415 (on the first read).
+    """
+
+    def __init__(self, source, encoding, max_size=None, chunk_size=65536):
+        """
+        Initializes the DecompressingStream.
+
+        :param source: stream with the encoded body
+        :type source: file-like object
+        :param encoding: content coding of the body (Content-Encoding)
+        :type encoding: str
+        :param max_size: maximum size of the decompressed body in bytes, defaults to None (unlimited)
+        :type max_size: int, optional
+        :param chunk_size: size of the chunks read from the source stream in bytes, defaults to 65536
+        :type chunk_size: int, optional
+        """
+        super().__init__()
+        self.source = source
+        self.encoding = encoding
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+
+        # Set the decompressor (None if the content coding is not supported)
+        wbits = CONTENT_ENCODING_WBITS.get(encoding)
+        self.decompressor = zlib.decompressobj(wbits) if wbits is not None else None
+
+        # Set the decompression state
+        self.pending = b""
+        self.decompressed_size = 0
+        self.exhausted = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        """Reads the decompressed data into the buffer (returns the number of bytes read)"""
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def read(self, size=-1):
+        """
+        Reads up to <size> bytes of the decompressed body.
+
+        :param size: number of bytes to read, defaults to -1 (until the end of the body)
+        :type size: int, optional
+        :return: decompressed data (empty at the end of the body)
+        :rtype: bytes
+        """
+        if self.decompressor is None:
+            raise UnsupportedMediaType(f"Unsupported Content-Encoding: {self.encoding}")
+
+        # Decompress the data until the requested size is available
+        chunks, available = [], 0
+        while (size is None or size < 0 or available < size) and not self.exhausted:
+            chunk = self._decompress(self.chunk_size if size is None or size < 0 else size - available)
+            chunks.append(chunk)
+            available += len(chunk)
+
+        # Return the decompressed data
+        return b"".join(chunks)
+
+    def _decompress(self, max_length):
+        """Decompresses up to <max_length> bytes (reads the next chunk of the encoded body if needed)"""
+
+        # Read the next chunk of the encoded body
+        if not self.pending:
+            self.pending = self.source.read(self.chunk_size) or b""
+            if not self.pending:
+                self.exhausted = True
+                if not self.decompressor.eof:
+                    raise BadRequest(f"Truncated {self.encoding}-encoded request body")
+                return self.decompressor.flush()
+
+        # Decompress the chunk (bounded by max_length, the rest is kept for the next call)
+        try:
+            data = self.decompressor.decompress(self.pending, max_length)
+        except zlib.error as e:
+            raise BadRequest(f"Malformed {self.encoding}-encoded request body: {e}")
+        self.pending = self.decompressor.unconsumed_tail
+
+        # Ignore the trailing data after the end of the compressed stream
+        if self.decompressor.eof:
+            self.pending = b""
+            self.exhausted = True
+
+        # Check the size of the decompressed body
+        self.decompressed_size += len(data)
+        if self.max_size is not None and self.decompressed_size > self.max_size:
+            self.exhausted = True
+            raise RequestEntityTooLarge(f"Decompressed request body exceeds {self.max_size} bytes")
+
+        # Return the decompressed data
+        return data
+
+
+class RequestDecompressionMiddleware(object):
+    """
+    Class implementing the WSGI middleware decompressing the encoded request bodies.
+
+    The requests with the ``Content-Encoding`` header get the decompressing
+    stream as their ``wsgi.input`` (the Content-Encoding and Content-Length
+    headers are removed, the stream is terminated by the end of the encoded
+    body), so the decompression is transparent to the request-response cache
+    and to the request unwrapping, and it is performed incrementally while the
+    body is being read.
+    """
+
+    def __init__(self, wsgi_app, max_size=None, chunk_size=65536):
+        """
+        Initializes the RequestDecompressionMiddleware.
+
+        :param wsgi_app: wrapped WSGI application
+        :type wsgi_app: callable
+        :param max_size: maximum size of the decompressed body in bytes, defaults to None (unlimited)
+        :type max_size: int, optional
+        :param chunk_size: size of the chunks read from the encoded body in bytes, defaults to 65536
+        :type chunk_size: int, optional
+        """
+        self.wsgi_app = wsgi_app
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+
+    def __call__(self, environ, start_response):
+        encoding = environ.get("HTTP_CONTENT_ENCODING", "").strip().lower()
+        if encoding and encoding != CONTENT_ENCODING_IDENTITY:
+
+            # Limit the source stream to the encoded body
+            source = environ["wsgi.input"]
+            content_length = get_content_length(environ)
+            if content_length is not None and "wsgi.input_terminated" not in environ:
+                source = LimitedStream(source, content_length)
+
+            # Replace the input stream with the decompressing stream
+            environ["wsgi.input"] = DecompressingStream(source, encoding, self.max_size, self.chunk_size)
+            environ["wsgi.input_terminated"] = True
+            environ[ENCODED_CONTENT_LENGTH_KEY] = content_length
+            environ.pop("HTTP_CONTENT_ENCODING", None)
+            environ.pop("CONTENT_LENGTH", None)
+
+        # Call the wrapped WSGI application
+        return self.wsgi_app(environ, start_response)
+
+
+# ---------------------------------------- #
+# Response compression routines definition #
+# ---------------------------------------- #
+
+def get_response_content_encoding(request, encodings=CONTENT_ENCODINGS):
+    """Returns the content coding of the response negotiated via the Accept-Encoding header (None for identity)"""
+    return request.accept_encodings.best_match(encodings)
+
+
+def get_compressor(encoding, level):
+    """Returns the compressor of the content coding"""
+    return zlib.compressobj(level, zlib.DEFLATED, CONTENT_ENCODING_WBITS[encoding])
+
+
+def compress_body(body, encoding, level):
+    """Compresses the response body"""
+    compressor = get_compressor(encoding, level)
+    return compressor.compress(body) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, level):
+    """Compresses the streamed response body (each chunk is flushed, so it is sent without waiting for the next)"""
+    compressor = get_compressor(encoding, level)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
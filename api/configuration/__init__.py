@@ -1,5 +1,5 @@
 import os
-import json
+from api.configuration.registry import ConfigurationRegistry
 
 
 # ---------------------------- #
@@ -13,17 +13,18 @@ configuration_path = os.path.dirname(os.path.realpath(__file__))
 application_path = os.path.join(configuration_path, "..")
 
 
+# --------------------------------- #
+# Configuration registry definition #
+# --------------------------------- #
+
+# Prepare the registry (all configuration files are loaded and validated once)
+registry = ConfigurationRegistry(configuration_path)
+
+
 # -------------------------------- #
 # Configuration helpers definition #
 # -------------------------------- #
 
 def load_configuration(configuration_filename):
-    """Loads the configuration from the specified configuration file name"""
-
-    # Prepare the api configuration file path
-    path = os.path.join(configuration_path, configuration_filename)
-
-    # Read the configuration
-    if path and os.path.isfile(path) and os.access(path, os.R_OK):
-        with open(path, "r") as f:
-            return json.load(f)
+    """Loads the configuration (frozen view) from the specified configuration file name"""
+    return registry.get(configuration_filename)
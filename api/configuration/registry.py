@@ -0,0 +1,263 @@
+import os
+import glob
+import json
+import time
+import threading
+
+
+# -------------------------------------------- #
+# Configuration registry exceptions definition #
+# -------------------------------------------- #
+class ConfigurationNotValidException(Exception): pass
+class ConfigurationFrozenException(TypeError): pass
+
+
+# -------------------------------------------- #
+# Configuration registry attributes definition #
+# -------------------------------------------- #
+
+# Prefix of the environment variables overriding the configuration (FEATURIZER_<FILE>__<KEY>__<KEY>=<JSON value>)
+CONFIGURATION_ENVIRONMENT_PREFIX = "FEATURIZER_"
+
+# Separator of the keys in the names of the environment variables overriding the configuration
+CONFIGURATION_ENVIRONMENT_SEPARATOR = "__"
+
+# Environment variable with the minimum seconds between checking the configuration files for changes (0: no reload)
+CONFIGURATION_RELOAD_INTERVAL_VARIABLE = "FEATURIZER_CONFIGURATION_RELOAD_INTERVAL"
+
+# Default minimum seconds between checking the configuration files for changes
+DEFAULT_CONFIGURATION_RELOAD_INTERVAL = 1.0
+
+
+# ------------------------------------- #
+# Frozen configuration views definition #
+# ------------------------------------- #
+
+class FrozenDict(dict):
+    """
+    Class implementing the read-only view of the configuration dict.
+
+    The view is a ``dict`` (it is JSON-serializable and it can be unpacked),
+    but it cannot be modified in place; the mutable copy is created via
+    ``dict(view)`` (shallow) or ``copy.deepcopy(view)`` (deep, thawed).
+    """
+
+    def _frozen(self, *args, **kwargs):
+        raise ConfigurationFrozenException("The configuration is read-only (modify its copy instead)")
+
+    __setitem__ = __delitem__ = __ior__ = _frozen
+    clear = pop = popitem = setdefault = update = _frozen
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value):
+    """Returns the read-only view of the configuration value (dicts are frozen, lists are converted to tuples)"""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Returns the mutable copy of the configuration value (frozen dicts are copied, tuples are converted to lists)"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+# --------------------------------------- #
+# Configuration registry class definition #
+# --------------------------------------- #
+
+class ConfigurationRegistry(object):
+    """
+    Class implementing the registry of the API configuration files (api/configuration/*.json).
+
+    All configuration files are loaded and validated once (each of them must be
+    a JSON object), the environment variables override their values, and the
+    configurations are then served as the frozen (read-only) views, so they are
+    neither re-read from the disk nor modified by the callers. The files are
+    checked for the changes (modification time) at most once per the reload
+    interval; the changed file is re-loaded and validated, and its view is
+    replaced at once (the invalid changes are rejected, and the previously
+    loaded view is kept).
+
+    The environment variables ``FEATURIZER_<FILE>__<KEY>__...__<KEY>`` override
+    the values of the (nested) keys of the configuration ``<file>.json`` (the
+    file and the keys are matched case-insensitively); the values are parsed as
+    JSON (e.g. ``FEATURIZER_CACHING__CACHE__EXPIRATION_TIME_IN_SECONDS=120``),
+    and they must have the same type as the overridden values.
+    """
+
+    def __init__(self, directory, environment=None, reload_interval=None):
+        """
+        Initializes the ConfigurationRegistry.
+
+        :param directory: directory of the configuration files
+        :type directory: str
+        :param environment: environment variables, defaults to None (os.environ)
+        :type environment: dict, optional
+        :param reload_interval: minimum seconds between checking the files for changes, defaults to None (env/1 s)
+        :type reload_interval: float, optional
+        """
+
+        # Set the configuration directory and the environment
+        self.directory = directory
+        self.environment = os.environ if environment is None else environment
+
+        # Set the reload interval (0: the files are not checked for changes)
+        if reload_interval is None:
+            reload_interval = float(self.environment.get(
+                CONFIGURATION_RELOAD_INTERVAL_VARIABLE,
+                DEFAULT_CONFIGURATION_RELOAD_INTERVAL))
+        self.reload_interval = reload_interval
+
+        # Set the loaded configurations (file name: (modification time, frozen view))
+        self._configurations = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+        # Load all configuration files
+        self.load()
+
+    def __repr__(self):
+        return str({"directory": self.directory, "configurations": sorted(self._configurations)})
+
+    def __str__(self):
+        return repr(self)
+
+    def load(self):
+        """Loads and validates all configuration files of the directory (raises on the invalid file)"""
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            name = os.path.basename(path)
+            self._configurations[name] = self.load_file(name)
+            self._checked_at[name] = time.monotonic()
+
+    def get(self, name):
+        """
+        Gets the frozen view of the configuration (re-loads the file if it changed).
+
+        :param name: name of the configuration file (e.g. "caching.json")
+        :type name: str
+        :return: frozen view of the configuration (None if the file does not exist)
+        :rtype: api.configuration.registry.FrozenDict or None type
+        """
+        loaded = self._configurations.get(name)
+
+        # Check the file for changes (at most once per the reload interval)
+        if self.reload_interval and time.monotonic() - self._checked_at.get(name, 0) >= self.reload_interval:
+            loaded = self.reload(name)
+
+        # Return the frozen view of the configuration
+        return loaded[1] if loaded else None
+
+    def reload(self, name):
+        """Re-loads the configuration if its file changed (the invalid changes are rejected)"""
+        with self._lock:
+            self._checked_at[name] = time.monotonic()
+            loaded = self._configurations.get(name)
+
+            # Check the modification time of the file
+            try:
+                modified_at = os.stat(os.path.join(self.directory, name)).st_mtime
+            except OSError:
+                return loaded
+            if loaded and loaded[0] == modified_at:
+                return loaded
+
+            # Re-load the file (keep the loaded configuration if the file is not valid)
+            try:
+                self._configurations[name] = self.load_file(name)
+            except ConfigurationNotValidException:
+                return loaded
+            return self._configurations[name]
+
+    def load_file(self, name):
+        """
+        Loads, validates and overrides (environment) the configuration file.
+
+        :param name: name of the configuration file
+        :type name: str
+        :return: modification time of the file and the frozen view of the configuration
+        :rtype: tuple (float, api.configuration.registry.FrozenDict)
+        """
+        path = os.path.join(self.directory, name)
+
+        # Read the configuration
+        try:
+            modified_at = os.stat(path).st_mtime
+            with open(path, "r") as f:
+                configuration = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigurationNotValidException(f"Configuration {name} cannot be loaded: {e}")
+
+        # Validate the configuration
+        if not isinstance(configuration, dict):
+            raise ConfigurationNotValidException(f"Configuration {name} is not a valid JSON object")
+
+        # Override the configuration from the environment variables
+        configuration = self.override(name, configuration)
+
+        # Return the modification time and the frozen view of the configuration
+        return modified_at, freeze(configuration)
+
+    def override(self, name, configuration):
+        """Overrides the configuration values from the environment variables (FEATURIZER_<FILE>__<KEY>...)"""
+        prefix = f"{CONFIGURATION_ENVIRONMENT_PREFIX}{os.path.splitext(name)[0].upper()}{CONFIGURATION_ENVIRONMENT_SEPARATOR}"
+
+        for variable, value in sorted(self.environment.items()):
+            if not variable.upper().startswith(prefix):
+                continue
+
+            # Get the (nested) keys of the overridden value
+            keys = [key.lower() for key in variable[len(prefix):].split(CONFIGURATION_ENVIRONMENT_SEPARATOR)]
+            if not all(keys):
+                raise ConfigurationNotValidException(f"Configuration override {variable} is not valid")
+
+            # Get the dict holding the overridden value (match the keys case-insensitively)
+            node = configuration
+            for index, key in enumerate(keys):
+                key = next((existing for existing in node if existing.lower() == key), key)
+                if index == len(keys) - 1:
+                    break
+                node = node.setdefault(key, {})
+                if not isinstance(node, dict):
+                    raise ConfigurationNotValidException(f"Configuration override {variable} is not valid (not a dict)")
+
+            # Parse the value (JSON, or the plain string; the string values are not parsed)
+            try:
+                parsed = value if isinstance(node.get(key), str) else json.loads(value)
+            except ValueError:
+                parsed = value
+
+            # Validate the type of the value (the same type as the overridden value)
+            if key in node and node[key] is not None and parsed is not None and not self.is_same_type(node[key], parsed):
+                raise ConfigurationNotValidException(
+                    f"Configuration override {variable} is not valid "
+                    f"(expected {type(node[key]).__name__}, got {type(parsed).__name__})")
+
+            # Override the value
+            node[key] = parsed
+
+        # Return the overridden configuration
+        return configuration
+
+    @staticmethod
+    def is_same_type(value, override):
+        """Checks if the override has the same type as the value (the integers can override the floats)"""
+        if isinstance(value, bool) or isinstance(override, bool):
+            return isinstance(value, bool) and isinstance(override, bool)
+        if isinstance(value, float) and isinstance(override, int):
+            return True
+        return type(value) is type(override)
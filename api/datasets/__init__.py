@@ -0,0 +1,34 @@
+import os
+from api.configuration import load_configuration, application_path
+from api.datasets.featurizer import DatasetFeaturizer
+
+
+# ------------------------------------------------ #
+# Default dataset featurizer attributes definition #
+# ------------------------------------------------ #
+DEFAULT_DATASETS_DATA_ROOT = "api/datasets/data"
+DEFAULT_DATASETS_OUTPUT_ROOT = "api/datasets/features"
+
+
+# ---------------------------------------------------- #
+# Dataset featurizer configuration routines definition #
+# ---------------------------------------------------- #
+
+def configure_datasets():
+    """
+    Configures the out-of-core featurization of the server-side datasets (.npy files).
+
+    :return: dataset featurizer (None if the datasets are disabled)
+    :rtype: api.datasets.featurizer.DatasetFeaturizer or None type
+    """
+
+    # Load the configuration
+    configuration = load_configuration("datasets.json").get("datasets", {})
+    if not configuration.get("enabled"):
+        return None
+
+    # Prepare the dataset featurizer
+    return DatasetFeaturizer(
+        os.path.join(application_path, "..", configuration.get("data_root") or DEFAULT_DATASETS_DATA_ROOT),
+        os.path.join(application_path, "..", configuration.get("output_root") or DEFAULT_DATASETS_OUTPUT_ROOT),
+        chunk_size_in_bytes=configuration.get("chunk_size_in_bytes"))
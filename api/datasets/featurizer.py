@@ -0,0 +1,204 @@
+import os
+import uuid
+import numpy
+import marshmallow
+from pathlib import Path
+from api.featurization.interface import FeaturesExtractorPipeline
+from api.interfaces.inputs.interface import Sample
+from api.interfaces.inputs.utilities import SamplesLabelsValidator
+from api.interfaces.outputs.utilities import FeatureValuesValidator, FeatureLabelsValidator
+
+
+# ---------------------------------------- #
+# Dataset featurizer exceptions definition #
+# ---------------------------------------- #
+class FeaturesExtractionDatasetException(Exception): pass
+
+
+# ---------------------------------------- #
+# Dataset featurizer attributes definition #
+# ---------------------------------------- #
+
+# Default maximum size of the chunk of subjects read from the dataset at once
+DEFAULT_DATASET_CHUNK_SIZE_IN_BYTES = 64 * 1024 * 1024
+
+
+# ----------------------------------- #
+# Dataset featurizer class definition #
+# ----------------------------------- #
+
+class DatasetFeaturizer(object):
+    """
+    Class implementing the out-of-core featurization of the server-side datasets (.npy files).
+
+    The dataset is a ``.npy`` file under the data root (subjects in the first
+    dimension). It is opened with the memory mapping (it is not loaded into
+    memory), and it is featurized in the chunks of subjects bounded by the
+    chunk size: each of the chunks is read, featurized by the features
+    extractor pipeline (the parallel execution and the results caching are used
+    if configured), and its features are written to the memory-mapped output
+    ``.npy`` file under the output root. The peak memory is thus bounded by the
+    chunk size rather than by the size of the dataset. The output file is
+    written to a temporary file first, and it is renamed when all chunks are
+    featurized (a failed featurization leaves no partial output).
+    """
+
+    def __init__(self, data_root, output_root, chunk_size_in_bytes=None):
+        """
+        Initializes the DatasetFeaturizer.
+
+        :param data_root: directory of the datasets (the dataset paths are relative to it)
+        :type data_root: str
+        :param output_root: directory of the features outputs (the output paths are relative to it)
+        :type output_root: str
+        :param chunk_size_in_bytes: maximum size of the chunk of subjects, defaults to None (64 MiB)
+        :type chunk_size_in_bytes: int, optional
+        """
+
+        # Set the roots
+        self.data_root = os.path.realpath(data_root)
+        self.output_root = os.path.realpath(output_root)
+        Path(self.output_root).mkdir(parents=True, exist_ok=True)
+
+        # Set the chunk size
+        self.chunk_size_in_bytes = chunk_size_in_bytes or DEFAULT_DATASET_CHUNK_SIZE_IN_BYTES
+
+    def __repr__(self):
+        return str({"data_root": self.data_root, "output_root": self.output_root, "chunk": self.chunk_size_in_bytes})
+
+    def __str__(self):
+        return repr(self)
+
+    @staticmethod
+    def resolve_path(root, path, field):
+        """Resolves the relative path of the .npy file under the root (the paths escaping the root are rejected)"""
+        resolved = os.path.realpath(os.path.join(root, path))
+        if os.path.isabs(path) or os.path.commonpath([root, resolved]) != root or resolved == root:
+            raise marshmallow.ValidationError("Not a valid path (must be relative to the root).", field)
+        if not resolved.endswith(".npy"):
+            raise marshmallow.ValidationError("Not a valid path (must be a .npy file).", field)
+        return resolved
+
+    def get_output_path(self, dataset):
+        """Returns the relative path of the features output (defaults to <dataset>.features.npy)"""
+        return dataset.output if dataset.output else f"{dataset.path[:-len('.npy')]}.features.npy"
+
+    def open(self, dataset):
+        """
+        Opens the dataset with the memory mapping (read-only).
+
+        :param dataset: dataset to be opened
+        :type dataset: api.interfaces.inputs.Dataset
+        :return: memory-mapped sample values
+        :rtype: numpy.memmap
+        """
+        path = self.resolve_path(self.data_root, dataset.path, "samples.dataset.path")
+
+        # Open the dataset
+        if not os.path.isfile(path):
+            raise marshmallow.ValidationError("Dataset not found.", "samples.dataset.path")
+        try:
+            values = numpy.load(path, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            raise marshmallow.ValidationError("Not a valid .npy file.", "samples.dataset.path")
+
+        # Validate the sample values
+        if not numpy.issubdtype(values.dtype, numpy.number):
+            raise marshmallow.ValidationError("Not a valid numeric numpy.array.", "samples.dataset.path")
+        if values.size == 0:
+            raise marshmallow.ValidationError("Empty numpy.array.", "samples.dataset.path")
+
+        # Return the sample values (ensure the subjects-dimension for a rank-one array)
+        return values if values.ndim > 1 else values.reshape(1, -1)
+
+    def get_chunk_size(self, values):
+        """Returns the number of subjects in a chunk (at least one subject)"""
+        subject_size = int(numpy.prod(values.shape[1:], dtype=numpy.int64)) * values.dtype.itemsize
+        return max(int(self.chunk_size_in_bytes // max(subject_size, 1)), 1)
+
+    def featurize(self, dataset, extractor, pipeline, config, output_configuration=None, pool=None, cache=None):
+        """
+        Featurizes the dataset in the chunks of subjects (the features are written to the output .npy file).
+
+        :param dataset: dataset to be featurized
+        :type dataset: api.interfaces.inputs.Dataset
+        :param extractor: feature extractor interface class
+        :type extractor: <injected>.interface.featurizer.FeatureExtractor
+        :param pipeline: pipeline with the feature names and kwargs
+        :type pipeline: api.interfaces.inputs.FeaturesPipeline
+        :param config: feature extractor configuration
+        :type config: api.interfaces.inputs.FeaturesExtractorConfiguration
+        :param output_configuration: features output configuration (dtype), defaults to None
+        :type output_configuration: dict, optional
+        :param pool: features extraction pool (parallel execution), defaults to None
+        :type pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+        :param cache: features results cache (per-subject, per-feature), defaults to None
+        :type cache: api.caching.results.FeaturesResultCache, optional
+        :return: feature labels and the description of the features output (path, shape, dtype)
+        :rtype: dict
+        """
+        dtype = (output_configuration or {}).get("dtype")
+
+        # Open the dataset and validate the sample labels
+        values = self.open(dataset)
+        labels = SamplesLabelsValidator.validate(dataset.labels, values)
+
+        # Prepare the features output
+        output = self.get_output_path(dataset)
+        path = self.resolve_path(self.output_root, output, "samples.dataset.output")
+        Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        # Featurize the dataset in the chunks of subjects
+        subjects, size = values.shape[0], self.get_chunk_size(values)
+        features, feature_labels = None, None
+        try:
+            for start in range(0, subjects, size):
+
+                # Read the chunk of subjects (only the chunk is loaded into memory)
+                chunk = numpy.array(values[start:start + size], dtype=dataset.dtype or values.dtype)
+
+                # Extract the features of the chunk
+                extracted = FeaturesExtractorPipeline(
+                    extractor,
+                    Sample(chunk, labels),
+                    config,
+                    pool=pool,
+                    cache=cache).extract(pipeline)
+                chunk_features = FeatureValuesValidator.validate(extracted["values"], dtype)
+
+                # Prepare the features output (the shape is known after the first chunk)
+                if features is None:
+                    feature_labels = FeatureLabelsValidator.validate(extracted["labels"], chunk_features)
+                    features = numpy.lib.format.open_memmap(
+                        temporary,
+                        mode="w+",
+                        dtype=chunk_features.dtype,
+                        shape=(subjects, *chunk_features.shape[1:]))
+
+                # Validate the features of the chunk (the same features for all chunks)
+                if chunk_features.shape != (chunk.shape[0], *features.shape[1:]) or \
+                        list(extracted["labels"]) != list(feature_labels):
+                    raise FeaturesExtractionDatasetException(
+                        f"Not valid features of the subjects {start}-{start + chunk.shape[0] - 1} "
+                        f"(the features differ from the features of the first chunk of subjects)")
+
+                # Write the features of the chunk
+                features[start:start + chunk.shape[0]] = chunk_features
+                del chunk, chunk_features, extracted
+
+            # Flush the features output and move it to its path
+            features.flush()
+            shape, features_dtype = features.shape, features.dtype
+            del features
+            os.replace(temporary, path)
+
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+
+        # Return the feature labels and the description of the features output
+        return {
+            "labels": feature_labels,
+            "dataset": {"path": output, "shape": list(shape), "dtype": features_dtype.name}
+        }
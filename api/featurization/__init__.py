@@ -1,7 +1,9 @@
+import os
 import sys
 import subprocess
 import importlib
-from api.configuration import load_configuration
+from api.configuration import load_configuration, application_path
+from api.featurization.library_injection.manifest import FeaturesExtractionInjectionManifest, get_distribution_version
 
 
 # ----------------------------------------------------------------------------------- #
@@ -14,6 +16,12 @@ class FeaturesExtractionPipInjectionException(Exception): pass
 class FeaturesExtractionPipInstallationException(Exception): pass
 
 
+# ------------------------------------------------------------------- #
+# Default features extraction library injection attributes definition #
+# ------------------------------------------------------------------- #
+DEFAULT_INJECTION_MANIFEST_PATH = "api/featurization/library_injection/manifest.json"
+
+
 # --------------------------------- #
 # Configuration routines definition #
 # --------------------------------- #
@@ -24,15 +32,63 @@ def configure_features_extraction_library_injection():
     # Load the features extractor configuration
     configuration = load_configuration("injection.json")["features_extraction_library"]
 
-    # Get the injection type
+    # Prepare the features extraction library (the injection type-specific configuration)
     injection_type = configuration.get("injection_type")
+    return prepare_features_extraction_library(
+        injection_type,
+        (configuration.get("injection") or {}).get(injection_type),
+        configuration.get("injection_types"))
+
+
+def configure_features_extraction_library_manifest(library=None):
+    """
+    Configures the manifest (cache) of the features extraction library injection.
+
+    :param library: name of the library served at ``/featurize/<library>``, defaults to None (injected library)
+    :type library: str, optional
+    :return: injection manifest (None if the manifest is disabled)
+    :rtype: api.featurization.library_injection.manifest.FeaturesExtractionInjectionManifest or None type
+    """
+
+    # Load the features extractor configuration
+    configuration = load_configuration("injection.json")["features_extraction_library"]
+    manifest_configuration = configuration.get("manifest", {})
+    if not manifest_configuration.get("enabled"):
+        return None
+
+    # Get the installation name of the library (pip) and the path of its manifest (<path>.<library>.json)
+    path = os.path.join(application_path, "..", manifest_configuration.get("path") or DEFAULT_INJECTION_MANIFEST_PATH)
+    if library is None:
+        injection_configuration = (configuration.get("injection") or {}).get(configuration.get("injection_type")) or {}
+    else:
+        injection_configuration = (configuration.get("libraries") or {}).get(library) or {}
+        path = f"{os.path.splitext(path)[0]}.{library}{os.path.splitext(path)[1]}"
+    installation_name = injection_configuration.get("installation_name") or None
+
+    # Prepare the injection manifest
+    return FeaturesExtractionInjectionManifest(path, installation_name=installation_name)
+
+
+def prepare_features_extraction_library(injection_type, injection_configuration, injection_types):
+    """
+    Validates and installs (if pip-installable) the features extraction library.
+
+    :param injection_type: injection type (local, pip)
+    :type injection_type: str
+    :param injection_configuration: injection type-specific configuration (import and installation name)
+    :type injection_configuration: dict
+    :param injection_types: supported injection types
+    :type injection_types: list
+    :return: import name of the features extraction library
+    :rtype: str
+    """
+
+    # Validate the injection type
     if not injection_type:
         raise FeaturesExtractionLibraryInjectionTypeNotDefinedException(f"Injection type undefined")
-    if injection_type not in configuration.get("injection_types"):
+    if injection_type not in (injection_types or ()):
         raise FeaturesExtractionLibraryInjectionTypeNotSupportedException(f"Injection type unsupported")
-
-    # Get the injection type-specific configuration
-    injection_configuration = configuration.get("injection").get(injection_type)
+    injection_configuration = injection_configuration or {}
 
     # Get the features extraction installation and import names
     install_name = injection_configuration.get("installation_name")
@@ -60,7 +116,13 @@ def configure_features_extraction_library_injection():
 # -------------------------------- #
 
 def install_features_extraction_library(library_name):
-    """Installs the features extraction library (if pip-installable)"""
+    """Installs the features extraction library (if pip-installable and not installed yet)"""
+
+    # Check the installed distribution (the metadata are read, the library is not imported)
+    if get_distribution_version(library_name):
+        return
+
+    # Check the importable library, and install it if needed
     try:
         importlib.import_module(library_name)
     except ImportError:
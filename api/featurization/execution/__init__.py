@@ -0,0 +1,185 @@
+import os
+from api.configuration import load_configuration, application_path
+from api.featurization.execution.pool import FeaturesExtractionPool
+from api.featurization.execution.shared import DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES
+from api.featurization.execution.batch import FeaturesExtractionBatchExecutor
+from api.featurization.execution.supervisor import FeaturesExtractionSupervisor, DEFAULT_SUPERVISION_POLL_INTERVAL
+from api.featurization.execution.scheduling import (
+    FeaturesExtractionCostModel,
+    FeaturesExtractionScheduler,
+    DEFAULT_COST_MODEL_SMOOTHING,
+    DEFAULT_COST_MODEL_SAVE_INTERVAL,
+    DEFAULT_MIN_SCHEDULED_COST
+)
+
+
+# ----------------------------------------------------------------- #
+# Features extraction execution configuration exceptions definition #
+# ----------------------------------------------------------------- #
+class FeaturesExtractionExecutionModeNotDefinedException(Exception): pass
+class FeaturesExtractionExecutionModeNotSupportedException(Exception): pass
+
+
+# --------------------------------------- #
+# Default execution attributes definition #
+# --------------------------------------- #
+DEFAULT_STREAMING_CHUNK_SIZE = 8
+DEFAULT_BATCH_MAX_ITEMS = 1000
+DEFAULT_COST_MODEL_PATH = "api/featurization/execution/costs.json"
+
+
+# --------------------------------- #
+# Configuration routines definition #
+# --------------------------------- #
+
+def configure_features_extraction_execution(library_name, scheduler=None):
+    """
+    Configures the API features extraction execution.
+
+    In the serial execution mode, the features are extracted on the request
+    thread (no pool is created). In the parallel execution mode, the sample
+    values are split along the subject axis into chunks that are featurized
+    by the long-lived pool of worker processes (each of the workers has the
+    injected features extraction library already imported).
+
+    :param library_name: import name of the injected features extraction library
+    :type library_name: str
+    :param scheduler: features extraction scheduler (cost model of the features), defaults to None
+    :type scheduler: api.featurization.execution.scheduling.FeaturesExtractionScheduler, optional
+    :return: features extraction pool (None for the serial execution)
+    :rtype: api.featurization.execution.pool.FeaturesExtractionPool or None type
+    """
+
+    # Load the features extraction execution configuration
+    configuration = load_configuration("execution.json")["features_extraction_execution"]
+
+    # Get the execution mode
+    execution_mode = configuration.get("execution_mode")
+    if not execution_mode:
+        raise FeaturesExtractionExecutionModeNotDefinedException(f"Execution mode undefined")
+    if execution_mode not in configuration.get("execution_modes"):
+        raise FeaturesExtractionExecutionModeNotSupportedException(f"Execution mode unsupported")
+
+    # Handle the serial execution (no pool)
+    if execution_mode == "serial":
+        return None
+
+    # Get the execution mode-specific configuration
+    execution_configuration = configuration.get("execution").get(execution_mode)
+
+    # Prepare the features extraction pool (the workers are started by the application, see: api.start_workers)
+    return FeaturesExtractionPool(
+        library_name,
+        workers=execution_configuration.get("workers"),
+        chunk_size=execution_configuration.get("chunk_size"),
+        start_method=execution_configuration.get("start_method"),
+        warm_up_workers=execution_configuration.get("warm_up"),
+        shared_memory=execution_configuration.get("shared_memory", True),
+        shared_memory_threshold=execution_configuration.get(
+            "shared_memory_threshold_in_bytes",
+            DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES),
+        scheduler=scheduler)
+
+
+def configure_features_extraction_streaming():
+    """Configures the API features extraction streaming (number of subjects featurized per streamed chunk)"""
+    return {key: value for key, value in load_configuration("execution.json").get(
+        "features_extraction_streaming", {}).items()}
+
+
+def configure_features_extraction_batching():
+    """
+    Configures the API features extraction batching (the executor of the batches of featurization requests).
+
+    :return: features extraction batch executor
+    :rtype: api.featurization.execution.batch.FeaturesExtractionBatchExecutor
+    """
+
+    # Load the features extraction batching configuration
+    configuration = load_configuration("execution.json").get("features_extraction_batch", {})
+
+    # Prepare the features extraction batch executor
+    return FeaturesExtractionBatchExecutor(
+        workers=configuration.get("workers"),
+        max_items=configuration.get("max_items", DEFAULT_BATCH_MAX_ITEMS))
+
+
+def configure_features_extraction_supervision(library_name, scheduler=None):
+    """
+    Configures the API features extraction supervision (time budgets of the features and deadlines of the requests).
+
+    If the features have the time budgets (per feature name, or the default
+    one), or the request has the deadline, the elements of the pipeline are
+    extracted by the killable worker processes of the supervisor: the element
+    exceeding its budget is killed, and its features are returned as NaN
+    (with the error annotation) instead of failing the whole request.
+
+    :param library_name: import name of the injected features extraction library
+    :type library_name: str
+    :param scheduler: features extraction scheduler (cost model of the features), defaults to None
+    :type scheduler: api.featurization.execution.scheduling.FeaturesExtractionScheduler, optional
+    :return: features extraction supervisor (None if the supervision is disabled)
+    :rtype: api.featurization.execution.supervisor.FeaturesExtractionSupervisor or None type
+    """
+
+    # Load the features extraction supervision configuration
+    configuration = load_configuration("execution.json").get("features_extraction_supervision", {})
+    if not configuration.get("enabled"):
+        return None
+
+    # Prepare the features extraction supervisor (the workers are started on their first use)
+    return FeaturesExtractionSupervisor(
+        library_name,
+        workers=configuration.get("workers"),
+        start_method=configuration.get("start_method"),
+        warm_up_workers=configuration.get("warm_up"),
+        default_timeout=configuration.get("default_timeout_in_seconds"),
+        timeouts=configuration.get("timeouts_in_seconds"),
+        default_deadline=configuration.get("default_deadline_in_seconds"),
+        max_deadline=configuration.get("max_deadline_in_seconds"),
+        poll_interval=configuration.get("poll_interval_in_seconds", DEFAULT_SUPERVISION_POLL_INTERVAL),
+        shared_memory_threshold=configuration.get(
+            "shared_memory_threshold_in_bytes",
+            DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES),
+        scheduler=scheduler)
+
+
+def configure_features_extraction_scheduling(library_name, library=None):
+    """
+    Configures the API features extraction scheduling (cost model of the features persisted across the restarts).
+
+    The runtimes of the pipeline elements extracted by the worker processes
+    (of the pool and of the supervisor) are recorded into the cost model per
+    the feature name, args and the samples per subject. The pool packs the
+    pipeline elements and the chunks of subjects onto its worker processes by
+    their predicted costs (longest-processing-time first), and the supervisor
+    submits the costliest elements first.
+
+    :param library_name: import name of the injected features extraction library
+    :type library_name: str
+    :param library: name of the library served at ``/featurize/<library>``, defaults to None (injected library)
+    :type library: str, optional
+    :return: features extraction scheduler (None if the scheduling is disabled)
+    :rtype: api.featurization.execution.scheduling.FeaturesExtractionScheduler or None type
+    """
+
+    # Load the features extraction scheduling configuration
+    configuration = load_configuration("execution.json").get("features_extraction_scheduling", {})
+    if not configuration.get("enabled"):
+        return None
+
+    # Get the path of the cost model (<path>.<library>.json for the libraries served at /featurize/<library>)
+    path = None
+    if configuration.get("persistent", True):
+        path = os.path.join(application_path, "..", configuration.get("path") or DEFAULT_COST_MODEL_PATH)
+        if library is not None:
+            path = f"{os.path.splitext(path)[0]}.{library}{os.path.splitext(path)[1]}"
+
+    # Prepare the features extraction scheduler (the persisted costs are loaded)
+    return FeaturesExtractionScheduler(
+        FeaturesExtractionCostModel(
+            path,
+            library_name=library_name,
+            smoothing=configuration.get("smoothing", DEFAULT_COST_MODEL_SMOOTHING),
+            save_interval=configuration.get("save_interval_in_seconds", DEFAULT_COST_MODEL_SAVE_INTERVAL)),
+        min_scheduled_cost=configuration.get("min_scheduled_cost_in_seconds", DEFAULT_MIN_SCHEDULED_COST))
@@ -0,0 +1,223 @@
+import os
+import threading
+import numpy
+from concurrent.futures import ThreadPoolExecutor
+from api.common.utilities import canonicalize
+from api.featurization.interface import FeaturesExtractorPipeline
+from api.interfaces.inputs.ragged import RaggedArray
+from api.interfaces.inputs.interface import (
+    Sample,
+    FeaturesExtractorConfiguration,
+    FeaturesOutputConfiguration,
+    FeaturesPipeline
+)
+from api.interfaces.outputs.interface import Features
+
+
+# -------------------------------------------------------- #
+# Features extraction batch executor exceptions definition #
+# -------------------------------------------------------- #
+class FeaturesExtractionBatchItemException(Exception): pass
+
+
+# --------------------------------------------------- #
+# Features extraction batch executor class definition #
+# --------------------------------------------------- #
+
+class FeaturesExtractionBatchExecutor(object):
+    """
+    Class implementing the executor of the batches of independent featurization requests.
+
+    Each of the batch items is validated on its own (the same schemas as the
+    ``/featurize`` requests). The valid items sharing the extraction context
+    (the features pipeline, the extractor configuration, the sample labels, and
+    the shape and dtype of the subjects; the ragged subjects are grouped with
+    the ragged ones) are featurized together: their subjects are concatenated
+    into one sample, featurized by one features extractor pipeline, and the
+    features are split back to the items. The groups of items are featurized
+    concurrently by the pool of threads (the parallel execution and the results
+    caching are used if configured). If the featurization of a group fails, its
+    items are featurized one by one, so the errors are reported only for the
+    failing items. The deadline of the batch applies to all of its groups, and
+    the errors of the timed-out features are reported for the items of the
+    group (see: ``FeaturesExtractorPipeline``).
+    """
+
+    def __init__(self, workers=None, max_items=None):
+        """
+        Initializes the FeaturesExtractionBatchExecutor.
+
+        :param workers: number of the threads featurizing the groups of items, defaults to None (CPU count)
+        :type workers: int, optional
+        :param max_items: maximum number of the items in a batch, defaults to None (unlimited)
+        :type max_items: int, optional
+        """
+
+        # Set the executor configuration
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        self.max_items = max_items if max_items else None
+
+        # Set the thread pool (created lazily per process)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"workers": self.workers, "max_items": self.max_items})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def executor(self):
+        """Returns the thread pool of the current process (creates it if needed)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="featurization-batch")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def shutdown(self):
+        """Shuts down the thread pool of the current process"""
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def execute(self, items, extractor, pool=None, cache=None, resolve=None, supervisor=None, deadline=None):
+        """
+        Featurizes the batch of items.
+
+        :param items: featurization requests (the same structure as the ``/featurize`` input data)
+        :type items: list of dict
+        :param extractor: feature extractor interface class
+        :type extractor: <injected>.interface.featurizer.FeatureExtractor
+        :param pool: features extraction pool (parallel execution), defaults to None
+        :type pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+        :param cache: features results cache (per-subject, per-feature), defaults to None
+        :type cache: api.caching.results.FeaturesResultCache, optional
+        :param resolve: function preparing the item before its validation (e.g. resolving the sample handle)
+        :type resolve: callable, optional
+        :param supervisor: features extraction supervisor (time budgets of the features), defaults to None
+        :type supervisor: api.featurization.execution.supervisor.FeaturesExtractionSupervisor, optional
+        :param deadline: deadline of the batch (and its cancellation), defaults to None
+        :type deadline: api.featurization.execution.deadline.FeaturesExtractionDeadline, optional
+        :return: per-item features (the ``/featurize`` output data) or the exception raised for the item
+        :rtype: list of (dict or Exception)
+        """
+        results = [None] * len(items)
+
+        # Validate the items and group them by the extraction context
+        groups = {}
+        for index, item in enumerate(items):
+            try:
+                prepared = self.prepare_item(index, resolve(item) if resolve else item)
+                groups.setdefault(self.get_group_key(prepared), []).append(prepared)
+            except Exception as e:
+                results[index] = e
+
+        # Featurize the groups of items (concurrently if there are more of them)
+        if len(groups) > 1:
+            futures = [
+                self.executor.submit(self.featurize_group, group, extractor, pool, cache, supervisor, deadline)
+                for group in groups.values()
+            ]
+            featurized = [future.result() for future in futures]
+        else:
+            featurized = [
+                self.featurize_group(group, extractor, pool, cache, supervisor, deadline)
+                for group in groups.values()
+            ]
+
+        # Set the per-item results
+        for group in featurized:
+            for index, result in group:
+                results[index] = result
+
+        # Return the per-item results
+        return results
+
+    @staticmethod
+    def prepare_item(index, item):
+        """Validates the item (returns the index, samples, pipeline, extractor and output configuration)"""
+        if not isinstance(item, dict):
+            raise FeaturesExtractionBatchItemException(f"Not a valid dict (requests[{index}])")
+        return {
+            "index": index,
+            "samples": Sample.from_request(item),
+            "pipeline": FeaturesPipeline.from_request(item),
+            "settings": FeaturesExtractorConfiguration.from_request(item),
+            "output": FeaturesOutputConfiguration.from_request(item)
+        }
+
+    @staticmethod
+    def get_group_key(item):
+        """Returns the key of the extraction context of the item (the items of one context are featurized together)"""
+        values = item["samples"].values
+        context = [item["pipeline"].pipeline, item["settings"].extractor_configuration, item["samples"].labels]
+        return f"{canonicalize(context)}{values.shape[1:]}{values.dtype.str}"
+
+    def featurize_group(self, group, extractor, pool=None, cache=None, supervisor=None, deadline=None):
+        """
+        Featurizes the group of items sharing the extraction context.
+
+        :param group: validated items of the group
+        :type group: list of dict
+        :param extractor: feature extractor interface class
+        :type extractor: <injected>.interface.featurizer.FeatureExtractor
+        :param pool: features extraction pool (parallel execution), defaults to None
+        :type pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+        :param cache: features results cache (per-subject, per-feature), defaults to None
+        :type cache: api.caching.results.FeaturesResultCache, optional
+        :param supervisor: features extraction supervisor (time budgets of the features), defaults to None
+        :type supervisor: api.featurization.execution.supervisor.FeaturesExtractionSupervisor, optional
+        :param deadline: deadline of the batch (and its cancellation), defaults to None
+        :type deadline: api.featurization.execution.deadline.FeaturesExtractionDeadline, optional
+        :return: index and features (or the exception) of each of the items
+        :rtype: list of tuple (int, dict or Exception)
+        """
+        first = group[0]
+
+        # Featurize the subjects of all items together
+        try:
+            values = [item["samples"].values for item in group]
+            if len(values) > 1:
+                ragged = isinstance(values[0], RaggedArray)
+                values = RaggedArray.concatenate(values) if ragged else numpy.concatenate(values, axis=0)
+            else:
+                values = values[0]
+            sample = Sample(values, first["samples"].labels)
+            extracted = FeaturesExtractorPipeline(
+                extractor,
+                sample,
+                first["settings"],
+                pool=pool,
+                cache=cache,
+                supervisor=supervisor,
+                deadline=deadline).extract(first["pipeline"])
+            features = numpy.atleast_2d(extracted["values"])
+
+        # Handle the failed group (featurize the items one by one)
+        except Exception as e:
+            if len(group) == 1:
+                return [(first["index"], e)]
+            return [
+                result for item in group
+                for result in self.featurize_group([item], extractor, pool, cache, supervisor, deadline)
+            ]
+
+        # Split the features back to the items
+        results, start = [], 0
+        for item in group:
+            stop = start + item["samples"].values.shape[0]
+            try:
+                values = {"values": features[start:stop], "labels": extracted["labels"]}
+                if extracted.get("errors"):
+                    values["errors"] = extracted["errors"]
+                results.append((item["index"], Features(values, **item["output"].output_configuration).to_response()))
+            except Exception as e:
+                results.append((item["index"], e))
+            start = stop
+
+        # Return the per-item results
+        return results
@@ -0,0 +1,181 @@
+import math
+import time
+import socket
+import threading
+from marshmallow import ValidationError
+
+
+# -------------------------------------------------- #
+# Features extraction deadline exceptions definition #
+# -------------------------------------------------- #
+class FeaturesExtractionTimeoutException(Exception): pass
+class FeaturesExtractionCancelledException(Exception): pass
+class FeaturesExtractionStoppedException(Exception): pass
+
+
+# ---------------------------------------------------------- #
+# Default features extraction deadline attributes definition #
+# ---------------------------------------------------------- #
+
+# Request header with the deadline of the request (seconds from the arrival of the request)
+DEADLINE_HEADER_NAME = "X-Featurizer-Deadline"
+
+# Request body field with the deadline of the request (seconds from the arrival of the request)
+DEADLINE_FIELD_NAME = "deadline_in_seconds"
+
+# WSGI environment keys of the client sockets (gunicorn, werkzeug development server)
+CLIENT_SOCKET_ENVIRON_KEYS = ("gunicorn.socket", "werkzeug.socket")
+
+
+# ------------------------------------------------ #
+# Features extraction deadline routines definition #
+# ------------------------------------------------ #
+
+def parse_deadline(value, source):
+    """Parses the deadline in seconds (positive finite number; raises the validation error otherwise)"""
+    try:
+        deadline = float(value)
+    except (TypeError, ValueError):
+        deadline = math.nan
+    if isinstance(value, bool) or not math.isfinite(deadline) or deadline <= 0:
+        raise ValidationError(f"Not a valid deadline (positive number of seconds): {value!r}", source)
+    return deadline
+
+
+def get_client_disconnect_probe(environ):
+    """
+    Gets the probe detecting the disconnection of the client (from the WSGI environment of the request).
+
+    The probe peeks at the client socket without blocking and without consuming
+    any data: the socket of a client that closed the connection is readable,
+    and the peek returns no data (end of the stream). If the client socket is
+    not available in the WSGI environment (or it cannot be peeked at, e.g. the
+    TLS sockets), the probe is not available.
+
+    :param environ: WSGI environment of the request
+    :type environ: dict
+    :return: probe returning True if the client disconnected (None if not available)
+    :rtype: callable () -> bool or None type
+    """
+    client = next((environ[key] for key in CLIENT_SOCKET_ENVIRON_KEYS if environ.get(key) is not None), None)
+    if not isinstance(client, socket.socket) or not hasattr(socket, "MSG_DONTWAIT"):
+        return None
+
+    def probe():
+        try:
+            return client.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b""
+        except (BlockingIOError, InterruptedError):
+            return False
+        except (ConnectionError, OSError):
+            return True
+        except ValueError:
+            return False
+    return probe
+
+
+# --------------------------------------------- #
+# Features extraction deadline class definition #
+# --------------------------------------------- #
+
+class FeaturesExtractionDeadline(object):
+    """
+    Class implementing the deadline (and the cancellation) of the features extraction.
+
+    The deadline expires after the timeout (measured on the monotonic clock
+    from the arrival of the request, the elapsed time of the request counts).
+    The extraction is cancelled explicitly (e.g. when the streamed response is
+    closed), or when the probe reports that the client disconnected; the
+    cancellation is sticky (once cancelled, the deadline stays cancelled).
+    """
+
+    def __init__(self, timeout=None, probe=None, elapsed=0.0):
+        """
+        Initializes the FeaturesExtractionDeadline.
+
+        :param timeout: timeout of the extraction in seconds, defaults to None (no deadline)
+        :type timeout: float, optional
+        :param probe: probe returning True if the client disconnected, defaults to None
+        :type probe: callable () -> bool, optional
+        :param elapsed: time already elapsed since the arrival of the request in seconds, defaults to 0.0
+        :type elapsed: float, optional
+        """
+        self.timeout = timeout if timeout else None
+        self.expires_at = time.monotonic() - elapsed + self.timeout if self.timeout else None
+        self.probe = probe
+        self._cancelled = threading.Event()
+
+    def __repr__(self):
+        return str({"timeout": self.timeout, "remaining": self.remaining(), "cancelled": self._cancelled.is_set()})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def expired(self):
+        """Checks if the deadline expired"""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    @property
+    def cancelled(self):
+        """Checks if the extraction was cancelled (or if the client disconnected)"""
+        if not self._cancelled.is_set() and self.probe is not None and self.probe():
+            self._cancelled.set()
+        return self._cancelled.is_set()
+
+    def remaining(self):
+        """Returns the remaining time in seconds (None if there is no deadline)"""
+        return max(self.expires_at - time.monotonic(), 0.0) if self.expires_at is not None else None
+
+    def get_timeout(self, budget=None):
+        """Returns the timeout of the next step in seconds (the smaller of the budget and the remaining time)"""
+        timeouts = [timeout for timeout in (budget, self.remaining()) if timeout is not None]
+        return min(timeouts) if timeouts else None
+
+    def cancel(self):
+        """Cancels the extraction"""
+        self._cancelled.set()
+
+    def check(self):
+        """Checks if the extraction was cancelled (raises FeaturesExtractionCancelledException)"""
+        if self.cancelled:
+            raise FeaturesExtractionCancelledException("Features extraction cancelled (the client disconnected)")
+
+    @classmethod
+    def from_request(cls, request, body=None, default=None, maximum=None, elapsed=0.0):
+        """
+        Creates the deadline of the request.
+
+        The deadline is set by the ``X-Featurizer-Deadline`` header, or by the
+        ``deadline_in_seconds`` field of the request body (the smaller of them
+        if both are set), in seconds from the arrival of the request. If none
+        of them is set, the default deadline applies; the deadline is capped by
+        the maximum deadline.
+
+        :param request: request
+        :type request: flask.Request
+        :param body: unwrapped request body, defaults to None
+        :type body: dict, optional
+        :param default: default deadline in seconds, defaults to None (no deadline)
+        :type default: float, optional
+        :param maximum: maximum deadline in seconds, defaults to None (unlimited)
+        :type maximum: float, optional
+        :param elapsed: time already elapsed since the arrival of the request in seconds, defaults to 0.0
+        :type elapsed: float, optional
+        :return: deadline of the request (with the probe of the client disconnection)
+        :rtype: api.featurization.execution.deadline.FeaturesExtractionDeadline
+        """
+
+        # Get the requested deadlines
+        deadlines = []
+        if request.headers.get(DEADLINE_HEADER_NAME) is not None:
+            deadlines.append(parse_deadline(request.headers.get(DEADLINE_HEADER_NAME), DEADLINE_HEADER_NAME))
+        if isinstance(body, dict) and body.get(DEADLINE_FIELD_NAME) is not None:
+            deadlines.append(parse_deadline(body.get(DEADLINE_FIELD_NAME), DEADLINE_FIELD_NAME))
+
+        # Apply the default and the maximum deadline
+        timeout = min(deadlines) if deadlines else (default if default else None)
+        if timeout and maximum:
+            timeout = min(timeout, maximum)
+
+        # Create the deadline of the request
+        return cls(timeout=timeout, probe=get_client_disconnect_probe(request.environ), elapsed=elapsed)
@@ -0,0 +1,562 @@
+import os
+import math
+import time
+import numpy
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker
+from api.interfaces.inputs.ragged import RaggedArray
+from api.featurization.interface import extract_features, extract_features_by_element
+from api.featurization.library_injection.imports import import_features_extractor
+from api.featurization.execution.shared import (
+    SharedArray,
+    DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES,
+    is_shareable,
+    create_shared_array,
+    attach_shared_array,
+    release_shared_arrays,
+    read_shared_array,
+    unlink_shared_array,
+    cleanup_orphaned_shared_arrays
+)
+from api.featurization.execution.scheduling import split_subjects, get_samples_per_subject
+
+
+# ---------------------------------------------- #
+# Features extraction pool exceptions definition #
+# ---------------------------------------------- #
+class FeaturesExtractionPoolBrokenException(Exception): pass
+
+
+# ---------------------------------------------- #
+# Features extraction worker routines definition #
+# ---------------------------------------------- #
+
+# Injected features extractor (imported once in each of the worker processes)
+worker_features_extractor = None
+
+
+def initialize_worker(library_name):
+    """Initializes the worker process (imports the injected features extractor)"""
+    global worker_features_extractor
+    worker_features_extractor = import_features_extractor(library_name)
+
+
+def warm_up_worker():
+    """Warms-up the worker process (returns the worker process identifier)"""
+    return os.getpid()
+
+
+def extract_in_worker(
+        values,
+        labels,
+        configuration,
+        pipeline,
+        chunk=None,
+        threshold=None,
+        offsets=None,
+        by_element=False):
+    """
+    Extracts the features from the chunk of subjects in the worker process.
+
+    The sample values are passed either as the array (pickled), or as the
+    handle of the shared array (the worker gets the read-only view on the
+    chunk of subjects). If the shared-memory threshold is set, the features
+    of at least the threshold size are returned as the handle of the new
+    shared array (owned by the parent process) instead of being pickled. The
+    ragged sample values are shared as their flat values and the offsets. If
+    the pipeline is extracted element by element, the widths of the elements
+    are returned as well (see: ``extract_features_by_element``).
+
+    :param values: sample values of the chunk of subjects (or the handle of the shared sample values)
+    :type values: numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray or SharedArray
+    :param labels: sample labels
+    :type labels: list
+    :param configuration: features extractor configuration
+    :type configuration: dict
+    :param pipeline: pipeline with the feature names and kwargs
+    :type pipeline: list
+    :param chunk: chunk of subjects (of the shared sample values), defaults to None
+    :type chunk: slice, optional
+    :param threshold: minimum size of the shared features in bytes, defaults to None (features are pickled)
+    :type threshold: int, optional
+    :param offsets: offsets of the subjects in the shared flat values (ragged sample values), defaults to None
+    :type offsets: numpy.ndarray, optional
+    :param by_element: extract the pipeline element by element (return the widths), defaults to False
+    :type by_element: bool, optional
+    :return: extracted features (or the handle of the shared features) and feature labels (and widths)
+    :rtype: dict
+    """
+    try:
+
+        # Attach to the shared sample values (read-only view on the chunk of subjects)
+        if isinstance(values, SharedArray):
+            values = attach_shared_array(values)
+            values = (RaggedArray(values, offsets) if offsets is not None else values)[chunk]
+
+        # Extract the features via the injected features extractor (subject by subject if the values are ragged)
+        extract = extract_features_by_element if by_element else extract_features
+        extracted = extract(worker_features_extractor, values, labels, configuration, pipeline)
+        features = extracted["features"]
+
+        # Share the features (the parent process reads and unlinks them)
+        if threshold is not None and is_shareable(features, threshold):
+            features = create_shared_array(numpy.ascontiguousarray(features), owner=os.getppid())
+
+        # Return the extracted features and labels (and the widths of the elements)
+        result = {
+            "features": features,
+            "labels": extracted["labels"]
+        }
+        if by_element:
+            result["widths"] = extracted["widths"]
+        return result
+
+    # Release the shared sample values
+    finally:
+        values = extracted = None
+        release_shared_arrays()
+
+
+def extract_scheduled_in_worker(units, labels, configuration, threshold=None):
+    """
+    Extracts the features of the scheduled units (chunks of subjects and their pipelines) in the worker process.
+
+    The units are extracted one after another, each of them element by element
+    (see: ``extract_features_by_element``), so the features of each of the
+    elements and their runtimes are returned. The sample values of the units
+    are passed the same way as by ``extract_in_worker``.
+
+    :param units: sample values (or the handle of the shared sample values), chunk, offsets and the pipeline
+    :type units: list of tuple (numpy.ndarray or RaggedArray or SharedArray, slice, numpy.ndarray, list)
+    :param labels: sample labels
+    :type labels: list
+    :param configuration: features extractor configuration
+    :type configuration: dict
+    :param threshold: minimum size of the shared features in bytes, defaults to None (features are pickled)
+    :type threshold: int, optional
+    :return: extracted features (or the handles of the shared features), labels, widths and runtimes of each unit
+    :rtype: list of dict
+    """
+    results = []
+    try:
+        for values, chunk, offsets, pipeline in units:
+
+            # Attach to the shared sample values (read-only view on the chunk of subjects)
+            if isinstance(values, SharedArray):
+                values = attach_shared_array(values)
+                values = RaggedArray(values, offsets) if offsets is not None else values
+            values = values[chunk] if chunk is not None else values
+
+            # Extract the features element by element via the injected features extractor
+            extracted = extract_features_by_element(worker_features_extractor, values, labels, configuration, pipeline)
+
+            # Share the features (the parent process reads and unlinks them)
+            if threshold is not None and is_shareable(extracted["features"], threshold):
+                extracted["features"] = create_shared_array(
+                    numpy.ascontiguousarray(extracted["features"]),
+                    owner=os.getppid())
+            results.append(extracted)
+            values = extracted = None
+
+        # Return the extracted features of the units
+        return results
+
+    # Release the shared sample values (and the shared features of the units, if any of them failed)
+    except Exception:
+        for extracted in results:
+            if isinstance(extracted["features"], SharedArray):
+                unlink_shared_array(extracted["features"])
+        raise
+    finally:
+        values = extracted = None
+        release_shared_arrays()
+
+
+def stitch_features(chunks):
+    """
+    Stitches the features of the chunks of subjects along the subject axis.
+
+    The shared features are copied directly into the stitched array (and their
+    segments are unlinked), the pickled features are copied the same way.
+
+    :param chunks: features of the chunks of subjects (arrays or handles of the shared arrays)
+    :type chunks: list
+    :return: stitched features
+    :rtype: numpy.ndarray
+    """
+
+    # Get the shapes (at least 2-D) and the dtype of the features
+    shapes = [
+        (1,) * (2 - len(c.shape)) + c.shape if isinstance(c, SharedArray) else numpy.atleast_2d(c).shape
+        for c in chunks
+    ]
+    dtype = numpy.result_type(*[
+        numpy.dtype(c.dtype) if isinstance(c, SharedArray) else numpy.asarray(c)
+        for c in chunks
+    ])
+    if len({shape[1:] for shape in shapes}) > 1:
+        raise ValueError(f"Features of the chunks of subjects cannot be stitched: {shapes}")
+
+    # Copy the features into the stitched array
+    features, start = numpy.empty((sum(shape[0] for shape in shapes), *shapes[0][1:]), dtype=dtype), 0
+    for chunk, shape in zip(chunks, shapes):
+        if isinstance(chunk, SharedArray):
+            read_shared_array(chunk, out=features[start:start + shape[0]].reshape(chunk.shape))
+        else:
+            features[start:start + shape[0]] = numpy.atleast_2d(chunk)
+        start += shape[0]
+
+    # Return the stitched features
+    return features
+
+
+# ----------------------------------- #
+# Features extraction pool definition #
+# ----------------------------------- #
+
+class FeaturesExtractionPool(object):
+    """Class implementing the pool of the features extraction worker processes"""
+
+    def __init__(
+            self,
+            library_name,
+            workers=None,
+            chunk_size=None,
+            start_method=None,
+            warm_up_workers=False,
+            shared_memory=True,
+            shared_memory_threshold=DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES,
+            scheduler=None):
+        """
+        Initializes the FeaturesExtractionPool.
+
+        The pool of the worker processes is created lazily (on the first use
+        in the current process), so the pool can be safely prepared before the
+        server forks its workers (each of the forked processes gets its own).
+
+        If the scheduler is set, the pipeline elements (and the chunks of
+        subjects) are packed onto the worker processes by their predicted
+        costs (see: ``extract_scheduled``).
+
+        :param library_name: import name of the injected features extraction library
+        :type library_name: str
+        :param workers: number of the worker processes, defaults to None (CPU count)
+        :type workers: int, optional
+        :param chunk_size: number of subjects in a chunk, defaults to None (even split)
+        :type chunk_size: int, optional
+        :param start_method: multiprocessing start method, defaults to None (platform default)
+        :type start_method: str, optional
+        :param warm_up_workers: warm-up the workers when the application starts them, defaults to False
+        :type warm_up_workers: bool, optional
+        :param shared_memory: pass the sample values/features via the shared memory, defaults to True
+        :type shared_memory: bool, optional
+        :param shared_memory_threshold: minimum size of the shared arrays in bytes, defaults to 1 MiB
+        :type shared_memory_threshold: int, optional
+        :param scheduler: features extraction scheduler (cost model of the features), defaults to None
+        :type scheduler: api.featurization.execution.scheduling.FeaturesExtractionScheduler, optional
+        """
+
+        # Set the features extraction library
+        self.library_name = library_name
+
+        # Set the pool configuration
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size if chunk_size else None
+        self.start_method = start_method if start_method else None
+        self.warm_up_workers = bool(warm_up_workers)
+
+        # Set the shared-memory transport of the sample values and features
+        self.shared_memory = bool(shared_memory)
+        self.shared_memory_threshold = shared_memory_threshold if shared_memory_threshold is not None else 0
+
+        # Set the features extraction scheduler
+        self.scheduler = scheduler
+
+        # Set the pool of the worker processes (created lazily per process)
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"library": self.library_name, "workers": self.workers, "chunk_size": self.chunk_size})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def executor(self):
+        """Returns the pool of the worker processes (creates it in the current process if needed)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+
+                # Prepare the shared-memory transport (clean the segments orphaned by the killed processes)
+                if self.shared_memory and os.name == "posix":
+                    resource_tracker.ensure_running()
+                    cleanup_orphaned_shared_arrays()
+
+                # Prepare the pool of the worker processes
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=initialize_worker,
+                    initargs=(self.library_name,))
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def warm_up(self):
+        """Warms-up the pool (starts the worker processes and imports the injected library)"""
+        wait([self.executor.submit(warm_up_worker) for _ in range(self.workers)])
+
+    def shutdown(self, wait_for_workers=True):
+        """Shuts down the pool of the worker processes (in the current process)"""
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=wait_for_workers)
+            self._executor = None
+            self._executor_pid = None
+
+    def get_worker_pids(self):
+        """Returns the process identifiers of the running worker processes (in the current process)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                return []
+            return list((getattr(self._executor, "_processes", None) or {}).keys())
+
+    def get_chunks(self, subjects, offsets=None):
+        """
+        Splits the subjects into the chunks (slices along the subject axis).
+
+        If the offsets of the ragged subjects are set (and the chunk size is
+        not), the subjects are split into the chunks of about the same volume
+        of the values (rather than of the same number of subjects).
+
+        :param subjects: number of subjects
+        :type subjects: int
+        :param offsets: offsets of the ragged subjects in their flat values, defaults to None
+        :type offsets: numpy.ndarray, optional
+        :return: chunks of subjects
+        :rtype: list of slice
+        """
+
+        # Split the ragged subjects by the volume of their values (at the subject boundaries nearest to the even split)
+        if offsets is not None and not self.chunk_size and subjects > 0:
+            return split_subjects(subjects, self.workers, offsets)
+
+        # Split the subjects by their number
+        size = self.chunk_size if self.chunk_size else math.ceil(subjects / self.workers)
+        size = max(int(size), 1)
+        return [slice(start, min(start + size, subjects)) for start in range(0, subjects, size)]
+
+    def is_splittable(self, values):
+        """Checks if the sample values are split into more than one chunk"""
+        return len(self.get_chunks(len(values), values.offsets if isinstance(values, RaggedArray) else None)) > 1
+
+    def extract(self, values, labels, configuration, pipeline, by_element=False):
+        """
+        Extracts the features from the chunks of subjects via the worker processes.
+
+        If the pipeline is extracted element by element, the widths of the
+        elements are returned as well (see: ``extract_in_worker``).
+
+        :param values: sample values (subjects in the first dimension)
+        :type values: numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray
+        :param labels: sample labels
+        :type labels: list
+        :param configuration: features extractor configuration
+        :type configuration: dict
+        :param pipeline: pipeline with the feature names and kwargs
+        :type pipeline: list
+        :param by_element: extract the pipeline element by element (return the widths), defaults to False
+        :type by_element: bool, optional
+        :return: extracted features (stitched along the subject axis) and feature labels (and widths)
+        :rtype: dict
+        """
+
+        # Share the sample values (the worker processes get the read-only views instead of the copies)
+        offsets = values.offsets if isinstance(values, RaggedArray) else None
+        buffer = values.values if offsets is not None else values
+        shared = create_shared_array(buffer) if self.shared_memory and is_shareable(
+            buffer, self.shared_memory_threshold) else None
+        threshold = self.shared_memory_threshold if self.shared_memory else None
+
+        # Submit the chunks of subjects to the worker processes
+        try:
+            futures = [
+                self.executor.submit(
+                    extract_in_worker, shared, labels, configuration, pipeline, chunk, threshold, offsets, by_element)
+                if shared else
+                self.executor.submit(
+                    extract_in_worker, values[chunk], labels, configuration, pipeline,
+                    None, threshold, None, by_element)
+                for chunk in self.get_chunks(len(values), offsets)
+            ]
+            extracted, error = self.collect(futures)
+
+        # Handle the broken pool (a worker died): the pool is re-created on the next use
+        except BrokenProcessPool as e:
+            self.shutdown(wait_for_workers=False)
+            raise FeaturesExtractionPoolBrokenException(f"Features extraction worker terminated abruptly: {e}")
+
+        # Release the shared sample values
+        finally:
+            if shared:
+                unlink_shared_array(shared)
+
+        # Handle the failed chunk of subjects (the shared features of the other chunks are released)
+        if error is not None:
+            for e in extracted:
+                if isinstance(e["features"], SharedArray):
+                    unlink_shared_array(e["features"])
+            raise self.get_error(error)
+
+        # Return the extracted features and labels (stitched along the subject axis)
+        result = {
+            "features": stitch_features([e["features"] for e in extracted]),
+            "labels": extracted[0]["labels"]
+        }
+        if by_element:
+            result["widths"] = extracted[0]["widths"]
+        return result
+
+    def is_schedulable(self, tasks):
+        """Checks if the tasks are extracted by the scheduled workers (see: extract_scheduled)"""
+        return self.scheduler is not None and self.scheduler.is_required(tasks)
+
+    def extract_scheduled(self, tasks, labels, configuration):
+        """
+        Extracts the features of the tasks via the worker processes scheduled by their predicted costs.
+
+        Each of the tasks is the sample values and the pipeline element. The
+        tasks are packed onto the worker processes by the scheduler (the costly
+        tasks are split into the chunks of subjects, the longest tasks are
+        assigned first to the least loaded worker), and each of the workers
+        extracts its units element by element. The runtimes of the elements are
+        recorded into the cost model (with their predicted costs), and so is
+        the makespan of the schedule. The same sample values of the tasks are
+        shared with the workers once.
+
+        :param tasks: sample values and the pipeline element of the tasks
+        :type tasks: list of tuple (numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray, dict)
+        :param labels: sample labels
+        :type labels: list
+        :param configuration: features extractor configuration
+        :type configuration: dict
+        :return: extracted features and feature labels of each of the tasks
+        :rtype: list of dict
+        """
+        started = time.monotonic()
+        threshold = self.shared_memory_threshold if self.shared_memory else None
+        shared = {}
+
+        # Schedule the tasks onto the worker processes
+        schedule, makespan = self.scheduler.schedule(tasks, self.workers)
+
+        # Prepare the units of the workers (the units of the same values and chunk extract one pipeline)
+        try:
+            submitted = []
+            for units in schedule:
+                calls, pieces = {}, []
+                for index, chunk, cost in units:
+                    values, element = tasks[index]
+                    offsets = values.offsets if isinstance(values, RaggedArray) else None
+                    buffer = values.values if offsets is not None else values
+                    if self.shared_memory and id(buffer) not in shared and is_shareable(
+                            buffer, self.shared_memory_threshold):
+                        shared[id(buffer)] = create_shared_array(buffer)
+                    key = (id(values), chunk.start, chunk.stop)
+                    if key not in calls:
+                        calls[key] = (
+                            (shared[id(buffer)], chunk, offsets, [])
+                            if id(buffer) in shared else
+                            (values[chunk], None, None, []))
+                    calls[key][3].append(element)
+                    pieces.append((list(calls).index(key), len(calls[key][3]) - 1, index, chunk, cost))
+                submitted.append((self.executor.submit(
+                    extract_scheduled_in_worker,
+                    list(calls.values()),
+                    labels,
+                    configuration,
+                    threshold), pieces))
+            results, error = self.collect([future for future, _ in submitted])
+
+        # Handle the broken pool (a worker died): the pool is re-created on the next use
+        except BrokenProcessPool as e:
+            self.shutdown(wait_for_workers=False)
+            raise FeaturesExtractionPoolBrokenException(f"Features extraction worker terminated abruptly: {e}")
+
+        # Release the shared sample values
+        finally:
+            for array in shared.values():
+                unlink_shared_array(array)
+
+        # Read the features of the units (the shared features are unlinked)
+        for calls in results:
+            for extracted in calls:
+                extracted["features"] = stitch_features([extracted["features"]])
+        if error is not None:
+            raise self.get_error(error)
+
+        # Split the features of the units into the pieces of the tasks (and record the runtimes of the elements)
+        pieces = {}
+        for (_, units), calls in zip(submitted, results):
+            for call, position, index, chunk, cost in units:
+                extracted = calls[call]
+                start = sum(extracted["widths"][:position])
+                width = extracted["widths"][position]
+                pieces.setdefault(index, []).append((chunk.start, {
+                    "features": extracted["features"][..., start:start + width],
+                    "labels": extracted["labels"][start:start + width]
+                }))
+                values, element = tasks[index]
+                self.scheduler.model.record(
+                    element,
+                    chunk.stop - chunk.start,
+                    get_samples_per_subject(values[chunk]),
+                    extracted["durations"][position],
+                    predicted=cost)
+        self.scheduler.record(makespan, time.monotonic() - started)
+
+        # Return the features of the tasks (stitched along the subject axis)
+        extracted = []
+        for index in range(len(tasks)):
+            chunks = [piece for _, piece in sorted(pieces.get(index, []), key=lambda piece: piece[0])]
+            extracted.append({
+                "features": stitch_features([piece["features"] for piece in chunks]) if len(chunks) > 1 else (
+                    chunks[0]["features"]),
+                "labels": chunks[0]["labels"]
+            })
+        return extracted
+
+    @staticmethod
+    def collect(futures):
+        """
+        Collects the results of all the submitted chunks of subjects.
+
+        All the futures are waited for (even if any of them failed, or the pool
+        broke), so the shared features of all the successful chunks can be
+        released. The broken pool takes precedence over the other errors.
+
+        :param futures: futures of the submitted chunks of subjects
+        :type futures: list of concurrent.futures.Future
+        :return: results of the successful chunks, first error (None if all chunks succeeded)
+        :rtype: tuple (list of dict, Exception or None type)
+        """
+        results, error = [], None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except BrokenProcessPool as e:
+                error = error if isinstance(error, BrokenProcessPool) else e
+            except Exception as e:
+                error = error if error is not None else e
+        return results, error
+
+    def get_error(self, error):
+        """Returns the error of the extraction (the broken pool is shut down, it is re-created on the next use)"""
+        if isinstance(error, BrokenProcessPool):
+            self.shutdown(wait_for_workers=False)
+            return FeaturesExtractionPoolBrokenException(f"Features extraction worker terminated abruptly: {error}")
+        return error
@@ -0,0 +1,447 @@
+import os
+import math
+import json
+import time
+import uuid
+import heapq
+import threading
+import numpy
+from pathlib import Path
+from api.common.utilities import canonicalize
+from api.interfaces.inputs.ragged import RaggedArray
+
+
+# ------------------------------------------------------------ #
+# Default features extraction scheduling attributes definition #
+# ------------------------------------------------------------ #
+
+# Weight of the new runtime in the moving average of the runtimes of the pipeline element
+DEFAULT_COST_MODEL_SMOOTHING = 0.3
+
+# Interval of saving the cost model (the cost model is saved after the runtimes are recorded)
+DEFAULT_COST_MODEL_SAVE_INTERVAL = 60.0
+
+# Minimum predicted cost of the extraction scheduled onto the worker processes (the cheaper one runs serially)
+DEFAULT_MIN_SCHEDULED_COST = 0.01
+
+
+# -------------------------------------------------- #
+# Features extraction scheduling routines definition #
+# -------------------------------------------------- #
+
+def split_subjects(subjects, parts, offsets=None):
+    """
+    Splits the subjects into the (at most) <parts> chunks (slices along the subject axis).
+
+    If the offsets of the ragged subjects are set, the subjects are split into
+    the chunks of about the same volume of the values (at the subject
+    boundaries nearest to the even split), otherwise into the chunks of about
+    the same number of subjects.
+
+    :param subjects: number of subjects
+    :type subjects: int
+    :param parts: number of the chunks
+    :type parts: int
+    :param offsets: offsets of the ragged subjects in their flat values, defaults to None
+    :type offsets: numpy.ndarray, optional
+    :return: chunks of subjects
+    :rtype: list of slice
+    """
+    parts = max(min(int(parts), subjects), 1)
+
+    # Split the ragged subjects by the volume of their values
+    if offsets is not None and subjects > 0 and offsets[-1] > 0:
+        targets = numpy.arange(1, parts) * (offsets[-1] / parts)
+        upper = numpy.clip(numpy.searchsorted(offsets, targets), 1, subjects)
+        bounds = numpy.where(targets - offsets[upper - 1] < offsets[upper] - targets, upper - 1, upper)
+        bounds = sorted({0, subjects, *(int(bound) for bound in bounds if 0 < bound < subjects)})
+        return [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    # Split the subjects by their number
+    size = max(math.ceil(subjects / parts), 1)
+    return [slice(start, min(start + size, subjects)) for start in range(0, subjects, size)]
+
+
+def get_samples_per_subject(values):
+    """Returns the (mean) number of the samples per subject (the length of the last dimension of the values)"""
+    if isinstance(values, RaggedArray):
+        return float(values.offsets[-1]) / len(values) if len(values) else 0.0
+    return float(values.shape[-1]) if numpy.ndim(values) > 1 else 1.0
+
+
+def get_samples_bucket(samples):
+    """Returns the bucket of the number of the samples per subject (the nearest power of 2)"""
+    return 2 ** int(round(math.log2(samples))) if samples >= 1 else 1
+
+
+# ----------------------------------------------- #
+# Features extraction cost model class definition #
+# ----------------------------------------------- #
+
+class FeaturesExtractionCostModel(object):
+    """
+    Class implementing the cost model of the features extraction (historical runtimes of the pipeline elements).
+
+    The runtime of the pipeline element is recorded per the feature name, the
+    canonicalized args and the bucket of the number of the samples per subject
+    (the nearest power of 2), as the moving average of the seconds per subject
+    (normalized to the samples of the bucket). The cost of the element is then
+    predicted from the runtimes of its bucket, or scaled from the nearest
+    bucket of the same element (or of the same feature with other args), and
+    it is unknown (None) for the features that never ran.
+
+    The cost model is persisted in the JSON file (atomically; loaded when it is
+    created, saved at most once per the save interval, and when the workers
+    are stopped), so the costs survive the restarts. The processes sharing the
+    file merge their costs (the entry with more observations is kept).
+    """
+
+    def __init__(
+            self,
+            path=None,
+            library_name=None,
+            smoothing=DEFAULT_COST_MODEL_SMOOTHING,
+            save_interval=DEFAULT_COST_MODEL_SAVE_INTERVAL):
+        """
+        Initializes the FeaturesExtractionCostModel.
+
+        :param path: path of the cost model file, defaults to None (not persisted)
+        :type path: str, optional
+        :param library_name: import name of the features extraction library (costs are per library), defaults to None
+        :type library_name: str, optional
+        :param smoothing: weight of the new runtime in the moving average, defaults to 0.3
+        :type smoothing: float, optional
+        :param save_interval: interval of saving the cost model in seconds, defaults to 60 s
+        :type save_interval: float, optional
+        """
+
+        # Set the cost model file
+        self.path = path if path else None
+        self.library_name = library_name
+        self.save_interval = save_interval if save_interval is not None else DEFAULT_COST_MODEL_SAVE_INTERVAL
+
+        # Set the moving average
+        self.smoothing = min(max(float(smoothing), 0.0), 1.0) if smoothing is not None else DEFAULT_COST_MODEL_SMOOTHING
+
+        # Set the costs (key: entry) and the statistics of the predicted and the actual costs
+        self.costs = {}
+        self.observations = 0
+        self.predicted_seconds = 0.0
+        self.actual_seconds = 0.0
+        self.absolute_error_seconds = 0.0
+
+        # Set the state of the cost model
+        self._lock = threading.Lock()
+        self._saved_at = time.monotonic()
+        self._modified = False
+
+        # Load the persisted costs
+        self.load()
+
+    def __repr__(self):
+        return str({"path": self.path, "library": self.library_name, "costs": len(self)})
+
+    def __str__(self):
+        return repr(self)
+
+    def __len__(self):
+        with self._lock:
+            return len(self.costs)
+
+    @staticmethod
+    def get_key(element, bucket):
+        """Returns the key of the cost of the pipeline element (feature name, canonicalized args and samples bucket)"""
+        return canonicalize([element.get("name"), element.get("args") or {}, bucket])
+
+    def predict(self, element, subjects, samples):
+        """
+        Predicts the cost of the pipeline element.
+
+        :param element: pipeline element (feature name and kwargs)
+        :type element: dict
+        :param subjects: number of subjects
+        :type subjects: int
+        :param samples: (mean) number of the samples per subject
+        :type samples: float
+        :return: predicted cost in seconds (None if the feature never ran)
+        :rtype: float or None type
+        """
+        bucket = get_samples_bucket(samples)
+        with self._lock:
+
+            # Get the cost of the bucket of the element
+            entry = self.costs.get(self.get_key(element, bucket))
+
+            # Get the cost of the nearest bucket of the element (or of the feature with other args)
+            if entry is None:
+                args = canonicalize(element.get("args") or {})
+                candidates = [e for e in self.costs.values() if e["name"] == element.get("name")]
+                candidates = [e for e in candidates if e["args"] == args] or candidates
+                if not candidates:
+                    return None
+                entry = min(candidates, key=lambda e: abs(math.log2(e["samples"]) - math.log2(bucket)))
+
+        # Scale the seconds per subject to the samples and the subjects
+        return entry["seconds_per_subject"] * (max(samples, 1.0) / entry["samples"]) * subjects
+
+    def record(self, element, subjects, samples, seconds, predicted=None):
+        """
+        Records the runtime of the pipeline element.
+
+        :param element: pipeline element (feature name and kwargs)
+        :type element: dict
+        :param subjects: number of subjects
+        :type subjects: int
+        :param samples: (mean) number of the samples per subject
+        :type samples: float
+        :param seconds: runtime in seconds
+        :type seconds: float
+        :param predicted: predicted cost in seconds, defaults to None (not predicted)
+        :type predicted: float, optional
+        :return: None
+        :rtype: None type
+        """
+        if subjects <= 0:
+            return
+        bucket = get_samples_bucket(samples)
+        seconds_per_subject = seconds / subjects * (bucket / max(samples, 1.0))
+        key = self.get_key(element, bucket)
+        with self._lock:
+
+            # Update the moving average of the runtime
+            entry = self.costs.get(key)
+            if entry is None:
+                self.costs[key] = {
+                    "name": element.get("name"),
+                    "args": canonicalize(element.get("args") or {}),
+                    "samples": bucket,
+                    "seconds_per_subject": seconds_per_subject,
+                    "count": 1
+                }
+            else:
+                entry["seconds_per_subject"] += self.smoothing * (seconds_per_subject - entry["seconds_per_subject"])
+                entry["count"] += 1
+
+            # Update the statistics of the predicted and the actual costs
+            if predicted is not None:
+                self.observations += 1
+                self.predicted_seconds += float(predicted)
+                self.actual_seconds += float(seconds)
+                self.absolute_error_seconds += abs(float(predicted) - float(seconds))
+            self._modified = True
+            save = self.path is not None and time.monotonic() - self._saved_at >= self.save_interval
+
+        # Save the cost model (at most once per the save interval)
+        if save:
+            self.save()
+
+    def load(self):
+        """Loads the persisted costs (the missing or invalid file is ignored)"""
+        costs = self.read()
+        with self._lock:
+            for key, entry in costs.items():
+                if key not in self.costs or entry["count"] > self.costs[key]["count"]:
+                    self.costs[key] = entry
+        return len(costs)
+
+    def read(self):
+        """Reads the costs from the cost model file (empty if the file is missing or not valid)"""
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                persisted = json.load(f)
+            if not isinstance(persisted, dict) or persisted.get("library") != self.library_name:
+                return {}
+            return {
+                key: entry for key, entry in (persisted.get("costs") or {}).items()
+                if isinstance(entry, dict) and entry.get("samples", 0) >= 1 and entry.get("count", 0) >= 1
+                and isinstance(entry.get("seconds_per_subject"), (int, float))
+            }
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """
+        Saves the costs to the cost model file (merged with the costs saved by the other processes).
+
+        :return: True if the cost model was saved
+        :rtype: bool
+        """
+        if self.path is None:
+            return False
+
+        # Merge the costs (the entry with more observations is kept)
+        self.load()
+        with self._lock:
+            persisted = {"library": self.library_name, "costs": {key: dict(entry) for key, entry in self.costs.items()}}
+            self._saved_at = time.monotonic()
+            self._modified = False
+
+        # Write the cost model (atomically; the cost model is optional, so the errors are ignored)
+        temporary = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        try:
+            Path(os.path.dirname(self.path)).mkdir(parents=True, exist_ok=True)
+            with open(temporary, "w") as f:
+                json.dump(persisted, f, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
+            return True
+        except OSError:
+            return False
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+
+    def flush(self):
+        """Saves the costs if they were modified since the last save"""
+        return self.save() if self._modified else False
+
+
+# ---------------------------------------------- #
+# Features extraction scheduler class definition #
+# ---------------------------------------------- #
+
+class FeaturesExtractionScheduler(object):
+    """
+    Class implementing the cost-model-driven scheduler of the features extraction.
+
+    The tasks (the sample values and the pipeline element) are packed onto the
+    worker processes by their predicted costs: the task costlier than the even
+    share of the workers is split into the chunks of subjects (of about the
+    even share each), and the tasks and the chunks are then assigned to the
+    least loaded worker, the longest first (longest-processing-time first).
+    The features that never ran get the mean cost of the known ones; if none
+    of the costs is known, each of the tasks is split into the even chunks of
+    subjects (as the pool splits the subjects without the scheduler).
+
+    The scheduler keeps the predicted and the actual makespan (the wall time
+    of the scheduled extraction) of the last schedule with the known costs and
+    their totals; the predicted and the actual costs of the tasks are kept by
+    the cost model.
+    """
+
+    def __init__(self, model, min_scheduled_cost=DEFAULT_MIN_SCHEDULED_COST):
+        """
+        Initializes the FeaturesExtractionScheduler.
+
+        :param model: cost model of the features extraction
+        :type model: api.featurization.execution.scheduling.FeaturesExtractionCostModel
+        :param min_scheduled_cost: minimum predicted cost of the scheduled extraction in seconds, defaults to 10 ms
+        :type min_scheduled_cost: float, optional
+        """
+        self.model = model
+        self.min_scheduled_cost = min_scheduled_cost if min_scheduled_cost is not None else 0.0
+
+        # Set the statistics of the schedules
+        self.schedules = 0
+        self.last_predicted_makespan = 0.0
+        self.last_actual_makespan = 0.0
+        self.predicted_makespan_seconds = 0.0
+        self.actual_makespan_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"model": self.model, "schedules": self.schedules})
+
+    def __str__(self):
+        return repr(self)
+
+    def predict(self, tasks):
+        """
+        Predicts the costs of the tasks.
+
+        :param tasks: sample values and the pipeline element of the tasks
+        :type tasks: list of tuple (numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray, dict)
+        :return: predicted costs in seconds (None for the features that never ran)
+        :rtype: list of float or None type
+        """
+        return [self.model.predict(element, len(values), get_samples_per_subject(values)) for values, element in tasks]
+
+    def is_required(self, tasks):
+        """Checks if the tasks are worth scheduling (more than one task or subject, and not predicted to be cheap)"""
+        if not tasks or any(len(values) == 0 for values, _ in tasks) or (len(tasks) == 1 and len(tasks[0][0]) < 2):
+            return False
+        costs = self.predict(tasks)
+        return None in costs or sum(costs) >= self.min_scheduled_cost
+
+    def schedule(self, tasks, workers):
+        """
+        Schedules the tasks onto the workers (longest-processing-time first).
+
+        :param tasks: sample values and the pipeline element of the tasks
+        :type tasks: list of tuple (numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray, dict)
+        :param workers: number of the workers
+        :type workers: int
+        :return: units of each of the workers (task index, chunk of subjects, predicted cost or None), makespan
+        :rtype: tuple (list of list of tuple (int, slice, float or None type), float or None type)
+        """
+
+        # Predict the costs of the tasks (the unknown costs are the mean of the known ones)
+        predicted = self.predict(tasks)
+        known = [cost for cost in predicted if cost is not None]
+        default = sum(known) / len(known) if known else 1.0
+        costs = [cost if cost is not None else default for cost in predicted]
+        share = sum(costs) / max(workers, 1)
+
+        # Split the tasks costlier than the even share into the chunks of subjects (all tasks, if no cost is known)
+        units = []
+        for index, ((values, _), cost) in enumerate(zip(tasks, costs)):
+            offsets = values.offsets if isinstance(values, RaggedArray) else None
+            parts = math.ceil(cost / share - 1e-9) if known and share > 0 else workers
+            for chunk in split_subjects(len(values), parts, offsets):
+                if offsets is not None and offsets[-1] > 0:
+                    fraction = float(offsets[chunk.stop] - offsets[chunk.start]) / float(offsets[-1])
+                else:
+                    fraction = (chunk.stop - chunk.start) / max(len(values), 1)
+                units.append((index, chunk, cost * fraction, predicted[index] is not None))
+
+        # Assign the units to the least loaded workers (the costliest units first)
+        assigned = [[] for _ in range(max(min(workers, len(units)), 1))]
+        loads = [(0.0, worker) for worker in range(len(assigned))]
+        for index, chunk, cost, is_known in sorted(units, key=lambda unit: -unit[2]):
+            load, worker = heapq.heappop(loads)
+            assigned[worker].append((index, chunk, cost if is_known else None))
+            heapq.heappush(loads, (load + cost, worker))
+
+        # Return the units of the workers and the predicted makespan (None if any of the costs is unknown)
+        makespan = max(load for load, _ in loads) if len(known) == len(predicted) else None
+        return [units for units in assigned if units], makespan
+
+    def record(self, predicted, actual):
+        """
+        Records the predicted and the actual makespan of the schedule.
+
+        :param predicted: predicted makespan in seconds (None if not predicted)
+        :type predicted: float or None type
+        :param actual: actual makespan (wall time) in seconds (kept only if the makespan was predicted)
+        :type actual: float
+        :return: None
+        :rtype: None type
+        """
+        with self._lock:
+            self.schedules += 1
+            if predicted is not None:
+                self.last_predicted_makespan = float(predicted)
+                self.last_actual_makespan = float(actual)
+                self.predicted_makespan_seconds += float(predicted)
+                self.actual_makespan_seconds += float(actual)
+
+    def get_statistics(self):
+        """Returns the statistics of the predicted and the actual costs (of the tasks and of the schedules)"""
+        with self._lock:
+            return {
+                "schedules": self.schedules,
+                "costs": len(self.model),
+                "observations": self.model.observations,
+                "predicted_seconds": self.model.predicted_seconds,
+                "actual_seconds": self.model.actual_seconds,
+                "absolute_error_seconds": self.model.absolute_error_seconds,
+                "predicted_makespan_seconds": self.predicted_makespan_seconds,
+                "actual_makespan_seconds": self.actual_makespan_seconds,
+                "last_predicted_makespan_seconds": self.last_predicted_makespan,
+                "last_actual_makespan_seconds": self.last_actual_makespan
+            }
+
+    def save(self):
+        """Saves the cost model (if it was modified)"""
+        return self.model.flush()
@@ -0,0 +1,283 @@
+import os
+import sys
+import glob
+import uuid
+import atexit
+import threading
+import numpy
+from multiprocessing import shared_memory, resource_tracker
+
+
+# ------------------------------------------ #
+# Shared-memory arrays attributes definition #
+# ------------------------------------------ #
+
+# Prefix of the shared-memory segments (the name is: <prefix>_<owner pid>_<random>)
+SHARED_ARRAY_PREFIX = "fz"
+
+# Directory of the shared-memory segments (POSIX platforms with /dev/shm)
+SHARED_ARRAY_DIRECTORY = "/dev/shm"
+
+# Minimum size of the arrays to be shared (smaller arrays are pickled)
+DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES = 1024 * 1024
+
+
+# ----------------------------------------------- #
+# Shared-memory arrays lifecycle state definition #
+# ----------------------------------------------- #
+
+# Names of the segments owned (to be unlinked) by the current process
+owned_segments = set()
+owned_segments_lock = threading.Lock()
+
+# Segments attached by the current process (to be closed when their views are released)
+attached_segments = []
+
+
+# ------------------------------------- #
+# Shared-memory array handle definition #
+# ------------------------------------- #
+
+class SharedArray(object):
+    """
+    Class implementing the (picklable) handle of the array stored in the shared memory.
+
+    Only the handle (name of the segment, shape and dtype of the array) is sent
+    between the processes, the array itself is not copied: the receiving
+    process attaches to the segment and gets a read-only view (or it copies
+    the array directly into its destination).
+    """
+
+    def __init__(self, name, shape, dtype):
+        """
+        Initializes the SharedArray.
+
+        :param name: name of the shared-memory segment
+        :type name: str
+        :param shape: shape of the array
+        :type shape: tuple
+        :param dtype: dtype of the array
+        :type dtype: str
+        """
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = dtype
+
+    def __repr__(self):
+        return str({"name": self.name, "shape": self.shape, "dtype": self.dtype})
+
+    def __str__(self):
+        return repr(self)
+
+
+# --------------------------------------- #
+# Shared-memory array routines definition #
+# --------------------------------------- #
+
+def is_shareable(values, threshold=DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES):
+    """Checks if the array should be shared (non-object array of at least the threshold size)"""
+    return (
+        isinstance(values, numpy.ndarray) and
+        not values.dtype.hasobject and
+        values.nbytes > 0 and
+        values.nbytes >= (threshold or 0))
+
+
+def open_segment(name):
+    """
+    Opens the existing shared-memory segment (without tracking it again).
+
+    The segment is tracked by the resource tracker (shared by the process and
+    its worker processes; unlinked at the latest when the tracker exits) from
+    its creation until it is unlinked. Before Python 3.13, the opening process
+    registers the segment again, which is a no-op for the tracker.
+
+    :param name: name of the shared-memory segment
+    :type name: str
+    :return: shared-memory segment
+    :rtype: multiprocessing.shared_memory.SharedMemory
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def create_shared_array(values, owner=None):
+    """
+    Copies the array into a new shared-memory segment.
+
+    The segment is owned by the <owner> process (its pid is in the segment
+    name, so the segment can be cleaned if the owner is killed). If the owner
+    is the current process, the segment is unlinked at the exit at the latest.
+
+    :param values: array to be shared
+    :type values: numpy.ndarray
+    :param owner: pid of the process owning the segment, defaults to None (current process)
+    :type owner: int, optional
+    :return: handle of the shared array
+    :rtype: api.featurization.execution.shared.SharedArray
+    """
+    owner = owner if owner else os.getpid()
+
+    # Create the segment
+    name = f"{SHARED_ARRAY_PREFIX}_{owner}_{uuid.uuid4().hex[:12]}"
+    segment = shared_memory.SharedMemory(name=name, create=True, size=values.nbytes)
+
+    # Copy the values into the segment
+    try:
+        destination = numpy.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)
+        destination[...] = values
+        del destination
+    except Exception:
+        segment.close()
+        segment.unlink()
+        raise
+    segment.close()
+
+    # Register the segment owned by the current process
+    if owner == os.getpid():
+        with owned_segments_lock:
+            owned_segments.add(name)
+
+    # Return the handle of the shared array
+    return SharedArray(name, values.shape, values.dtype.str)
+
+
+def attach_shared_array(handle):
+    """
+    Attaches to the shared array (returns the read-only view on the segment).
+
+    The segment stays mapped until ``release_shared_arrays`` is called after
+    the view (and all arrays derived from it) is released.
+
+    :param handle: handle of the shared array
+    :type handle: api.featurization.execution.shared.SharedArray
+    :return: read-only view on the shared array
+    :rtype: numpy.ndarray
+    """
+
+    # Attach to the segment
+    segment = open_segment(handle.name)
+    attached_segments.append(segment)
+
+    # Prepare the read-only view
+    values = numpy.ndarray(handle.shape, dtype=numpy.dtype(handle.dtype), buffer=segment.buf)
+    values.setflags(write=False)
+
+    # Return the read-only view
+    return values
+
+
+def release_shared_arrays():
+    """
+    Closes the attached segments whose views were released.
+
+    The segments whose views are still referenced (e.g. kept by the injected
+    features extractor) stay mapped until the next release.
+
+    :return: number of the segments still attached
+    :rtype: int
+    """
+    for segment in list(attached_segments):
+        try:
+            segment.close()
+            attached_segments.remove(segment)
+        except BufferError:
+            pass
+    return len(attached_segments)
+
+
+def read_shared_array(handle, out=None):
+    """
+    Reads (copies) the shared array and unlinks its segment.
+
+    :param handle: handle of the shared array
+    :type handle: api.featurization.execution.shared.SharedArray
+    :param out: destination array (of the same shape), defaults to None (new array)
+    :type out: numpy.ndarray, optional
+    :return: copy of the shared array
+    :rtype: numpy.ndarray
+    """
+
+    # Copy the values from the segment
+    segment = open_segment(handle.name)
+    try:
+        source = numpy.ndarray(handle.shape, dtype=numpy.dtype(handle.dtype), buffer=segment.buf)
+        if out is None:
+            out = source.copy()
+        else:
+            out[...] = source
+        del source
+    finally:
+        segment.close()
+
+    # Unlink the segment
+    unlink_shared_array(handle)
+
+    # Return the copy of the shared array
+    return out
+
+
+def unlink_shared_array(handle):
+    """Unlinks the shared-memory segment (the mapped views stay valid until they are released)"""
+    with owned_segments_lock:
+        owned_segments.discard(handle.name)
+
+    # Open the segment
+    try:
+        segment = open_segment(handle.name)
+    except FileNotFoundError:
+        return
+
+    # Unlink the segment (and stop tracking it on behalf of its creator)
+    segment.close()
+    segment.unlink()
+    if sys.version_info >= (3, 13):
+        resource_tracker.unregister(segment._name, "shared_memory")
+
+
+def unlink_owned_segments():
+    """Unlinks the segments still owned by the current process (called at the exit)"""
+    with owned_segments_lock:
+        names = list(owned_segments)
+    for name in names:
+        unlink_shared_array(SharedArray(name, (), "u1"))
+
+
+def cleanup_orphaned_shared_arrays():
+    """
+    Unlinks the orphaned segments (the owner process is not alive anymore).
+
+    The segments of the processes that were killed (i.e. that could not unlink
+    their segments at the exit) are found by the owner pid in the segment name.
+    Only the platforms exposing the segments in /dev/shm are supported.
+
+    :return: number of the unlinked segments
+    :rtype: int
+    """
+    unlinked = 0
+    for path in glob.glob(os.path.join(SHARED_ARRAY_DIRECTORY, f"{SHARED_ARRAY_PREFIX}_*_*")):
+        _, pid, _ = os.path.basename(path).split("_", 2)
+        if not pid.isdigit() or is_process_alive(int(pid)):
+            continue
+        try:
+            os.unlink(path)
+            unlinked += 1
+        except OSError:
+            pass
+    return unlinked
+
+
+def is_process_alive(pid):
+    """Checks if the process is alive"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Unlink the owned segments at the exit
+atexit.register(unlink_owned_segments)
@@ -0,0 +1,591 @@
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, wait
+from multiprocessing import resource_tracker
+from api.interfaces.inputs.ragged import RaggedArray
+from api.featurization.execution.pool import initialize_worker, extract_in_worker, FeaturesExtractionPoolBrokenException
+from api.featurization.execution.deadline import (
+    FeaturesExtractionTimeoutException,
+    FeaturesExtractionCancelledException,
+    FeaturesExtractionStoppedException
+)
+from api.featurization.execution.scheduling import get_samples_per_subject
+from api.featurization.execution.shared import (
+    DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES,
+    is_shareable,
+    create_shared_array,
+    unlink_shared_array,
+    cleanup_orphaned_shared_arrays
+)
+
+
+# ------------------------------------------------------------- #
+# Default features extraction supervision attributes definition #
+# ------------------------------------------------------------- #
+
+# Interval of checking the timeout and the cancellation of the running extraction
+DEFAULT_SUPERVISION_POLL_INTERVAL = 0.05
+
+
+# --------------------------------------------------------- #
+# Supervised features extraction worker routines definition #
+# --------------------------------------------------------- #
+
+def run_supervised_worker(connection, library_name):
+    """
+    Runs the supervised worker process (extracts the features of the received tasks until the connection closes).
+
+    The worker process reports that it is ready (the injected library is
+    imported) before it receives the first task, so the start of the worker
+    process does not count against the time budget of the task.
+
+    :param connection: connection to the supervisor (receives the tasks, sends the results)
+    :type connection: multiprocessing.connection.Connection
+    :param library_name: import name of the injected features extraction library
+    :type library_name: str
+    :return: None
+    :rtype: None type
+    """
+    initialize_worker(library_name)
+    connection.send(os.getpid())
+    while True:
+
+        # Receive the task (the arguments of extract_in_worker)
+        try:
+            task = connection.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        # Extract the features (the errors are sent back to the supervisor)
+        try:
+            result = (True, extract_in_worker(*task))
+        except Exception as e:
+            result = (False, e)
+
+        # Send the result (the errors that cannot be pickled are sent as their messages)
+        try:
+            connection.send(result)
+        except Exception as e:
+            connection.send((False, RuntimeError(str(result[1] if not result[0] else e))))
+
+
+# ------------------------------------------------------ #
+# Supervised features extraction worker class definition #
+# ------------------------------------------------------ #
+
+class FeaturesExtractionSupervisedWorker(object):
+    """
+    Class implementing the killable worker process of the features extraction supervisor.
+
+    The worker process is started on its first task, and it keeps the
+    injected features extraction library imported between the tasks. If the
+    task exceeds its timeout (or it is cancelled), the worker process is
+    killed, and a new one is started on the next task. The timeout of the task
+    starts when the worker process is ready (the start of the worker process
+    and the import of the injected library do not count). If the supervisor
+    is stopping, the running task is cancelled (its worker process is killed).
+    """
+
+    def __init__(self, library_name, context, poll_interval=DEFAULT_SUPERVISION_POLL_INTERVAL, stopping=None):
+        """
+        Initializes the FeaturesExtractionSupervisedWorker.
+
+        :param library_name: import name of the injected features extraction library
+        :type library_name: str
+        :param context: multiprocessing context (start method)
+        :type context: multiprocessing.context.BaseContext
+        :param poll_interval: interval of checking the timeout and the cancellation, defaults to 50 ms
+        :type poll_interval: float, optional
+        :param stopping: event set when the supervisor is stopping, defaults to None
+        :type stopping: threading.Event, optional
+        """
+        self.library_name = library_name
+        self.context = context
+        self.poll_interval = poll_interval
+        self.stopping = stopping if stopping is not None else threading.Event()
+        self.process = None
+        self.connection = None
+        self.ready = False
+        self.runtime = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"library": self.library_name, "pid": self.pid})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def pid(self):
+        """Returns the process identifier of the running worker process (None if it is not running)"""
+        process = self.process
+        return process.pid if process is not None and process.is_alive() else None
+
+    def start(self):
+        """Starts the worker process"""
+        connection, worker_connection = self.context.Pipe(duplex=True)
+        process = self.context.Process(
+            target=run_supervised_worker,
+            args=(worker_connection, self.library_name),
+            daemon=True)
+        process.start()
+        worker_connection.close()
+        with self._lock:
+            self.process, self.connection = process, connection
+            self.ready = False
+
+    def check_cancelled(self, deadline=None):
+        """Checks if the task was cancelled (kills the worker process; raises the cancellation exception)"""
+        if self.stopping.is_set():
+            self.kill()
+            raise FeaturesExtractionStoppedException("Features extraction stopped (the workers are shutting down)")
+        if deadline is not None and deadline.cancelled:
+            self.kill()
+            raise FeaturesExtractionCancelledException("Features extraction cancelled (the client disconnected)")
+
+    def wait_ready(self, deadline=None):
+        """
+        Waits until the worker process is ready (the injected library is imported; checks the deadline).
+
+        If the deadline expires first, the worker process is kept starting (it
+        is ready for the next task).
+
+        :param deadline: deadline of the extraction (cancellation), defaults to None
+        :type deadline: api.featurization.execution.deadline.FeaturesExtractionDeadline, optional
+        :return: None
+        :rtype: None type
+        """
+        if self.ready:
+            return
+        connection = self.connection
+        try:
+            while not connection.poll(self.poll_interval):
+                self.check_cancelled(deadline)
+                if deadline is not None and deadline.expired:
+                    raise FeaturesExtractionTimeoutException("Features extraction timed out (the deadline expired)")
+            connection.recv()
+        except (EOFError, OSError, AttributeError) as e:
+            self.kill()
+            self.check_cancelled()
+            raise FeaturesExtractionPoolBrokenException(f"Features extraction worker failed to start: {e}")
+        self.ready = True
+
+    def kill(self):
+        """Kills the worker process"""
+        with self._lock:
+            process, connection = self.process, self.connection
+            self.process = None
+            self.connection = None
+            self.ready = False
+        if process is not None:
+            process.kill()
+            process.join()
+        if connection is not None:
+            connection.close()
+
+    def stop(self):
+        """Stops the worker process (gracefully, the worker process is killed if it does not stop)"""
+        with self._lock:
+            process, connection = self.process, self.connection
+        if process is None:
+            return
+        if connection is not None:
+            try:
+                connection.send(None)
+                process.join(timeout=1)
+            except (OSError, ValueError):
+                pass
+        self.kill()
+
+    def run(self, task, timeout=None, deadline=None):
+        """
+        Runs the task in the worker process (kills the worker process on the timeout or the cancellation).
+
+        The worker process is started (if needed) and waited for before the
+        timeout starts; the timeout is the time budget capped by the remaining
+        time of the deadline at that moment. The runtime of the task is kept
+        in ``runtime``.
+
+        :param task: arguments of the features extraction (see: extract_in_worker)
+        :type task: tuple
+        :param timeout: time budget of the task in seconds, defaults to None (unlimited)
+        :type timeout: float, optional
+        :param deadline: deadline of the extraction (cancellation), defaults to None
+        :type deadline: api.featurization.execution.deadline.FeaturesExtractionDeadline, optional
+        :return: extracted features and feature labels
+        :rtype: dict
+        """
+        self.runtime = None
+
+        # Start the worker process (if needed) and wait until it is ready
+        if self.process is None or not self.process.is_alive():
+            self.kill()
+            self.start()
+        self.wait_ready(deadline)
+
+        # Get the timeout of the task (the time budget capped by the remaining time of the deadline)
+        if deadline is not None:
+            timeout = deadline.get_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            raise FeaturesExtractionTimeoutException("Features extraction timed out (the deadline expired)")
+
+        # Send the task and wait for the result (check the timeout and the cancellation)
+        connection = self.connection
+        started = time.monotonic()
+        try:
+            connection.send(task)
+            while not connection.poll(self.poll_interval):
+                self.check_cancelled(deadline)
+                if timeout is not None and time.monotonic() - started >= timeout:
+                    self.kill()
+                    raise FeaturesExtractionTimeoutException(f"Features extraction timed out after {timeout:.3f} s")
+
+            # Receive the result (the worker process died if the connection is closed)
+            succeeded, result = connection.recv()
+        except (EOFError, OSError, AttributeError) as e:
+            self.kill()
+            self.check_cancelled()
+            raise FeaturesExtractionPoolBrokenException(f"Features extraction worker terminated abruptly: {e}")
+        self.runtime = time.monotonic() - started
+
+        # Return the extracted features (or raise the error of the extraction)
+        if not succeeded:
+            raise result
+        return result
+
+
+# ----------------------------------------------- #
+# Features extraction supervisor class definition #
+# ----------------------------------------------- #
+
+class FeaturesExtractionSupervisor(object):
+    """
+    Class implementing the supervisor of the features extraction with the time budgets.
+
+    The elements of the features extraction pipeline are extracted one by one
+    by the killable worker processes (each of the workers has the injected
+    features extraction library imported), and the elements run concurrently
+    across the workers. Each of the elements gets the time budget: the budget
+    of the feature (by its name), or the default one, capped by the remaining
+    time of the request deadline. If the element exceeds its time budget, its
+    worker process is killed (and replaced), and the element is reported as
+    timed-out instead of failing the whole extraction. If the extraction is
+    cancelled (e.g. the client disconnected), the workers of its elements are
+    killed as well.
+
+    The time budget of the element counts only its extraction: neither the
+    time the element waits for an idle worker process (behind the other
+    elements), nor the start of the worker process counts (both of them are
+    bounded only by the deadline of the request).
+
+    When the supervisor is shut down, the queued elements are stopped and
+    the running ones as well (their worker processes are killed) before
+    the worker processes are stopped, so the in-flight extractions fail with
+    ``FeaturesExtractionStoppedException`` (HTTP 503).
+    """
+
+    def __init__(
+            self,
+            library_name,
+            workers=None,
+            start_method=None,
+            warm_up_workers=False,
+            default_timeout=None,
+            timeouts=None,
+            default_deadline=None,
+            max_deadline=None,
+            poll_interval=DEFAULT_SUPERVISION_POLL_INTERVAL,
+            shared_memory_threshold=DEFAULT_SHARED_ARRAY_THRESHOLD_IN_BYTES,
+            scheduler=None):
+        """
+        Initializes the FeaturesExtractionSupervisor.
+
+        The worker processes are created lazily (on the first use in the
+        current process), so the supervisor can be safely prepared before the
+        server forks its workers (each of the forked processes gets its own).
+        The ``forkserver`` start method is recommended: the worker processes
+        started (or re-started after being killed) while a request is handled
+        do not inherit the client connections of the server, so the server can
+        close them (and the disconnection of the client can be detected).
+
+        :param library_name: import name of the injected features extraction library
+        :type library_name: str
+        :param workers: number of the worker processes, defaults to None (CPU count)
+        :type workers: int, optional
+        :param start_method: multiprocessing start method, defaults to None (platform default)
+        :type start_method: str, optional
+        :param warm_up_workers: warm-up the workers when the application starts them, defaults to False
+        :type warm_up_workers: bool, optional
+        :param default_timeout: default time budget of the features in seconds, defaults to None (unlimited)
+        :type default_timeout: float, optional
+        :param timeouts: time budgets of the features in seconds (feature name: budget), defaults to None
+        :type timeouts: dict, optional
+        :param default_deadline: default deadline of the requests in seconds, defaults to None (no deadline)
+        :type default_deadline: float, optional
+        :param max_deadline: maximum deadline of the requests in seconds, defaults to None (unlimited)
+        :type max_deadline: float, optional
+        :param poll_interval: interval of checking the timeout and the cancellation, defaults to 50 ms
+        :type poll_interval: float, optional
+        :param shared_memory_threshold: minimum size of the shared sample values in bytes, defaults to 1 MiB
+        :type shared_memory_threshold: int, optional
+        :param scheduler: features extraction scheduler (cost model of the features), defaults to None
+        :type scheduler: api.featurization.execution.scheduling.FeaturesExtractionScheduler, optional
+        """
+
+        # Set the features extraction library and the scheduler
+        self.library_name = library_name
+        self.scheduler = scheduler
+
+        # Set the supervisor configuration
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        self.start_method = start_method if start_method else None
+        self.warm_up_workers = bool(warm_up_workers)
+        self.poll_interval = poll_interval if poll_interval else DEFAULT_SUPERVISION_POLL_INTERVAL
+        self.shared_memory_threshold = shared_memory_threshold
+
+        # Set the time budgets of the features and the deadlines of the requests
+        self.default_timeout = default_timeout if default_timeout else None
+        self.timeouts = {name: timeout for name, timeout in (timeouts or {}).items() if timeout}
+        self.default_deadline = default_deadline if default_deadline else None
+        self.max_deadline = max_deadline if max_deadline else None
+
+        # Set the worker processes and the threads waiting for them (created lazily per process)
+        self._idle = None
+        self._workers = []
+        self._executor = None
+        self._executor_pid = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"library": self.library_name, "workers": self.workers, "timeouts": self.timeouts})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def executor(self):
+        """Returns the threads waiting for the worker processes (creates the workers in the current process)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+
+                # Prepare the shared-memory transport (clean the segments orphaned by the killed processes)
+                if os.name == "posix":
+                    resource_tracker.ensure_running()
+                    cleanup_orphaned_shared_arrays()
+
+                # Prepare the worker processes (started on their first task; the forkserver preloads the modules)
+                context = multiprocessing.get_context(self.start_method)
+                if self.start_method == "forkserver":
+                    context.set_forkserver_preload([__name__])
+                self._stopping = threading.Event()
+                self._workers = [
+                    FeaturesExtractionSupervisedWorker(self.library_name, context, self.poll_interval, self._stopping)
+                    for _ in range(self.workers)
+                ]
+                self._idle = queue.Queue()
+                for worker in self._workers:
+                    self._idle.put(worker)
+
+                # Prepare the threads waiting for the worker processes
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="supervisor")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def get_timeout(self, element):
+        """Returns the time budget of the pipeline element in seconds (None if unlimited)"""
+        return self.timeouts.get(element.get("name"), self.default_timeout)
+
+    def is_required(self, pipeline, deadline=None):
+        """Checks if the extraction of the pipeline is supervised (the deadline or any time budget applies)"""
+        if deadline is not None and deadline.timeout is not None:
+            return True
+        return any(self.get_timeout(element) is not None for element in pipeline)
+
+    def warm_up(self):
+        """Warms-up the supervisor (starts the worker processes and waits until they import the injected library)"""
+        self.executor
+        with self._lock:
+            started = [worker for worker in self._workers if worker.process is None]
+            for worker in started:
+                worker.start()
+            for worker in started:
+                worker.wait_ready()
+
+    def shutdown(self):
+        """
+        Shuts down the worker processes (in the current process).
+
+        The supervisor is marked as stopping first: the queued tasks are
+        stopped before they run, and the running ones are stopped (their
+        worker processes are killed within the poll interval). The worker processes are stopped
+        after all of the running tasks returned them.
+
+        :return: None
+        :rtype: None type
+        """
+
+        # Mark the supervisor as stopping (the running tasks are stopped)
+        with self._lock:
+            executor, workers = self._executor, self._workers
+            if executor is not None and self._executor_pid == os.getpid():
+                self._stopping.set()
+            else:
+                executor, workers = None, []
+
+        # Wait for the tasks (they are stopped within the poll interval), then stop the worker processes
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for worker in workers:
+            worker.stop()
+
+        # Reset the worker processes (they are created again on the next use)
+        with self._lock:
+            if self._executor is executor or executor is None:
+                self._idle = None
+                self._workers = []
+                self._executor = None
+                self._executor_pid = None
+
+    def get_worker_pids(self):
+        """Returns the process identifiers of the running worker processes (in the current process)"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                return []
+            return [worker.pid for worker in self._workers if worker.pid is not None]
+
+    def run(self, task, timeout=None, deadline=None, cost=None):
+        """
+        Runs the task in the idle worker process (and records its runtime into the cost model).
+
+        The time budget of the task starts when the task is sent to the worker
+        process: the time spent waiting for the idle worker process (and for
+        the start of the worker process) is bounded only by the deadline.
+
+        :param task: arguments of the features extraction (see: extract_in_worker)
+        :type task: tuple
+        :param timeout: time budget of the task in seconds, defaults to None (unlimited)
+        :type timeout: float, optional
+        :param deadline: deadline of the extraction, defaults to None
+        :type deadline: api.featurization.execution.deadline.FeaturesExtractionDeadline, optional
+        :param cost: sample values and the pipeline element of the task, and its predicted cost, defaults to None
+        :type cost: tuple (numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray, dict, float), optional
+        :return: extracted features and feature labels
+        :rtype: dict
+        """
+
+        # Wait for the idle worker process (until the deadline expires)
+        idle = self._idle
+        try:
+            worker = idle.get(timeout=deadline.remaining() if deadline is not None else None)
+        except queue.Empty:
+            raise FeaturesExtractionTimeoutException("Features extraction timed out (the deadline expired)")
+
+        # Run the task in the worker process
+        try:
+            if worker.stopping.is_set():
+                raise FeaturesExtractionStoppedException("Features extraction stopped (the workers are shutting down)")
+            if deadline is not None:
+                deadline.check()
+            extracted = worker.run(task, timeout=timeout, deadline=deadline)
+            runtime = worker.runtime
+        finally:
+            idle.put(worker)
+
+        # Record the runtime of the task
+        if cost is not None:
+            values, element, predicted = cost
+            self.scheduler.model.record(
+                element,
+                len(values),
+                get_samples_per_subject(values),
+                runtime,
+                predicted=predicted)
+        return extracted
+
+    def extract(self, tasks, labels, configuration, deadline=None):
+        """
+        Extracts the features of the tasks via the killable worker processes.
+
+        Each of the tasks is the sample values and the pipeline (usually with
+        one element), it gets the time budget of its elements (the largest of
+        them if there are more) capped by the remaining time of the deadline.
+        The same sample values of the tasks are shared with the workers once.
+        If the scheduler is set, the tasks are submitted in the order of their
+        predicted costs (the longest first), and the runtimes of the tasks of
+        one element are recorded into the cost model.
+
+        :param tasks: sample values and the pipeline of the tasks
+        :type tasks: list of tuple (numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray, list)
+        :param labels: sample labels
+        :type labels: list
+        :param configuration: features extractor configuration
+        :type configuration: dict
+        :param deadline: deadline of the extraction, defaults to None
+        :type deadline: api.featurization.execution.deadline.FeaturesExtractionDeadline, optional
+        :return: extracted features and feature labels (or the timeout exception) of each of the tasks
+        :rtype: list of dict or api.featurization.execution.deadline.FeaturesExtractionTimeoutException
+        """
+        executor = self.executor
+        shared = {}
+        try:
+
+            # Prepare the tasks (share the sample values with the worker processes)
+            prepared = []
+            for values, pipeline in tasks:
+                offsets = values.offsets if isinstance(values, RaggedArray) else None
+                buffer = values.values if offsets is not None else values
+                if id(buffer) not in shared and is_shareable(buffer, self.shared_memory_threshold):
+                    shared[id(buffer)] = create_shared_array(buffer)
+                if id(buffer) in shared:
+                    task = (shared[id(buffer)], labels, configuration, pipeline, slice(None), None, offsets)
+                else:
+                    task = (values, labels, configuration, pipeline)
+                budgets = [self.get_timeout(element) for element in pipeline]
+                prepared.append((task, None if None in budgets else max(budgets, default=None)))
+
+            # Get the predicted costs of the tasks of one element (the unknown costs are submitted first)
+            costs = [None] * len(tasks)
+            if self.scheduler is not None:
+                costs = [
+                    (values, pipeline[0], self.scheduler.predict([(values, pipeline[0])])[0])
+                    if len(pipeline) == 1 else None
+                    for values, pipeline in tasks
+                ]
+            order = sorted(range(len(prepared)), key=lambda i: -(
+                costs[i][2] if costs[i] is not None and costs[i][2] is not None else float("inf")))
+
+            # Run the tasks concurrently (all of them are waited for, so the shared values can be released)
+            futures = [None] * len(prepared)
+            try:
+                for i in order:
+                    futures[i] = executor.submit(self.run, prepared[i][0], prepared[i][1], deadline, costs[i])
+            except RuntimeError:
+                raise FeaturesExtractionStoppedException("Features extraction stopped (the workers are shutting down)")
+            finally:
+                wait([future for future in futures if future is not None])
+
+        # Release the shared sample values
+        finally:
+            for array in shared.values():
+                unlink_shared_array(array)
+
+        # Collect the results (raise the cancellation and the errors, return the timeouts)
+        results, error = [], None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except FeaturesExtractionTimeoutException as e:
+                results.append(e)
+            except (FeaturesExtractionCancelledException, FeaturesExtractionStoppedException) as e:
+                raise e
+            except Exception as e:
+                error = error if error is not None else e
+        if error is not None:
+            raise error
+        return results
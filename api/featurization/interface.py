@@ -1,3 +1,93 @@
+import time
+import numpy
+from api.interfaces.inputs.interface import Sample
+from api.interfaces.inputs.ragged import RaggedArray
+from api.featurization.planning import FeaturesPipelinePlan
+
+
+# --------------------------------------- #
+# Features extraction routines definition #
+# --------------------------------------- #
+
+def extract_features(extractor, values, labels, configuration, pipeline):
+    """
+    Extracts the features via the injected features extractor.
+
+    The rectangular values are featurized at once. The ragged values are
+    featurized subject by subject: the extractor gets the unpadded view on the
+    values of each subject (with the subject dimension of size 1), and the
+    features of the subjects are stacked along the subject axis.
+
+    :param extractor: feature extractor interface class
+    :type extractor: <injected>.interface.featurizer.FeatureExtractor
+    :param values: sample values (subjects in the first dimension)
+    :type values: numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray
+    :param labels: sample labels
+    :type labels: list
+    :param configuration: features extractor configuration
+    :type configuration: dict
+    :param pipeline: pipeline with the feature names and kwargs
+    :type pipeline: list
+    :return: extracted features and feature labels
+    :rtype: dict
+    """
+
+    # Extract the features of the rectangular values at once
+    if not isinstance(values, RaggedArray):
+        return extractor(values, labels, **configuration).extract(pipeline)
+
+    # Extract the features of the ragged values subject by subject
+    extracted = [extractor(subject[numpy.newaxis], labels, **configuration).extract(pipeline) for subject in values]
+    return {
+        "features": numpy.concatenate([numpy.atleast_2d(e["features"]) for e in extracted], axis=0),
+        "labels": extracted[0]["labels"]
+    }
+
+
+def extract_features_by_element(extractor, values, labels, configuration, pipeline):
+    """
+    Extracts the features via the injected features extractor element by element (and measures their runtimes).
+
+    The extractor is created once (once per subject if the values are ragged),
+    and the elements of the pipeline are extracted one after another, so the
+    feature columns and the runtime of each of the elements are known.
+
+    :param extractor: feature extractor interface class
+    :type extractor: <injected>.interface.featurizer.FeatureExtractor
+    :param values: sample values (subjects in the first dimension)
+    :type values: numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray
+    :param labels: sample labels
+    :type labels: list
+    :param configuration: features extractor configuration
+    :type configuration: dict
+    :param pipeline: pipeline with the feature names and kwargs
+    :type pipeline: list
+    :return: extracted features, feature labels, widths and runtimes (in seconds) of the elements
+    :rtype: dict
+    """
+
+    # Extract the elements of the pipeline one by one (subject by subject if the values are ragged)
+    subjects = [values] if not isinstance(values, RaggedArray) else [subject[numpy.newaxis] for subject in values]
+    features, first, durations = [], None, [0.0] * len(pipeline)
+    for subject in subjects:
+        instance = extractor(subject, labels, **configuration)
+        extracted = []
+        for j, element in enumerate(pipeline):
+            started = time.perf_counter()
+            extracted.append(instance.extract([element]))
+            durations[j] += time.perf_counter() - started
+        features.append(numpy.concatenate([numpy.atleast_2d(e["features"]) for e in extracted], axis=-1))
+        first = first if first is not None else extracted
+
+    # Return the features stacked along the subject axis, the labels and the widths of the elements
+    return {
+        "features": numpy.concatenate(features, axis=0) if len(features) > 1 else features[0],
+        "labels": [label for e in first for label in e["labels"]],
+        "widths": [len(e["labels"]) for e in first],
+        "durations": durations
+    }
+
+
 # ------------------------------------------------- #
 # Features extraction pipeline interface definition #
 # ------------------------------------------------- #
@@ -5,7 +95,7 @@
 class FeaturesExtractorPipeline(object):
     """Class implementing the features extractor pipeline interface"""
 
-    def __init__(self, extractor, sample, config):
+    def __init__(self, extractor, sample, config, pool=None, cache=None, supervisor=None, deadline=None):
         """
         Initializes the FeaturesExtractorPipeline (using injected extractor).
 
@@ -15,11 +105,28 @@ class FeaturesExtractorPipeline(object):
         :type sample: api.interfaces.inputs.Sample
         :param config: feature extractor configuration
         :type config: api.interfaces.inputs.FeaturesExtractorConfiguration
+        :param pool: features extraction pool (parallel execution), defaults to None
+        :type pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+        :param cache: features results cache (per-subject, per-feature), defaults to None
+        :type cache: api.caching.results.FeaturesResultCache, optional
+        :param supervisor: features extraction supervisor (time budgets of the features), defaults to None
+        :type supervisor: api.featurization.execution.supervisor.FeaturesExtractionSupervisor, optional
+        :param deadline: deadline of the extraction (and its cancellation), defaults to None
+        :type deadline: api.featurization.execution.deadline.FeaturesExtractionDeadline, optional
         """
-        self.extractor = extractor(sample.values, sample.labels, **config.extractor_configuration)
+        self.extractor = None
+        if not isinstance(sample.values, RaggedArray):
+            self.extractor = extractor(sample.values, sample.labels, **config.extractor_configuration)
+        self.extractor_interface = extractor
+        self.sample = sample
+        self.config = config
+        self.pool = pool
+        self.cache = cache
+        self.supervisor = supervisor
+        self.deadline = deadline
 
     def __repr__(self):
-        return str({"extractor": self.extractor})
+        return str({"extractor": self.extractor, "pool": self.pool, "cache": self.cache, "supervisor": self.supervisor})
 
     def __str__(self):
         return repr(self)
@@ -31,17 +138,332 @@ class FeaturesExtractorPipeline(object):
         """
         Extracts the features from the features extraction pipeline.
 
+        The pipeline is planned first: the identical elements (the same feature
+        name and canonicalized args) are collapsed, each of the unique elements
+        is extracted once, and the features are then fanned out back to the
+        requested columns and labels (see: ``FeaturesPipelinePlan``).
+
+        If the features extraction pool is set, and the sample values can be
+        split into more than one chunk of subjects, the chunks are featurized
+        in parallel by the worker processes (the features are then stitched
+        back along the subject axis). If the pool has the scheduler, the unique
+        elements (and the chunks of subjects of the costly ones) are packed
+        onto the worker processes by their predicted costs instead (see:
+        ``FeaturesExtractionPool.extract_scheduled``).
+
+        If the sample values are ragged (``RaggedArray``), the extractor gets
+        the unpadded values of each subject one by one (see:
+        ``extract_features``), so the extraction scales with the real length
+        of the subjects rather than with the longest one.
+
+        If the features results cache is set, only the (subject, feature) cells
+        missing in the cache are computed (the pipeline elements missing for the
+        same subjects are extracted at once), and the cells are then merged into
+        the output matrix.
+
+        If the features extraction supervisor is set, and the deadline or the
+        time budget of any of the features applies, the unique elements are
+        extracted one by one by the killable worker processes of the supervisor
+        (instead of the pool or the request thread). The element exceeding its
+        time budget (or the remaining time of the deadline) is killed, and its
+        features are NaN (one column labeled by the feature name) annotated by
+        the error (``errors``); its cells are not cached. Between the chunks
+        and the elements, the extraction is stopped if it was cancelled.
+
         :param pipeline: pipeline with the feature names and kwargs
         :type pipeline: api.interfaces.inputs.FeaturesPipeline
-        :return: extracted features and feature labels
+        :return: extracted features and feature labels (and the errors of the timed-out features)
         :rtype: dict
         """
 
-        # Extract the features via the injected features extractor
-        extracted = self.extractor.extract(pipeline.pipeline)
+        # Plan the extraction (collapse the identical pipeline elements)
+        plan = FeaturesPipelinePlan(pipeline.pipeline)
+        supervised = self.is_supervised(plan.elements)
 
-        # Return the extracted feature values and labels
-        return {
+        # Extract the features of the unique elements via the injected features extractor
+        self.check_cancelled()
+        if self.cache is not None:
+            extracted = self._extract_cached(plan.elements, supervised)
+        else:
+            extracted = self._extract_planned(plan, supervised)
+        errors = extracted.get("errors") or {}
+
+        # Fan out the features to the requested pipeline
+        extracted = plan.fan_out(extracted, extracted.get("widths"))
+
+        # Return the extracted feature values and labels (and the errors of the requested pipeline elements)
+        features = {
             "values": extracted["features"],
             "labels": extracted["labels"]
         }
+        if errors:
+            features["errors"] = [
+                {"index": index, "feature": pipeline.pipeline[index].get("name"), "message": errors[unique]}
+                for index, unique in enumerate(plan.indices) if unique in errors
+            ]
+        return features
+
+    def iter_extract(self, pipeline, chunk_size=None):
+        """
+        Extracts the features from the features extraction pipeline in the chunks of subjects.
+
+        The chunks are featurized one after another (each of them the same way
+        as the whole sample is featurized by ``extract``), so the features of
+        the first subjects are available before the rest is featurized.
+
+        :param pipeline: pipeline with the feature names and kwargs
+        :type pipeline: api.interfaces.inputs.FeaturesPipeline
+        :param chunk_size: number of subjects in a chunk, defaults to None (all subjects)
+        :type chunk_size: int, optional
+        :return: index of the first subject in the chunk, extracted features and feature labels
+        :rtype: generator of tuple (int, dict)
+        """
+
+        # Get the number of subjects and the chunk size
+        subjects = self.sample.values.shape[0]
+        size = max(int(chunk_size), 1) if chunk_size else subjects
+
+        # Extract the features in the chunks of subjects
+        for start in range(0, subjects, size):
+            if start == 0 and size >= subjects:
+                yield start, self.extract(pipeline)
+            else:
+                sample = Sample(self.sample.values[start:start + size], self.sample.labels)
+                chunk = FeaturesExtractorPipeline(
+                    self.extractor_interface,
+                    sample,
+                    self.config,
+                    pool=self.pool,
+                    cache=self.cache,
+                    supervisor=self.supervisor,
+                    deadline=self.deadline)
+                yield start, chunk.extract(pipeline)
+
+    def is_scheduled(self, tasks):
+        """Checks if the tasks (the sample values and the pipeline element) are scheduled onto the pool"""
+        return self.pool is not None and self.pool.is_schedulable(tasks)
+
+    def is_supervised(self, pipeline):
+        """Checks if the pipeline is extracted by the supervisor (the deadline or any time budget applies)"""
+        return self.supervisor is not None and self.supervisor.is_required(pipeline, self.deadline)
+
+    def check_cancelled(self):
+        """Checks if the extraction was cancelled (raises FeaturesExtractionCancelledException)"""
+        if self.deadline is not None:
+            self.deadline.check()
+
+    def _extract(self, values, pipeline, by_element=False):
+        """
+        Extracts the features from the sample values (serially or via the features extraction pool).
+
+        If the pipeline is extracted element by element, the extractor is still
+        created once, and the widths of the elements are returned as well.
+        """
+
+        # Extract the features via the worker processes
+        if self.pool and self.pool.is_splittable(values):
+            return self.pool.extract(
+                values,
+                self.sample.labels,
+                self.config.extractor_configuration,
+                pipeline,
+                by_element=by_element)
+
+        # Extract the features via the extractor on the request thread
+        if values is self.sample.values and self.extractor is not None:
+            if not by_element:
+                return self.extractor.extract(pipeline)
+            extracted = [self.extractor.extract([element]) for element in pipeline]
+            return {
+                "features": numpy.concatenate([numpy.atleast_2d(e["features"]) for e in extracted], axis=-1),
+                "labels": [label for e in extracted for label in e["labels"]],
+                "widths": [len(e["labels"]) for e in extracted]
+            }
+        extract = extract_features_by_element if by_element else extract_features
+        return extract(
+            self.extractor_interface,
+            values,
+            self.sample.labels,
+            self.config.extractor_configuration,
+            pipeline)
+
+    def _extract_supervised(self, tasks):
+        """
+        Extracts the features of the tasks via the features extraction supervisor.
+
+        The tasks (the sample values and the pipeline element) run concurrently
+        in the killable worker processes. The timed-out tasks are returned as
+        their timeout exceptions, the other errors are raised.
+        """
+        return self.supervisor.extract(
+            [(values, [element]) for values, element in tasks],
+            self.sample.labels,
+            self.config.extractor_configuration,
+            self.deadline)
+
+    def _extract_planned(self, plan, supervised=False):
+        """
+        Extracts the features of the unique elements of the planned pipeline.
+
+        The unique elements are extracted at once. If the columns must be
+        fanned out (the pipeline has the duplicates), the unique elements are
+        extracted element by element in the same pass (the extractor is created
+        once), so the columns of each of them are known. If the extraction is
+        supervised, the unique elements are extracted one by
+        one by the supervisor (the timed-out elements are NaN). If the tasks
+        are scheduled, the unique elements are extracted by the scheduled
+        worker processes (their columns are known).
+        """
+
+        # Extract the features of the unique elements one by one via the supervisor
+        tasks = [(self.sample.values, element) for element in plan.elements]
+        if supervised:
+            extracted = self._extract_supervised(tasks)
+            return self.merge_supervised(plan.elements, extracted, len(self.sample.values))
+
+        # Extract the features of the unique elements via the scheduled worker processes
+        if self.is_scheduled(tasks):
+            extracted = self.pool.extract_scheduled(tasks, self.sample.labels, self.config.extractor_configuration)
+            return self.merge_supervised(plan.elements, extracted, len(self.sample.values))
+
+        # Extract the features of the unique elements at once (element by element if the columns are fanned out)
+        return self._extract(self.sample.values, plan.elements, by_element=plan.has_duplicates)
+
+    @staticmethod
+    def merge_supervised(pipeline, extracted, subjects):
+        """
+        Merges the features of the pipeline elements extracted by the supervisor (or by the scheduled workers).
+
+        The timed-out elements get one column of NaN (labeled by the feature
+        name, shaped like the features of the other elements), and their
+        errors are returned per the index of the element.
+
+        :param pipeline: pipeline elements
+        :type pipeline: list
+        :param extracted: extracted features and feature labels (or the timeout exception) of the elements
+        :type extracted: list of dict or Exception
+        :param subjects: number of subjects
+        :type subjects: int
+        :return: extracted features, feature labels, widths of the elements and the errors of the elements
+        :rtype: dict
+        """
+
+        # Get the shape of the features (of the elements that were not timed-out)
+        shapes = [numpy.atleast_2d(e["features"]).shape for e in extracted if not isinstance(e, Exception)]
+        shape = (subjects, *(shapes[0][1:-1] if shapes else ()), 1)
+
+        # Merge the features (the timed-out elements are NaN)
+        features, labels, widths, errors = [], [], [], {}
+        for j, (element, e) in enumerate(zip(pipeline, extracted)):
+            if isinstance(e, Exception):
+                features.append(numpy.full(shape, numpy.nan))
+                labels.append(element.get("name"))
+                widths.append(1)
+                errors[j] = str(e)
+            else:
+                features.append(numpy.atleast_2d(e["features"]))
+                labels.extend(e["labels"])
+                widths.append(len(e["labels"]))
+
+        # Return the merged features
+        return {
+            "features": numpy.concatenate(features, axis=-1),
+            "labels": labels,
+            "widths": widths,
+            "errors": errors
+        }
+
+    def _extract_grouped(self, tasks):
+        """
+        Extracts the features of the pipeline elements missing for the same subjects at once.
+
+        The elements of each of the groups are extracted in one pass (the
+        extractor is created once), and the features are split into the
+        elements by their widths.
+        """
+
+        # Group the pipeline elements by the subjects they are missing for
+        groups = {}
+        for index, (_, missing, _, _) in enumerate(tasks):
+            groups.setdefault(tuple(missing), []).append(index)
+
+        # Extract the features of the groups (and split them into the elements by their widths)
+        computed = [None] * len(tasks)
+        for group in groups.values():
+            self.check_cancelled()
+            extracted = self._extract(tasks[group[0]][2], [tasks[index][3] for index in group], by_element=True)
+            features, start = numpy.atleast_2d(extracted["features"]), 0
+            for index, width in zip(group, extracted["widths"]):
+                computed[index] = {
+                    "features": features[..., start:start + width],
+                    "labels": extracted["labels"][start:start + width]
+                }
+                start += width
+        return computed
+
+    def _extract_cached(self, pipeline, supervised=False):
+        """Extracts the features that are missing in the features results cache (and merges the cells)"""
+
+        # Prepare the keys of the (subject, feature) cells
+        context = self.cache.get_context_digest(self.sample.labels, self.config.extractor_configuration)
+        subjects = self.cache.get_subject_digests(self.sample.values)
+        elements = [self.cache.get_element_digest(element) for element in pipeline]
+        keys = [[self.cache.get_key(context, s, e) for e in elements] for s in subjects]
+
+        # Get the cached cells
+        cells = {}
+        for i in range(len(subjects)):
+            for j in range(len(elements)):
+                cell = self.cache.get(keys[i][j])
+                if cell is not None:
+                    cells[(i, j)] = cell
+
+        # Get the missing cells (each pipeline element for the subjects it is missing for)
+        tasks = []
+        for j, element in enumerate(pipeline):
+            missing = [i for i in range(len(subjects)) if (i, j) not in cells]
+            if missing:
+                values = self.sample.values if len(missing) == len(subjects) else self.sample.values[missing]
+                tasks.append((j, missing, values, element))
+
+        # Extract the features of the pipeline elements (via the supervisor, the scheduled workers, or in groups)
+        if supervised:
+            computed = self._extract_supervised([(values, element) for _, _, values, element in tasks])
+        elif self.is_scheduled([(values, element) for _, _, values, element in tasks]):
+            computed = self.pool.extract_scheduled(
+                [(values, element) for _, _, values, element in tasks],
+                self.sample.labels,
+                self.config.extractor_configuration)
+        else:
+            computed = self._extract_grouped(tasks)
+
+        # Set the computed cells (the timed-out cells are not cached)
+        errors = {}
+        for (j, missing, _, element), extracted in zip(tasks, computed):
+            if isinstance(extracted, Exception):
+                errors[j] = str(extracted)
+                continue
+            features = numpy.atleast_2d(extracted["features"])
+            for index, i in enumerate(missing):
+                cells[(i, j)] = (features[index], tuple(extracted["labels"]))
+                self.cache.set(keys[i][j], *cells[(i, j)])
+
+        # Set the timed-out cells (NaN shaped like the other cells of the element, or like the other elements)
+        for j in errors:
+            shapes = [cells[(i, j)][0].shape for i in range(len(subjects)) if (i, j) in cells]
+            shapes = shapes or [(*cell[0].shape[:-1], 1) for cell in cells.values()] or [(1,)]
+            labels = next((cells[(i, j)][1] for i in range(len(subjects)) if (i, j) in cells), None)
+            for i in range(len(subjects)):
+                if (i, j) not in cells:
+                    cells[(i, j)] = (numpy.full(shapes[0], numpy.nan), labels or (pipeline[j].get("name"),))
+
+        # Merge the cells into the output matrix (subjects in the first, features in the last dimension)
+        return {
+            "features": numpy.stack([
+                numpy.concatenate([cells[(i, j)][0] for j in range(len(elements))], axis=-1)
+                for i in range(len(subjects))
+            ]),
+            "labels": [label for j in range(len(elements)) for label in cells[(0, j)][1]],
+            "widths": [len(cells[(0, j)][1]) for j in range(len(elements))],
+            "errors": errors
+        }
@@ -0,0 +1,104 @@
+import re
+from functools import partial
+from api.configuration import load_configuration
+from api.common.errors import register_errors_from_third_parties
+from api.caching import configure_results_caching
+from api.featurization import prepare_features_extraction_library, configure_features_extraction_library_manifest
+from api.featurization.execution import (
+    configure_features_extraction_execution,
+    configure_features_extraction_supervision,
+    configure_features_extraction_scheduling
+)
+from api.featurization.library_injection import inject_features_extraction_library
+from api.featurization.libraries.registry import FeaturesExtractionLibrary, FeaturesExtractionLibraryRegistry
+
+
+# ----------------------------------------------------------------- #
+# Features extraction libraries configuration exceptions definition #
+# ----------------------------------------------------------------- #
+class FeaturesExtractionLibraryNameNotValidException(Exception): pass
+
+
+# ----------------------------------------------------------- #
+# Default features extraction libraries attributes definition #
+# ----------------------------------------------------------- #
+LIBRARY_NAME_PATTERN = r"[A-Za-z0-9_\-]+"
+
+# Names of the libraries colliding with the other /featurize/<name> endpoints
+RESERVED_LIBRARY_NAMES = ("batch", "jobs")
+
+
+# --------------------------------------------------------------- #
+# Features extraction libraries configuration routines definition #
+# --------------------------------------------------------------- #
+
+def configure_features_extraction_libraries(app):
+    """
+    Configures the features extraction libraries served at ``/featurize/<library>``.
+
+    :param app: application (the exceptions of the libraries are registered as client-side errors)
+    :type app: flask.Flask
+    :return: registry of the libraries (None if there are no libraries)
+    :rtype: api.featurization.libraries.registry.FeaturesExtractionLibraryRegistry or None type
+    """
+
+    # Load the features extraction libraries configuration
+    configuration = load_configuration("injection.json")["features_extraction_library"]
+    libraries = configuration.get("libraries") or {}
+    if not libraries:
+        return None
+
+    # Validate the names of the libraries
+    for name in libraries:
+        if not re.fullmatch(LIBRARY_NAME_PATTERN, name) or name in RESERVED_LIBRARY_NAMES:
+            raise FeaturesExtractionLibraryNameNotValidException(f"Features extraction library name not valid: {name}")
+
+    # Prepare the registry of the libraries (the libraries are injected on their first use)
+    registry_configuration = configuration.get("libraries_registry", {})
+    return FeaturesExtractionLibraryRegistry(
+        libraries,
+        loader=partial(load_features_extraction_library, app, injection_types=configuration.get("injection_types")),
+        memory_budget_in_bytes=registry_configuration.get("memory_budget_in_bytes"),
+        max_loaded=registry_configuration.get("max_loaded"))
+
+
+def load_features_extraction_library(app, name, configuration, injection_types=None):
+    """
+    Injects the features extraction library served at ``/featurize/<library>``.
+
+    :param app: application (the exceptions of the library are registered as client-side errors)
+    :type app: flask.Flask
+    :param name: name of the library
+    :type name: str
+    :param configuration: injection configuration of the library (injection type, import and installation name)
+    :type configuration: dict
+    :param injection_types: supported injection types, defaults to None
+    :type injection_types: list, optional
+    :return: injected library (with its own features extraction pool, results cache, supervisor and scheduler)
+    :rtype: api.featurization.libraries.registry.FeaturesExtractionLibrary
+    """
+
+    # Validate and install (if pip-installable) the library
+    import_name = prepare_features_extraction_library(configuration.get("injection_type"), configuration, injection_types)
+
+    # Inject the features extractor, its exceptions and the library version (resolved from the manifest if valid)
+    injected_library = inject_features_extraction_library(
+        import_name,
+        manifest=configure_features_extraction_library_manifest(name))
+
+    # Register the injected features extractor exceptions as client-side errors
+    if injected_library["exceptions"]:
+        register_errors_from_third_parties(app, injected_library["exceptions"])
+
+    # Prepare the library (its own features extraction pool, features results cache, supervisor and scheduler)
+    scheduler = configure_features_extraction_scheduling(import_name, library=name)
+    return FeaturesExtractionLibrary(
+        name,
+        import_name,
+        injected_library["extractor"],
+        exceptions=injected_library["exceptions"],
+        version=injected_library["version"],
+        pool=configure_features_extraction_execution(import_name, scheduler=scheduler),
+        cache=configure_results_caching(import_name, injected_library["version"]),
+        supervisor=configure_features_extraction_supervision(import_name, scheduler=scheduler),
+        scheduler=scheduler)
@@ -0,0 +1,294 @@
+import os
+import time
+import threading
+
+
+# ------------------------------------------------------------ #
+# Features extraction libraries registry exceptions definition #
+# ------------------------------------------------------------ #
+class FeaturesExtractionLibraryNotFoundException(Exception): pass
+
+
+# -------------------------------------------------------- #
+# Features extraction libraries memory routines definition #
+# -------------------------------------------------------- #
+
+def get_process_memory(pid):
+    """Returns the resident memory of the process in bytes (0 if it cannot be read, e.g. not on Linux)"""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+# -------------------------------------------- #
+# Features extraction library class definition #
+# -------------------------------------------- #
+
+class FeaturesExtractionLibrary(object):
+    """
+    Class implementing the injected features extraction library served at ``/featurize/<library>``.
+
+    The library holds the injected features extractor, its exceptions and the
+    version, and its own features extraction pool, features results cache,
+    features extraction supervisor and scheduler. The library is loaded when
+    its pool is warmed-up, and it is unloaded when its pool and supervisor are
+    shut down, its cache is cleared and the cost model of its scheduler is
+    saved (the injected modules stay imported, the pool, the supervisor and
+    the cache are re-created on the next use).
+    """
+
+    def __init__(
+            self,
+            name,
+            import_name,
+            extractor,
+            exceptions=None,
+            version="",
+            pool=None,
+            cache=None,
+            supervisor=None,
+            scheduler=None):
+        """
+        Initializes the FeaturesExtractionLibrary.
+
+        :param name: name of the library (``/featurize/<name>``)
+        :type name: str
+        :param import_name: import name of the injected features extraction library
+        :type import_name: str
+        :param extractor: injected features extractor
+        :type extractor: <injected>.interface.featurizer.FeatureExtractor
+        :param exceptions: injected features extractor exceptions, defaults to None
+        :type exceptions: list, optional
+        :param version: version of the injected library, defaults to ""
+        :type version: str, optional
+        :param pool: features extraction pool (parallel execution), defaults to None
+        :type pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+        :param cache: features results cache (per-subject, per-feature), defaults to None
+        :type cache: api.caching.results.FeaturesResultCache, optional
+        :param supervisor: features extraction supervisor (time budgets of the features), defaults to None
+        :type supervisor: api.featurization.execution.supervisor.FeaturesExtractionSupervisor, optional
+        :param scheduler: features extraction scheduler (cost model of the features), defaults to None
+        :type scheduler: api.featurization.execution.scheduling.FeaturesExtractionScheduler, optional
+        """
+
+        # Set the injected features extraction library
+        self.name = name
+        self.import_name = import_name
+        self.extractor = extractor
+        self.exceptions = exceptions or []
+        self.version = version or ""
+
+        # Set the features extraction pool, the features results cache, the supervisor and the scheduler
+        self.pool = pool
+        self.cache = cache
+        self.supervisor = supervisor
+        self.scheduler = scheduler
+
+        # Set the state of the library
+        self.loaded = False
+        self.last_used = 0.0
+        self.users = 0
+
+    def __repr__(self):
+        return str({
+            "name": self.name,
+            "library": self.import_name,
+            "version": self.version,
+            "loaded": self.loaded,
+            "users": self.users})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def memory_usage(self):
+        """Returns the memory held by the library in bytes (worker processes of the pool/supervisor, cached features)"""
+        pids = (self.pool.get_worker_pids() if self.pool else []) + (
+            self.supervisor.get_worker_pids() if self.supervisor else [])
+        return sum(get_process_memory(pid) for pid in pids) + (self.cache.size if self.cache else 0)
+
+    def load(self):
+        """Loads the library (warms-up the pool, if configured)"""
+        if self.pool and self.pool.warm_up_workers:
+            self.pool.warm_up()
+        self.loaded = True
+
+    def unload(self):
+        """Unloads the library (shuts down the pool and the supervisor, clears the cache, saves the cost model)"""
+        self.loaded = False
+        if self.pool:
+            self.pool.shutdown()
+        if self.supervisor:
+            self.supervisor.shutdown()
+        if self.cache:
+            self.cache.clear()
+        if self.scheduler:
+            self.scheduler.save()
+
+
+# ------------------------------------------------------- #
+# Features extraction libraries registry class definition #
+# ------------------------------------------------------- #
+
+class FeaturesExtractionLibraryRegistry(object):
+    """
+    Class implementing the registry of the features extraction libraries served at ``/featurize/<library>``.
+
+    The libraries are injected lazily, on their first use (each of them gets
+    its own features extraction pool, features results cache, and its own
+    exceptions registered as the client-side errors). The library is acquired
+    for the time of the request (the number of its users is counted) and then
+    released. After each use, the least recently used idle libraries are
+    unloaded while the number of the loaded libraries exceeds the limit, or
+    while the memory they hold (the resident memory of their worker processes
+    and the size of their cached features) exceeds the memory budget; the
+    library in use (by any of the concurrent requests) is never unloaded.
+    """
+
+    def __init__(self, libraries, loader, memory_budget_in_bytes=None, max_loaded=None):
+        """
+        Initializes the FeaturesExtractionLibraryRegistry.
+
+        :param libraries: configuration of the libraries (name: injection configuration)
+        :type libraries: dict
+        :param loader: function injecting the library given its name and configuration
+        :type loader: callable (str, dict) -> api.featurization.libraries.registry.FeaturesExtractionLibrary
+        :param memory_budget_in_bytes: memory budget of the loaded libraries, defaults to None (unlimited)
+        :type memory_budget_in_bytes: int, optional
+        :param max_loaded: maximum number of the loaded libraries, defaults to None (unlimited)
+        :type max_loaded: int, optional
+        """
+
+        # Set the configuration of the libraries and the loader
+        self.libraries = dict(libraries)
+        self.loader = loader
+
+        # Set the bounds of the loaded libraries
+        self.memory_budget_in_bytes = memory_budget_in_bytes if memory_budget_in_bytes else None
+        self.max_loaded = max_loaded if max_loaded else None
+
+        # Set the injected libraries (name: library) and their locks
+        self._injected = {}
+        self._locks = {name: threading.Lock() for name in self.libraries}
+        self._lock = threading.Lock()
+
+        # Set the registry statistics
+        self.evictions = 0
+
+    def __repr__(self):
+        return str({"libraries": sorted(self.libraries), "loaded": self.get_loaded()})
+
+    def __str__(self):
+        return repr(self)
+
+    def __contains__(self, name):
+        return name in self.libraries
+
+    def get_loaded(self):
+        """Returns the names of the loaded libraries (the least recently used first)"""
+        with self._lock:
+            loaded = [library for library in self._injected.values() if library.loaded]
+        return [library.name for library in sorted(loaded, key=lambda library: library.last_used)]
+
+    def get_memory_usage(self):
+        """Returns the memory held by the loaded libraries in bytes"""
+        with self._lock:
+            loaded = [library for library in self._injected.values() if library.loaded]
+        return sum(library.memory_usage for library in loaded)
+
+    def acquire(self, name):
+        """
+        Acquires the library (injects and loads it if needed), and unloads the least recently used idle libraries.
+
+        The acquired library is not unloaded until it is released (see: release).
+
+        :param name: name of the library
+        :type name: str
+        :return: loaded library
+        :rtype: api.featurization.libraries.registry.FeaturesExtractionLibrary
+        """
+        if name not in self.libraries:
+            raise FeaturesExtractionLibraryNotFoundException(f"Unknown features extraction library: {name}")
+
+        # Inject and load the library (once; the concurrent requests of the library wait for it)
+        with self._locks[name]:
+            library = self._injected.get(name)
+            if library is None:
+                library = self.loader(name, self.libraries[name])
+                with self._lock:
+                    self._injected[name] = library
+            library.users += 1
+            library.last_used = time.monotonic()
+            try:
+                if not library.loaded:
+                    library.load()
+            except Exception:
+                library.users -= 1
+                raise
+
+        # Unload the least recently used idle libraries (over the limits)
+        self.evict()
+
+        # Return the library
+        return library
+
+    def release(self, library):
+        """
+        Releases the acquired library, and unloads the least recently used idle libraries.
+
+        :param library: acquired library
+        :type library: api.featurization.libraries.registry.FeaturesExtractionLibrary
+        :return: None
+        :rtype: None type
+        """
+        with self._locks[library.name]:
+            library.users = max(library.users - 1, 0)
+            library.last_used = time.monotonic()
+        self.evict()
+
+    def evict(self):
+        """
+        Unloads the least recently used idle libraries while the limits are exceeded.
+
+        The libraries in use (acquired and not released yet) are not unloaded,
+        so the limits can be exceeded until they are released.
+
+        :return: names of the unloaded libraries
+        :rtype: list of str
+        """
+        if not self.max_loaded and not self.memory_budget_in_bytes:
+            return []
+
+        # Get the loaded libraries (the least recently used first) and the memory they hold
+        with self._lock:
+            loaded = sorted(
+                (library for library in self._injected.values() if library.loaded),
+                key=lambda library: library.last_used)
+        memory = {library.name: library.memory_usage for library in loaded} if self.memory_budget_in_bytes else {}
+
+        # Unload the libraries while the limits are exceeded
+        evicted = []
+        for library in loaded:
+            over_count = self.max_loaded and len(loaded) - len(evicted) > self.max_loaded
+            over_memory = self.memory_budget_in_bytes and sum(memory.values()) > self.memory_budget_in_bytes
+            if not over_count and not over_memory:
+                break
+            with self._locks[library.name]:
+                if not library.loaded or library.users > 0:
+                    continue
+                library.unload()
+                self.evictions += 1
+            memory.pop(library.name, None)
+            evicted.append(library.name)
+
+        # Return the names of the unloaded libraries
+        return evicted
+
+    def shutdown(self):
+        """Unloads all libraries (in the current process)"""
+        with self._lock:
+            injected = list(self._injected.values())
+        for library in injected:
+            library.unload()
@@ -2,7 +2,8 @@ from api.common.logging import get_application_logger
 from api.featurization.library_injection.validation import (
     validate_features_library,
     get_validated_features_extractor,
-    get_validated_features_extractor_exceptions
+    get_validated_features_extractor_exceptions,
+    get_validated_features_extraction_library_version
 )
 
 
@@ -26,3 +27,47 @@ def inject_features_extractor(features_extractor_library_name):
 def inject_features_extractor_exceptions(features_extractor_library_name):
     """Injects the feature extractor exceptions from the external library"""
     return get_validated_features_extractor_exceptions(features_extractor_library_name)
+
+
+def inject_features_extraction_library_version(features_extractor_library_name):
+    """Injects the feature extraction library version from the external library"""
+    return get_validated_features_extraction_library_version(features_extractor_library_name)
+
+
+def inject_features_extraction_library(features_extractor_library_name, manifest=None):
+    """
+    Injects the feature extractor, its exceptions and the library version from the external library.
+
+    If the injection manifest is set and it matches the installed library, the
+    injection is resolved from the manifest (the import validation and the
+    discovery of the exceptions are skipped). Otherwise, the library is
+    validated and injected, and the manifest is (re-)written.
+
+    :param features_extractor_library_name: import name of the features extraction library
+    :type features_extractor_library_name: str
+    :param manifest: injection manifest, defaults to None
+    :type manifest: api.featurization.library_injection.manifest.FeaturesExtractionInjectionManifest, optional
+    :return: injected features extractor, exceptions and version
+    :rtype: dict
+    """
+
+    # Resolve the injection from the manifest
+    if manifest:
+        injected = manifest.load(features_extractor_library_name)
+        if injected:
+            return injected
+
+    # Validate and inject the library
+    validate_features_library(features_extractor_library_name)
+    injected = {
+        "extractor": inject_features_extractor(features_extractor_library_name),
+        "exceptions": inject_features_extractor_exceptions(features_extractor_library_name),
+        "version": inject_features_extraction_library_version(features_extractor_library_name)
+    }
+
+    # Write the manifest
+    if manifest:
+        manifest.save(features_extractor_library_name, **injected)
+
+    # Return the injected features extractor, exceptions and version
+    return injected
@@ -1,4 +1,5 @@
 import importlib
+import importlib.metadata
 
 
 # --------------------------------------------------------------------- #
@@ -67,3 +68,18 @@ def import_features_extractor_exceptions(library_name):
 
     except AttributeError:
         return []
+
+
+def import_features_extraction_library_version(library_name):
+    """Returns the version of the features extraction library (empty if unknown)"""
+
+    # Get the version from the library module
+    version = getattr(importlib.import_module(library_name), "__version__", None)
+    if version:
+        return str(version)
+
+    # Get the version from the installed distribution metadata
+    try:
+        return importlib.metadata.version(library_name)
+    except importlib.metadata.PackageNotFoundError:
+        return ""
@@ -0,0 +1,191 @@
+import os
+import re
+import sys
+import json
+import uuid
+import importlib
+import importlib.util
+import importlib.metadata
+from pathlib import Path
+
+
+# ------------------------------------------------------------------ #
+# Features extraction library injection manifest routines definition #
+# ------------------------------------------------------------------ #
+
+def get_distribution_name(installation_name):
+    """Returns the distribution name of the installation name (without the version specifiers and extras)"""
+    return re.split(r"[<>=!~;@\[\s]", str(installation_name or "").strip(), maxsplit=1)[0]
+
+
+def get_distribution_version(installation_name):
+    """Returns the version of the installed distribution (None if it is not installed; the library is not imported)"""
+    name = get_distribution_name(installation_name)
+    if not name:
+        return None
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def get_library_fingerprint(library_name, installation_name=None):
+    """
+    Returns the fingerprint of the installed features extraction library (the library is not imported).
+
+    :param library_name: import name of the features extraction library
+    :type library_name: str
+    :param installation_name: installation (distribution) name of the library, defaults to None (import name)
+    :type installation_name: str, optional
+    :return: fingerprint (library, distribution version, origin and its modification time, Python version)
+    :rtype: dict or None type (if the library is not found)
+    """
+
+    # Find the library (without importing it)
+    try:
+        spec = importlib.util.find_spec(library_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+
+    # Get the origin of the library (the package __init__ or the module file)
+    origin = spec.origin if spec.origin and os.path.isfile(spec.origin) else None
+
+    # Return the fingerprint
+    return {
+        "library": library_name,
+        "version": get_distribution_version(installation_name or library_name),
+        "origin": origin,
+        "modified_at": os.stat(origin).st_mtime if origin else None,
+        "python": ".".join(str(part) for part in sys.version_info[:3])
+    }
+
+
+def get_reference(obj):
+    """Returns the import reference of the class (<module>:<qualified name>)"""
+    return f"{obj.__module__}:{obj.__qualname__}"
+
+
+def resolve_reference(reference):
+    """Imports the class given its import reference (<module>:<qualified name>)"""
+    module, name = reference.split(":", 1)
+    obj = importlib.import_module(module)
+    for attribute in name.split("."):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+# --------------------------------------------------------------- #
+# Features extraction library injection manifest class definition #
+# --------------------------------------------------------------- #
+
+class FeaturesExtractionInjectionManifest(object):
+    """
+    Class implementing the manifest (cache) of the injected features extraction library.
+
+    The result of the injection (the version of the library, and the import
+    references of the features extractor and of its exceptions) is recorded
+    in the manifest file together with the fingerprint of the installed library
+    (the distribution version from ``importlib.metadata`` and the modification
+    time of the library origin, both obtained without importing the library).
+    On the next start, if the fingerprint matches, the injection is resolved
+    from the manifest (the pip installation check, the import validation and
+    the discovery of the exceptions are skipped). Otherwise, the library is
+    injected as usual and the manifest is re-written.
+    """
+
+    def __init__(self, path, installation_name=None):
+        """
+        Initializes the FeaturesExtractionInjectionManifest.
+
+        :param path: path of the manifest file
+        :type path: str
+        :param installation_name: installation (distribution) name of the library, defaults to None (import name)
+        :type installation_name: str, optional
+        """
+        self.path = path
+        self.installation_name = installation_name
+
+    def __repr__(self):
+        return str({"path": self.path, "installation_name": self.installation_name})
+
+    def __str__(self):
+        return repr(self)
+
+    def get_fingerprint(self, library_name):
+        """Returns the fingerprint of the installed library (see: get_library_fingerprint)"""
+        return get_library_fingerprint(library_name, self.installation_name)
+
+    def load(self, library_name):
+        """
+        Loads the injection from the manifest (if the fingerprint of the installed library matches).
+
+        :param library_name: import name of the features extraction library
+        :type library_name: str
+        :return: injected features extractor, exceptions and version (None if the manifest is not valid)
+        :rtype: dict or None type
+        """
+
+        # Read the manifest
+        try:
+            with open(self.path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Check the fingerprint of the installed library
+        fingerprint = self.get_fingerprint(library_name)
+        if not fingerprint or not isinstance(manifest, dict) or manifest.get("fingerprint") != fingerprint:
+            return None
+
+        # Resolve the injected features extractor and exceptions
+        try:
+            return {
+                "extractor": resolve_reference(manifest["extractor"]),
+                "exceptions": [resolve_reference(reference) for reference in manifest["exceptions"]],
+                "version": manifest.get("version", "")
+            }
+        except Exception:
+            return None
+
+    def save(self, library_name, extractor, exceptions, version=""):
+        """
+        Saves the injection to the manifest (with the fingerprint of the installed library).
+
+        :param library_name: import name of the features extraction library
+        :type library_name: str
+        :param extractor: injected features extractor
+        :type extractor: <injected>.interface.featurizer.FeatureExtractor
+        :param exceptions: injected features extractor exceptions
+        :type exceptions: list
+        :param version: version of the injected library, defaults to ""
+        :type version: str, optional
+        :return: True if the manifest was saved
+        :rtype: bool
+        """
+        fingerprint = self.get_fingerprint(library_name)
+        if not fingerprint:
+            return False
+
+        # Prepare the manifest
+        manifest = {
+            "fingerprint": fingerprint,
+            "extractor": get_reference(extractor),
+            "exceptions": [get_reference(exception) for exception in exceptions or []],
+            "version": version or ""
+        }
+
+        # Write the manifest (atomically; the manifest is optional, so the errors are ignored)
+        temporary = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        try:
+            Path(os.path.dirname(self.path)).mkdir(parents=True, exist_ok=True)
+            with open(temporary, "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(temporary, self.path)
+            return True
+        except OSError:
+            return False
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
@@ -18,3 +18,8 @@ def get_validated_features_extractor(features_extraction_library):
 def get_validated_features_extractor_exceptions(features_extraction_library):
     """Returns the injected features extractor exceptions"""
     return import_features_extractor_exceptions(features_extraction_library)
+
+
+def get_validated_features_extraction_library_version(features_extraction_library):
+    """Returns the injected features extraction library version"""
+    return import_features_extraction_library_version(features_extraction_library)
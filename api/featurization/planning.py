@@ -0,0 +1,84 @@
+import numpy
+from api.common.utilities import canonicalize
+
+
+# ------------------------------------------- #
+# Features pipeline planning class definition #
+# ------------------------------------------- #
+
+class FeaturesPipelinePlan(object):
+    """
+    Class implementing the extraction plan of the features pipeline.
+
+    The pipeline elements are canonicalized (the feature name and the args
+    with sorted keys), and the identical elements are collapsed, so each of
+    the unique elements is extracted only once (in the order of the first
+    occurrence). The features extracted by the unique elements are then fanned
+    out back to the requested columns (and labels) of the pipeline.
+    """
+
+    def __init__(self, pipeline):
+        """
+        Initializes the FeaturesPipelinePlan.
+
+        :param pipeline: pipeline with the feature names and kwargs (as requested)
+        :type pipeline: list
+        """
+
+        # Set the requested pipeline
+        self.pipeline = pipeline
+
+        # Collapse the identical elements (map each of the requested elements to its unique element)
+        self.elements, self.indices, unique = [], [], {}
+        for element in pipeline:
+            key = self.get_element_key(element)
+            if key not in unique:
+                unique[key] = len(self.elements)
+                self.elements.append(element)
+            self.indices.append(unique[key])
+
+    def __repr__(self):
+        return str({"requested": len(self.pipeline), "unique": len(self.elements)})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def has_duplicates(self):
+        """Checks if the pipeline contains the identical elements"""
+        return len(self.elements) < len(self.pipeline)
+
+    @staticmethod
+    def get_element_key(element):
+        """Returns the canonical key of the pipeline element (feature name and canonicalized args)"""
+        return canonicalize([element.get("name"), element.get("args") or {}])
+
+    def fan_out(self, extracted, widths=None):
+        """
+        Fans out the features extracted by the unique elements to the requested pipeline.
+
+        :param extracted: features and feature labels extracted by the unique elements
+        :type extracted: dict
+        :param widths: number of the feature columns of each of the unique elements, defaults to None (1 each)
+        :type widths: list, optional
+        :return: features and feature labels of the requested pipeline
+        :rtype: dict
+        """
+        if not self.has_duplicates:
+            return extracted
+
+        # Get the columns of the unique elements
+        widths = widths if widths is not None else [1] * len(self.elements)
+        offsets = numpy.concatenate([[0], numpy.cumsum(widths)]).astype(int)
+        columns = [range(offsets[index], offsets[index + 1]) for index in self.indices]
+
+        # Fan out the feature columns and labels
+        columns = [column for element_columns in columns for column in element_columns]
+        features = numpy.atleast_2d(extracted["features"])
+        labels = list(extracted["labels"])
+
+        # Return the features and feature labels of the requested pipeline
+        return {
+            "features": numpy.take(features, columns, axis=-1),
+            "labels": [labels[column] for column in columns]
+        }
@@ -0,0 +1,92 @@
+from flask import request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from werkzeug.exceptions import RequestEntityTooLarge
+from api.configuration import load_configuration
+from api.metrics import get_request_size
+from api.authentication.database.models import User
+
+
+# ----------------------------------------------- #
+# Default request ingestion attributes definition #
+# ----------------------------------------------- #
+DEFAULT_MAX_BODY_SIZE = 256 * 1024 * 1024
+
+
+# --------------------------------------------------- #
+# Request ingestion configuration routines definition #
+# --------------------------------------------------- #
+
+def configure_ingestion(app):
+    """
+    Configures the ingestion of the request bodies (the per-route and per-user limits of the body size).
+
+    The limit of the request is resolved before its body is read: the limit of
+    the user (if configured, it takes precedence), the limit of the route, or
+    the default limit. The requests declaring a larger body (``Content-Length``,
+    or the size of the encoded body) are rejected right away (HTTP 413), and
+    the limit is also enforced while the body is being read (the bodies of an
+    unknown size, e.g. chunked or decompressed ones).
+
+    :param app: application
+    :type app: flask.Flask
+    :return: None
+    :rtype: None type
+    """
+
+    # Load the request ingestion configuration
+    configuration = load_configuration("ingestion.json").get("ingestion", {})
+    if not configuration.get("enabled"):
+        return
+
+    # Get the limits (default, per-route and per-user)
+    default_limit = configuration.get("max_body_size_in_bytes") or DEFAULT_MAX_BODY_SIZE
+    route_limits = dict(configuration.get("routes") or {})
+    user_limits = dict(configuration.get("users") or {})
+
+    @app.before_request
+    def limit_request_body():
+        """Limits the size of the request body (before the body is read)"""
+        limit = get_body_limit(default_limit, route_limits, user_limits)
+
+        # Enforce the limit while the body is being read
+        request.max_content_length = limit
+
+        # Reject the request declaring a larger body
+        if get_request_size(request) > limit:
+            raise RequestEntityTooLarge(f"Request body exceeds {limit} bytes")
+
+
+def get_body_limit(default_limit, route_limits, user_limits):
+    """
+    Returns the limit of the size of the current request body.
+
+    :param default_limit: default limit in bytes
+    :type default_limit: int
+    :param route_limits: limits of the routes in bytes (route rule: limit)
+    :type route_limits: dict
+    :param user_limits: limits of the users in bytes (username: limit)
+    :type user_limits: dict
+    :return: limit in bytes
+    :rtype: int
+    """
+
+    # Get the limit of the user (the users are identified by the optional access token)
+    if user_limits:
+        username = get_request_username()
+        if username in user_limits:
+            return user_limits[username]
+
+    # Get the limit of the route
+    rule = request.url_rule.rule if request.url_rule is not None else None
+    return route_limits.get(rule, default_limit)
+
+
+def get_request_username():
+    """Returns the username of the user authorized by the access token of the request (None if not authorized)"""
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        return None
+    user = User.get_by_identifier(int(identity)) if identity is not None and str(identity).isdigit() else None
+    return user.username if user is not None else None
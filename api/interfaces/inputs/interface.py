@@ -1,4 +1,10 @@
-from api.interfaces.inputs.schema import SampleSchema, FeaturesPipelineSchema, FeaturesExtractorConfigurationSchema
+from api.interfaces.inputs.schema import (
+    SampleSchema,
+    DatasetSchema,
+    FeaturesPipelineSchema,
+    FeaturesExtractorConfigurationSchema,
+    FeaturesOutputConfigurationSchema
+)
 
 
 # --------------------------------- #
@@ -35,6 +41,48 @@ class Sample(object):
         return cls(**cls.schema.load(request))
 
 
+# ----------------------------------------------------- #
+# Input dataset (server-side .npy) interface definition #
+# ----------------------------------------------------- #
+
+class Dataset(object):
+    """Class implementing the input dataset interface (server-side .npy file)"""
+
+    # Define the schema
+    schema = DatasetSchema()
+
+    def __init__(self, path, output=None, labels=None, dtype=None):
+        """Initializes the Dataset"""
+        self.path = path
+        self.output = output
+        self.labels = labels if labels else []
+        self.dtype = dtype
+
+    def __repr__(self):
+        return str({"path": self.path, "output": self.output, "labels": self.labels, "dtype": self.dtype})
+
+    def __str__(self):
+        return repr(self)
+
+    @staticmethod
+    def is_requested(request):
+        """Checks if the request references the dataset (``samples.dataset``)"""
+        samples = request.get("samples") if isinstance(request, dict) else None
+        return isinstance(samples, dict) and samples.get("dataset") is not None
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Creates the Dataset instance utilizing the schema.
+
+        :param request: dict with the dataset path (and output path), and the sample labels
+        :type request: dict
+        :return: class instance
+        :rtype: api.interfaces.inputs.Dataset
+        """
+        return cls(**cls.schema.load(request))
+
+
 # ----------------------------------------------------------- #
 # Input features extractor configuration interface definition #
 # ----------------------------------------------------------- #
@@ -68,6 +116,39 @@ class FeaturesExtractorConfiguration(object):
         return cls(**cls.schema.load(request))
 
 
+# -------------------------------------------------------- #
+# Input features output configuration interface definition #
+# -------------------------------------------------------- #
+
+class FeaturesOutputConfiguration(object):
+    """Class implementing the input features output configuration interface"""
+
+    # Define the schema
+    schema = FeaturesOutputConfigurationSchema()
+
+    def __init__(self, output_configuration):
+        """Initializes the FeaturesOutputConfiguration"""
+        self.output_configuration = output_configuration if output_configuration else {}
+
+    def __repr__(self):
+        return str({"configuration": self.output_configuration})
+
+    def __str__(self):
+        return repr(self)
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Creates the FeaturesOutputConfiguration instance.
+
+        :param request: dict with the features output configuration (dtype, encoding)
+        :type request: dict or str
+        :return: class instance
+        :rtype: api.interfaces.inputs.FeaturesOutputConfiguration
+        """
+        return cls(**cls.schema.load(request))
+
+
 # -------------------------------------------- #
 # Input features pipeline interface definition #
 # -------------------------------------------- #
@@ -0,0 +1,159 @@
+import numpy
+
+
+# ------------------------------------------ #
+# Ragged sample values exceptions definition #
+# ------------------------------------------ #
+class RaggedArrayNotValidException(Exception): pass
+
+
+# ------------------------------------- #
+# Ragged sample values class definition #
+# ------------------------------------- #
+
+class RaggedArray(object):
+    """
+    Class implementing the ragged (variable-length) sample values in the packed representation.
+
+    The values of all subjects are concatenated along their last dimension
+    (the samples) into one flat buffer, and the samples of the subject ``i``
+    are ``buffer[..., offsets[i]:offsets[i + 1]]`` (the offsets start at 0 and
+    end at the length of the last dimension of the buffer). The subjects are
+    the views on the buffer (neither padded nor copied), and so are the slices
+    of subjects; only the selections of subjects (lists of indices) copy their
+    samples.
+
+    The array mimics the subject axis of the rectangular values: ``len``,
+    iteration over the subjects, indexing and slicing of the subjects, and the
+    ``shape`` with ``None`` in place of the variable-length dimension (e.g.
+    ``(10, 2, None)`` for 10 subjects of ``(2, N_i)`` values).
+    """
+
+    def __init__(self, values, offsets):
+        """
+        Initializes the RaggedArray.
+
+        :param values: flat buffer (values of all subjects concatenated along the last dimension)
+        :type values: numpy.ndarray
+        :param offsets: offsets of the subjects in the buffer (subjects + 1 non-decreasing integers from 0)
+        :type offsets: numpy.ndarray or list
+        """
+        self.values = values
+        self.offsets = numpy.asarray(offsets, dtype=numpy.int64)
+
+        # Validate the offsets
+        if not isinstance(values, numpy.ndarray) or values.ndim < 1:
+            raise RaggedArrayNotValidException("Not a valid numpy.array (at least 1-D flat values)")
+        if self.offsets.ndim != 1 or self.offsets.size < 1:
+            raise RaggedArrayNotValidException("Not a valid 1-D array of the offsets")
+        if self.offsets[0] != 0 or self.offsets[-1] != values.shape[-1]:
+            raise RaggedArrayNotValidException(
+                f"Not valid offsets (must start at 0 and end at the length of the values: {values.shape[-1]})")
+        if numpy.any(numpy.diff(self.offsets) < 0):
+            raise RaggedArrayNotValidException("Not valid offsets (must be non-decreasing)")
+
+    def __repr__(self):
+        return str({"shape": self.shape, "dtype": self.dtype.str, "lengths": self.lengths.tolist()})
+
+    def __str__(self):
+        return repr(self)
+
+    def __len__(self):
+        return self.offsets.size - 1
+
+    def __iter__(self):
+        for start, stop in zip(self.offsets[:-1], self.offsets[1:]):
+            yield self.values[..., start:stop]
+
+    def __getitem__(self, index):
+        """
+        Gets the subject (view on its values), or the slice or the selection of subjects (ragged array).
+
+        :param index: index, slice or the list of indices of the subjects
+        :type index: int or slice or list or numpy.ndarray
+        :return: values of the subject, or the ragged array of the subjects
+        :rtype: numpy.ndarray or api.interfaces.inputs.ragged.RaggedArray
+        """
+
+        # Get the subject (view on its values)
+        if isinstance(index, (int, numpy.integer)):
+            index = range(len(self))[index]
+            return self.values[..., self.offsets[index]:self.offsets[index + 1]]
+
+        # Get the slice of subjects (view on their values)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                stop = max(start, stop)
+                offsets = self.offsets[start:stop + 1]
+                return RaggedArray(self.values[..., offsets[0]:offsets[-1]], offsets - offsets[0])
+            index = range(start, stop, step)
+
+        # Get the selection of subjects (their values are copied)
+        subjects = [self[int(i)] for i in index]
+        return RaggedArray.from_subjects(subjects, self.values)
+
+    @property
+    def shape(self):
+        """Returns the shape of the values (subjects, ..., None in place of the variable-length dimension)"""
+        return (len(self), *self.values.shape[:-1], None)
+
+    @property
+    def ndim(self):
+        """Returns the number of the dimensions (subject dimension included)"""
+        return self.values.ndim + 1
+
+    @property
+    def dtype(self):
+        """Returns the data type of the values"""
+        return self.values.dtype
+
+    @property
+    def size(self):
+        """Returns the number of the values (of all subjects)"""
+        return self.values.size
+
+    @property
+    def nbytes(self):
+        """Returns the size of the values in bytes (of all subjects)"""
+        return self.values.nbytes
+
+    @property
+    def lengths(self):
+        """Returns the lengths of the subjects (the sizes of their variable-length dimension)"""
+        return numpy.diff(self.offsets)
+
+    def astype(self, dtype, copy=True):
+        """Returns the ragged array with the values cast to the data type"""
+        return RaggedArray(self.values.astype(dtype, copy=copy), self.offsets)
+
+    @classmethod
+    def from_subjects(cls, subjects, like=None):
+        """
+        Creates the ragged array from the values of the subjects (the values are copied into the flat buffer).
+
+        :param subjects: values of the subjects (the same dimensions except the last one)
+        :type subjects: list of numpy.ndarray
+        :param like: array the empty flat buffer is shaped like (if there are no subjects), defaults to None
+        :type like: numpy.ndarray, optional
+        :return: ragged array
+        :rtype: api.interfaces.inputs.ragged.RaggedArray
+        """
+        offsets = numpy.concatenate([[0], numpy.cumsum([subject.shape[-1] for subject in subjects], dtype=numpy.int64)])
+        if subjects:
+            return cls(numpy.concatenate(subjects, axis=-1), offsets)
+        return cls(numpy.empty((*like.shape[:-1], 0), dtype=like.dtype) if like is not None else numpy.empty(0), offsets)
+
+    @classmethod
+    def concatenate(cls, arrays):
+        """
+        Concatenates the ragged arrays along the subject axis.
+
+        :param arrays: ragged arrays (the same dimensions of the values except the last one)
+        :type arrays: list of api.interfaces.inputs.ragged.RaggedArray
+        :return: ragged array
+        :rtype: api.interfaces.inputs.ragged.RaggedArray
+        """
+        starts = numpy.cumsum([0] + [array.offsets[-1] for array in arrays[:-1]], dtype=numpy.int64)
+        offsets = [arrays[0].offsets[:1]] + [array.offsets[1:] + start for array, start in zip(arrays, starts)]
+        return cls(numpy.concatenate([array.values for array in arrays], axis=-1), numpy.concatenate(offsets))
@@ -1,5 +1,5 @@
 import marshmallow
-from api.interfaces.inputs.utilities import SamplesValuesValidator, SamplesLabelsValidator
+from api.interfaces.inputs.utilities import SamplesValuesValidator, SamplesOffsetsValidator, SamplesLabelsValidator
 from api.wrappers.data import *
 
 
@@ -15,8 +15,15 @@ class SampleSchema(marshmallow.Schema):
         unknown = marshmallow.EXCLUDE
 
     # Define the schema attributes
-    values = marshmallow.fields.Str(required=True)
+    #
+    #  1. values: JSON-string (json-tricks) or numpy.ndarray (binary transport)
+    #  2. offsets: offsets of the subjects in the flat values of the ragged samples (optional)
+    #  3. labels: list of the sample labels
+    #  4. dtype: data type the values are cast to before the extraction (optional)
+    values = marshmallow.fields.Raw(required=True)
+    offsets = marshmallow.fields.Raw(missing=None)
     labels = marshmallow.fields.List(marshmallow.fields.String, missing=[])
+    dtype = marshmallow.fields.Str(missing=None, validate=marshmallow.validate.OneOf(DATA_DTYPES))
 
     @marshmallow.pre_load
     def _pre_load(self, data, **kwargs):
@@ -37,16 +44,63 @@ class SampleSchema(marshmallow.Schema):
 
         # Get the attributes
         values = DataWrapper.unwrap_data(data["values"])
+        offsets = DataWrapper.unwrap_data(data["offsets"])
         labels = data["labels"] or []
 
-        # Handle the sample values/labels
-        values = SamplesValuesValidator.validate(values)
+        # Handle the sample values/offsets/labels (the offsets pack the flat values into the ragged samples)
+        values = SamplesValuesValidator.validate(values, data.get("dtype"), ragged=offsets is not None)
+        if offsets is not None:
+            values = SamplesOffsetsValidator.validate(offsets, values)
         labels = SamplesLabelsValidator.validate(labels, values)
 
         # Return the output data
         return {"values": values, "labels": labels}
 
 
+# ------------------------------------------------------------ #
+# Input dataset (server-side .npy) interface schema definition #
+# ------------------------------------------------------------ #
+
+class DatasetSchema(marshmallow.Schema):
+    """Class defining the schema for the dataset input interface (server-side .npy file)"""
+
+    # Define the meta attributes
+    class Meta:
+        unknown = marshmallow.EXCLUDE
+
+    # Define the schema attributes
+    #
+    #  1. path: path of the .npy dataset (relative to the data root)
+    #  2. output: path of the .npy features output (relative to the output root; optional)
+    #  3. labels: list of the sample labels
+    #  4. dtype: data type the values are cast to before the extraction (optional)
+    path = marshmallow.fields.Str(required=True)
+    output = marshmallow.fields.Str(missing=None)
+    labels = marshmallow.fields.List(marshmallow.fields.String, missing=[])
+    dtype = marshmallow.fields.Str(missing=None, validate=marshmallow.validate.OneOf(DATA_DTYPES))
+
+    @marshmallow.pre_load
+    def _pre_load(self, data, **kwargs):
+        """Handles the pre-loading data preparation and validation"""
+
+        # Handle the sample field
+        if not isinstance(data.get("samples"), dict):
+            raise marshmallow.ValidationError("Not a valid dict.", "samples")
+
+        # Handle the dataset field
+        if not isinstance(data["samples"].get("dataset"), dict):
+            raise marshmallow.ValidationError("Not a valid dict.", "samples.dataset")
+        if data["samples"].get("values") is not None:
+            raise marshmallow.ValidationError("Only one of the values and the dataset can be set.", "samples.dataset")
+
+        # Return the output data
+        return {
+            **data["samples"]["dataset"],
+            "labels": data["samples"].get("labels") or [],
+            "dtype": data["samples"].get("dtype")
+        }
+
+
 # ------------------------------------------------- #
 # Feature extractor configuration schema definition #
 # ------------------------------------------------- #
@@ -62,6 +116,43 @@ class FeaturesExtractorConfigurationSchema(marshmallow.Schema):
     extractor_configuration = marshmallow.fields.Dict(missing={})
 
 
+# ----------------------------------------------- #
+# Features output configuration schema definition #
+# ----------------------------------------------- #
+
+class FeaturesOutputSchema(marshmallow.Schema):
+    """Class defining the schema for the features output (data type and encoding of the values)"""
+
+    # Define the meta attributes
+    class Meta:
+        unknown = marshmallow.EXCLUDE
+
+    # Define the schema attributes
+    #
+    #  1. dtype: data type the feature values are cast to (optional)
+    #  2. encoding: encoding of the JSON-serialized feature values (nested lists or base64 raw buffer)
+    dtype = marshmallow.fields.Str(missing=None, validate=marshmallow.validate.OneOf(DATA_DTYPES))
+    encoding = marshmallow.fields.Str(missing=DATA_ENCODING_LIST, validate=marshmallow.validate.OneOf(DATA_ENCODINGS))
+
+
+class FeaturesOutputConfigurationSchema(marshmallow.Schema):
+    """Class defining the schema for the features output configuration"""
+
+    # Define the meta attributes
+    class Meta:
+        unknown = marshmallow.EXCLUDE
+
+    # Define the schema attributes
+    output_configuration = marshmallow.fields.Nested(FeaturesOutputSchema, missing=None)
+
+    @marshmallow.post_load
+    def _post_load(self, data, **kwargs):
+        """Handles the post-loading data preparation (defaults of the missing output configuration)"""
+        if not data.get("output_configuration"):
+            data["output_configuration"] = FeaturesOutputSchema().load({})
+        return data
+
+
 # --------------------------------------------------- #
 # Input features pipeline interface schema definition #
 # --------------------------------------------------- #
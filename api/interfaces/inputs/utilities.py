@@ -1,17 +1,22 @@
 import numpy
 import marshmallow
+from api.interfaces.inputs.ragged import RaggedArray, RaggedArrayNotValidException
 
 
 class SamplesValuesValidator(object):
     """Class implementing validator for the sample values"""
 
     @classmethod
-    def validate(cls, values):
+    def validate(cls, values, dtype=None, ragged=False):
         """
         Validates the sample values.
 
         :param values: values to be validated
         :type values: Any
+        :param dtype: data type the values are cast to, defaults to None (no casting)
+        :type dtype: str, optional
+        :param ragged: the values are the flat values of the ragged samples, defaults to False
+        :type ragged: bool, optional
         :return: validated values
         :rtype: Any
         """
@@ -24,13 +29,50 @@ class SamplesValuesValidator(object):
         if values.size == 0:
             raise marshmallow.ValidationError(f"Empty numpy.array.", "samples.values")
 
-        # Ensure the subjects-dimension for a rank-one array
-        values = numpy.atleast_2d(values)
+        # Ensure the subjects-dimension for a rank-one array (the flat values of the ragged samples are kept)
+        if not ragged:
+            values = numpy.atleast_2d(values)
+
+        # Cast the sample values (e.g. to run the extraction in float32)
+        if dtype:
+            if not numpy.issubdtype(values.dtype, numpy.number):
+                raise marshmallow.ValidationError(f"Not a valid numeric numpy.array (cast to {dtype}).", "samples.values")
+            values = values.astype(dtype, copy=False)
 
         # Return the validated sample values
         return values
 
 
+class SamplesOffsetsValidator(object):
+    """Class implementing validator for the sample offsets (ragged samples)"""
+
+    @classmethod
+    def validate(cls, offsets, values):
+        """
+        Validates the sample offsets and packs the flat values into the ragged samples.
+
+        :param offsets: offsets to be validated (subjects + 1 non-decreasing integers from 0 to the values length)
+        :type offsets: Any
+        :param values: flat values to be referenced
+        :type values: numpy.ndarray
+        :return: ragged sample values
+        :rtype: api.interfaces.inputs.ragged.RaggedArray
+        """
+
+        # Validate the sample offsets
+        offsets = numpy.asarray(offsets) if isinstance(offsets, (tuple, list, numpy.ndarray)) else None
+        if offsets is None or offsets.ndim != 1 or not numpy.issubdtype(offsets.dtype, numpy.integer):
+            raise marshmallow.ValidationError(f"Not a valid 1-D list of integers.", "samples.offsets")
+        if numpy.any(numpy.diff(offsets) < 0):
+            raise marshmallow.ValidationError(f"Not valid offsets (must be non-decreasing).", "samples.offsets")
+
+        # Pack the flat values into the ragged samples
+        try:
+            return RaggedArray(values, offsets)
+        except RaggedArrayNotValidException as e:
+            raise marshmallow.ValidationError(str(e), "samples.offsets")
+
+
 class SamplesLabelsValidator(object):
     """Class implementing validator for the sample labels"""
 
@@ -39,6 +81,10 @@ class SamplesLabelsValidator(object):
         """
         Validates the sample labels.
 
+        The labels of the ragged sample values are not checked against the
+        last dimension (its length varies per subject); they are passed to the
+        extractor of each of the subjects as they are.
+
         :param labels: labels to be validated
         :type labels: Any
         :param values: values to be referenced
@@ -51,7 +97,7 @@ class SamplesLabelsValidator(object):
         if labels:
             if not isinstance(labels, (tuple, list)):
                 raise marshmallow.ValidationError(f"Not a valid (tuple, list).", "samples.labels")
-            if not (len(labels) == values.shape[-1]):
+            if not isinstance(values, RaggedArray) and not (len(labels) == values.shape[-1]):
                 raise marshmallow.ValidationError(
                     f"Not a valid shape (must match the values). The API expects the same number of labels "
                     f"as the shape of the last dimension of the samples (for more information, check the "
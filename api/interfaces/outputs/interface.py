@@ -1,4 +1,6 @@
-from api.interfaces.outputs.schema import FeaturesSchema
+from api.interfaces.outputs.schema import FeaturesSchema, BinaryFeaturesSchema
+from api.interfaces.outputs.utilities import FeatureValuesValidator, FeatureLabelsValidator
+from api.wrappers.data import DATA_ENCODING_LIST
 
 
 # ------------------------------------ #
@@ -8,13 +10,60 @@ from api.interfaces.outputs.schema import FeaturesSchema
 class Features(object):
     """Class implementing the output features interface"""
 
-    # Define the schema
+    # Define the schemas
     schema = FeaturesSchema()
+    binary_schema = BinaryFeaturesSchema()
 
-    def __init__(self, features):
-        """Initializes the Features"""
+    def __init__(self, features, dtype=None, encoding=DATA_ENCODING_LIST):
+        """
+        Initializes the Features.
+
+        :param features: extracted feature values and labels
+        :type features: dict
+        :param dtype: data type the feature values are cast to, defaults to None (no casting)
+        :type dtype: str, optional
+        :param encoding: encoding of the JSON-serialized feature values (list, base64), defaults to "list"
+        :type encoding: str, optional
+        """
         self.features = features
+        self.dtype = dtype
+        self.encoding = encoding or DATA_ENCODING_LIST
 
     def to_response(self):
         """Dumps the features to the data to be used in the response"""
         return {"features": self.schema.dump(self)}
+
+    def to_binary_response(self):
+        """Dumps the features to the data to be used in the binary response"""
+        return {"features": self.binary_schema.dump(self)}
+
+    def to_stream_records(self, start=0):
+        """
+        Dumps the features to the per-subject records to be used in the streaming response.
+
+        :param start: index of the first subject, defaults to 0
+        :type start: int, optional
+        :return: per-subject records (index, values)
+        :rtype: list of dict
+        """
+
+        # Validate the feature values
+        values = FeatureValuesValidator.validate(self.features.get("values"), self.dtype)
+
+        # Return the per-subject records
+        return [{"index": start + index, "values": subject.tolist()} for index, subject in enumerate(values)]
+
+    def to_stream_trailer(self, errors=None):
+        """
+        Dumps the feature labels to the trailer to be used in the streaming response.
+
+        :param errors: errors of the timed-out features (of all streamed chunks), defaults to None
+        :type errors: list, optional
+        :return: trailer (labels, and the errors if there are any)
+        :rtype: dict
+        """
+        values = FeatureValuesValidator.validate(self.features.get("values"))
+        trailer = {"labels": FeatureLabelsValidator.validate(self.features.get("labels"), values)}
+        if errors:
+            trailer["errors"] = errors
+        return trailer
@@ -18,6 +18,10 @@ class FeaturesSchema(marshmallow.Schema):
     # Define the schema attributes
     values = marshmallow.fields.Str(required=True)
     labels = marshmallow.fields.List(marshmallow.fields.String, missing=[])
+    errors = marshmallow.fields.List(marshmallow.fields.Dict())
+
+    # Define the wrapping of the values (serialization to JSON-string)
+    wrap_values = True
 
     @marshmallow.pre_dump
     def _pre_dump(self, instance, **kwargs):
@@ -32,8 +36,19 @@ class FeaturesSchema(marshmallow.Schema):
         labels = instance.features["labels"]
 
         # Handle the feature values/labels
-        instance.features["values"] = DataWrapper.wrap_data(FeatureValuesValidator.validate(values))
+        values = FeatureValuesValidator.validate(values, instance.dtype)
+        instance.features["values"] = DataWrapper.wrap_data(values, instance.encoding) if self.wrap_values else values
         instance.features["labels"] = FeatureLabelsValidator.validate(labels, values)
 
         # Return the output data
         return instance.features
+
+
+class BinaryFeaturesSchema(FeaturesSchema):
+    """Class defining the schema for the features input interface (binary transport)"""
+
+    # Define the schema attributes
+    values = marshmallow.fields.Raw(required=True)
+
+    # Define the wrapping of the values (values are kept as numpy.ndarray)
+    wrap_values = False
@@ -6,12 +6,14 @@ class FeatureValuesValidator(object):
     """Class implementing validator for the feature values"""
 
     @classmethod
-    def validate(cls, values):
+    def validate(cls, values, dtype=None):
         """
         Validates the feature values.
 
         :param values: values to be validated
         :type values: Any
+        :param dtype: data type the values are cast to, defaults to None (no casting)
+        :type dtype: str, optional
         :return: validated values
         :rtype: Any
         """
@@ -25,6 +27,12 @@ class FeatureValuesValidator(object):
         # Ensure the subjects-dimension for a rank-one array
         values = numpy.atleast_2d(values)
 
+        # Cast the feature values (e.g. to halve the size of the response)
+        if dtype:
+            if not numpy.issubdtype(values.dtype, numpy.number):
+                raise marshmallow.ValidationError(f"Not a valid numeric numpy.array (cast to {dtype}).", "features.values")
+            values = values.astype(dtype, copy=False)
+
         # Return the validated feature values
         return values
 
@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+from api.configuration import load_configuration, application_path
+from api.jobs.store import JobStore
+from api.jobs.workers import JobsWorkerPool, DEFAULT_JOBS_STOP_TIMEOUT_IN_SECONDS
+
+
+# ------------------------------------------------ #
+# Default featurization jobs attributes definition #
+# ------------------------------------------------ #
+DEFAULT_JOBS_DATABASE = "api/jobs/database/jobs.db"
+
+
+# ---------------------------------------------------- #
+# Featurization jobs configuration routines definition #
+# ---------------------------------------------------- #
+
+def configure_jobs(extractor, pool=None, cache=None, supervisor=None):
+    """
+    Configures the asynchronous featurization jobs.
+
+    :param extractor: feature extractor interface class
+    :type extractor: <injected>.interface.featurizer.FeatureExtractor
+    :param pool: features extraction pool (parallel execution), defaults to None
+    :type pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+    :param cache: features results cache (per-subject, per-feature), defaults to None
+    :type cache: api.caching.results.FeaturesResultCache, optional
+    :param supervisor: features extraction supervisor (time budgets of the features), defaults to None
+    :type supervisor: api.featurization.execution.supervisor.FeaturesExtractionSupervisor, optional
+    :return: featurization jobs worker pool
+    :rtype: api.jobs.workers.JobsWorkerPool
+    """
+
+    # Load the configuration
+    configuration = load_configuration("jobs.json").get("jobs", {})
+
+    # Prepare the database path and make sure the database directory exists
+    path = os.path.join(application_path, "..", configuration.get("database") or DEFAULT_JOBS_DATABASE)
+    Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+
+    # Prepare the jobs store
+    store = JobStore(
+        path,
+        max_pending_jobs=configuration.get("max_pending_jobs"),
+        stale_after=configuration.get("stale_after_in_seconds"),
+        expiration_time=configuration.get("expiration_time_in_seconds"))
+
+    # Prepare the jobs worker pool (the worker threads are started by the application, see: api.start_workers)
+    return JobsWorkerPool(
+        store,
+        extractor,
+        workers=configuration.get("workers"),
+        chunk_size=configuration.get("chunk_size"),
+        polling_interval=configuration.get("polling_interval_in_seconds", 1.0),
+        pool=pool,
+        cache=cache,
+        supervisor=supervisor,
+        stop_timeout=configuration.get("stop_timeout_in_seconds", DEFAULT_JOBS_STOP_TIMEOUT_IN_SECONDS))
@@ -0,0 +1,300 @@
+import os
+import time
+import socket
+import sqlite3
+import threading
+from api.common.identifiers import get_identifier
+
+
+# ------------------------------------ #
+# Featurization jobs states definition #
+# ------------------------------------ #
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# Pending (not finished) jobs
+JOB_PENDING_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+
+# ---------------------------------------- #
+# Featurization jobs exceptions definition #
+# ---------------------------------------- #
+class JobsQueueFullException(Exception): pass
+
+
+# ----------------------------------------- #
+# Featurization jobs store class definition #
+# ----------------------------------------- #
+
+class JobStore(object):
+    """
+    Class implementing the persistent, bounded store (queue) of the featurization jobs.
+
+    The jobs are stored in the local SQLite database (no external broker is
+    needed). The store is shared by the worker threads (and processes): a
+    job is claimed atomically, so it is executed by exactly one worker. The
+    accepted jobs survive the restarts: the running jobs of the workers that
+    are gone (or that have not reported any progress for a while) are queued
+    again.
+    """
+
+    # Define the schema
+    schema = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            owner TEXT,
+            status TEXT NOT NULL,
+            claimed_by TEXT,
+            created_on REAL NOT NULL,
+            updated_on REAL NOT NULL,
+            subjects_done INTEGER NOT NULL DEFAULT 0,
+            subjects_total INTEGER NOT NULL DEFAULT 0,
+            request BLOB,
+            result BLOB,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_status_created_on ON jobs (status, created_on);
+    """
+
+    # Define the job fields (without the request and result blobs)
+    fields = ("id", "owner", "status", "created_on", "updated_on", "subjects_done", "subjects_total", "error")
+
+    def __init__(self, path, max_pending_jobs=None, stale_after=None, expiration_time=None):
+        """
+        Initializes the JobStore.
+
+        :param path: path to the SQLite database file
+        :type path: str
+        :param max_pending_jobs: maximum number of the queued/running jobs, defaults to None (unbounded)
+        :type max_pending_jobs: int, optional
+        :param stale_after: seconds after which a running job without progress is queued again, defaults to None
+        :type stale_after: float, optional
+        :param expiration_time: seconds after which the finished jobs are removed, defaults to None
+        :type expiration_time: float, optional
+        """
+
+        # Set the database path
+        self.path = path
+
+        # Set the store configuration
+        self.max_pending_jobs = max_pending_jobs
+        self.stale_after = stale_after
+        self.expiration_time = expiration_time
+
+        # Set the connections (one per thread)
+        self._local = threading.local()
+
+        # Create the tables if needed
+        with self.connection as connection:
+            connection.executescript(self.schema)
+
+    def __repr__(self):
+        return str({"path": self.path, "max_pending_jobs": self.max_pending_jobs})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def connection(self):
+        """Returns the database connection of the current thread (and process)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def get_worker_identifier():
+        """Returns the identifier of the current worker process"""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def submit(self, owner, request, subjects):
+        """
+        Submits (queues) a new job.
+
+        :param owner: identifier of the user submitting the job
+        :type owner: str
+        :param request: wrapped (.npz) validated request
+        :type request: bytes
+        :param subjects: number of subjects to be featurized
+        :type subjects: int
+        :return: job
+        :rtype: dict
+        """
+        identifier, now = get_identifier(), time.time()
+
+        # Queue the job (if the queue is not full)
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self.max_pending_jobs:
+                pending = connection.execute(
+                    f"SELECT COUNT(*) FROM jobs WHERE status IN ({', '.join('?' * len(JOB_PENDING_STATES))})",
+                    JOB_PENDING_STATES).fetchone()[0]
+                if pending >= self.max_pending_jobs:
+                    raise JobsQueueFullException("Featurization jobs queue is full")
+            connection.execute(
+                "INSERT INTO jobs (id, owner, status, created_on, updated_on, subjects_total, request) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (identifier, owner, JOB_QUEUED, now, now, subjects, sqlite3.Binary(request)))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        # Return the job
+        return self.get(identifier)
+
+    def claim(self):
+        """
+        Claims the oldest queued job (atomically marks it as running).
+
+        :return: claimed job with the request (None if there is no queued job)
+        :rtype: dict or None type
+        """
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_on LIMIT 1", (JOB_QUEUED,)).fetchone()
+            if row:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, claimed_by = ?, updated_on = ? WHERE id = ?",
+                    (JOB_RUNNING, self.get_worker_identifier(), time.time(), row["id"]))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        # Return the claimed job (with the request)
+        return self.get(row["id"], with_request=True) if row else None
+
+    def update_progress(self, identifier, subjects_done):
+        """Updates the progress of the running job claimed by the current worker process (True if updated)"""
+        cursor = self.connection.execute(
+            "UPDATE jobs SET subjects_done = ?, updated_on = ? WHERE id = ? AND status = ? AND claimed_by = ?",
+            (subjects_done, time.time(), identifier, JOB_RUNNING, self.get_worker_identifier()))
+        return cursor.rowcount > 0
+
+    def complete(self, identifier, result):
+        """Completes the job claimed by the current worker process (stores the wrapped (.npz) result; True if done)"""
+        cursor = self.connection.execute(
+            "UPDATE jobs SET status = ?, result = ?, request = NULL, subjects_done = subjects_total, updated_on = ? "
+            "WHERE id = ? AND status = ? AND claimed_by = ?",
+            (JOB_COMPLETED, sqlite3.Binary(result), time.time(), identifier, JOB_RUNNING, self.get_worker_identifier()))
+        return cursor.rowcount > 0
+
+    def fail(self, identifier, error):
+        """Fails the job claimed by the current worker process (stores the error message; True if done)"""
+        cursor = self.connection.execute(
+            "UPDATE jobs SET status = ?, error = ?, request = NULL, updated_on = ? "
+            "WHERE id = ? AND status = ? AND claimed_by = ?",
+            (JOB_FAILED, str(error), time.time(), identifier, JOB_RUNNING, self.get_worker_identifier()))
+        return cursor.rowcount > 0
+
+    def get(self, identifier, owner=None, with_request=False, with_result=False):
+        """
+        Gets the job.
+
+        :param identifier: identifier of the job
+        :type identifier: str
+        :param owner: identifier of the owner (the job of other users is not returned), defaults to None
+        :type owner: str, optional
+        :param with_request: return also the wrapped request, defaults to False
+        :type with_request: bool, optional
+        :param with_result: return also the wrapped result, defaults to False
+        :type with_result: bool, optional
+        :return: job (None if it does not exist)
+        :rtype: dict or None type
+        """
+
+        # Prepare the fields
+        fields = list(self.fields)
+        if with_request:
+            fields.append("request")
+        if with_result:
+            fields.append("result")
+
+        # Get the job
+        row = self.connection.execute(f"SELECT {', '.join(fields)} FROM jobs WHERE id = ?", (identifier,)).fetchone()
+        if not row or (owner is not None and row["owner"] != owner):
+            return None
+
+        # Return the job
+        return dict(row)
+
+    def recover(self):
+        """
+        Queues again the running jobs that were abandoned by their workers.
+
+        A running job is abandoned if its worker process on this host is not
+        alive anymore (e.g. after the restart), or if it has not reported any
+        progress for longer than the stale timeout.
+
+        :return: number of the jobs queued again
+        :rtype: int
+        """
+
+        # Get the running jobs
+        rows = self.connection.execute(
+            "SELECT id, claimed_by, updated_on FROM jobs WHERE status = ?", (JOB_RUNNING,)).fetchall()
+
+        # Get the abandoned jobs
+        abandoned = [row["id"] for row in rows if self._is_abandoned(row["claimed_by"], row["updated_on"])]
+
+        # Queue the abandoned jobs again
+        for identifier in abandoned:
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, claimed_by = NULL, subjects_done = 0 WHERE id = ? AND status = ?",
+                (JOB_QUEUED, identifier, JOB_RUNNING))
+
+        # Return the number of the jobs queued again
+        return len(abandoned)
+
+    def release(self, identifier):
+        """
+        Queues again the running job claimed by the current worker process (e.g. when the worker is stopped).
+
+        :param identifier: identifier of the job
+        :type identifier: str
+        :return: True if the job was queued again
+        :rtype: bool
+        """
+        cursor = self.connection.execute(
+            "UPDATE jobs SET status = ?, claimed_by = NULL, subjects_done = 0, updated_on = ? "
+            "WHERE id = ? AND status = ? AND claimed_by = ?",
+            (JOB_QUEUED, time.time(), identifier, JOB_RUNNING, self.get_worker_identifier()))
+        return cursor.rowcount > 0
+
+    def purge(self):
+        """Removes the finished jobs that expired"""
+        if self.expiration_time:
+            self.connection.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_on < ?",
+                (JOB_COMPLETED, JOB_FAILED, time.time() - self.expiration_time))
+
+    def _is_abandoned(self, claimed_by, updated_on):
+        """Checks if the running job was abandoned by its worker"""
+
+        # Check the progress of the job
+        if self.stale_after and time.time() - updated_on > self.stale_after:
+            return True
+
+        # Check the worker of the job (only the workers on this host can be checked)
+        host, _, pid = (claimed_by or "").rpartition(":")
+        if host != socket.gethostname() or not pid.isdigit():
+            return False
+        if int(pid) == os.getpid():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
@@ -0,0 +1,286 @@
+import os
+import time
+import numpy
+import logging
+import threading
+from api.wrappers.data import BinaryDataWrapper
+from api.featurization.interface import FeaturesExtractorPipeline
+from api.interfaces.inputs.ragged import RaggedArray
+from api.interfaces.inputs.interface import Sample, FeaturesExtractorConfiguration, FeaturesPipeline
+from api.interfaces.outputs.interface import Features
+
+
+# ---------------------------------------------------- #
+# Featurization jobs worker pool attributes definition #
+# ---------------------------------------------------- #
+
+# Seconds to wait for the running jobs when the worker threads are stopped
+DEFAULT_JOBS_STOP_TIMEOUT_IN_SECONDS = 5.0
+
+
+# ----------------------------------------------- #
+# Featurization jobs worker pool class definition #
+# ----------------------------------------------- #
+
+class JobsWorkerPool(object):
+    """
+    Class implementing the pool of the featurization jobs worker threads.
+
+    Each of the worker threads claims the queued jobs from the jobs store and
+    featurizes them in the chunks of subjects (the progress is reported after
+    each of the chunks). The features are extracted by the same features
+    extractor pipeline as the synchronous featurization (i.e. the parallel
+    execution, the results caching and the time budgets of the features are
+    used if configured; the jobs have no deadline).
+
+    When the worker threads are stopped (e.g. the server worker is recycled),
+    the running jobs are stopped after their current chunk of subjects and
+    queued again; the jobs that do not stop in time are queued again as well,
+    so they are not left running until the store recovers them.
+    """
+
+    def __init__(
+            self,
+            store,
+            extractor,
+            workers=1,
+            chunk_size=None,
+            polling_interval=1.0,
+            pool=None,
+            cache=None,
+            supervisor=None,
+            stop_timeout=DEFAULT_JOBS_STOP_TIMEOUT_IN_SECONDS):
+        """
+        Initializes the JobsWorkerPool.
+
+        :param store: featurization jobs store
+        :type store: api.jobs.store.JobStore
+        :param extractor: feature extractor interface class
+        :type extractor: <injected>.interface.featurizer.FeatureExtractor
+        :param workers: number of the worker threads, defaults to 1
+        :type workers: int, optional
+        :param chunk_size: number of subjects featurized between progress updates, defaults to None (all)
+        :type chunk_size: int, optional
+        :param polling_interval: seconds between polling the store for new jobs, defaults to 1.0
+        :type polling_interval: float, optional
+        :param pool: features extraction pool (parallel execution), defaults to None
+        :type pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+        :param cache: features results cache (per-subject, per-feature), defaults to None
+        :type cache: api.caching.results.FeaturesResultCache, optional
+        :param supervisor: features extraction supervisor (time budgets of the features), defaults to None
+        :type supervisor: api.featurization.execution.supervisor.FeaturesExtractionSupervisor, optional
+        :param stop_timeout: seconds to wait for the running jobs when the threads are stopped, defaults to 5.0
+        :type stop_timeout: float, optional
+        """
+
+        # Set the jobs store
+        self.store = store
+
+        # Set the features extraction
+        self.extractor = extractor
+        self.pool = pool
+        self.cache = cache
+        self.supervisor = supervisor
+
+        # Set the worker pool configuration
+        self.workers = max(int(workers or 1), 1)
+        self.chunk_size = chunk_size if chunk_size else None
+        self.polling_interval = polling_interval
+        self.stop_timeout = stop_timeout
+
+        # Set the worker threads (started lazily per process) and the jobs they run (thread name: job identifier)
+        self._threads = []
+        self._threads_pid = None
+        self._running = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._writing = threading.Lock()
+
+        # Set the logger
+        self.logger = logging.getLogger("werkzeug")
+
+    def __repr__(self):
+        return str({"store": self.store, "workers": self.workers, "chunk_size": self.chunk_size})
+
+    def __str__(self):
+        return repr(self)
+
+    def start(self):
+        """Starts the worker threads in the current process (if they are not running)"""
+        with self._lock:
+            if self._threads_pid == os.getpid() and all(thread.is_alive() for thread in self._threads):
+                return
+
+            # Queue again the jobs abandoned by the workers (e.g. before the restart)
+            self.store.recover()
+
+            # Start the worker threads (each generation of the threads has its own stopping event, so the threads
+            # left behind by the previous stop do not write the jobs claimed again)
+            with self._writing:
+                self._stopping = threading.Event()
+            self._threads = [
+                threading.Thread(
+                    target=self._work,
+                    args=(self._stopping,),
+                    name=f"featurization-jobs-worker-{i}",
+                    daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._threads_pid = os.getpid()
+
+    def stop(self):
+        """
+        Stops the worker threads in the current process (the running jobs are queued again).
+
+        The running jobs are stopped after their current chunk of subjects (and
+        queued again). The jobs that are still running after the stop timeout
+        are queued again as well (their threads are left to finish as daemons,
+        they do not write the progress or the results of the jobs anymore).
+
+        :return: None
+        :rtype: None type
+        """
+        with self._lock:
+            if self._threads_pid != os.getpid():
+                return
+
+            # Stop the worker threads (wake up the waiting ones, wait for the running jobs)
+            with self._writing:
+                self._stopping.set()
+            self._wakeup.set()
+            deadline = time.monotonic() + (self.stop_timeout or 0.0)
+            for thread in self._threads:
+                thread.join(max(deadline - time.monotonic(), 0.0))
+
+            # Queue again the jobs that are still running
+            for identifier in list(self._running.values()):
+                try:
+                    self.store.release(identifier)
+                except Exception as e:
+                    self.logger.error(f"Featurization job {identifier} could not be queued again: {e}")
+            self._threads = []
+            self._threads_pid = None
+
+    def notify(self):
+        """Notifies the worker threads about a new job"""
+        self.start()
+        self._wakeup.set()
+
+    def _work(self, stopping):
+        """Runs the worker loop (claims and executes the queued jobs until the stopping event is set)"""
+        while not stopping.is_set():
+            try:
+                self.store.purge()
+                job = self.store.claim()
+            except Exception as e:
+                self.logger.error(f"Featurization jobs store failed: {e}")
+                job = None
+
+            # Wait for a new job
+            if not job:
+                self._wakeup.wait(self.polling_interval)
+                self._wakeup.clear()
+                continue
+
+            # Execute the job
+            name = threading.current_thread().name
+            self._running[name] = job["id"]
+            try:
+                self.execute(job, stopping)
+            finally:
+                self._running.pop(name, None)
+
+    def execute(self, job, stopping=None):
+        """
+        Executes the featurization job.
+
+        The progress and the result of the job are written only while the
+        worker threads are not stopping (the stopped job is queued again), and
+        only if the job is still claimed by the current worker process.
+
+        :param job: claimed job with the wrapped (.npz) request
+        :type job: dict
+        :param stopping: stopping event of the worker thread, defaults to None (the current one)
+        :type stopping: threading.Event, optional
+        :return: None
+        :rtype: None type
+        """
+        stopping = stopping or self._stopping
+        try:
+
+            # Unwrap the request
+            values, header = BinaryDataWrapper.unwrap_npz(job["request"])
+
+            # Prepare the data samples, the features pipeline and the features extractor configuration
+            labels = header.get("samples", {}).get("labels") or []
+            offsets = header.get("samples", {}).get("offsets")
+            values = RaggedArray(values, offsets) if offsets is not None else values
+            pipeline = FeaturesPipeline(header["features"]["pipeline"])
+            settings = FeaturesExtractorConfiguration(header.get("extractor_configuration"))
+            output = header.get("output_configuration") or {}
+
+            # Prepare the features extractor
+            extractor = FeaturesExtractorPipeline(
+                self.extractor,
+                Sample(values, labels),
+                settings,
+                pool=self.pool,
+                cache=self.cache,
+                supervisor=self.supervisor)
+
+            # Extract the features in the chunks of subjects (report the progress after each chunk)
+            chunks, features_labels, errors = [], None, {}
+            for start, extracted in extractor.iter_extract(pipeline, chunk_size=self.chunk_size):
+                chunks.append(numpy.atleast_2d(extracted["values"]))
+                features_labels = extracted["labels"]
+                for error in extracted.get("errors") or []:
+                    errors.setdefault(error["index"], error)
+                if not self._write(job, stopping, self.store.update_progress, start + chunks[-1].shape[0]):
+                    return
+
+            # Prepare and validate the features
+            features = Features({
+                "values": numpy.concatenate(chunks, axis=0),
+                "labels": features_labels
+            }, **output).to_binary_response()
+
+            # Complete the job (store the wrapped result, the errors of the timed-out features and the output settings)
+            features_header = {"labels": features["features"]["labels"]}
+            if errors:
+                features_header["errors"] = [errors[index] for index in sorted(errors)]
+            self._write(job, stopping, self.store.complete, BinaryDataWrapper.wrap_npz(
+                features["features"]["values"],
+                header={"features": features_header, "output_configuration": output}))
+
+        # Handle the failed job
+        except Exception as e:
+            if self._write(job, stopping, self.store.fail, e):
+                self.logger.error(f"Featurization job {job['id']} failed: {e}")
+
+    def _write(self, job, stopping, update, *args):
+        """
+        Writes the job into the store unless the worker thread is stopping (then the job is queued again).
+
+        The stopped job is queued again only until the worker threads are
+        started again (the job may be claimed by the new worker threads).
+
+        :param job: claimed job
+        :type job: dict
+        :param stopping: stopping event of the worker thread
+        :type stopping: threading.Event
+        :param update: store method writing the job (e.g. update_progress, complete, fail)
+        :type update: callable
+        :param args: arguments of the store method (after the job identifier)
+        :type args: tuple
+        :return: True if the job was written (False if it was stopped or claimed by another worker process)
+        :rtype: bool
+        """
+        with self._writing:
+            if not stopping.is_set():
+                return update(job["id"], *args)
+            if stopping is self._stopping:
+                self.store.release(job["id"])
+            return False
@@ -0,0 +1,240 @@
+import flask
+from functools import wraps
+from api.configuration import load_configuration
+from api.metrics.registry import MetricsRegistry, DEFAULT_SIZE_BUCKETS
+from api.metrics.timing import StageTimer
+from api.compression.encoding import ENCODED_CONTENT_LENGTH_KEY
+
+
+# ------------------------------------- #
+# Default metrics attributes definition #
+# ------------------------------------- #
+SERVER_TIMING_HEADER_NAME = "Server-Timing"
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --------------------------- #
+# Metrics registry definition #
+# --------------------------- #
+
+# Registry of the metrics (per process; each of the server workers serves its own metrics at /metrics)
+registry = MetricsRegistry()
+
+# Request metrics
+requests_in_flight = registry.gauge(
+    "featurizer_requests_in_flight",
+    "Number of the requests being processed",
+    labels=("endpoint",))
+request_duration = registry.histogram(
+    "featurizer_request_duration_seconds",
+    "Runtime of the requests",
+    labels=("endpoint",))
+request_stage_duration = registry.histogram(
+    "featurizer_request_stage_duration_seconds",
+    "Runtime of the request processing stages",
+    labels=("endpoint", "stage"))
+request_size = registry.histogram(
+    "featurizer_request_size_bytes",
+    "Size of the request bodies",
+    labels=("endpoint",),
+    buckets=DEFAULT_SIZE_BUCKETS)
+response_size = registry.histogram(
+    "featurizer_response_size_bytes",
+    "Size of the (not streamed) response bodies",
+    labels=("endpoint",),
+    buckets=DEFAULT_SIZE_BUCKETS)
+
+# Caching metrics
+response_cache_requests = registry.counter(
+    "featurizer_response_cache_requests_total",
+    "Number of the requests handled by the request-response cache",
+    labels=("result",))
+
+# Function metrics
+function_duration = registry.histogram(
+    "featurizer_function_duration_seconds",
+    "Runtime of the measured functions",
+    labels=("function",))
+
+
+# ----------------------------------------- #
+# Metrics configuration routines definition #
+# ----------------------------------------- #
+
+def configure_metrics():
+    """Configures the metrics (the /metrics endpoint and the Server-Timing headers)"""
+    return {key: value for key, value in (load_configuration("metrics.json") or {}).get("metrics", {}).items()}
+
+
+def register_results_cache_metrics(cache):
+    """
+    Registers the metrics of the features results cache.
+
+    :param cache: features results cache (per-subject, per-feature), defaults to None
+    :type cache: api.caching.results.FeaturesResultCache or None type
+    :return: None
+    :rtype: None type
+    """
+    if cache is None:
+        return
+    registry.counter(
+        "featurizer_results_cache_hits_total",
+        "Number of the (subject, feature) cells found in the features results cache").set_function(lambda: cache.hits)
+    registry.counter(
+        "featurizer_results_cache_misses_total",
+        "Number of the (subject, feature) cells missing in the features results cache").set_function(
+        lambda: cache.misses)
+    registry.gauge(
+        "featurizer_results_cache_cells",
+        "Number of the cells in the features results cache").set_function(lambda: len(cache))
+    registry.gauge(
+        "featurizer_results_cache_size_bytes",
+        "Size of the cells in the features results cache").set_function(lambda: cache.size)
+
+
+def register_libraries_metrics(libraries):
+    """
+    Registers the metrics of the features extraction libraries served at ``/featurize/<library>``.
+
+    :param libraries: registry of the features extraction libraries, defaults to None
+    :type libraries: api.featurization.libraries.registry.FeaturesExtractionLibraryRegistry or None type
+    :return: None
+    :rtype: None type
+    """
+    if libraries is None:
+        return
+    registry.gauge(
+        "featurizer_libraries_loaded",
+        "Number of the loaded features extraction libraries").set_function(lambda: len(libraries.get_loaded()))
+    registry.gauge(
+        "featurizer_libraries_memory_bytes",
+        "Memory held by the loaded features extraction libraries").set_function(libraries.get_memory_usage)
+    registry.counter(
+        "featurizer_libraries_evictions_total",
+        "Number of the features extraction libraries unloaded over the limits").set_function(
+        lambda: libraries.evictions)
+
+
+def register_scheduling_metrics(scheduler):
+    """
+    Registers the metrics of the features extraction scheduler (predicted and actual costs).
+
+    :param scheduler: features extraction scheduler (cost model of the features), defaults to None
+    :type scheduler: api.featurization.execution.scheduling.FeaturesExtractionScheduler or None type
+    :return: None
+    :rtype: None type
+    """
+    if scheduler is None:
+        return
+    registry.counter(
+        "featurizer_scheduling_schedules_total",
+        "Number of the features extractions scheduled by the cost model").set_function(lambda: scheduler.schedules)
+    registry.gauge(
+        "featurizer_scheduling_costs",
+        "Number of the entries in the cost model of the features").set_function(lambda: len(scheduler.model))
+    registry.counter(
+        "featurizer_scheduling_predicted_seconds_total",
+        "Predicted cost of the pipeline elements (with the known cost)").set_function(
+        lambda: scheduler.model.predicted_seconds)
+    registry.counter(
+        "featurizer_scheduling_actual_seconds_total",
+        "Actual runtime of the pipeline elements (with the known cost)").set_function(
+        lambda: scheduler.model.actual_seconds)
+    registry.counter(
+        "featurizer_scheduling_absolute_error_seconds_total",
+        "Absolute error of the predicted cost of the pipeline elements").set_function(
+        lambda: scheduler.model.absolute_error_seconds)
+    registry.counter(
+        "featurizer_scheduling_predicted_makespan_seconds_total",
+        "Predicted makespan of the scheduled features extractions (with the known costs)").set_function(
+        lambda: scheduler.predicted_makespan_seconds)
+    registry.counter(
+        "featurizer_scheduling_actual_makespan_seconds_total",
+        "Actual makespan (wall time) of the scheduled features extractions (with the known costs)").set_function(
+        lambda: scheduler.actual_makespan_seconds)
+    registry.gauge(
+        "featurizer_scheduling_predicted_makespan_seconds",
+        "Predicted makespan of the last scheduled features extraction (with the known costs)").set_function(
+        lambda: scheduler.last_predicted_makespan)
+    registry.gauge(
+        "featurizer_scheduling_actual_makespan_seconds",
+        "Actual makespan (wall time) of the last scheduled features extraction (with the known costs)").set_function(
+        lambda: scheduler.last_actual_makespan)
+
+
+# ------------------------------------------- #
+# Request instrumentation routines definition #
+# ------------------------------------------- #
+
+def get_stage_timer():
+    """Returns the stage timer of the current request"""
+    if "stage_timer" not in flask.g:
+        flask.g.stage_timer = StageTimer()
+    return flask.g.stage_timer
+
+
+def get_request_size(request):
+    """Returns the size of the request body as received (i.e. before it is decompressed)"""
+    return request.environ.get(ENCODED_CONTENT_LENGTH_KEY) or request.content_length or 0
+
+
+def instrument_request(endpoint, server_timing=True):
+    """
+    Decorator that instruments the request handler of the <endpoint>.
+
+    The decorator tracks the requests in flight, the size of the request and
+    response bodies, the runtime of the request and the runtime of the stages
+    measured by the handler via ``get_stage_timer().stage(<name>)``. The stage
+    timings are sent in the ``Server-Timing`` response header (if enabled) of
+    the copy of the response (the response can be shared by the requests if it
+    is memoized by the request-response cache).
+
+    :param endpoint: name of the endpoint (label of the metrics)
+    :type endpoint: str
+    :param server_timing: send the Server-Timing header, defaults to True
+    :type server_timing: bool, optional
+    :return: decorator
+    :rtype: callable
+    """
+
+    def decorator(method):
+
+        @wraps(method)
+        def instrumented(*args, **kwargs):
+
+            # Prepare the stage timer of the request
+            timer = flask.g.stage_timer = StageTimer()
+            requests_in_flight.inc(endpoint=endpoint)
+            request_size.observe(get_request_size(flask.request), endpoint=endpoint)
+
+            # Handle the request
+            streamed = False
+            try:
+                response = method(*args, **kwargs)
+                streamed = isinstance(response, flask.Response) and response.is_streamed
+            finally:
+                if not streamed:
+                    requests_in_flight.dec(endpoint=endpoint)
+
+            # Observe the runtime of the request and its stages
+            request_duration.observe(timer.total, endpoint=endpoint)
+            timer.observe(request_stage_duration, endpoint=endpoint)
+
+            # Observe the response (the streamed response is in flight until it is closed)
+            if isinstance(response, flask.Response):
+                if streamed:
+                    response.call_on_close(lambda: requests_in_flight.dec(endpoint=endpoint))
+                else:
+                    response_size.observe(response.calculate_content_length() or 0, endpoint=endpoint)
+                if server_timing:
+                    if not streamed:
+                        response = response.__class__(
+                            response.get_data(),
+                            status=response.status,
+                            headers=response.headers.copy())
+                    response.headers[SERVER_TIMING_HEADER_NAME] = timer.to_header()
+
+            # Return the response
+            return response
+        return instrumented
+    return decorator
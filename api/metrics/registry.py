@@ -0,0 +1,220 @@
+import math
+import threading
+
+
+# ------------------------------------- #
+# Default metrics attributes definition #
+# ------------------------------------- #
+
+# Buckets of the duration histograms (in seconds)
+DEFAULT_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Buckets of the size histograms (in bytes)
+DEFAULT_SIZE_BUCKETS = tuple(4 ** i * 256 for i in range(12))
+
+
+# -------------------------- #
+# Metrics classes definition #
+# -------------------------- #
+
+class Metric(object):
+    """
+    Class implementing the base metric (Prometheus text exposition format).
+
+    The metric keeps one value per combination of its label values. The value
+    can also be provided by a function (evaluated when the metric is rendered).
+    """
+
+    # Define the metric type
+    type = "untyped"
+
+    def __init__(self, name, documentation, labels=()):
+        """
+        Initializes the Metric.
+
+        :param name: name of the metric
+        :type name: str
+        :param documentation: help text of the metric
+        :type documentation: str
+        :param labels: names of the labels, defaults to ()
+        :type labels: tuple, optional
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.function = None
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"name": self.name, "type": self.type, "labels": self.labels})
+
+    def __str__(self):
+        return repr(self)
+
+    def set_function(self, function):
+        """Sets the function providing the value of the metric (without labels)"""
+        self.function = function
+
+    def get_label_values(self, labels):
+        """Returns the label values (in the order of the label names)"""
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def get_samples(self):
+        """Returns the samples of the metric (name suffix, label names and values, value)"""
+        if self.function is not None:
+            return [("", (), (), self.function())]
+        with self._lock:
+            return [("", self.labels, key, value) for key, value in self._values.items()]
+
+    @staticmethod
+    def format_value(value):
+        """Formats the sample value"""
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+    @staticmethod
+    def format_labels(names, values):
+        """Formats the sample labels"""
+        if not names:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"") for v in values)
+        return "{" + ",".join(f"{name}=\"{value}\"" for name, value in zip(names, escaped)) + "}"
+
+    def render(self):
+        """Renders the metric (Prometheus text exposition format)"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, names, values, value in self.get_samples():
+            lines.append(f"{self.name}{suffix}{self.format_labels(names, values)} {self.format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Class implementing the counter metric"""
+
+    # Define the metric type
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        """Increments the counter"""
+        key = self.get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Class implementing the gauge metric"""
+
+    # Define the metric type
+    type = "gauge"
+
+    def inc(self, amount=1, **labels):
+        """Increments the gauge"""
+        key = self.get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        """Decrements the gauge"""
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        """Sets the gauge"""
+        key = self.get_label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """Class implementing the histogram metric (cumulative buckets, sum and count)"""
+
+    # Define the metric type
+    type = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_DURATION_BUCKETS):
+        """
+        Initializes the Histogram.
+
+        :param name: name of the metric
+        :type name: str
+        :param documentation: help text of the metric
+        :type documentation: str
+        :param labels: names of the labels, defaults to ()
+        :type labels: tuple, optional
+        :param buckets: upper bounds of the buckets, defaults to DEFAULT_DURATION_BUCKETS
+        :type buckets: tuple, optional
+        """
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        """Observes the value"""
+        key = self.get_label_values(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def get_samples(self):
+        """Returns the samples of the histogram (buckets, sum and count)"""
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+        # Prepare the samples
+        samples = []
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for bucket, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append(("_bucket", self.labels + ("le",), key + (self.format_value(bucket),), cumulative))
+            samples.append(("_sum", self.labels, key, total))
+            samples.append(("_count", self.labels, key, cumulative))
+
+        # Return the samples
+        return samples
+
+
+# --------------------------------- #
+# Metrics registry class definition #
+# --------------------------------- #
+
+class MetricsRegistry(object):
+    """Class implementing the registry of the metrics (created once, rendered together)"""
+
+    def __init__(self):
+        """Initializes the MetricsRegistry"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return str({"metrics": list(self._metrics)})
+
+    def __str__(self):
+        return repr(self)
+
+    def register(self, metric):
+        """Registers the metric (the already registered metric of the same name is returned)"""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labels=()):
+        """Returns the registered counter"""
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=()):
+        """Returns the registered gauge"""
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_DURATION_BUCKETS):
+        """Returns the registered histogram"""
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self):
+        """Renders the metrics (Prometheus text exposition format)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
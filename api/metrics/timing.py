@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+
+
+# ---------------------------- #
+# Stage timer class definition #
+# ---------------------------- #
+
+class StageTimer(object):
+    """
+    Class implementing the timer of the request processing stages.
+
+    The runtime of the stages is measured by the monotonic high-resolution
+    clock (the repeated stages, e.g. logging, are accumulated). The timings
+    are exposed in the ``Server-Timing`` header format, and they are observed
+    by the stage duration histogram.
+    """
+
+    def __init__(self):
+        """Initializes the StageTimer"""
+        self.started_on = time.perf_counter()
+        self.stages = {}
+
+    def __repr__(self):
+        return str(self.stages)
+
+    def __str__(self):
+        return repr(self)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measures the runtime of the stage.
+
+        :param name: name of the stage
+        :type name: str
+        :return: context manager measuring the stage
+        :rtype: contextlib.contextmanager
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self):
+        """Returns the runtime since the timer was created (in seconds)"""
+        return time.perf_counter() - self.started_on
+
+    def to_header(self):
+        """Returns the timings in the Server-Timing header format (durations in milliseconds)"""
+        timings = [*self.stages.items(), ("total", self.total)]
+        return ", ".join(f"{name};dur={1000 * duration:.3f}" for name, duration in timings)
+
+    def observe(self, histogram, **labels):
+        """Observes the runtime of the stages by the histogram (labeled by the stage)"""
+        for name, duration in self.stages.items():
+            histogram.observe(duration, stage=name, **labels)
@@ -1,14 +1,88 @@
 from api.resources.security import SignupResource, LoginResource, RefreshAccessTokenResource
-from api.resources.featurizer import FeaturizerResource
+from api.resources.featurizer import FeaturizerResource, FeaturizerLibraryResource
+from api.resources.batch import FeaturizerBatchResource
+from api.resources.jobs import FeaturizerJobsResource, FeaturizerJobResource, FeaturizerJobResultResource
+from api.resources.samples import SamplesResource, SampleResource
+from api.resources.metrics import MetricsResource
+from api.metrics import (
+    configure_metrics,
+    register_results_cache_metrics,
+    register_libraries_metrics,
+    register_scheduling_metrics
+)
 
 
 # ------------------------------------------- #
 # Featurizer API Resources helpers definition #
 # ------------------------------------------- #
 
-def add_featurizer_resource(api, extractor):
+def add_featurizer_resource(api, extractor, pool=None, cache=None, store=None, datasets=None, supervisor=None):
     """Register featurizer resource"""
-    api.add_resource(FeaturizerResource, "/featurize", resource_class_kwargs={"extractor_interface": extractor})
+    api.add_resource(
+        FeaturizerResource,
+        "/featurize",
+        resource_class_kwargs={
+            "extractor_interface": extractor,
+            "extractor_pool": pool,
+            "extractor_cache": cache,
+            "extractor_supervisor": supervisor,
+            "sample_store": store,
+            "dataset_featurizer": datasets
+        })
+
+
+def add_featurizer_libraries_resource(api, libraries, store=None, datasets=None):
+    """Registers featurizer resource of the features extraction libraries"""
+    api.add_resource(
+        FeaturizerLibraryResource,
+        "/featurize/<string:library>",
+        resource_class_kwargs={
+            "libraries": libraries,
+            "sample_store": store,
+            "dataset_featurizer": datasets
+        })
+
+
+def add_featurizer_batch_resource(api, extractor, pool=None, cache=None, batch=None, store=None, supervisor=None):
+    """Registers featurizer batch resource"""
+    api.add_resource(
+        FeaturizerBatchResource,
+        "/featurize/batch",
+        resource_class_kwargs={
+            "extractor_interface": extractor,
+            "extractor_pool": pool,
+            "extractor_cache": cache,
+            "extractor_supervisor": supervisor,
+            "batch_executor": batch,
+            "sample_store": store
+        })
+
+
+def add_featurizer_jobs_resources(api, jobs, store=None):
+    """Registers featurizer jobs resources"""
+    api.add_resource(
+        FeaturizerJobsResource,
+        "/featurize/jobs",
+        resource_class_kwargs={"jobs": jobs, "sample_store": store})
+    api.add_resource(FeaturizerJobResource, "/featurize/jobs/<string:job_id>", resource_class_kwargs={"jobs": jobs})
+    api.add_resource(
+        FeaturizerJobResultResource,
+        "/featurize/jobs/<string:job_id>/result",
+        resource_class_kwargs={"jobs": jobs})
+
+
+def add_samples_resources(api, store):
+    """Registers samples resources"""
+    api.add_resource(SamplesResource, "/samples", resource_class_kwargs={"store": store})
+    api.add_resource(SampleResource, "/samples/<string:handle>", resource_class_kwargs={"store": store})
+
+
+def add_metrics_resource(api, cache=None, libraries=None, scheduler=None):
+    """Registers metrics resource"""
+    register_results_cache_metrics(cache)
+    register_libraries_metrics(libraries)
+    register_scheduling_metrics(scheduler)
+    api.add_resource(MetricsResource, "/metrics")
 
 
 def add_signup_resource(api):
@@ -30,7 +104,18 @@ def add_refresh_resource(api):
 # Featurizer API Resources registration #
 # ------------------------------------- #
 
-def configure_routes(api, feature_extractor_interface):
+def configure_routes(
+        api,
+        feature_extractor_interface,
+        feature_extraction_pool=None,
+        feature_extraction_cache=None,
+        featurization_jobs=None,
+        feature_extraction_batch=None,
+        sample_store=None,
+        dataset_featurizer=None,
+        feature_extraction_libraries=None,
+        feature_extraction_supervisor=None,
+        feature_extraction_scheduler=None):
     """
     Prepares and registers the resources supported by the featurizer API.
 
@@ -38,6 +123,24 @@ def configure_routes(api, feature_extractor_interface):
     :type api: flask_restful.API
     :param feature_extractor_interface: features extraction interface
     :type feature_extractor_interface: object instance
+    :param feature_extraction_pool: features extraction pool, defaults to None
+    :type feature_extraction_pool: api.featurization.execution.pool.FeaturesExtractionPool, optional
+    :param feature_extraction_cache: features results cache, defaults to None
+    :type feature_extraction_cache: api.caching.results.FeaturesResultCache, optional
+    :param featurization_jobs: featurization jobs worker pool, defaults to None
+    :type featurization_jobs: api.jobs.workers.JobsWorkerPool, optional
+    :param feature_extraction_batch: features extraction batch executor, defaults to None
+    :type feature_extraction_batch: api.featurization.execution.batch.FeaturesExtractionBatchExecutor, optional
+    :param sample_store: store of the uploaded sample values, defaults to None
+    :type sample_store: api.samples.store.SampleStore, optional
+    :param dataset_featurizer: featurizer of the server-side datasets, defaults to None
+    :type dataset_featurizer: api.datasets.featurizer.DatasetFeaturizer, optional
+    :param feature_extraction_libraries: registry of the libraries served at /featurize/<library>, defaults to None
+    :type feature_extraction_libraries: api.featurization.libraries.registry.FeaturesExtractionLibraryRegistry, optional
+    :param feature_extraction_supervisor: features extraction supervisor (time budgets, deadlines), defaults to None
+    :type feature_extraction_supervisor: api.featurization.execution.supervisor.FeaturesExtractionSupervisor, optional
+    :param feature_extraction_scheduler: features extraction scheduler (cost model of the features), defaults to None
+    :type feature_extraction_scheduler: api.featurization.execution.scheduling.FeaturesExtractionScheduler, optional
     :return: None
     :rtype: None type
     """
@@ -45,10 +148,47 @@ def configure_routes(api, feature_extractor_interface):
     # Register the resources
     #
     #  1. add and register the FeaturizerResource
-    #  2. add and register the SignupResource
-    #  3. add and register the LoginResource
-    #  4. add and register the RefreshAccessTokenResource
-    add_featurizer_resource(api, extractor=feature_extractor_interface)
+    #  2. add and register the FeaturizerBatchResource
+    #  3. add and register the FeaturizerJobsResource, FeaturizerJobResource, FeaturizerJobResultResource
+    #  4. add and register the FeaturizerLibraryResource
+    #  5. add and register the SamplesResource, SampleResource
+    #  6. add and register the MetricsResource
+    #  7. add and register the SignupResource
+    #  8. add and register the LoginResource
+    #  9. add and register the RefreshAccessTokenResource
+    add_featurizer_resource(
+        api,
+        extractor=feature_extractor_interface,
+        pool=feature_extraction_pool,
+        cache=feature_extraction_cache,
+        store=sample_store,
+        datasets=dataset_featurizer,
+        supervisor=feature_extraction_supervisor)
+    if feature_extraction_batch:
+        add_featurizer_batch_resource(
+            api,
+            extractor=feature_extractor_interface,
+            pool=feature_extraction_pool,
+            cache=feature_extraction_cache,
+            batch=feature_extraction_batch,
+            store=sample_store,
+            supervisor=feature_extraction_supervisor)
+    if featurization_jobs:
+        add_featurizer_jobs_resources(api, jobs=featurization_jobs, store=sample_store)
+    if feature_extraction_libraries:
+        add_featurizer_libraries_resource(
+            api,
+            libraries=feature_extraction_libraries,
+            store=sample_store,
+            datasets=dataset_featurizer)
+    if sample_store:
+        add_samples_resources(api, store=sample_store)
+    if configure_metrics().get("enabled"):
+        add_metrics_resource(
+            api,
+            cache=feature_extraction_cache,
+            libraries=feature_extraction_libraries,
+            scheduler=feature_extraction_scheduler)
     add_signup_resource(api)
     add_login_resource(api)
     add_refresh_resource(api)
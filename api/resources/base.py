@@ -2,8 +2,11 @@ import os
 from pathlib import Path
 from api.common.identifiers import get_identifier
 from api.common.logging import get_request_logger, get_response_logger, get_application_logger, get_loggable_object
+from api.common.logging import configure_payload_logging
 from api.configuration import application_path
 from api.caching import configure_caching, DEFAULT_CACHING_TIME
+from api.featurization.execution import configure_features_extraction_streaming, DEFAULT_STREAMING_CHUNK_SIZE
+from api.metrics import configure_metrics
 
 
 # --------------------------------------- #
@@ -20,17 +23,20 @@ class LoggableResource(object):
     request_logger = get_request_logger()
     response_logger = get_response_logger()
 
+    # Configuration for the payload logging (summaries and full-body sampling)
+    payload_logging_configuration = configure_payload_logging()
+
     def __init__(self):
         self.identifier = None
 
     def log_request_data(self, request):
         """Logs the request data"""
         self.identifier = get_identifier()
-        self.request_logger.info(get_loggable_object(request, self.identifier))
+        self.request_logger.info(get_loggable_object(request, self.identifier, self.payload_logging_configuration))
 
     def log_response_data(self, response):
         """Logs the response data"""
-        self.response_logger.info(get_loggable_object(response, self.identifier))
+        self.response_logger.info(get_loggable_object(response, self.identifier, self.payload_logging_configuration))
 
     @property
     def application_logger(self):
@@ -50,3 +56,31 @@ class CacheableResource(object):
 
     # Caching attributes
     CACHE_EXPIRATION_TIME = caching_configuration.get("expiration_time_in_seconds", DEFAULT_CACHING_TIME)
+
+
+# ----------------------------------------- #
+# Streamable API Resources class definition #
+# ----------------------------------------- #
+
+class StreamableResource(object):
+    """Class implementing streamable resource"""
+
+    # Configuration for streaming
+    streaming_configuration = configure_features_extraction_streaming()
+
+    # Streaming attributes
+    STREAM_CHUNK_SIZE = streaming_configuration.get("chunk_size", DEFAULT_STREAMING_CHUNK_SIZE)
+
+
+# ------------------------------------------- #
+# Instrumented API Resources class definition #
+# ------------------------------------------- #
+
+class InstrumentedResource(object):
+    """Class implementing instrumented resource"""
+
+    # Configuration for metrics
+    metrics_configuration = configure_metrics()
+
+    # Instrumentation attributes
+    SERVER_TIMING = metrics_configuration.get("server_timing", True)
@@ -0,0 +1,174 @@
+import flask
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from http import HTTPStatus
+from api.common.errors import get_error_status_code
+from api.metrics import instrument_request, get_stage_timer
+from api.samples import resolve_sample_handle
+from api.wrappers.request import RequestWrapper
+from api.wrappers.response import ResponseWrapper
+from api.wrappers.media import MEDIA_TYPE_JSON
+from api.resources.base import LoggableResource, InstrumentedResource
+from api.featurization.execution.deadline import FeaturesExtractionDeadline
+
+
+# ---------------------------------------- #
+# Featurizer batch API Resource definition #
+# ---------------------------------------- #
+
+class FeaturizerBatchResource(Resource, LoggableResource, InstrumentedResource):
+    """Class implementing the featurizer batch API resource (controller)"""
+
+    def __init__(self, extractor_interface=None, extractor_pool=None, extractor_cache=None, batch_executor=None,
+                 sample_store=None, extractor_supervisor=None):
+        """Initializes the FeaturizerBatchResource (controller)"""
+
+        # Initialize the super-class
+        super().__init__()
+
+        # Set the features extractor interface
+        self.extractor_interface = extractor_interface
+
+        # Set the features extraction pool (parallel execution)
+        self.extractor_pool = extractor_pool
+
+        # Set the features results cache (per-subject, per-feature)
+        self.extractor_cache = extractor_cache
+
+        # Set the features extraction batch executor
+        self.batch_executor = batch_executor
+
+        # Set the features extraction supervisor (time budgets of the features, deadlines of the requests)
+        self.extractor_supervisor = extractor_supervisor
+
+        # Set the sample store (sample handles)
+        self.sample_store = sample_store
+
+    @jwt_required()
+    @instrument_request("featurize_batch", server_timing=InstrumentedResource.SERVER_TIMING)
+    def post(self):
+        """
+        Computes the features for the batch of independent featurization requests.
+
+        The method expects the JSON-serialized list of the featurization
+        requests in the ``requests`` field of the body. Each of the requests has
+        the same structure as the input data of the ``/featurize`` endpoint
+        (see: ``api.resources.featurizer.py``), i.e. each of them has its own
+        samples, features pipeline, extractor and output configuration. The
+        authorization, the request unwrapping and the logging are performed
+        once for the whole batch.
+
+        The requests sharing the features pipeline, the extractor configuration,
+        the sample labels, and the shape of the subjects are featurized together
+        (their subjects are concatenated), and the groups of requests are
+        featurized concurrently (see:
+        ``api.featurization.execution.batch.FeaturesExtractionBatchExecutor``).
+
+        The response holds the per-request results in the order of the
+        requests: the ``/featurize`` output data (``features``) for each of the
+        successful requests, and the ``error`` (``status`` and ``message``) for
+        each of the failed requests (the other requests are not affected).
+
+        The deadline of the batch (the ``X-Featurizer-Deadline`` header or the
+        ``deadline_in_seconds`` field of the body) applies to all requests of
+        the batch; the features exceeding their time budgets are NaN, and
+        their errors are annotated in ``features.errors`` of the requests.
+
+        :return: per-request features or errors
+        :rtype: flask.Response
+
+        **Example**
+
+        .. code-block:: python
+
+            # Request body
+            {
+                "requests": [
+                    {
+                        "samples": {"values": DataWrapper.wrap_data(numpy.random.rand(2, 1, 100))},
+                        "features": {"pipeline": [{"name": "feature 1", "args": {}}]}
+                    },
+                    {
+                        "samples": {"values": DataWrapper.wrap_data(numpy.random.rand(3, 1, 100))},
+                        "features": {"pipeline": [{"name": "unknown feature", "args": {}}]}
+                    }
+                ]
+            }
+
+            # Response body
+            {
+                "results": [
+                    {"features": {"labels": ["feature 1"], "values": "<json-tricks serialized array>"}},
+                    {"error": {"status": 400, "message": "Unknown feature: unknown feature"}}
+                ]
+            }
+        """
+
+        try:
+
+            # Prepare the stage timer (the stages are sent in the Server-Timing header)
+            timer = get_stage_timer()
+
+            # Unwrap the input request
+            with timer.stage("unwrap"):
+                request = RequestWrapper.unwrap_request(flask.request)
+            with timer.stage("logging"):
+                self.log_request_data(request)
+
+            # Validate the batch
+            items = request.get("requests") if isinstance(request, dict) else None
+            if not isinstance(items, list) or not items:
+                return {"message": "Missing data for required field (requests: non-empty list)"}, HTTPStatus.BAD_REQUEST
+            if self.batch_executor.max_items and len(items) > self.batch_executor.max_items:
+                return {"message": f"Too many requests (maximum: {self.batch_executor.max_items})"}, HTTPStatus.BAD_REQUEST
+
+            # Prepare the deadline of the batch
+            supervisor = self.extractor_supervisor
+            deadline = FeaturesExtractionDeadline.from_request(
+                flask.request,
+                request,
+                default=supervisor.default_deadline if supervisor else None,
+                maximum=supervisor.max_deadline if supervisor else None,
+                elapsed=timer.total)
+
+            # Featurize the batch (the sample handles are resolved per request)
+            owner = get_jwt_identity()
+            with timer.stage("extraction"):
+                results = self.batch_executor.execute(
+                    items,
+                    self.extractor_interface,
+                    pool=self.extractor_pool,
+                    cache=self.extractor_cache,
+                    resolve=lambda item: resolve_sample_handle(item, self.sample_store, owner),
+                    supervisor=supervisor,
+                    deadline=deadline)
+
+            # Prepare the per-request results (features or errors)
+            with timer.stage("features"):
+                results = {"results": [self.get_result(result) for result in results]}
+            with timer.stage("logging"):
+                self.log_response_data(results)
+
+            # Wrap the output response
+            with timer.stage("wrap"):
+                response = ResponseWrapper.wrap_response(results)
+
+            # Send the successful HTTP Response
+            return flask.Response(response=response, status=HTTPStatus.OK, mimetype=MEDIA_TYPE_JSON)
+
+        # Handle the error logging
+        except Exception as e:
+            self.application_logger.error(e)
+            raise
+
+    def get_result(self, result):
+        """Returns the per-request result (features, or the error with the HTTP status code and message)"""
+        if not isinstance(result, Exception):
+            return result
+
+        # Prepare the error (the internal server errors are logged, their messages are not sent)
+        status = get_error_status_code(result)
+        if status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            self.application_logger.error(result)
+            return {"error": {"status": status, "message": "Internal server error: we are working to resolve the issue"}}
+        return {"error": {"status": status, "message": str(result)}}
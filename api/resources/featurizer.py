@@ -1,24 +1,42 @@
 import flask
+import marshmallow
 from flask_restful import Resource
-from flask_jwt_extended import jwt_required
-from flask_api_cache import ApiCache
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from http import HTTPStatus
+from api.caching import RequestCache
+from api.metrics import instrument_request, get_stage_timer
+from api.samples import resolve_sample_handle
 from api.wrappers.request import RequestWrapper
 from api.wrappers.response import ResponseWrapper
+from api.wrappers.media import MEDIA_TYPE_JSON, get_response_media_type, is_binary_media_type, is_streaming_media_type
 from api.featurization.interface import FeaturesExtractorPipeline
-from api.interfaces.inputs.interface import Sample, FeaturesExtractorConfiguration, FeaturesPipeline
+from api.featurization.execution.deadline import FeaturesExtractionDeadline
+from api.interfaces.inputs.interface import (
+    Sample,
+    Dataset,
+    FeaturesExtractorConfiguration,
+    FeaturesOutputConfiguration,
+    FeaturesPipeline
+)
 from api.interfaces.outputs.interface import Features
-from api.resources.base import LoggableResource, CacheableResource
+from api.resources.base import LoggableResource, CacheableResource, StreamableResource, InstrumentedResource
 
 
 # ---------------------------------- #
 # Featurizer API Resource definition #
 # ---------------------------------- #
 
-class FeaturizerResource(Resource, LoggableResource, CacheableResource):
+class FeaturizerResource(Resource, LoggableResource, CacheableResource, StreamableResource, InstrumentedResource):
     """Class implementing the featurizer API resource (controller)"""
 
-    def __init__(self, extractor_interface=None):
+    def __init__(
+            self,
+            extractor_interface=None,
+            extractor_pool=None,
+            extractor_cache=None,
+            extractor_supervisor=None,
+            sample_store=None,
+            dataset_featurizer=None):
         """Initializes the FeaturizerResource (controller)"""
 
         # Initialize the super-class
@@ -27,8 +45,24 @@ class FeaturizerResource(Resource, LoggableResource, CacheableResource):
         # Set the features extractor interface
         self.extractor_interface = extractor_interface
 
+        # Set the features extraction pool (parallel execution)
+        self.extractor_pool = extractor_pool
+
+        # Set the features results cache (per-subject, per-feature)
+        self.extractor_cache = extractor_cache
+
+        # Set the features extraction supervisor (time budgets of the features, deadlines of the requests)
+        self.extractor_supervisor = extractor_supervisor
+
+        # Set the sample store (sample handles)
+        self.sample_store = sample_store
+
+        # Set the dataset featurizer (server-side datasets)
+        self.dataset_featurizer = dataset_featurizer
+
     @jwt_required()
-    @ApiCache(expired_time=CacheableResource.CACHE_EXPIRATION_TIME)
+    @instrument_request("featurize", server_timing=InstrumentedResource.SERVER_TIMING)
+    @RequestCache(expired_time=CacheableResource.CACHE_EXPIRATION_TIME)
     def post(self):
         """
         Computes the features from the data for 1-M subjects.
@@ -51,12 +85,18 @@ class FeaturizerResource(Resource, LoggableResource, CacheableResource):
         with these field-value pairs (example bellow):
 
         - ``samples`` (``dict``, mandatory)
-        - ``samples.values`` (``np.array``, mandatory)
+        - ``samples.values`` (``np.array``, mandatory; or ``samples.handle``)
+        - ``samples.handle`` (``str``, optional)
+        - ``samples.offsets`` (``list``, optional)
+        - ``samples.dataset`` (``dict``, optional)
         - ``samples.labels`` (``list``, optional)
+        - ``samples.dtype`` (``str``, optional)
         - ``features`` (``dict``, mandatory)
         - ``features.pipeline`` (``list``, mandatory)
         - ``features.pipeline[0..., F]`` (``dict``, mandatory)
         - ``extractor_configuration`` (``dict``, optional)
+        - ``output_configuration`` (``dict``, optional)
+        - ``deadline_in_seconds`` (``float``, optional)
 
         .. code-block:: python
 
@@ -114,6 +154,7 @@ class FeaturizerResource(Resource, LoggableResource, CacheableResource):
         - ``features`` (``dict``, mandatory)
         - ``features.values`` (``np.array``, mandatory)
         - ``features.labels`` (``list``, optional)
+        - ``features.errors`` (``list``, optional)
 
         .. code-block:: python
 
@@ -131,6 +172,164 @@ class FeaturizerResource(Resource, LoggableResource, CacheableResource):
         is obtained (``api.wrapper.data.DataWrapper.unwrap_data``; see the
         example bellow).
 
+        **Ragged samples**
+
+        The subjects of different lengths (the last dimension of the samples)
+        are sent without padding: ``samples.values`` holds the samples of all
+        subjects concatenated along the last dimension, and ``samples.offsets``
+        holds the offsets of the subjects (``subjects + 1`` increasing integers
+        from 0 to the length of the last dimension). The extractor gets the
+        unpadded view on the samples of each subject (with the subject
+        dimension of size 1), and the features of the subjects are stacked
+        (see: ``api.interfaces.inputs.ragged.RaggedArray``).
+
+        .. code-block:: python
+
+            # Example: 3 subjects of 2-D samples of the lengths 100, 20 and 5000
+            {
+                "samples": {
+                    "values": np.array((2, 5120)),
+                    "offsets": [0, 100, 120, 5120]
+                },
+                "features": {"pipeline": [{"name": "feature 1", "args": {}}]}
+            }
+
+        **Time budgets and deadlines**
+
+        The features can have the time budgets (per feature name, or the
+        default one; configured at ``execution.json``), and the request can
+        have the deadline (the ``X-Featurizer-Deadline`` header or the
+        ``deadline_in_seconds`` field, in seconds). If any of them applies, the
+        pipeline elements are extracted by the killable worker processes (see:
+        ``api.featurization.execution.supervisor``): the element over its
+        budget (or over the deadline) is killed, its features are NaN (one
+        column labeled by the feature name), and the error is annotated in
+        ``features.errors`` (the rest of the features is returned; the partial
+        responses are not cached). If the client disconnects, the extraction
+        is cancelled.
+
+        .. code-block:: python
+
+            # Example: the 2nd feature exceeded its time budget
+            {
+                "features": {
+                    "labels": ["feature 1", "feature 2"],
+                    "values": np.array((10, 2)),
+                    "errors": [
+                        {
+                            "index": 1,
+                            "feature": "feature 2",
+                            "message": "Features extraction timed out after 2.000 s"
+                        }
+                    ]
+                }
+            }
+
+        **Sample handles**
+
+        The sample values uploaded via the ``/samples`` endpoint are referenced
+        by their handle (``samples.handle``) instead of being sent in
+        ``samples.values``, so the same samples can be featurized with many
+        pipelines without being uploaded and decoded again (see:
+        ``api.resources.samples.py``).
+
+        **Server-side datasets**
+
+        The datasets larger than the memory are referenced as the ``.npy``
+        files under the configured data root (``samples.dataset.path``) instead
+        of being sent in ``samples.values``. The dataset is memory-mapped and
+        featurized in the bounded chunks of subjects, and the features are
+        written to the ``.npy`` file under the configured output root
+        (``samples.dataset.output``, defaults to ``<path>.features.npy``). The
+        response holds the feature labels and the description of the output
+        file instead of the feature values (see:
+        ``api.datasets.featurizer.DatasetFeaturizer``).
+
+        .. code-block:: python
+
+            # Request body
+            {
+                "samples": {"dataset": {"path": "recordings/holter.npy", "output": "features/holter.npy"}},
+                "features": {"pipeline": [{"name": "feature 1", "args": {}}]}
+            }
+
+            # Response body
+            {
+                "features": {
+                    "labels": ["feature 1"],
+                    "dataset": {"path": "features/holter.npy", "shape": [100000, 1], "dtype": "float64"}
+                }
+            }
+
+        **Data types and encoding**
+
+        The sample values are cast to ``samples.dtype`` before the extraction
+        (``float16``, ``float32`` or ``float64``; e.g. to run the extraction in
+        ``float32`` if the library supports it). The feature values are cast to
+        ``output_configuration.dtype`` before they are sent (for all of the
+        media types), and ``output_configuration.encoding`` selects how they
+        are JSON-serialized: ``list`` (default; nested lists) or ``base64``
+        (the raw buffer with dtype and shape; deserialized by ``unwrap_data``).
+
+        .. code-block:: python
+
+            # Example: float32 features sent as the base64-encoded raw buffer
+            {
+                "output_configuration": {
+                    "dtype": "float32",
+                    "encoding": "base64"
+                }
+            }
+
+        **Binary transport**
+
+        To avoid the JSON-serialization of large samples/features, the request
+        can be sent and the response can be received as NumPy buffers:
+
+        - ``Content-Type: application/x-npy``: the body is the ``.npy`` buffer
+          with the sample values, the rest of the input data (``samples.labels``,
+          ``features`` and ``extractor_configuration``) is sent as the JSON
+          header in the ``X-Featurizer-Header`` HTTP header
+        - ``Content-Type: application/x-npz``: the body is the ``.npz`` archive
+          with the ``values`` member (sample values) and the ``header`` member
+          (JSON-string with the rest of the input data)
+        - ``Accept: application/x-npz``: the response is the ``.npz`` archive
+          with the ``values`` member (feature values) and the ``header`` member
+          (JSON-string with ``features.labels``)
+
+        The binary sample values are not copied: they are decoded as a read-only
+        view on the request buffer (``api.wrapper.data.BinaryDataWrapper``).
+
+        **Streaming**
+
+        With ``Accept: application/x-ndjson``, the features are streamed as
+        newline-delimited JSON records: one record per subject (``index`` and
+        ``values`` as nested lists) as soon as the subject's chunk is featurized,
+        followed by the trailer with the feature labels (``labels``; and the
+        ``errors`` of the timed-out features). If an error occurs after the
+        streaming has started, the last record is ``error``.
+
+        .. code-block:: python
+
+            {"index": 0, "values": [[0.1, ... 0.5], [0.6, ... 0.9]]}
+            ...
+            {"index": 9, "values": [[0.2, ... 0.4], [0.3, ... 0.7]]}
+            {"labels": ["feature 1", ... "feature 5"]}
+
+        **Compression**
+
+        The request body can be sent compressed (``Content-Encoding: gzip`` or
+        ``deflate``; it is decompressed incrementally up to the configured size,
+        HTTP 413 is returned above it), and the response is compressed if it is
+        negotiated via the ``Accept-Encoding`` header (see: ``api.compression``).
+
+        **Metrics**
+
+        The runtime of the workflow steps (``unwrap``, ``sample``, ``pipeline``,
+        ``extractor``, ``extraction``, ``features``, ``wrap`` and ``logging``)
+        is sent in the ``Server-Timing`` header of the response, and it is
+        aggregated into the histograms served at the ``/metrics`` endpoint.
+
         **Workflow**
 
         1. Unwrap the input request
@@ -220,34 +419,263 @@ class FeaturizerResource(Resource, LoggableResource, CacheableResource):
             #  7. Wrap the output response
             #  8. Send the successful HTTP Response
 
+            # Negotiate the media type of the response
+            media_type = get_response_media_type(flask.request)
+
+            # Prepare the stage timer (the stages are sent in the Server-Timing header)
+            timer = get_stage_timer()
+
             # Unwrap the input request
-            request = RequestWrapper.unwrap_request(flask.request)
-            self.log_request_data(request)
+            with timer.stage("unwrap"):
+                request = RequestWrapper.unwrap_request(flask.request)
+            with timer.stage("logging"):
+                self.log_request_data(request)
+
+            # Featurize the server-side dataset (if referenced)
+            if Dataset.is_requested(request):
+                return self.featurize_dataset(request)
 
-            # Prepare and validate the data samples
-            samples = Sample.from_request(request)
+            # Prepare and validate the data samples (resolve the sample handle)
+            with timer.stage("sample"):
+                request = resolve_sample_handle(request, self.sample_store, get_jwt_identity())
+                samples = Sample.from_request(request)
 
             # Prepare and validate the features pipeline and the features extractor configuration
-            pipeline = FeaturesPipeline.from_request(request)
-            settings = FeaturesExtractorConfiguration.from_request(request)
+            with timer.stage("pipeline"):
+                pipeline = FeaturesPipeline.from_request(request)
+                settings = FeaturesExtractorConfiguration.from_request(request)
+                output = FeaturesOutputConfiguration.from_request(request)
+                deadline = self.get_deadline(request)
 
             # Prepare the features extractor
-            extractor = FeaturesExtractorPipeline(self.extractor_interface, samples, settings)
-
-            # Extract the features specified in the features pipeline
-            features = extractor.extract(pipeline)
+            with timer.stage("extractor"):
+                extractor = FeaturesExtractorPipeline(
+                    self.extractor_interface,
+                    samples,
+                    settings,
+                    pool=self.extractor_pool,
+                    cache=self.extractor_cache,
+                    supervisor=self.extractor_supervisor,
+                    deadline=deadline)
+
+            # Stream the features specified in the features pipeline (if negotiated)
+            if is_streaming_media_type(media_type):
+                return self.stream_features(extractor, pipeline, output, media_type)
+
+            # Extract the features specified in the features pipeline (the partial features are not cached)
+            with timer.stage("extraction"):
+                features = extractor.extract(pipeline)
+                flask.g.response_cache_bypass = bool(features.get("errors"))
 
             # Prepare and validate the features
-            features = Features(features).to_response()
-            self.log_response_data(features)
+            with timer.stage("features"):
+                if is_binary_media_type(media_type):
+                    features = Features(features, **output.output_configuration).to_binary_response()
+                else:
+                    features = Features(features, **output.output_configuration).to_response()
+            with timer.stage("logging"):
+                self.log_response_data(features)
 
             # Wrap the output response
-            response = ResponseWrapper.wrap_response(features)
+            with timer.stage("wrap"):
+                if is_binary_media_type(media_type):
+                    response = ResponseWrapper.wrap_binary_response(features)
+                else:
+                    response = ResponseWrapper.wrap_response(features)
 
             # Send the successful HTTP Response
-            return flask.Response(response=response, status=HTTPStatus.OK, mimetype="application/json")
+            return flask.Response(response=response, status=HTTPStatus.OK, mimetype=media_type)
 
         # Handle the error logging
         except Exception as e:
             self.application_logger.error(e)
             raise
+
+    def get_deadline(self, request):
+        """
+        Gets the deadline of the request (the deadlines are bounded by the configuration of the supervisor).
+
+        :param request: unwrapped request (the input data with ``deadline_in_seconds``)
+        :type request: dict
+        :return: deadline of the request (with the probe of the client disconnection)
+        :rtype: api.featurization.execution.deadline.FeaturesExtractionDeadline
+        """
+        supervisor = self.extractor_supervisor
+        return FeaturesExtractionDeadline.from_request(
+            flask.request,
+            request,
+            default=supervisor.default_deadline if supervisor else None,
+            maximum=supervisor.max_deadline if supervisor else None,
+            elapsed=get_stage_timer().total)
+
+    def featurize_dataset(self, request):
+        """
+        Featurizes the server-side dataset (the features are written to the output .npy file).
+
+        :param request: unwrapped request (the input data with ``samples.dataset``)
+        :type request: dict
+        :return: HTTP Response with the feature labels and the description of the features output
+        :rtype: flask.Response
+        """
+        timer = get_stage_timer()
+
+        # Validate the dataset, the features pipeline and the features extractor/output configuration
+        with timer.stage("sample"):
+            if not self.dataset_featurizer:
+                raise marshmallow.ValidationError("Datasets are not enabled.", "samples.dataset")
+            dataset = Dataset.from_request(request)
+        with timer.stage("pipeline"):
+            pipeline = FeaturesPipeline.from_request(request)
+            settings = FeaturesExtractorConfiguration.from_request(request)
+            output = FeaturesOutputConfiguration.from_request(request)
+
+        # Featurize the dataset in the chunks of subjects
+        with timer.stage("extraction"):
+            features = {"features": self.dataset_featurizer.featurize(
+                dataset,
+                self.extractor_interface,
+                pipeline,
+                settings,
+                output_configuration=output.output_configuration,
+                pool=self.extractor_pool,
+                cache=self.extractor_cache)}
+        with timer.stage("logging"):
+            self.log_response_data(features)
+
+        # Wrap the output response
+        with timer.stage("wrap"):
+            response = ResponseWrapper.wrap_response(features)
+
+        # Send the successful HTTP Response
+        return flask.Response(response=response, status=HTTPStatus.OK, mimetype=MEDIA_TYPE_JSON)
+
+    def stream_features(self, extractor, pipeline, output, media_type):
+        """
+        Streams the features (per-subject records followed by the trailer with the feature labels).
+
+        The first chunk of subjects is featurized before the streaming starts,
+        so the errors in the input data/pipeline are reported as the standard
+        error responses (the later errors are reported as the error record).
+
+        :param extractor: features extractor pipeline
+        :type extractor: api.featurization.interface.FeaturesExtractorPipeline
+        :param pipeline: pipeline with the feature names and kwargs
+        :type pipeline: api.interfaces.inputs.FeaturesPipeline
+        :param output: features output configuration (data type of the feature values)
+        :type output: api.interfaces.inputs.FeaturesOutputConfiguration
+        :param media_type: media type of the streaming response
+        :type media_type: str
+        :return: streaming HTTP Response
+        :rtype: flask.Response
+        """
+
+        # Extract and validate the features of the first chunk of subjects
+        chunks = extractor.iter_extract(pipeline, chunk_size=self.STREAM_CHUNK_SIZE)
+        with get_stage_timer().stage("extraction"):
+            start, extracted = next(chunks)
+        with get_stage_timer().stage("features"):
+            features = Features(extracted, **output.output_configuration)
+            records = features.to_stream_records(start)
+
+        # Collect the errors of the timed-out features (the first error of each of the pipeline elements)
+        errors = {}
+
+        def collect_errors(chunk_extracted):
+            """Collects the errors of the timed-out features of the chunk"""
+            for error in chunk_extracted.get("errors") or []:
+                errors.setdefault(error["index"], error)
+
+        def generate():
+            """Generates the streamed records"""
+            nonlocal features
+            try:
+
+                # Stream the per-subject records of the first chunk of subjects
+                collect_errors(extracted)
+                for record in records:
+                    yield ResponseWrapper.wrap_stream_record(record)
+
+                # Stream the per-subject records of the next chunks of subjects
+                for chunk_start, chunk_extracted in chunks:
+                    collect_errors(chunk_extracted)
+                    features = Features(chunk_extracted, **output.output_configuration)
+                    for record in features.to_stream_records(chunk_start):
+                        yield ResponseWrapper.wrap_stream_record(record)
+
+                # Stream the trailer with the feature labels (and the errors of the timed-out features)
+                trailer = features.to_stream_trailer([errors[index] for index in sorted(errors)])
+                self.log_response_data({"features": trailer})
+                yield ResponseWrapper.wrap_stream_record(trailer)
+
+            # Handle the closed response (the client disconnected): cancel the extraction
+            except GeneratorExit:
+                if extractor.deadline is not None:
+                    extractor.deadline.cancel()
+                raise
+
+            # Handle the error (the streaming has already started)
+            except Exception as e:
+                self.application_logger.error(e)
+                yield ResponseWrapper.wrap_stream_record({"error": {"message": str(e)}})
+
+        # Send the streaming HTTP Response
+        return flask.Response(flask.stream_with_context(generate()), status=HTTPStatus.OK, mimetype=media_type)
+
+
+# ------------------------------------------------------------ #
+# Featurizer API Resource definition (per-library featurizers) #
+# ------------------------------------------------------------ #
+
+class FeaturizerLibraryResource(FeaturizerResource):
+    """Class implementing the featurizer API resource of the libraries served at /featurize/<library> (controller)"""
+
+    def __init__(self, libraries=None, sample_store=None, dataset_featurizer=None):
+        """Initializes the FeaturizerLibraryResource (controller)"""
+
+        # Initialize the super-class (the features extractor of the library is set per request)
+        super().__init__(sample_store=sample_store, dataset_featurizer=dataset_featurizer)
+
+        # Set the registry of the features extraction libraries
+        self.libraries = libraries
+
+    @jwt_required()
+    def post(self, library):
+        """
+        Computes the features from the data for 1-M subjects via the features extraction library <library>.
+
+        The input and output data are the same as of the ``/featurize``
+        endpoint (see: ``FeaturizerResource.post``). The library is injected on
+        its first use, and it gets its own features extraction pool, features
+        results cache, supervisor and registered exceptions (see:
+        ``api.featurization.libraries.registry.FeaturesExtractionLibraryRegistry``).
+        The library is acquired until the response is sent (until the streamed
+        response is closed), so it is not unloaded while it is in use.
+
+        :param library: name of the features extraction library (configured at ``injection.json``)
+        :type library: str
+        :return: features (or HTTP 404 if the library is unknown)
+        :rtype: flask.Response
+        """
+
+        # Acquire the library (inject and load it if needed)
+        if self.libraries is None or library not in self.libraries:
+            return {"message": f"Unknown features extraction library: {library}"}, HTTPStatus.NOT_FOUND
+        injected = self.libraries.acquire(library)
+
+        # Set the features extractor, the pool, the cache and the supervisor of the library
+        self.extractor_interface = injected.extractor
+        self.extractor_pool = injected.pool
+        self.extractor_cache = injected.cache
+        self.extractor_supervisor = injected.supervisor
+
+        # Featurize the input data (release the library when the response is sent or the streamed response is closed)
+        streamed = False
+        try:
+            response = super().post()
+            if isinstance(response, flask.Response) and response.is_streamed:
+                response.call_on_close(lambda: self.libraries.release(injected))
+                streamed = True
+            return response
+        finally:
+            if not streamed:
+                self.libraries.release(injected)
@@ -0,0 +1,208 @@
+import flask
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from http import HTTPStatus
+from api.jobs.store import JobsQueueFullException, JOB_COMPLETED
+from api.samples import resolve_sample_handle
+from api.wrappers.data import BinaryDataWrapper
+from api.wrappers.request import RequestWrapper
+from api.wrappers.response import ResponseWrapper
+from api.wrappers.media import get_response_media_type, is_binary_media_type
+from api.interfaces.inputs.ragged import RaggedArray
+from api.interfaces.inputs.interface import (
+    Sample,
+    FeaturesExtractorConfiguration,
+    FeaturesOutputConfiguration,
+    FeaturesPipeline
+)
+from api.interfaces.outputs.interface import Features
+from api.resources.base import LoggableResource
+
+
+# ------------------------------------------- #
+# Featurization jobs API Resources definition #
+# ------------------------------------------- #
+
+class BaseJobResource(Resource, LoggableResource):
+    """Base class for the featurization jobs resources"""
+
+    def __init__(self, jobs=None, sample_store=None):
+        """Initializes the BaseJobResource (controller)"""
+
+        # Initialize the super-class
+        super().__init__()
+
+        # Set the featurization jobs worker pool
+        self.jobs = jobs
+
+        # Set the sample store (sample handles)
+        self.sample_store = sample_store
+
+    @staticmethod
+    def get_job_status(job):
+        """Returns the job status data to be used in the response"""
+        return {
+            "job": {
+                "id": job["id"],
+                "status": job["status"],
+                "subjects_done": job["subjects_done"],
+                "subjects_total": job["subjects_total"],
+                "error": job["error"]
+            }
+        }
+
+
+class FeaturizerJobsResource(BaseJobResource):
+    """Class implementing the featurization jobs submission API resource"""
+
+    @jwt_required()
+    def post(self):
+        """
+        Submits the asynchronous featurization job.
+
+        The method expects the same input data as the ``/featurize`` endpoint
+        (including the binary transport, see: ``api.resources.featurizer.py``).
+        The input data are validated, the job is queued for the local worker
+        pool, and the job identifier is returned immediately. The job queue is
+        bounded (HTTP 503 is returned if it is full) and persistent (the queued
+        jobs survive the restarts).
+
+        :return: submitted job status (id, status, subjects_done, subjects_total)
+        :rtype: dict
+
+        **Example**
+
+        .. code-block:: python
+
+            import time
+            import requests
+
+            # Submit the job (body: the same as for the /featurize endpoint)
+            response = requests.post(
+                url="http://localhost:5000/featurize/jobs",
+                json=body,
+                headers=headers)
+            job = response.json().get("job")
+
+            # Poll the job status
+            while job.get("status") in ("queued", "running"):
+                time.sleep(5)
+                job = requests.get(
+                    url=f"http://localhost:5000/featurize/jobs/{job.get('id')}",
+                    headers=headers).json().get("job")
+
+            # Fetch the features (the same output data as for the /featurize endpoint)
+            response = requests.get(
+                url=f"http://localhost:5000/featurize/jobs/{job.get('id')}/result",
+                headers=headers)
+        """
+
+        try:
+
+            # Unwrap the input request
+            request = RequestWrapper.unwrap_request(flask.request)
+            self.log_request_data(request)
+
+            # Prepare and validate the data samples, the features pipeline and the features extractor/output configuration
+            samples = Sample.from_request(resolve_sample_handle(request, self.sample_store, get_jwt_identity()))
+            pipeline = FeaturesPipeline.from_request(request)
+            settings = FeaturesExtractorConfiguration.from_request(request)
+            output = FeaturesOutputConfiguration.from_request(request)
+
+            # Wrap the validated request (values and the JSON header; the flat values and the offsets if ragged)
+            ragged = isinstance(samples.values, RaggedArray)
+            header = {
+                "samples": {"labels": samples.labels, "offsets": samples.values.offsets.tolist() if ragged else None},
+                "features": {"pipeline": pipeline.pipeline},
+                "extractor_configuration": settings.extractor_configuration,
+                "output_configuration": output.output_configuration
+            }
+            wrapped = BinaryDataWrapper.wrap_npz(samples.values.values if ragged else samples.values, header=header)
+
+            # Submit the job
+            try:
+                job = self.jobs.store.submit(get_jwt_identity(), wrapped, samples.values.shape[0])
+            except JobsQueueFullException as e:
+                return {"message": str(e)}, HTTPStatus.SERVICE_UNAVAILABLE
+
+            # Notify the workers
+            self.jobs.notify()
+
+            # Send the accepted HTTP Response
+            response = self.get_job_status(job)
+            self.log_response_data(response)
+            return response, HTTPStatus.ACCEPTED, {"Location": f"{flask.request.path}/{job['id']}"}
+
+        # Handle the error logging
+        except Exception as e:
+            self.application_logger.error(e)
+            raise
+
+
+class FeaturizerJobResource(BaseJobResource):
+    """Class implementing the featurization job status API resource"""
+
+    @jwt_required()
+    def get(self, job_id):
+        """
+        Returns the featurization job status (progress).
+
+        :param job_id: identifier of the job
+        :type job_id: str
+        :return: job status (id, status, subjects_done, subjects_total, error)
+        :rtype: dict
+        """
+
+        # Make sure the workers are running in this process
+        self.jobs.start()
+
+        # Get the job
+        job = self.jobs.store.get(job_id, owner=get_jwt_identity())
+        if not job:
+            return {"message": "Job not found"}, HTTPStatus.NOT_FOUND
+
+        # Return the job status
+        return self.get_job_status(job), HTTPStatus.OK
+
+
+class FeaturizerJobResultResource(BaseJobResource):
+    """Class implementing the featurization job result API resource"""
+
+    @jwt_required()
+    def get(self, job_id):
+        """
+        Returns the features computed by the featurization job.
+
+        The output data (and the content negotiation via the Accept header) are
+        the same as for the ``/featurize`` endpoint. If the job has not been
+        completed (yet), HTTP 409 is returned with the job status.
+
+        :param job_id: identifier of the job
+        :type job_id: str
+        :return: extracted features
+        :rtype: flask.Response
+        """
+
+        # Negotiate the media type of the response
+        media_type = get_response_media_type(flask.request)
+
+        # Get the job
+        job = self.jobs.store.get(job_id, owner=get_jwt_identity(), with_result=True)
+        if not job:
+            return {"message": "Job not found"}, HTTPStatus.NOT_FOUND
+        if job["status"] != JOB_COMPLETED:
+            return {"message": f"Job not completed ({job['status']})", **self.get_job_status(job)}, HTTPStatus.CONFLICT
+
+        # Wrap the output response (the result is stored already wrapped for the binary transport)
+        if is_binary_media_type(media_type):
+            response = job["result"]
+        else:
+            values, header = BinaryDataWrapper.unwrap_npz(job["result"])
+            features = {"values": values, "labels": header.get("features", {}).get("labels", [])}
+            if header.get("features", {}).get("errors"):
+                features["errors"] = header["features"]["errors"]
+            output = header.get("output_configuration") or {}
+            response = ResponseWrapper.wrap_response(Features(features, **output).to_response())
+
+        # Send the successful HTTP Response
+        return flask.Response(response=response, status=HTTPStatus.OK, mimetype=media_type)
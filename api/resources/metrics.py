@@ -0,0 +1,32 @@
+import flask
+from flask_restful import Resource
+from http import HTTPStatus
+from api.metrics import registry, METRICS_MEDIA_TYPE
+
+
+# ------------------------------- #
+# Metrics API Resource definition #
+# ------------------------------- #
+
+class MetricsResource(Resource):
+    """Class implementing the metrics API resource"""
+
+    def get(self):
+        """
+        Returns the metrics of the featurizer API (Prometheus text exposition format).
+
+        The metrics comprise the histograms of the request runtime, the runtime
+        of the request processing stages (the same stages are sent in the
+        ``Server-Timing`` header of the ``/featurize`` responses), the size of
+        the request/response bodies, the requests in flight, and the hits and
+        misses of the request-response cache and the features results cache,
+        and the predicted and actual costs of the scheduled features extraction.
+        The metrics are collected per process: under the pre-fork server
+        (``gunicorn.conf.py``), each scrape is served by one of the server
+        workers, and it reports the metrics of that worker only (the metrics
+        are not aggregated across the workers).
+
+        :return: metrics
+        :rtype: flask.Response
+        """
+        return flask.Response(response=registry.render(), status=HTTPStatus.OK, content_type=METRICS_MEDIA_TYPE)
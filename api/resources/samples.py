@@ -0,0 +1,127 @@
+import flask
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from http import HTTPStatus
+from api.samples.store import SampleQuotaExceededException
+from api.wrappers.request import RequestWrapper
+from api.interfaces.inputs.interface import Sample
+from api.interfaces.inputs.ragged import RaggedArray
+from api.resources.base import LoggableResource
+
+
+# ------------------------------------- #
+# Sample store API Resources definition #
+# ------------------------------------- #
+
+class BaseSampleResource(Resource, LoggableResource):
+    """Base class for the sample store resources"""
+
+    def __init__(self, store=None):
+        """Initializes the BaseSampleResource (controller)"""
+
+        # Initialize the super-class
+        super().__init__()
+
+        # Set the sample store
+        self.store = store
+
+
+class SamplesResource(BaseSampleResource):
+    """Class implementing the sample upload API resource"""
+
+    @jwt_required()
+    def post(self):
+        """
+        Uploads (validates and stores) the sample values and returns their handle.
+
+        The method expects the ``samples`` of the same structure as the input
+        data of the ``/featurize`` endpoint (including the binary transport and
+        the ``samples.dtype`` casting, see: ``api.resources.featurizer.py``).
+        The validated sample values are stored once, and the content-hash
+        handle is returned. The handle can be then sent in ``samples.handle``
+        instead of ``samples.values`` to the ``/featurize`` endpoints, so the
+        values are neither uploaded nor decoded again. The stored values expire
+        after a period of no use, and they are subject to the per-user quotas
+        (HTTP 507 is returned if a quota is exceeded). The ragged samples are
+        stored as their flat values (``samples.offsets`` is then sent together
+        with the handle).
+
+        :return: stored sample description (handle, shape, dtype, size_in_bytes)
+        :rtype: dict
+
+        **Example**
+
+        .. code-block:: python
+
+            # Upload the samples
+            response = requests.post(
+                url="http://localhost:5000/samples",
+                json={"samples": {"values": DataWrapper.wrap_data(samples)}},
+                headers=headers)
+            handle = response.json().get("sample").get("handle")
+
+            # Featurize the uploaded samples (with many different pipelines)
+            response = requests.post(
+                url="http://localhost:5000/featurize",
+                json={"samples": {"handle": handle}, "features": {"pipeline": features_pipeline}},
+                headers=headers)
+        """
+
+        try:
+
+            # Unwrap the input request
+            request = RequestWrapper.unwrap_request(flask.request)
+            self.log_request_data(request)
+
+            # Prepare and validate the data samples
+            samples = Sample.from_request(request)
+
+            # Store the sample values (the flat values of the ragged samples)
+            values = samples.values.values if isinstance(samples.values, RaggedArray) else samples.values
+            try:
+                sample = self.store.put(values, get_jwt_identity())
+            except SampleQuotaExceededException as e:
+                return {"message": str(e)}, HTTPStatus.INSUFFICIENT_STORAGE
+
+            # Send the created HTTP Response
+            response = {"sample": sample}
+            self.log_response_data(response)
+            return response, HTTPStatus.CREATED, {"Location": f"{flask.request.path}/{sample['handle']}"}
+
+        # Handle the error logging
+        except Exception as e:
+            self.application_logger.error(e)
+            raise
+
+
+class SampleResource(BaseSampleResource):
+    """Class implementing the stored sample API resource"""
+
+    @jwt_required()
+    def get(self, handle):
+        """
+        Returns the description of the stored sample values (marks them as used).
+
+        :param handle: handle of the sample values
+        :type handle: str
+        :return: stored sample description (handle, shape, dtype, size_in_bytes)
+        :rtype: dict
+        """
+        sample = self.store.describe(handle, get_jwt_identity())
+        if not sample:
+            return {"message": "Sample not found"}, HTTPStatus.NOT_FOUND
+        return {"sample": sample}, HTTPStatus.OK
+
+    @jwt_required()
+    def delete(self, handle):
+        """
+        Deletes the stored sample values (of the user).
+
+        :param handle: handle of the sample values
+        :type handle: str
+        :return: None
+        :rtype: None type
+        """
+        if not self.store.delete(handle, get_jwt_identity()):
+            return {"message": "Sample not found"}, HTTPStatus.NOT_FOUND
+        return None, HTTPStatus.NO_CONTENT
@@ -5,6 +5,7 @@ from webargs import validate
 from webargs import fields
 from webargs.flaskparser import use_args, use_kwargs
 from api.authentication.database.models import User
+from api.authentication.hashing import PasswordHasherBusyException
 
 
 # --------------------------------- #
@@ -77,10 +78,16 @@ class SignupResource(BaseUserResource):
         if self.model.get_by_username(username):
             return {"message": "Username already exist"}, HTTPStatus.BAD_REQUEST
 
-        # Create the new user
+        # Create the new user (the password is hashed by the password hasher)
         user = self.model(username=username, password=password)
-        user.hash_password()
-        user.save()
+        try:
+            user.hash_password()
+        except PasswordHasherBusyException as e:
+            return {"message": str(e)}, HTTPStatus.SERVICE_UNAVAILABLE
+
+        # Save the new user (the concurrent sign-ups of the same username violate the unique index)
+        if not user.save():
+            return {"message": "Username already exist"}, HTTPStatus.BAD_REQUEST
 
         # Return the response
         return {"username": str(user.username)}, HTTPStatus.CREATED
@@ -124,8 +131,11 @@ class LoginResource(BaseUserResource):
                 refresh_token = response.json().get("refresh_token")
         """
 
-        # Authenticate the user from the database
-        user = User.authenticate(username=username, password=password)
+        # Authenticate the user from the database (the password is verified by the password hasher)
+        try:
+            user = User.authenticate(username=username, password=password)
+        except PasswordHasherBusyException as e:
+            return {"message": str(e)}, HTTPStatus.SERVICE_UNAVAILABLE
         if not user:
             return {"message": "Invalid credentials"}, HTTPStatus.UNAUTHORIZED
 
@@ -0,0 +1,73 @@
+import os
+import marshmallow
+from api.configuration import load_configuration, application_path
+from api.samples.store import SampleStore
+
+
+# ------------------------------------------ #
+# Default sample store attributes definition #
+# ------------------------------------------ #
+DEFAULT_SAMPLES_DIRECTORY = "api/samples/storage"
+
+
+# ---------------------------------------------- #
+# Sample store configuration routines definition #
+# ---------------------------------------------- #
+
+def configure_samples_store():
+    """
+    Configures the store of the uploaded sample values (sample handles).
+
+    :return: sample store (None if the store is disabled)
+    :rtype: api.samples.store.SampleStore or None type
+    """
+
+    # Load the configuration
+    configuration = load_configuration("samples.json").get("samples", {})
+    if not configuration.get("enabled"):
+        return None
+
+    # Prepare the sample store
+    return SampleStore(
+        os.path.join(application_path, "..", configuration.get("directory") or DEFAULT_SAMPLES_DIRECTORY),
+        max_memory_size_in_bytes=configuration.get("max_memory_size_in_bytes"),
+        expiration_time=configuration.get("expiration_time_in_seconds"),
+        max_samples_per_owner=configuration.get("max_samples_per_user"),
+        max_size_per_owner_in_bytes=configuration.get("max_size_per_user_in_bytes"))
+
+
+# -------------------------------------------- #
+# Sample handles resolving routines definition #
+# -------------------------------------------- #
+
+def resolve_sample_handle(request, store, owner):
+    """
+    Resolves the sample handle in the request (places the stored values into ``samples.values``).
+
+    :param request: unwrapped request (the input data of the ``/featurize`` endpoint)
+    :type request: dict
+    :param store: sample store, or None if the store is disabled
+    :type store: api.samples.store.SampleStore or None type
+    :param owner: owner of the stored sample values (user identity)
+    :type owner: str
+    :return: request with the resolved sample values (the same request if there is no handle)
+    :rtype: dict
+    """
+    samples = request.get("samples") if isinstance(request, dict) else None
+    if not isinstance(samples, dict) or samples.get("handle") is None:
+        return request
+
+    # Validate the sample handle
+    if store is None:
+        raise marshmallow.ValidationError("Sample handles are not enabled.", "samples.handle")
+    if samples.get("values") is not None:
+        raise marshmallow.ValidationError("Only one of the values and the handle can be set.", "samples.handle")
+
+    # Get the stored sample values
+    values = store.get(samples["handle"], owner)
+    if values is None:
+        raise marshmallow.ValidationError("Unknown (or expired) sample handle.", "samples.handle")
+
+    # Return the request with the resolved sample values
+    samples = {key: value for key, value in samples.items() if key != "handle"}
+    return {**request, "samples": {**samples, "values": values}}
@@ -0,0 +1,349 @@
+import os
+import re
+import glob
+import time
+import uuid
+import hashlib
+import threading
+import numpy
+from collections import OrderedDict
+from pathlib import Path
+
+
+# ---------------------------------- #
+# Sample store exceptions definition #
+# ---------------------------------- #
+class SampleQuotaExceededException(Exception): pass
+
+
+# ---------------------------------- #
+# Sample store attributes definition #
+# ---------------------------------- #
+
+# Pattern of the sample handles (SHA-256 hex digest of the sample values)
+SAMPLE_HANDLE_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+# ----------------------------- #
+# Sample store class definition #
+# ----------------------------- #
+
+class SampleStore(object):
+    """
+    Class implementing the store of the uploaded sample values (addressed by the content-hash handles).
+
+    The sample values are stored once and then referenced by their handle (the
+    digest of the dtype, the shape and the bytes of the values). Each of the
+    stored arrays is written to a ``.npy`` file on the local disk (the arrays
+    directory), and the recently used arrays are kept in memory (LRU bounded by
+    the size of the arrays). The ownership of the arrays is stored per owner
+    (one marker file per owner and handle, its modification time is the last
+    use), so the arrays are shared by all processes of the application, the
+    arrays expire after the expiration time of no use by any of their owners,
+    and the quotas (the number and the size of the arrays) are enforced per
+    owner.
+    """
+
+    def __init__(
+            self,
+            directory,
+            max_memory_size_in_bytes=None,
+            expiration_time=None,
+            max_samples_per_owner=None,
+            max_size_per_owner_in_bytes=None,
+            purge_interval=60):
+        """
+        Initializes the SampleStore.
+
+        :param directory: directory of the store (arrays and owners)
+        :type directory: str
+        :param max_memory_size_in_bytes: maximum size of the arrays kept in memory, defaults to None (unbounded)
+        :type max_memory_size_in_bytes: int, optional
+        :param expiration_time: seconds after the last use an array expires, defaults to None (never)
+        :type expiration_time: int, optional
+        :param max_samples_per_owner: maximum number of the arrays per owner, defaults to None (unlimited)
+        :type max_samples_per_owner: int, optional
+        :param max_size_per_owner_in_bytes: maximum size of the arrays per owner, defaults to None (unlimited)
+        :type max_size_per_owner_in_bytes: int, optional
+        :param purge_interval: minimum seconds between purging the expired arrays, defaults to 60
+        :type purge_interval: int, optional
+        """
+
+        # Set the store directories
+        self.directory = directory
+        self.arrays_directory = os.path.join(directory, "arrays")
+        self.owners_directory = os.path.join(directory, "owners")
+        Path(self.arrays_directory).mkdir(parents=True, exist_ok=True)
+        Path(self.owners_directory).mkdir(parents=True, exist_ok=True)
+
+        # Set the store bounds
+        self.max_memory_size_in_bytes = max_memory_size_in_bytes
+        self.expiration_time = expiration_time
+        self.max_samples_per_owner = max_samples_per_owner
+        self.max_size_per_owner_in_bytes = max_size_per_owner_in_bytes
+        self.purge_interval = purge_interval
+
+        # Set the in-memory arrays (handle: array)
+        self._arrays = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._purged_at = 0
+
+    def __repr__(self):
+        return str({"directory": self.directory, "arrays": len(self._arrays), "size": self.size})
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def size(self):
+        """Returns the size of the arrays kept in memory (in bytes)"""
+        return self._size
+
+    @staticmethod
+    def get_handle(values):
+        """Returns the handle of the sample values (digest of the dtype, the shape and the bytes)"""
+        digest = hashlib.sha256(f"{values.dtype.str}{values.shape}".encode("utf8"))
+        digest.update(numpy.ascontiguousarray(values).data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def is_handle(handle):
+        """Checks if the handle is valid"""
+        return isinstance(handle, str) and SAMPLE_HANDLE_PATTERN.match(handle) is not None
+
+    def get_array_path(self, handle):
+        """Returns the path of the .npy file of the array"""
+        return os.path.join(self.arrays_directory, f"{handle}.npy")
+
+    def get_owner_directory(self, owner):
+        """Returns the directory of the owner markers"""
+        return os.path.join(self.owners_directory, hashlib.sha256(str(owner).encode("utf8")).hexdigest()[:32])
+
+    def get_marker_path(self, handle, owner):
+        """Returns the path of the owner marker of the array"""
+        return os.path.join(self.get_owner_directory(owner), handle)
+
+    def put(self, values, owner):
+        """
+        Stores the sample values (the already stored values are only re-owned/touched).
+
+        :param values: sample values
+        :type values: numpy.ndarray
+        :param owner: owner of the sample values (user identity)
+        :type owner: str
+        :return: description of the stored values (handle, shape, dtype, size_in_bytes)
+        :rtype: dict
+        """
+        self.purge()
+
+        # Get the handle of the sample values
+        handle = self.get_handle(values)
+        marker = self.get_marker_path(handle, owner)
+
+        with self._lock:
+
+            # Check the quotas of the owner (not for the values already owned)
+            if not os.path.exists(marker):
+                self.check_quotas(owner, values.nbytes)
+
+            # Write the array to the .npy file (the same content is written only once)
+            path = self.get_array_path(handle)
+            if not os.path.exists(path):
+                temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    with open(temporary, "wb") as f:
+                        numpy.save(f, numpy.ascontiguousarray(values), allow_pickle=False)
+                    os.replace(temporary, path)
+                finally:
+                    if os.path.exists(temporary):
+                        os.unlink(temporary)
+
+            # Mark the ownership (the modification time of the marker is the last use)
+            Path(os.path.dirname(marker)).mkdir(parents=True, exist_ok=True)
+            Path(marker).touch()
+
+            # Keep the array in memory
+            if handle in self._arrays:
+                self._arrays.move_to_end(handle)
+            else:
+                self._cache(handle, numpy.array(values, copy=True))
+
+        # Return the description of the stored values
+        return self.describe_array(handle, values)
+
+    def get(self, handle, owner):
+        """
+        Gets the stored sample values (read-only).
+
+        :param handle: handle of the sample values
+        :type handle: str
+        :param owner: owner of the sample values (user identity)
+        :type owner: str
+        :return: sample values or None if they are not stored (or not owned by the owner, or expired)
+        :rtype: numpy.ndarray or None type
+        """
+        if not self.is_handle(handle) or not self.touch(handle, owner):
+            return None
+
+        with self._lock:
+
+            # Get the array from memory
+            values = self._arrays.get(handle)
+            if values is not None:
+                self._arrays.move_to_end(handle)
+                return values
+
+            # Load the array from the .npy file (and keep it in memory)
+            try:
+                values = numpy.load(self.get_array_path(handle), allow_pickle=False)
+            except FileNotFoundError:
+                return None
+            return self._cache(handle, values)
+
+    def describe(self, handle, owner):
+        """Returns the description of the stored sample values (None if they are not stored/owned)"""
+        if not self.is_handle(handle) or not self.touch(handle, owner):
+            return None
+        try:
+            with open(self.get_array_path(handle), "rb") as f:
+                if numpy.lib.format.read_magic(f) == (1, 0):
+                    shape, _, dtype = numpy.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, _, dtype = numpy.lib.format.read_array_header_2_0(f)
+        except (OSError, ValueError):
+            return None
+        return self.describe_array(handle, numpy.empty(0, dtype=dtype), shape)
+
+    def delete(self, handle, owner):
+        """
+        Deletes the ownership of the stored sample values (the values are deleted if they have no owners).
+
+        :param handle: handle of the sample values
+        :type handle: str
+        :param owner: owner of the sample values (user identity)
+        :type owner: str
+        :return: True if the values were owned by the owner
+        :rtype: bool
+        """
+        if not self.is_handle(handle):
+            return False
+        try:
+            os.unlink(self.get_marker_path(handle, owner))
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self._delete_unowned(handle)
+        return True
+
+    def touch(self, handle, owner):
+        """Marks the use of the sample values by the owner (returns False if they are not owned or expired)"""
+        marker = self.get_marker_path(handle, owner)
+        try:
+            if self.is_expired(os.stat(marker).st_mtime):
+                return False
+            os.utime(marker)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def is_expired(self, used_at):
+        """Checks if the sample values last used at <used_at> are expired"""
+        return bool(self.expiration_time) and used_at + self.expiration_time < time.time()
+
+    def check_quotas(self, owner, size_in_bytes):
+        """Checks the quotas of the owner for storing the new sample values of <size_in_bytes>"""
+        handles = [
+            os.path.basename(marker) for marker in glob.glob(os.path.join(self.get_owner_directory(owner), "*"))
+            if self.is_handle(os.path.basename(marker))
+        ]
+
+        # Check the number of the sample values
+        if self.max_samples_per_owner and len(handles) + 1 > self.max_samples_per_owner:
+            raise SampleQuotaExceededException(f"Quota exceeded (maximum samples: {self.max_samples_per_owner})")
+
+        # Check the size of the sample values
+        if self.max_size_per_owner_in_bytes:
+            size = size_in_bytes
+            for handle in handles:
+                try:
+                    size += os.path.getsize(self.get_array_path(handle))
+                except OSError:
+                    pass
+            if size > self.max_size_per_owner_in_bytes:
+                raise SampleQuotaExceededException(
+                    f"Quota exceeded (maximum size of the samples: {self.max_size_per_owner_in_bytes} bytes)")
+
+    def purge(self, force=False):
+        """
+        Deletes the expired ownerships, and the sample values without owners.
+
+        :param force: purge regardless of the purge interval, defaults to False
+        :type force: bool, optional
+        :return: number of the deleted sample values
+        :rtype: int
+        """
+        if not self.expiration_time:
+            return 0
+        if not force and time.time() - self._purged_at < self.purge_interval:
+            return 0
+        self._purged_at = time.time()
+
+        # Delete the expired ownerships
+        handles = set()
+        for marker in glob.glob(os.path.join(self.owners_directory, "*", "*")):
+            try:
+                if self.is_expired(os.stat(marker).st_mtime):
+                    os.unlink(marker)
+                    handles.add(os.path.basename(marker))
+            except FileNotFoundError:
+                pass
+
+        # Delete the sample values without owners
+        with self._lock:
+            return sum(self._delete_unowned(handle) for handle in handles if self.is_handle(handle))
+
+    def _delete_unowned(self, handle):
+        """Deletes the sample values if they have no owners (returns True if deleted)"""
+        if glob.glob(os.path.join(self.owners_directory, "*", handle)):
+            return False
+        values = self._arrays.pop(handle, None)
+        if values is not None:
+            self._size -= values.nbytes
+        try:
+            os.unlink(self.get_array_path(handle))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _cache(self, handle, values):
+        """Keeps the array in memory (evicts the least recently used arrays if needed; returns the array)"""
+        values.setflags(write=False)
+
+        # Do not keep the arrays exceeding the memory size
+        if self.max_memory_size_in_bytes and values.nbytes > self.max_memory_size_in_bytes:
+            return values
+
+        # Keep the array
+        if handle in self._arrays:
+            self._size -= self._arrays.pop(handle).nbytes
+        self._arrays[handle] = values
+        self._size += values.nbytes
+
+        # Evict the least recently used arrays (they stay on the disk)
+        while self.max_memory_size_in_bytes and self._size > self.max_memory_size_in_bytes:
+            self._size -= self._arrays.popitem(last=False)[1].nbytes
+
+        # Return the array
+        return values
+
+    @staticmethod
+    def describe_array(handle, values, shape=None):
+        """Returns the description of the sample values (handle, shape, dtype, size_in_bytes)"""
+        shape = tuple(values.shape if shape is None else shape)
+        return {
+            "handle": handle,
+            "shape": list(shape),
+            "dtype": values.dtype.name,
+            "size_in_bytes": int(numpy.prod(shape, dtype=numpy.int64)) * values.dtype.itemsize
+        }
@@ -1,6 +1,47 @@
+import io
+import json
+import base64
+import numpy
 import json_tricks
 
 
+# ------------------------------------------------- #
+# Data types and encodings of the values definition #
+# ------------------------------------------------- #
+
+# Data types the sample/feature values can be cast to
+DATA_DTYPES = ("float16", "float32", "float64")
+
+# Encodings of the JSON-serialized values (nested lists, or base64-encoded raw buffer)
+DATA_ENCODING_LIST = "list"
+DATA_ENCODING_BASE64 = "base64"
+DATA_ENCODINGS = (DATA_ENCODING_LIST, DATA_ENCODING_BASE64)
+
+# Encoding of the values that are not a plain numeric array (they are unwrapped by json-tricks)
+DATA_ENCODING_RAW = "raw"
+
+# Layout of the json-tricks serialized arrays ({"__ndarray__": <values>, "dtype": ..., "shape": ..., ...})
+NDARRAY_PREFIX = '{"__ndarray__": '
+NDARRAY_METADATA_SEPARATOR = ', "dtype": '
+NDARRAY_BASE64_PREFIX = '"b64:'
+
+# Kinds of the data types decoded without json-tricks (signed/unsigned integers, floats)
+NDARRAY_FAST_KINDS = "iuf"
+
+# Number of the characters of the serialized values decoded at once (the values are decoded window by window)
+DEFAULT_DECODING_WINDOW = 256 * 1024
+
+# Layout of the json-tricks serialized arrays escaped in the JSON-strings (as they are streamed in the JSON body)
+ESCAPED_NDARRAY_PREFIX = json.dumps(NDARRAY_PREFIX)[1:-1].encode()
+ESCAPED_NDARRAY_BASE64_PREFIX = json.dumps(NDARRAY_BASE64_PREFIX)[1:-1].encode()
+
+# Characters of the nested lists of the integers (the other lists are decoded as the floats)
+NDARRAY_INTEGER_CHARACTERS = b"0123456789+-[], \t\r\n"
+
+# Translation of the brackets of the nested lists to the whitespace (the values are decoded as the flat list)
+NDARRAY_BRACKETS_TRANSLATION = bytes.maketrans(b"[]", b"  ")
+
+
 # ---------------------------------------------- #
 # Data wrapping/unwrapping exceptions definition #
 # ---------------------------------------------- #
@@ -19,14 +60,547 @@ class DataWrapper(object):
     def unwrap_data(data):
         """Unwraps the data (deserialize from JSON-string to numpy.ndarray)"""
         try:
-            return json_tricks.loads(data) if isinstance(data, str) else data
+            if not isinstance(data, str):
+                return data
+            values = DataWrapper.unwrap_ndarray(data)
+            return values if values is not None else json_tricks.loads(data)
+        except Exception as e:
+            raise DataUnwrappingException(e)
+
+    @staticmethod
+    def unwrap_ndarray(data, window=DEFAULT_DECODING_WINDOW):
+        """
+        Unwraps the json-tricks serialized numeric array without json-tricks (the fast path of unwrap_data).
+
+        The values (nested lists, or the base64-encoded raw buffer) are decoded
+        window by window directly into the pre-allocated array of the declared
+        dtype and shape, so neither the nested lists of the Python numbers nor
+        the copies of the whole serialized values are created (the memory
+        needed is the array itself and one window of the serialized values).
+        The brackets of the nested lists are checked against the shape, so the
+        ragged or malformed lists are left to json-tricks (they are refused).
+
+        :param data: json-tricks serialized array (JSON-string)
+        :type data: str
+        :param window: number of the characters decoded at once, defaults to DEFAULT_DECODING_WINDOW
+        :type window: int, optional
+        :return: array (None if the data are not a plain numeric array; they are decoded by json-tricks then)
+        :rtype: numpy.ndarray or None type
+        """
+
+        # Locate the values and parse the metadata (dtype, shape, order, endianness)
+        stop = data.rfind(NDARRAY_METADATA_SEPARATOR)
+        if not data.startswith(NDARRAY_PREFIX) or stop < len(NDARRAY_PREFIX):
+            return None
+        try:
+            metadata = json.loads("{" + data[stop + 2:])
+            dtype = numpy.dtype(metadata["dtype"])
+            shape = tuple(int(dimension) for dimension in metadata["shape"])
+        except (ValueError, TypeError, KeyError):
+            return None
+        if dtype.kind not in NDARRAY_FAST_KINDS or not shape or metadata.keys() - {"dtype", "shape", "Corder", "endian"}:
+            return None
+
+        # Prepare the array
+        values = numpy.empty(int(numpy.prod(shape, dtype=numpy.int64)), dtype=dtype)
+        start = len(NDARRAY_PREFIX)
+
+        # Decode the base64-encoded raw buffer (window by window, the windows are aligned to 4 characters)
+        if data.startswith(NDARRAY_BASE64_PREFIX, start):
+            if metadata.get("endian") in ("little", "big"):
+                values = values.view(dtype.newbyteorder("<" if metadata["endian"] == "little" else ">"))
+            start, stop, window = start + len(NDARRAY_BASE64_PREFIX), stop - 1, max(window // 4 * 4, 4)
+            buffer, position = values.view(numpy.uint8), 0
+            for offset in range(start, stop, window):
+                chunk = base64.b64decode(data[offset:min(offset + window, stop)], validate=True)
+                if position + len(chunk) > buffer.size:
+                    return None
+                buffer[position:position + len(chunk)] = numpy.frombuffer(chunk, dtype=numpy.uint8)
+                position += len(chunk)
+            if position != buffer.size or data[stop] != '"':
+                return None
+            return values.reshape(shape, order="C" if metadata.get("Corder", True) else "F")
+
+        # Decode the nested lists (window by window, the windows are split at the commas)
+        position, translation = 0, str.maketrans("[],", "   ")
+        if not values.size:
+            return values.reshape(shape) if not data[start:stop].translate(translation).strip() else None
+        translation = str.maketrans("[]", "  ")
+        while start < stop:
+            end = stop if stop - start <= window else data.find(",", start + window, stop)
+            end = stop if end < 0 else end
+            text = data[start:end]
+            if text.translate(translation).strip():
+                expected = text.count(",") + 1
+                if position + expected > values.size:
+                    return None
+                brackets = DataWrapper.count_brackets(text)
+                if brackets is None or not all(map(numpy.array_equal, brackets, DataWrapper.expect_brackets(
+                        position, expected, shape))):
+                    return None
+                text = text.translate(translation)
+                try:
+                    chunk = numpy.fromstring(text, dtype=dtype.newbyteorder("="), sep=",")
+                except ValueError:
+                    return None
+                if chunk.size != expected:
+                    return None
+                values[position:position + expected] = chunk
+                position += expected
+            start = end + 1
+        if position != values.size:
+            return None
+        return values.reshape(shape)
+
+    @staticmethod
+    def count_brackets(text):
+        """
+        Counts the brackets around each of the values of the window of the nested lists (split at the commas).
+
+        Each of the values may be preceded only by the opening brackets, and
+        followed only by the closing brackets (within its part of the window).
+
+        :param text: window of the serialized nested lists
+        :type text: str or bytes
+        :return: numbers of the opening and the closing brackets of the values (None if the brackets are misplaced)
+        :rtype: tuple (numpy.ndarray, numpy.ndarray) or None type
+        """
+        characters = numpy.frombuffer(
+            text.encode("ascii", "replace") if isinstance(text, str) else text, dtype=numpy.uint8)
+        opening, closing, commas = characters == ord("["), characters == ord("]"), characters == ord(",")
+        values = ~(opening | closing | commas) & (characters > ord(" "))
+
+        # Index the values (the parts of the window between the commas), count the characters of the values before
+        parts = numpy.cumsum(commas, dtype=numpy.int32) - commas
+        seen = numpy.cumsum(values, dtype=numpy.int32)
+        before = numpy.concatenate(([0], seen[commas]))[parts]
+
+        # Check that the opening brackets precede the values, and the closing brackets follow them
+        if numpy.any(seen[opening] != before[opening]) or numpy.any(seen[closing] == before[closing]):
+            return None
+        count = int(parts[-1]) + 1 if parts.size else 1
+        return (
+            numpy.bincount(parts[opening], minlength=count).astype(numpy.uint8),
+            numpy.bincount(parts[closing], minlength=count).astype(numpy.uint8))
+
+    @staticmethod
+    def expect_brackets(position, count, shape):
+        """
+        Returns the numbers of the brackets around the values of the nested lists of the shape.
+
+        :param position: index of the first of the values (in the C order)
+        :type position: int
+        :param count: number of the values
+        :type count: int
+        :param shape: shape of the array
+        :type shape: tuple
+        :return: numbers of the opening and the closing brackets of the values
+        :rtype: tuple (numpy.ndarray, numpy.ndarray)
+        """
+        indices = numpy.arange(position, position + count, dtype=numpy.int64)
+        opening, closing = numpy.zeros(count, dtype=numpy.uint8), numpy.zeros(count, dtype=numpy.uint8)
+        stride = 1
+        for dimension in reversed(shape):
+            stride *= int(dimension)
+            opening += indices % stride == 0
+            closing += (indices + 1) % stride == 0
+        return opening, closing
+
+    @staticmethod
+    def wrap_data(data, encoding=DATA_ENCODING_LIST):
+        """
+        Wraps the data (serialize numpy.ndarray to JSON-string).
+
+        With the ``base64`` encoding, the arrays are serialized as the base64
+        raw buffers (with dtype, shape and byte order) instead of the nested
+        lists; both of the encodings are deserialized by ``unwrap_data``. The
+        arrays that are not C-contiguous (e.g. Fortran-ordered or transposed)
+        are copied into the C order first (the arrays in the non-native byte
+        order into the native one), and the 0-d arrays are serialized
+        as their values (see: ``encode_compact_ndarray``).
+
+        :param data: data to be wrapped
+        :type data: numpy.ndarray
+        :param encoding: encoding of the arrays (list, base64), defaults to "list"
+        :type encoding: str, optional
+        :return: JSON-string
+        :rtype: str
+        """
+        try:
+            if isinstance(data, str):
+                return data
+            properties = {"ndarray_compact": encoding == DATA_ENCODING_BASE64}
+            encoders = (DataWrapper.encode_compact_ndarray,) if encoding == DATA_ENCODING_BASE64 else ()
+            return json_tricks.dumps(data, allow_nan=True, properties=properties, extra_obj_encoders=encoders)
+        except Exception as e:
+            raise DataWrappingException(e)
+
+    @staticmethod
+    def encode_compact_ndarray(obj, primitives=False, properties=None):
+        """
+        Prepares the array for the compact (base64) json-tricks encoding.
+
+        The compact encoding supports only the C-ordered arrays of at least one
+        dimension in the native byte order: the other arrays are copied into
+        the C order (and the native byte order), and the 0-d arrays are encoded
+        as their values (the same way as by the nested lists encoding), so all
+        of them can be unwrapped back.
+
+        :param obj: object to be encoded
+        :type obj: any
+        :param primitives: encode the arrays as the primitives, defaults to False
+        :type primitives: bool, optional
+        :param properties: json-tricks encoding properties, defaults to None
+        :type properties: dict, optional
+        :return: prepared object (or the encoded 0-d array)
+        :rtype: any
+        """
+        if not isinstance(obj, numpy.ndarray) or primitives:
+            return obj
+        if obj.ndim == 0:
+            return json_tricks.encoders.numpy_encode(obj, properties={**(properties or {}), "ndarray_compact": False})
+        return numpy.ascontiguousarray(obj, dtype=obj.dtype.newbyteorder("="))
+
+
+# ----------------------------------- #
+# Streamed data unwrapping definition #
+# ----------------------------------- #
+
+class StreamingDataUnwrapper(object):
+    """
+    Class implementing the unwrapping of the json-tricks serialized array streamed in the JSON-string.
+
+    The escaped content of the JSON-string is fed chunk by chunk (as it is
+    read from the request body), and the values (nested lists, or the
+    base64-encoded raw buffer) are decoded window by window as they arrive,
+    so neither the JSON-string nor the serialized values are kept whole (the
+    memory needed is about the decoded values and one window). The dtype and
+    the shape follow the values, so the nested lists are decoded into 64-bit
+    numbers first, and they are checked against the shape (the brackets and
+    the number of the values) and cast into the dtype at the end. The content
+    that is not a plain numeric array (e.g. the lists of the non-numeric
+    values) is kept whole, and it is returned as the unescaped JSON-string.
+    """
+
+    def __init__(self, window=DEFAULT_DECODING_WINDOW):
+        """
+        Initializes the streaming data unwrapper.
+
+        :param window: number of the characters decoded at once, defaults to DEFAULT_DECODING_WINDOW
+        :type window: int, optional
+        """
+        self.window = max(int(window) // 4 * 4, 4)
+
+        # Set the encoding of the values (None until it is detected; list, base64, or raw), and the undecoded content
+        self.encoding = None
+        self.buffer = bytearray()
+        self.ended = False
+
+        # Set the decoded values (list: 64-bit chunks and their brackets; base64: raw buffer)
+        self.chunks = []
+        self.brackets = []
+        self.count = 0
+        self.empty = False
+        self.decoded = bytearray()
+
+    def __repr__(self):
+        return str({"encoding": self.encoding, "count": self.count, "decoded": len(self.decoded)})
+
+    def __str__(self):
+        return repr(self)
+
+    def feed(self, data):
+        """
+        Feeds the next chunk of the escaped content of the JSON-string.
+
+        :param data: chunk of the content (as it is in the JSON body, without the quotes)
+        :type data: bytes
+        :return: None
+        :rtype: None type
+        """
+        try:
+            self.buffer += data
+            self.decode()
+        except Exception as e:
+            raise DataUnwrappingException(e)
+
+    def close(self):
+        """
+        Decodes the rest of the content, and returns the array.
+
+        :return: array (or the unescaped JSON-string if it is not a plain numeric array)
+        :rtype: numpy.ndarray or str
+        """
+        try:
+            self.decode(final=True)
+
+            # Return the content that is not a plain numeric array as it is (unescaped)
+            if self.encoding == DATA_ENCODING_LIST or self.encoding == DATA_ENCODING_BASE64:
+                if not self.ended:
+                    raise ValueError("Not a valid json-tricks array (the metadata are missing)")
+            else:
+                return json.loads(b'"' + bytes(self.buffer) + b'"')
+
+            # Parse the metadata (dtype, shape, order, endianness; they follow the closing quote of the base64 buffer)
+            text = json.loads(b'"' + bytes(self.buffer) + b'"')
+            if self.encoding == DATA_ENCODING_BASE64:
+                if not text.startswith('"'):
+                    raise ValueError("Not a valid base64-encoded buffer")
+                text = text[1:]
+            text = text.lstrip()
+            metadata = json.loads("{" + (text[1:] if text.startswith(",") else text))
+            dtype = numpy.dtype(metadata["dtype"])
+            shape = tuple(int(dimension) for dimension in metadata["shape"])
+            size = int(numpy.prod(shape, dtype=numpy.int64))
+            if not shape or metadata.keys() - {"dtype", "shape", "Corder", "endian"} or dtype.hasobject:
+                raise ValueError("Not a valid json-tricks array (unsupported metadata)")
+
+            # Return the base64-encoded raw buffer
+            if self.encoding == DATA_ENCODING_BASE64:
+                if metadata.get("endian") in ("little", "big"):
+                    dtype = dtype.newbyteorder("<" if metadata["endian"] == "little" else ">")
+                if len(self.decoded) != size * dtype.itemsize:
+                    raise ValueError(f"Size mismatch of the values (expected shape: {shape})")
+                values = numpy.frombuffer(self.decoded, dtype=dtype)
+                return values.reshape(shape, order="C" if metadata.get("Corder", True) else "F")
+
+            # Check the nested lists against the shape (the number of the values, the brackets)
+            if dtype.kind not in NDARRAY_FAST_KINDS:
+                raise ValueError(f"Unsupported dtype of the nested lists: {dtype}")
+            if self.count != size or (self.empty and size):
+                raise ValueError(f"Size mismatch of the values (expected shape: {shape})")
+            position = 0
+            for brackets in self.brackets:
+                count = brackets[0].size
+                if not all(map(numpy.array_equal, brackets, DataWrapper.expect_brackets(position, count, shape))):
+                    raise ValueError(f"Not valid nested lists (they do not match the shape: {shape})")
+                position += count
+
+            # Cast the values into the dtype (the chunks are released one by one)
+            values, position = numpy.empty(size, dtype=dtype), 0
+            for index, chunk in enumerate(self.chunks):
+                values[position:position + chunk.size] = chunk
+                position += chunk.size
+                self.chunks[index] = None
+            self.chunks, self.brackets = [], []
+            return values.reshape(shape)
+
+        except Exception as e:
+            raise DataUnwrappingException(e)
+
+    def decode(self, final=False):
+        """
+        Decodes the buffered content (the rest of the values is kept until more of the content arrives).
+
+        :param final: the content is complete, defaults to False
+        :type final: bool, optional
+        :return: None
+        :rtype: None type
+        """
+
+        # Detect the encoding of the values (after the json-tricks prefix)
+        if self.encoding is None:
+            start = len(ESCAPED_NDARRAY_PREFIX)
+            if len(self.buffer) < start + len(ESCAPED_NDARRAY_BASE64_PREFIX) and not final:
+                return
+            if not self.buffer.startswith(ESCAPED_NDARRAY_PREFIX):
+                self.encoding = DATA_ENCODING_RAW
+            elif self.buffer.startswith(ESCAPED_NDARRAY_BASE64_PREFIX, start):
+                self.encoding = DATA_ENCODING_BASE64
+                del self.buffer[:start + len(ESCAPED_NDARRAY_BASE64_PREFIX)]
+            elif self.buffer.startswith(b"[", start):
+                self.encoding = DATA_ENCODING_LIST
+                del self.buffer[:start]
+            else:
+                self.encoding = DATA_ENCODING_RAW
+
+        # Keep the metadata (and the content that is not a plain numeric array) until the content is complete
+        if self.ended or self.encoding == DATA_ENCODING_RAW:
+            return
+
+        # Locate the end of the values (the metadata start with the escaped quote)
+        end = self.buffer.find(b"\\")
+        stop = end if end >= 0 else len(self.buffer)
+
+        # Decode the base64-encoded raw buffer (window by window, the windows are aligned to 4 characters)
+        if self.encoding == DATA_ENCODING_BASE64:
+            stop = stop if end >= 0 else stop // 4 * 4
+            for offset in range(0, stop, self.window):
+                chunk = bytes(self.buffer[offset:min(offset + self.window, stop)])
+                self.decoded += base64.b64decode(chunk, validate=True)
+            del self.buffer[:stop]
+            self.ended = end >= 0
+            return
+
+        # Decode the nested lists (window by window, the windows are split at the commas)
+        start = 0
+        while start <= stop:
+            cut = self.buffer.find(b",", start + self.window, stop) if stop - start > self.window else -1
+            if cut < 0 and end < 0:
+                break
+            cut = stop if cut < 0 else cut
+            if not self.decode_lists(bytes(self.buffer[start:cut]), last=cut == stop):
+                if self.count or start:
+                    raise ValueError("Not valid nested lists of numbers")
+                self.encoding = DATA_ENCODING_RAW
+                self.buffer[:0] = ESCAPED_NDARRAY_PREFIX
+                return
+            start = cut + 1
+        del self.buffer[:min(start, stop)]
+        self.ended = end >= 0
+
+    def decode_lists(self, text, last=False):
+        """
+        Decodes the window of the nested lists (split at the commas) into the 64-bit numbers.
+
+        :param text: window of the nested lists
+        :type text: bytes
+        :param last: the window is the last one (it is followed by the separator of the metadata), defaults to False
+        :type last: bool, optional
+        :return: True if the window was decoded (False if it is not a window of the nested lists of numbers)
+        :rtype: bool
+        """
+        if last:
+            text = text.rstrip()
+            text = text[:-1] if text.endswith(b",") else text
+        if not text.strip():
+            return True
+
+        # Keep the lists without the values (the empty array)
+        if not text.translate(None, b"[], \t\r\n"):
+            self.empty = True
+            return not self.count
+
+        # Count the brackets of the values and decode them (the integers are decoded exactly)
+        brackets = DataWrapper.count_brackets(text)
+        if brackets is None or self.empty:
+            return False
+        integral = not text.translate(None, NDARRAY_INTEGER_CHARACTERS)
+        try:
+            chunk = numpy.fromstring(
+                text.translate(NDARRAY_BRACKETS_TRANSLATION),
+                dtype=numpy.int64 if integral else numpy.float64,
+                sep=",")
+        except ValueError:
+            return False
+        if chunk.size != brackets[0].size:
+            return False
+
+        # Keep the values and their brackets (checked against the shape at the end)
+        self.chunks.append(chunk)
+        self.brackets.append(brackets)
+        self.count += chunk.size
+        return True
+
+
+# ------------------------------------------ #
+# Binary data wrapping/unwrapping definition #
+# ------------------------------------------ #
+
+class BinaryDataWrapper(object):
+    """Class implementing binary data wrapper (wrapping and unwrapping .npy/.npz buffers)"""
+
+    # Names of the .npz archive members
+    VALUES_MEMBER = "values"
+    HEADER_MEMBER = "header"
+
+    @staticmethod
+    def unwrap_npy(buffer):
+        """
+        Unwraps the .npy buffer (deserialize to numpy.ndarray).
+
+        The array is not copied: it is a read-only view on the input buffer
+        (the .npy header is parsed and the data are mapped right after it).
+
+        :param buffer: .npy-formatted buffer
+        :type buffer: bytes or bytearray
+        :return: array viewing the buffer
+        :rtype: numpy.ndarray
+        """
+        try:
+
+            # Parse the .npy header (version, shape, order, dtype)
+            stream = io.BytesIO(buffer)
+            version = numpy.lib.format.read_magic(stream)
+            if version == (1, 0):
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(stream)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(stream)
+            else:
+                raise ValueError(f"Unsupported .npy format version: {version}")
+
+            # Refuse the object arrays (they would require unpickling)
+            if dtype.hasobject:
+                raise ValueError("Object arrays are not supported")
+
+            # Map the array on the buffer (right after the header)
+            count = int(numpy.prod(shape, dtype=numpy.int64))
+            values = numpy.frombuffer(buffer, dtype=dtype, count=count, offset=stream.tell())
+            values.setflags(write=False)
+
+            # Return the array of the original shape/order
+            return values.reshape(shape, order="F" if fortran_order else "C")
+
+        except Exception as e:
+            raise DataUnwrappingException(e)
+
+    @staticmethod
+    def unwrap_npz(buffer):
+        """
+        Unwraps the .npz buffer (deserialize to the values and the JSON header).
+
+        :param buffer: .npz-formatted buffer (members: values, header)
+        :type buffer: bytes
+        :return: values and header
+        :rtype: tuple (numpy.ndarray, dict)
+        """
+        try:
+            with numpy.load(io.BytesIO(buffer), allow_pickle=False) as archive:
+                members = archive.files
+                if BinaryDataWrapper.VALUES_MEMBER not in members:
+                    raise ValueError(f"Missing the '{BinaryDataWrapper.VALUES_MEMBER}' member")
+
+                # Get the values and the header
+                values = archive[BinaryDataWrapper.VALUES_MEMBER]
+                header = None
+                if BinaryDataWrapper.HEADER_MEMBER in members:
+                    header = archive[BinaryDataWrapper.HEADER_MEMBER].item()
+
+            # Return the values and the header
+            return values, BinaryDataWrapper.unwrap_header(header)
+
+        except Exception as e:
+            raise DataUnwrappingException(e)
+
+    @staticmethod
+    def unwrap_header(header):
+        """Unwraps the JSON header (deserialize from JSON-string/bytes to dict)"""
+        try:
+            header = json.loads(header) if header else {}
+            if not isinstance(header, dict):
+                raise ValueError("Not a valid dict (header)")
+            return header
         except Exception as e:
             raise DataUnwrappingException(e)
 
     @staticmethod
-    def wrap_data(data):
-        """Wraps the data (serialize numpy.ndarray to JSON-string)"""
+    def wrap_npz(values, header=None):
+        """
+        Wraps the values and the JSON header (serialize to .npz buffer).
+
+        :param values: values to be wrapped
+        :type values: numpy.ndarray
+        :param header: JSON-serializable header, defaults to None
+        :type header: dict, optional
+        :return: .npz-formatted buffer (members: values, header)
+        :rtype: bytes
+        """
         try:
-            return json_tricks.dumps(data, allow_nan=True) if not isinstance(data, str) else data
+            stream = io.BytesIO()
+            numpy.savez(stream, **{
+                BinaryDataWrapper.VALUES_MEMBER: values,
+                BinaryDataWrapper.HEADER_MEMBER: numpy.array(json.dumps(header or {}))
+            })
+            return stream.getvalue()
         except Exception as e:
             raise DataWrappingException(e)
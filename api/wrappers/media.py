@@ -0,0 +1,44 @@
+# -------------------------------- #
+# Supported media types definition #
+# -------------------------------- #
+MEDIA_TYPE_JSON = "application/json"
+MEDIA_TYPE_NPY = "application/x-npy"
+MEDIA_TYPE_NPZ = "application/x-npz"
+MEDIA_TYPE_NDJSON = "application/x-ndjson"
+
+# Media types supported in the requests (bodies) and in the responses
+REQUEST_MEDIA_TYPES = (MEDIA_TYPE_JSON, MEDIA_TYPE_NPY, MEDIA_TYPE_NPZ)
+RESPONSE_MEDIA_TYPES = (MEDIA_TYPE_JSON, MEDIA_TYPE_NPZ, MEDIA_TYPE_NDJSON)
+
+# Media types with binary (NumPy) transport
+BINARY_MEDIA_TYPES = (MEDIA_TYPE_NPY, MEDIA_TYPE_NPZ)
+
+# Media types with streaming (per-subject records) transport
+STREAMING_MEDIA_TYPES = (MEDIA_TYPE_NDJSON,)
+
+# HTTP header holding the JSON header of the application/x-npy requests
+BINARY_HEADER_NAME = "X-Featurizer-Header"
+
+
+# --------------------------------------- #
+# Content negotiation routines definition #
+# --------------------------------------- #
+
+def get_request_media_type(request):
+    """Returns the media type of the request body (defaults to JSON)"""
+    return request.mimetype if request.mimetype in REQUEST_MEDIA_TYPES else MEDIA_TYPE_JSON
+
+
+def get_response_media_type(request):
+    """Returns the media type of the response negotiated via the Accept header (defaults to JSON)"""
+    return request.accept_mimetypes.best_match(RESPONSE_MEDIA_TYPES, default=MEDIA_TYPE_JSON)
+
+
+def is_binary_media_type(media_type):
+    """Checks if the media type uses the binary (NumPy) transport"""
+    return media_type in BINARY_MEDIA_TYPES
+
+
+def is_streaming_media_type(media_type):
+    """Checks if the media type uses the streaming (per-subject records) transport"""
+    return media_type in STREAMING_MEDIA_TYPES
@@ -1,4 +1,10 @@
+import re
 import json
+import hashlib
+from flask import g
+from werkzeug.exceptions import HTTPException, UnsupportedMediaType
+from api.wrappers.data import DataWrapper, BinaryDataWrapper, StreamingDataUnwrapper, DataUnwrappingException
+from api.wrappers.media import MEDIA_TYPE_NPY, MEDIA_TYPE_NPZ, BINARY_HEADER_NAME, get_request_media_type
 
 
 # ------------------------------------------------- #
@@ -8,6 +14,25 @@ class RequestUnwrappingException(Exception): pass
 class RequestWrappingException(Exception): pass
 
 
+# ---------------------------------------- #
+# Request unwrapping attributes definition #
+# ---------------------------------------- #
+
+# Size of the chunks the request body is read in
+DEFAULT_BODY_CHUNK_SIZE = 1024 * 1024
+
+# Charsets of the JSON bodies scanned as they are streamed (the other charsets are decoded once the body is read)
+STREAMED_BODY_CHARSETS = ("utf-8", "utf8", "ascii", "us-ascii")
+
+# Paths of the sample values decoded as they are streamed (None in place of the indices of the batch items)
+STREAMED_VALUES_PATHS = (("samples", "values"), ("requests", None, "samples", "values"))
+
+# Characters the streamed JSON is scanned for (in the objects, in the arrays, and in the strings)
+JSON_OBJECT_TOKENS = re.compile(rb'["{}\[\],:]')
+JSON_ARRAY_TOKENS = re.compile(rb'["{}\[\]]')
+JSON_STRING_TOKENS = re.compile(rb'["\\]')
+
+
 # -------------------------------------- #
 # Request wrapping/unwrapping definition #
 # -------------------------------------- #
@@ -17,12 +42,154 @@ class RequestWrapper(object):
 
     @staticmethod
     def unwrap_request(request):
-        """Unwraps the request (deserialize from JSON-string)"""
+        """
+        Unwraps the request (deserialize from JSON-string or from .npy/.npz buffer).
+
+        The body is read once per request (in chunks, within the size limit of
+        the request, see: ``api.ingestion``), its digest is computed while it is
+        read, and the unwrapped request is shared by the request-response cache
+        and the resource. The sample values of the JSON requests (``samples``,
+        and ``requests[*].samples`` of the batches) are decoded right away, so
+        the JSON-strings of the values are not kept alive with the request.
+
+        :param request: request to be unwrapped
+        :type request: flask.Request
+        :return: unwrapped request
+        :rtype: dict
+        """
         try:
-            return request.args if request.method == "GET" else (request.get_json() or json.loads(request.data))
+            if request.method == "GET":
+                return request.args
+            if "unwrapped_request" not in g:
+                g.unwrapped_request = RequestWrapper.unwrap_body(request)
+            return g.unwrapped_request
+        except HTTPException:
+            raise
         except Exception as e:
             raise RequestUnwrappingException(e)
 
+    @staticmethod
+    def get_body_digest(request):
+        """Returns the digest of the request body (the body is read and unwrapped if it was not yet)"""
+        RequestWrapper.unwrap_request(request)
+        return g.get("request_body_digest", "")
+
+    @staticmethod
+    def read_body(request, chunk_size=DEFAULT_BODY_CHUNK_SIZE, consume=None):
+        """
+        Reads the request body in chunks (the size limit is enforced by the request stream, HTTP 413).
+
+        :param request: request to be read
+        :type request: flask.Request
+        :param chunk_size: size of the chunks in bytes, defaults to DEFAULT_BODY_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :param consume: consumer of the chunks (the body is not kept then), defaults to None
+        :type consume: callable, optional
+        :return: request body (None if the chunks are consumed)
+        :rtype: bytearray or None type
+        """
+        body, digest = bytearray() if consume is None else None, hashlib.sha256()
+        while True:
+            chunk = request.stream.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            if consume is not None:
+                consume(chunk)
+            else:
+                body += chunk
+        g.request_body_digest = digest.hexdigest()
+        return body
+
+    @staticmethod
+    def unwrap_body(request):
+        """
+        Unwraps the request body (deserialize from JSON-string or from .npy/.npz buffer).
+
+        The sample values of the UTF-8 JSON bodies are decoded as the body is
+        streamed (see: ``StreamingRequestUnwrapper``), so neither the body nor
+        its decoded string are kept whole; the JSON bodies of the other charsets
+        are decoded once they are read.
+
+        :param request: request to be unwrapped
+        :type request: flask.Request
+        :return: unwrapped request
+        :rtype: dict
+        """
+        if get_request_media_type(request) in (MEDIA_TYPE_NPY, MEDIA_TYPE_NPZ):
+            return RequestWrapper.unwrap_binary_request(request)
+        if not request.is_json:
+            raise UnsupportedMediaType("Did not attempt to load JSON data because the request Content-Type was not "
+                                       "'application/json'.")
+
+        # Decode the sample values as the body is streamed (the rest of the body is parsed once it is read)
+        charset = request.mimetype_params.get("charset") or "utf-8"
+        if charset.lower() in STREAMED_BODY_CHARSETS:
+            unwrapper = StreamingRequestUnwrapper()
+            RequestWrapper.read_body(request, consume=unwrapper.feed)
+            return RequestWrapper.unwrap_values(unwrapper.close())
+
+        # Decode the body (the buffer is released before the JSON is parsed)
+        body = RequestWrapper.read_body(request)
+        text = body.decode(charset)
+        del body
+
+        # Parse the JSON and decode the sample values (the JSON-strings of the values are released)
+        request = json.loads(text)
+        del text
+        return RequestWrapper.unwrap_values(request)
+
+    @staticmethod
+    def unwrap_values(request):
+        """Decodes the sample values of the request and of the batch items (the invalid values are kept as they are)"""
+        items = request.get("requests") if isinstance(request, dict) else None
+        for item in [request] + (items if isinstance(items, list) else []):
+            samples = item.get("samples") if isinstance(item, dict) else None
+            if isinstance(samples, dict) and isinstance(samples.get("values"), str):
+                try:
+                    samples["values"] = DataWrapper.unwrap_data(samples["values"])
+                except DataUnwrappingException:
+                    pass
+        return request
+
+    @staticmethod
+    def unwrap_binary_request(request):
+        """
+        Unwraps the binary request (deserialize from .npy/.npz buffer).
+
+        The binary request carries the sample values as the .npy/.npz buffer,
+        the rest of the request (``samples.labels``, ``features``, and the
+        ``extractor_configuration``) is carried by the JSON header:
+
+        - ``application/x-npy``: the body is the .npy buffer with the values,
+          the JSON header is sent in the ``X-Featurizer-Header`` HTTP header
+        - ``application/x-npz``: the body is the .npz archive with the values
+          (``values`` member) and the JSON header (``header`` member)
+
+        :param request: request to be unwrapped
+        :type request: flask.Request
+        :return: unwrapped request (with numpy.ndarray in samples.values)
+        :rtype: dict
+        """
+
+        # Get the request body (without decoding it to a string)
+        buffer = RequestWrapper.read_body(request)
+
+        # Get the values and the header
+        if get_request_media_type(request) == MEDIA_TYPE_NPY:
+            values = BinaryDataWrapper.unwrap_npy(buffer)
+            header = BinaryDataWrapper.unwrap_header(request.headers.get(BINARY_HEADER_NAME))
+        else:
+            values, header = BinaryDataWrapper.unwrap_npz(buffer)
+
+        # Compose the request (place the values into the samples)
+        samples = header.get("samples") or {}
+        if not isinstance(samples, dict):
+            raise ValueError("Not a valid dict (samples)")
+
+        # Return the unwrapped request
+        return {**header, "samples": {**samples, "values": values}}
+
     @staticmethod
     def wrap_request(request):
         """Wraps the request (serialize to JSON-string)"""
@@ -30,3 +197,173 @@ class RequestWrapper(object):
             return json.dumps(request) if not isinstance(request, str) else request
         except Exception as e:
             raise RequestWrappingException(e)
+
+
+# -------------------------------------- #
+# Streamed request unwrapping definition #
+# -------------------------------------- #
+
+class StreamingRequestUnwrapper(object):
+    """
+    Class implementing the unwrapping of the JSON request body as it is streamed.
+
+    The body is scanned chunk by chunk: the JSON-strings of the sample values
+    (``samples.values``, and ``requests[*].samples.values`` of the batches)
+    are decoded as they are streamed (see: ``StreamingDataUnwrapper``), and
+    they are replaced by ``null`` in the rest of the body, which is kept and
+    parsed once the body is read (it holds the labels, the pipeline and the
+    configurations). The peak memory is about the decoded values then, not
+    the body with its decoded string and the values together.
+    """
+
+    def __init__(self):
+        """Initializes the streaming request unwrapper"""
+
+        # Set the rest of the body, the containers being scanned, and the undecoded tail of the last chunk
+        self.body = bytearray()
+        self.stack = []
+        self.tail = b""
+
+        # Set the string being scanned (None outside of the strings; key, values, or string), and the sample values
+        self.string = None
+        self.key = None
+        self.path = None
+        self.unwrapper = None
+        self.values = []
+
+    def __repr__(self):
+        return str({"body": len(self.body), "depth": len(self.stack), "values": len(self.values)})
+
+    def __str__(self):
+        return repr(self)
+
+    def feed(self, chunk):
+        """
+        Feeds the next chunk of the body.
+
+        :param chunk: chunk of the body
+        :type chunk: bytes
+        :return: None
+        :rtype: None type
+        """
+        data, position = self.tail + chunk if self.tail else chunk, 0
+        self.tail = b""
+        while position < len(data):
+            if self.string is not None:
+                position = self.scan_string(data, position)
+            else:
+                position = self.scan_tokens(data, position)
+
+    def close(self):
+        """
+        Parses the rest of the body, and places the sample values into it.
+
+        :return: unwrapped request (the sample values that are not plain numeric arrays are kept as JSON-strings)
+        :rtype: dict
+        """
+        if self.string is not None or self.tail:
+            raise ValueError("Not a valid JSON body (unterminated string)")
+        request, self.body = json.loads(bytes(self.body)), None
+        for path, values in self.values:
+            try:
+                container = request
+                for key in path[:-1]:
+                    container = container[key]
+                container[path[-1]] = values
+            except (KeyError, IndexError, TypeError):
+                continue
+        self.values = []
+        return request
+
+    def scan_tokens(self, data, position):
+        """Scans the chunk for the next token outside of the strings (returns the position after it)"""
+        container = self.stack[-1] if self.stack else None
+        tokens = JSON_OBJECT_TOKENS if container is None or container["tracked"] else JSON_ARRAY_TOKENS
+        match = tokens.search(data, position)
+        if match is None:
+            self.body += data[position:]
+            return len(data)
+
+        # Keep the body before the token
+        index = match.start()
+        token = data[index:index + 1]
+        self.body += data[position:index]
+
+        # Start the string (the key of the object, the sample values, or the other string)
+        if token == b'"':
+            if container is not None and container["kind"] == b"{" and container["key"] is None:
+                self.string, self.key = "key", bytearray()
+            elif self.is_values_path(self.get_path()):
+                self.string, self.path, self.unwrapper = "values", self.get_path(), StreamingDataUnwrapper()
+                return index + 1
+            else:
+                self.string = "string"
+            self.body += token
+            return index + 1
+
+        # Open or close the container, or move to the next key or item of the container
+        self.body += token
+        if token in (b"{", b"["):
+            tracked = token == b"{" or self.get_path() == STREAMED_VALUES_PATHS[1][:1]
+            self.stack.append({"kind": token, "key": None, "index": 0, "tracked": tracked})
+        elif token in (b"}", b"]"):
+            if self.stack:
+                self.stack.pop()
+        elif token == b"," and container is not None:
+            container["key"] = None
+            container["index"] += 1
+        return index + 1
+
+    def scan_string(self, data, position):
+        """Scans the chunk for the end of the string (returns the position after it)"""
+        match = JSON_STRING_TOKENS.search(data, position)
+        if match is None:
+            self.emit(data[position:])
+            return len(data)
+
+        # Keep the escaped character with its backslash (the backslash ending the chunk waits for the next one)
+        index = match.start()
+        if data[index:index + 1] == b"\\":
+            if index + 1 >= len(data):
+                self.emit(data[position:index])
+                self.tail = data[index:]
+                return len(data)
+            self.emit(data[position:index + 2])
+            return index + 2
+
+        # End the string (place the null in place of the sample values)
+        self.emit(data[position:index])
+        if self.string == "values":
+            self.values.append((self.path, self.unwrapper.close()))
+            self.path, self.unwrapper = None, None
+            self.body += b"null"
+        else:
+            self.body += b'"'
+            if self.string == "key":
+                self.stack[-1]["key"] = json.loads(b'"' + bytes(self.key) + b'"')
+                self.key = None
+        self.string = None
+        return index + 1
+
+    def emit(self, data):
+        """Passes the part of the string to the sample values, or keeps it in the body"""
+        if not data:
+            return
+        if self.string == "values":
+            self.unwrapper.feed(data)
+            return
+        self.body += data
+        if self.string == "key":
+            self.key += data
+
+    def get_path(self):
+        """Returns the path of the value being scanned (the keys of the objects, the indices of the arrays)"""
+        return tuple(entry["key"] if entry["kind"] == b"{" else entry["index"] for entry in self.stack)
+
+    @staticmethod
+    def is_values_path(path):
+        """Checks if the path is the path of the sample values"""
+        return any(
+            len(path) == len(pattern) and all(
+                isinstance(key, int) if expected is None else key == expected for key, expected in zip(path, pattern))
+            for pattern in STREAMED_VALUES_PATHS)
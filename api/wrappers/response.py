@@ -1,4 +1,5 @@
 import json
+from api.wrappers.data import BinaryDataWrapper
 
 
 # -------------------------------------------------- #
@@ -31,6 +32,35 @@ class ResponseWrapper(object):
         except Exception as e:
             raise ResponseWrappingException(e)
 
+    @staticmethod
+    def wrap_stream_record(record):
+        """Wraps the streamed record (serialize to newline-delimited JSON-string)"""
+        try:
+            return f"{json.dumps(record)}\n"
+        except Exception as e:
+            raise ResponseWrappingException(e)
+
+    @staticmethod
+    def wrap_binary_response(response):
+        """
+        Wraps the binary response (serialize to .npz buffer).
+
+        The feature values are stored in the ``values`` member of the .npz
+        archive, the rest of the response (``features.labels``) is stored
+        in the JSON ``header`` member.
+
+        :param response: response with numpy.ndarray in features.values
+        :type response: dict
+        :return: .npz-formatted buffer
+        :rtype: bytes
+        """
+        try:
+            features = dict(response["features"])
+            values = features.pop("values")
+            return BinaryDataWrapper.wrap_npz(values, header={**response, "features": features})
+        except Exception as e:
+            raise ResponseWrappingException(e)
+
 
 # ----------------------------- #
 # HTTPError wrapping definition #
@@ -1,3 +1,4 @@
+import sys
 import argparse
 from api import prepare_app
 
@@ -30,10 +31,17 @@ if __name__ == "__main__":
     parser.add_argument("--host", help="the hostname to listen on (defaults to '0.0.0.0')", type=str)
     parser.add_argument("--port", help="the port of the web-server (defaults to 5000)", type=int)
     parser.add_argument("--debug", help="debug run", action="store_true")
+    parser.add_argument("--profile-startup", help="profile the startup (imports, preparation) and exit", action="store_true")
+    parser.add_argument("--startup-budget", help="startup time budget in seconds (exits with 1 if exceeded)", type=float)
 
     # Parse the command line arguments
     args = parser.parse_args()
 
+    # Profile the startup (the API is not run)
+    if args.profile_startup:
+        from api.common.profiling import profile_startup
+        sys.exit(0 if profile_startup(__name__, budget=args.startup_budget) else 1)
+
     # Prepare the default args
     host_ = args.host if args.host else "0.0.0.0"
     port_ = args.port if args.port else 5000
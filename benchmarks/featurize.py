@@ -0,0 +1,369 @@
+import sys
+import json
+import time
+import flask
+import numpy
+import argparse
+import platform
+import statistics
+from api.wrappers.data import DataWrapper, BinaryDataWrapper
+from api.wrappers.media import MEDIA_TYPE_JSON, MEDIA_TYPE_NPZ
+from api.wrappers.request import RequestWrapper
+from api.wrappers.response import ResponseWrapper
+from api.featurization.interface import FeaturesExtractorPipeline
+from api.featurization.library_injection import (
+    validate_features_library,
+    inject_features_extractor,
+    inject_features_extraction_library_version
+)
+from api.interfaces.inputs.interface import Sample, FeaturesExtractorConfiguration, FeaturesPipeline
+from api.interfaces.outputs.interface import Features
+
+
+# --------------------------------------- #
+# Default benchmark attributes definition #
+# --------------------------------------- #
+DEFAULT_LIBRARY = "benchmarks.synthetic"
+DEFAULT_SIZES = ("10x1000", "100x1000", "100x10000")
+DEFAULT_DIMENSIONS = 2
+DEFAULT_FEATURES = 4
+DEFAULT_COST = 1
+DEFAULT_WIDTH = 1
+DEFAULT_REPEATS = 5
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_MIN_DELTA = 0.001
+
+# Transports (request/response media types)
+TRANSPORTS = {
+    "json": MEDIA_TYPE_JSON,
+    "npz": MEDIA_TYPE_NPZ
+}
+
+# Stages of the /featurize path (in the order of the execution)
+STAGES = ("unwrap", "sample", "pipeline", "extractor", "extraction", "features", "wrap")
+
+
+# ------------------------------------- #
+# Benchmark payload routines definition #
+# ------------------------------------- #
+
+def parse_size(size):
+    """Parses the payload size (<subjects>x<samples>)"""
+    subjects, _, samples = size.lower().partition("x")
+    return int(subjects), int(samples)
+
+
+def prepare_body(transport, values, features, cost, width):
+    """
+    Prepares the body of the /featurize request.
+
+    :param transport: transport (json, npz)
+    :type transport: str
+    :param values: sample values
+    :type values: numpy.ndarray
+    :param features: number of features in the pipeline
+    :type features: int
+    :param cost: CPU cost of the synthetic features
+    :type cost: int
+    :param width: output width of the synthetic features
+    :type width: int
+    :return: body of the request
+    :rtype: str or bytes
+    """
+
+    # Prepare the input data (without the sample values)
+    header = {
+        "samples": {"labels": []},
+        "features": {"pipeline": [{"name": f"feature {i}", "args": {}} for i in range(features)]},
+        "extractor_configuration": {"cost": cost, "width": width}
+    }
+
+    # Prepare the body
+    if transport == "npz":
+        return BinaryDataWrapper.wrap_npz(values, header=header)
+    samples = {**header["samples"], "values": DataWrapper.wrap_data(values)}
+    return RequestWrapper.wrap_request({**header, "samples": samples})
+
+
+# --------------------------------------- #
+# Benchmark measuring routines definition #
+# --------------------------------------- #
+
+def measure_stages(app, extractor_interface, transport, body):
+    """
+    Measures the runtime of each stage of the /featurize path (single run).
+
+    :param app: Flask application (request context)
+    :type app: flask.Flask
+    :param extractor_interface: feature extractor interface class
+    :type extractor_interface: <injected>.interface.featurizer.FeatureExtractor
+    :param transport: transport (json, npz)
+    :type transport: str
+    :param body: body of the request
+    :type body: str or bytes
+    :return: runtime of the stages (in seconds)
+    :rtype: dict
+    """
+    timings = {}
+    binary = transport == "npz"
+
+    with app.test_request_context("/featurize", method="POST", data=body, content_type=TRANSPORTS[transport]):
+
+        # Unwrap the input request
+        s = time.perf_counter()
+        request = RequestWrapper.unwrap_request(flask.request)
+        timings["unwrap"] = time.perf_counter() - s
+
+        # Prepare and validate the data samples
+        s = time.perf_counter()
+        samples = Sample.from_request(request)
+        timings["sample"] = time.perf_counter() - s
+
+        # Prepare and validate the features pipeline and the features extractor configuration
+        s = time.perf_counter()
+        pipeline = FeaturesPipeline.from_request(request)
+        settings = FeaturesExtractorConfiguration.from_request(request)
+        timings["pipeline"] = time.perf_counter() - s
+
+        # Prepare the features extractor
+        s = time.perf_counter()
+        extractor = FeaturesExtractorPipeline(extractor_interface, samples, settings)
+        timings["extractor"] = time.perf_counter() - s
+
+        # Extract the features specified in the features pipeline
+        s = time.perf_counter()
+        features = extractor.extract(pipeline)
+        timings["extraction"] = time.perf_counter() - s
+
+        # Prepare and validate the features
+        s = time.perf_counter()
+        features = Features(features).to_binary_response() if binary else Features(features).to_response()
+        timings["features"] = time.perf_counter() - s
+
+        # Wrap the output response
+        s = time.perf_counter()
+        if binary:
+            ResponseWrapper.wrap_binary_response(features)
+        else:
+            ResponseWrapper.wrap_response(features)
+        timings["wrap"] = time.perf_counter() - s
+
+    # Return the runtime of the stages
+    return timings
+
+
+def summarize_timings(timings):
+    """Summarizes the runtime of the repeated runs (median, min, mean in seconds)"""
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "mean": statistics.mean(timings)
+    }
+
+
+def run_benchmarks(library, transports, sizes, dimensions, features, cost, width, repeats):
+    """
+    Runs the benchmarks of the /featurize path across the transports and the payload sizes.
+
+    :param library: import name of the features extraction library
+    :type library: str
+    :param transports: transports (json, npz)
+    :type transports: list of str
+    :param sizes: payload sizes (<subjects>x<samples>)
+    :type sizes: list of str
+    :param dimensions: number of dimensions of the samples
+    :type dimensions: int
+    :param features: number of features in the pipeline
+    :type features: int
+    :param cost: CPU cost of the synthetic features
+    :type cost: int
+    :param width: output width of the synthetic features
+    :type width: int
+    :param repeats: number of the measured runs
+    :type repeats: int
+    :return: benchmark results (machine-readable)
+    :rtype: dict
+    """
+
+    # Inject the features extractor
+    validate_features_library(library)
+    extractor_interface = inject_features_extractor(library)
+
+    # Prepare the application (request context only)
+    app = flask.Flask(__name__)
+
+    # Run the benchmarks
+    results = []
+    for transport in transports:
+        for size in sizes:
+            subjects, samples = parse_size(size)
+
+            # Prepare the request body
+            values = numpy.random.default_rng(0).random((subjects, dimensions, samples))
+            body = prepare_body(transport, values, features, cost, width)
+
+            # Measure the stages (the first run is a warm-up)
+            measure_stages(app, extractor_interface, transport, body)
+            runs = [measure_stages(app, extractor_interface, transport, body) for _ in range(repeats)]
+
+            # Summarize the runtime of the stages
+            stages = {stage: summarize_timings([run[stage] for run in runs]) for stage in STAGES}
+            results.append({
+                "transport": transport,
+                "subjects": subjects,
+                "samples": samples,
+                "request_bytes": len(body),
+                "stages": stages,
+                "total": summarize_timings([sum(run.values()) for run in runs])
+            })
+
+    # Return the benchmark results
+    return {
+        "metadata": {
+            "created_on": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+            "library": library,
+            "library_version": inject_features_extraction_library_version(library),
+            "dimensions": dimensions,
+            "features": features,
+            "cost": cost,
+            "width": width,
+            "repeats": repeats
+        },
+        "results": results
+    }
+
+
+# --------------------------------------- #
+# Baseline comparison routines definition #
+# --------------------------------------- #
+
+def compare_with_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta=DEFAULT_MIN_DELTA):
+    """
+    Compares the benchmark results with the baseline results.
+
+    The stage is regressed if its median runtime exceeds the baseline median
+    runtime by more than the relative tolerance and by more than the minimum
+    absolute delta (the noise of the short stages is ignored).
+
+    :param results: benchmark results
+    :type results: dict
+    :param baseline: baseline benchmark results
+    :type baseline: dict
+    :param tolerance: relative tolerance, defaults to DEFAULT_TOLERANCE
+    :type tolerance: float, optional
+    :param min_delta: minimum absolute delta in seconds, defaults to DEFAULT_MIN_DELTA
+    :type min_delta: float, optional
+    :return: comparisons of the stages (with the regression flags)
+    :rtype: list of dict
+    """
+
+    # Index the baseline results
+    index = {(r["transport"], r["subjects"], r["samples"]): r for r in baseline.get("results", [])}
+
+    # Compare the stages
+    comparisons = []
+    for result in results.get("results", []):
+        reference = index.get((result["transport"], result["subjects"], result["samples"]))
+        if not reference:
+            continue
+        for stage in (*STAGES, "total"):
+            current = (result["total"] if stage == "total" else result["stages"][stage])["median"]
+            previous = (reference["total"] if stage == "total" else reference["stages"].get(stage, {})).get("median")
+            if previous is None:
+                continue
+            comparisons.append({
+                "transport": result["transport"],
+                "subjects": result["subjects"],
+                "samples": result["samples"],
+                "stage": stage,
+                "median": current,
+                "baseline_median": previous,
+                "ratio": current / previous if previous else None,
+                "regressed": current > previous * (1 + tolerance) and current - previous > min_delta
+            })
+
+    # Return the comparisons
+    return comparisons
+
+
+# --------------------------------------- #
+# Benchmark reporting routines definition #
+# --------------------------------------- #
+
+def print_results(results, comparisons=None):
+    """Prints the benchmark results (median runtime of the stages in milliseconds)"""
+
+    # Print the header
+    print(" ".join([f"{'transport':>9}", f"{'size':>12}", *[f"{stage:>10}" for stage in (*STAGES, "total")]]))
+
+    # Print the results
+    for result in results.get("results", []):
+        size = f"{result['subjects']}x{result['samples']}"
+        stages = [result["stages"][stage]["median"] for stage in STAGES] + [result["total"]["median"]]
+        print(" ".join([f"{result['transport']:>9}", f"{size:>12}", *[f"{1000 * t:>10.3f}" for t in stages]]))
+
+    # Print the regressions
+    for comparison in comparisons or []:
+        if comparison["regressed"]:
+            print(
+                f"REGRESSION {comparison['transport']} {comparison['subjects']}x{comparison['samples']} "
+                f"{comparison['stage']}: {1000 * comparison['median']:.3f} ms "
+                f"(baseline {1000 * comparison['baseline_median']:.3f} ms, ratio {comparison['ratio']:.2f})")
+
+
+def main():
+    """Runs the /featurize path benchmarks from the command line"""
+
+    # Prepare the command line arguments
+    parser = argparse.ArgumentParser(description="Featurizer API benchmarks (/featurize path stages)")
+    parser.add_argument("--library", help="features extraction library import name", type=str, default=DEFAULT_LIBRARY)
+    parser.add_argument("--transports", help="transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--sizes", help="payload sizes (<subjects>x<samples>)", nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--dimensions", help="dimensions of the samples", type=int, default=DEFAULT_DIMENSIONS)
+    parser.add_argument("--features", help="features in the pipeline", type=int, default=DEFAULT_FEATURES)
+    parser.add_argument("--cost", help="CPU cost of the synthetic features", type=int, default=DEFAULT_COST)
+    parser.add_argument("--width", help="output width of the synthetic features", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--repeats", help="measured runs", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--output", help="path to store the results (JSON)", type=str)
+    parser.add_argument("--baseline", help="path to the baseline results (JSON) to compare with", type=str)
+    parser.add_argument("--tolerance", help="relative regression tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--min-delta", help="minimum regression delta (seconds)", type=float, default=DEFAULT_MIN_DELTA)
+
+    # Parse the command line arguments
+    args = parser.parse_args()
+
+    # Run the benchmarks
+    results = run_benchmarks(
+        args.library,
+        args.transports,
+        args.sizes,
+        args.dimensions,
+        args.features,
+        args.cost,
+        args.width,
+        args.repeats)
+
+    # Compare the results with the baseline
+    comparisons = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            comparisons = compare_with_baseline(results, json.load(f), args.tolerance, args.min_delta)
+        results["comparisons"] = comparisons
+
+    # Store the results
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    # Print the results
+    print_results(results, comparisons)
+
+    # Exit with the failure if any of the stages regressed
+    return 1 if any(comparison["regressed"] for comparison in comparisons or []) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
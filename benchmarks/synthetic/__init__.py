@@ -0,0 +1,11 @@
+"""
+Synthetic features extraction library (used for benchmarking the featurizer API).
+
+The library satisfies the contract of the injected features extraction library
+(``<library>.interface.featurizer.FeatureExtractor`` and the extractor-specific
+exceptions at ``<library>.interface.featurizer.exceptions``), so it can be
+injected locally (``import_name``: ``benchmarks.synthetic``) instead of a real
+third-party library.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,99 @@
+import numpy
+from benchmarks.synthetic.interface.featurizer.exceptions import (
+    SyntheticFeatureArgumentException,
+    SyntheticFeatureValuesException
+)
+
+
+# ------------------------------------------------ #
+# Default synthetic features attributes definition #
+# ------------------------------------------------ #
+DEFAULT_FEATURE_COST = 1
+DEFAULT_FEATURE_WIDTH = 1
+
+
+# --------------------------------------------- #
+# Synthetic features extractor class definition #
+# --------------------------------------------- #
+
+class FeatureExtractor(object):
+    """
+    Class implementing the synthetic features extractor.
+
+    Any feature name is accepted. Each feature of the pipeline makes ``cost``
+    element-wise passes over the sample values (the tunable CPU cost) and then
+    reduces the last (samples) dimension into ``width`` feature values (the
+    tunable output width), i.e. the features of the values of the shape
+    ``(subjects, ..., samples)`` have the shape ``(subjects, ..., width)``.
+    The ``cost`` and ``width`` can be set for all features in the extractor
+    configuration, and overridden for a feature in its ``args``.
+    """
+
+    def __init__(self, values, labels=None, **configuration):
+        """
+        Initializes the FeatureExtractor.
+
+        :param values: sample values (subjects in the first, samples in the last dimension)
+        :type values: numpy.ndarray
+        :param labels: sample labels, defaults to None
+        :type labels: list, optional
+        :param configuration: extractor configuration (cost, width)
+        :type configuration: dict
+        """
+        self.values = values
+        self.labels = labels if labels else []
+        self.cost = configuration.get("cost", DEFAULT_FEATURE_COST)
+        self.width = configuration.get("width", DEFAULT_FEATURE_WIDTH)
+
+    def __repr__(self):
+        return str({"cost": self.cost, "width": self.width})
+
+    def __str__(self):
+        return repr(self)
+
+    def extract(self, pipeline):
+        """
+        Extracts the features from the features extraction pipeline.
+
+        :param pipeline: pipeline with the feature names and kwargs
+        :type pipeline: list of dict
+        :return: extracted features and feature labels
+        :rtype: dict
+        """
+
+        # Validate the sample values
+        values = numpy.asarray(self.values)
+        if values.ndim < 1 or not numpy.issubdtype(values.dtype, numpy.number):
+            raise SyntheticFeatureValuesException("Sample values must be a numeric array")
+
+        # Extract the features
+        features, labels = [], []
+        for element in pipeline:
+            name, args = element.get("name"), element.get("args") or {}
+            cost = self.get_argument(args, "cost", self.cost, minimum=0)
+            width = self.get_argument(args, "width", self.width, minimum=1)
+            features.append(self.extract_feature(values, cost, width))
+            labels.extend([name] if width == 1 else [f"{name} {i}" for i in range(width)])
+
+        # Return the extracted features and feature labels
+        return {"features": numpy.concatenate(features, axis=-1), "labels": labels}
+
+    @staticmethod
+    def get_argument(args, name, default, minimum=0):
+        """Returns the validated (integer) feature argument"""
+        value = args.get(name, default)
+        if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+            raise SyntheticFeatureArgumentException(f"Feature argument {name} must be an integer >= {minimum}")
+        return value
+
+    @staticmethod
+    def extract_feature(values, cost, width):
+        """Extracts the synthetic feature (cost passes, width moments of the last dimension)"""
+
+        # Make the element-wise passes over the sample values
+        transformed = values.astype(numpy.float64)
+        for _ in range(cost):
+            transformed = numpy.sin(transformed) + values
+
+        # Reduce the samples into the moments
+        return numpy.stack([numpy.mean(transformed ** (p + 1), axis=-1) for p in range(width)], axis=-1)
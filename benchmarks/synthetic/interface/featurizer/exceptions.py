@@ -0,0 +1,5 @@
+# -------------------------------------------------- #
+# Synthetic features extractor exceptions definition #
+# -------------------------------------------------- #
+class SyntheticFeatureArgumentException(Exception): pass
+class SyntheticFeatureValuesException(Exception): pass
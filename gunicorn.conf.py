@@ -0,0 +1,52 @@
+import os
+from api.configuration import load_configuration
+
+
+# ------------------------------------------ #
+# Production server configuration definition #
+# ------------------------------------------ #
+#
+# The featurizer API is prepared once in the master process (the features
+# extraction library injection and validation, the loggers, the routes) and
+# the server workers are forked from it (copy-on-write). The background
+# workers (features extraction pool, featurization jobs worker threads) are
+# started in each of the forked server workers. The metrics are collected per
+# server worker (/metrics reports the worker that serves the scrape).
+#
+# Usage: gunicorn wsgi:app (this configuration file is used by default)
+#
+# Graceful reload: kill -HUP <master pid> (the workers are gracefully replaced)
+
+# Load the configuration
+configuration = load_configuration("server.json").get("server", {})
+
+# Set the socket
+bind = configuration.get("bind") or "0.0.0.0:5000"
+
+# Set the workers
+workers = configuration.get("workers") or (os.cpu_count() or 1)
+threads = configuration.get("threads") or 1
+timeout = configuration.get("timeout_in_seconds", 120)
+graceful_timeout = configuration.get("graceful_timeout_in_seconds", 30)
+keepalive = configuration.get("keepalive_in_seconds", 5)
+max_requests = configuration.get("max_requests", 0)
+max_requests_jitter = configuration.get("max_requests_jitter", 0)
+
+# Prepare the application before forking the workers
+preload_app = True
+
+
+# --------------------------------- #
+# Server hooks definition (workers) #
+# --------------------------------- #
+
+def post_fork(server, worker):
+    """Prepares the application in the forked worker (releases the connections, starts the background workers)"""
+    from api import prepare_forked_app
+    prepare_forked_app(server.app.wsgi())
+
+
+def worker_exit(server, worker):
+    """Stops the background workers of the exiting worker"""
+    from api import stop_workers
+    stop_workers(server.app.wsgi())
@@ -0,0 +1,92 @@
+import numpy
+import pytest
+from api.featurization.execution.pool import FeaturesExtractionPool
+from api.featurization.interface import extract_features, extract_features_by_element
+from api.interfaces.inputs.ragged import RaggedArray
+from benchmarks.synthetic.interface.featurizer import FeatureExtractor
+
+
+# ------------------------------------------ #
+# Features extraction pool tests definitions #
+# ------------------------------------------ #
+LIBRARY_NAME = "benchmarks.synthetic"
+CONFIGURATION = {"cost": 2}
+PIPELINE = [{"name": "mean"}, {"name": "moments", "args": {"width": 3}}, {"name": "costly", "args": {"cost": 5}}]
+
+# The features of the ragged subject without the samples are NaN (both serial and parallel)
+pytestmark = pytest.mark.filterwarnings("ignore:Mean of empty slice", "ignore:invalid value encountered")
+
+
+@pytest.fixture(scope="module", params=[True, False], ids=["shared memory", "pickled"])
+def pool(request):
+    """Returns the pool of the worker processes (with or without the shared-memory transport)"""
+    pool = FeaturesExtractionPool(
+        LIBRARY_NAME,
+        workers=2,
+        chunk_size=3,
+        start_method="forkserver",
+        shared_memory=request.param,
+        shared_memory_threshold=0)
+    yield pool
+    pool.shutdown()
+
+
+def get_rectangular_values():
+    """Returns the rectangular sample values (10 subjects, 2 channels, 50 samples)"""
+    return numpy.random.default_rng(0).normal(size=(10, 2, 50))
+
+
+def get_ragged_values():
+    """Returns the ragged sample values (7 subjects, 2 channels, 0 to 300 samples)"""
+    offsets = numpy.cumsum([0, 3, 300, 0, 17, 1, 120, 45])
+    return RaggedArray(numpy.random.default_rng(1).normal(size=(2, int(offsets[-1]))), offsets)
+
+
+# ----------------------------------- #
+# Parallel vs serial extraction tests #
+# ----------------------------------- #
+
+@pytest.mark.parametrize("get_values", [get_rectangular_values, get_ragged_values], ids=["rectangular", "ragged"])
+def test_parallel_extraction_equals_serial(pool, get_values):
+    values = get_values()
+    serial = extract_features(FeatureExtractor, values, [], CONFIGURATION, PIPELINE)
+    parallel = pool.extract(values, [], CONFIGURATION, PIPELINE)
+
+    assert pool.is_splittable(values)
+    assert parallel["labels"] == serial["labels"]
+    assert parallel["features"].shape == serial["features"].shape
+    numpy.testing.assert_array_equal(parallel["features"], serial["features"])
+
+
+@pytest.mark.parametrize("get_values", [get_rectangular_values, get_ragged_values], ids=["rectangular", "ragged"])
+def test_parallel_extraction_by_element_equals_serial(pool, get_values):
+    values = get_values()
+    serial = extract_features_by_element(FeatureExtractor, values, [], CONFIGURATION, PIPELINE)
+    parallel = pool.extract(values, [], CONFIGURATION, PIPELINE, by_element=True)
+
+    assert parallel["labels"] == serial["labels"]
+    assert parallel["widths"] == serial["widths"]
+    numpy.testing.assert_array_equal(parallel["features"], serial["features"])
+
+
+def test_parallel_extraction_of_even_split_equals_serial():
+    pool = FeaturesExtractionPool(LIBRARY_NAME, workers=3, start_method="forkserver", shared_memory_threshold=0)
+    try:
+        for values in (get_rectangular_values(), get_ragged_values()):
+            serial = extract_features(FeatureExtractor, values, [], CONFIGURATION, PIPELINE)
+            parallel = pool.extract(values, [], CONFIGURATION, PIPELINE)
+            numpy.testing.assert_array_equal(parallel["features"], serial["features"])
+    finally:
+        pool.shutdown()
+
+
+def test_parallel_extraction_raises_error_of_failed_chunk(pool):
+    values = get_rectangular_values()
+    with pytest.raises(Exception) as error:
+        pool.extract(values, [], CONFIGURATION, [{"name": "invalid", "args": {"width": 0}}])
+    assert type(error.value).__name__ == "SyntheticFeatureArgumentException"
+
+    # The pool keeps working after the failed extraction
+    parallel = pool.extract(values, [], CONFIGURATION, PIPELINE)
+    serial = extract_features(FeatureExtractor, values, [], CONFIGURATION, PIPELINE)
+    numpy.testing.assert_array_equal(parallel["features"], serial["features"])
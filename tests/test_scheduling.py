@@ -0,0 +1,177 @@
+import numpy
+import pytest
+from api.featurization.execution.pool import FeaturesExtractionPool
+from api.featurization.execution.scheduling import (
+    FeaturesExtractionCostModel,
+    FeaturesExtractionScheduler,
+    split_subjects
+)
+from api.featurization.interface import extract_features
+from api.interfaces.inputs.ragged import RaggedArray
+from benchmarks.synthetic.interface.featurizer import FeatureExtractor
+
+
+# ------------------------------------------------ #
+# Features extraction scheduling tests definitions #
+# ------------------------------------------------ #
+LIBRARY_NAME = "benchmarks.synthetic"
+
+
+def get_offsets(sizes):
+    """Returns the offsets of the ragged subjects of the sizes"""
+    return numpy.concatenate([[0], numpy.cumsum(sizes)]).astype(numpy.int64)
+
+
+def get_volumes(chunks, offsets):
+    """Returns the volumes of the values of the chunks of subjects"""
+    return [int(offsets[chunk.stop] - offsets[chunk.start]) for chunk in chunks]
+
+
+def assert_covers(chunks, subjects, parts):
+    """Asserts that the chunks are the contiguous non-empty slices covering all the subjects"""
+    assert 1 <= len(chunks) <= parts
+    assert chunks[0].start == 0 and chunks[-1].stop == subjects
+    assert all(chunk.stop > chunk.start for chunk in chunks)
+    assert all(a.stop == b.start for a, b in zip(chunks[:-1], chunks[1:]))
+
+
+def get_scheduler(costs):
+    """Returns the scheduler of the cost model with the recorded costs (feature name: seconds per subject)"""
+    model = FeaturesExtractionCostModel()
+    for name, seconds in costs.items():
+        model.record({"name": name}, 1, 64, seconds)
+    return FeaturesExtractionScheduler(model, min_scheduled_cost=0.0)
+
+
+# ---------------------------------- #
+# Split of the ragged subjects tests #
+# ---------------------------------- #
+
+@pytest.mark.parametrize("sizes, parts, expected", [
+    ([10, 10, 10, 10], 2, [(0, 2), (2, 4)]),
+    ([100, 1, 1, 1, 1, 100], 2, [(0, 3), (3, 6)]),
+    ([1, 1000, 1], 3, [(0, 1), (1, 2), (2, 3)]),
+    ([1000, 1, 1, 1], 2, [(0, 1), (1, 4)]),
+    ([0, 0, 5, 0, 5, 0], 2, [(0, 3), (3, 6)]),
+])
+def test_ragged_subjects_are_split_by_volume(sizes, parts, expected):
+    chunks = split_subjects(len(sizes), parts, get_offsets(sizes))
+    assert [(chunk.start, chunk.stop) for chunk in chunks] == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_ragged_subjects_are_split_near_even_share(seed):
+    generator = numpy.random.default_rng(seed)
+    sizes = generator.integers(0, 1000, size=int(generator.integers(1, 50)))
+    sizes = sizes * (generator.random(len(sizes)) < 0.8)
+    offsets = get_offsets(sizes)
+    parts = int(generator.integers(1, 10))
+
+    chunks = split_subjects(len(sizes), parts, offsets)
+    assert_covers(chunks, len(sizes), parts)
+
+    # Each of the chunks exceeds the even share by at most the largest subject
+    if offsets[-1] > 0:
+        share = offsets[-1] / min(parts, len(sizes))
+        assert max(get_volumes(chunks, offsets)) <= share + sizes.max()
+
+
+def test_ragged_subjects_without_values_are_split_by_number():
+    chunks = split_subjects(6, 3, get_offsets([0] * 6))
+    assert [(chunk.start, chunk.stop) for chunk in chunks] == [(0, 2), (2, 4), (4, 6)]
+
+
+def test_subjects_are_split_into_at_most_subjects_parts():
+    assert [(chunk.start, chunk.stop) for chunk in split_subjects(2, 8, get_offsets([5, 7]))] == [(0, 1), (1, 2)]
+    assert [(chunk.start, chunk.stop) for chunk in split_subjects(2, 8)] == [(0, 1), (1, 2)]
+    assert split_subjects(0, 4, get_offsets([])) == []
+
+
+# ----------------------------------- #
+# Longest-processing-time first tests #
+# ----------------------------------- #
+
+def test_unknown_costs_are_split_evenly():
+    scheduler = get_scheduler({})
+    values = numpy.zeros((8, 64))
+
+    schedule, makespan = scheduler.schedule([(values, {"name": "a"}), (values, {"name": "b"})], 4)
+    assert makespan is None
+    assert len(schedule) == 4
+    units = [unit for units in schedule for unit in units]
+    assert len(units) == 8
+    assert all(cost is None for _, _, cost in units)
+    for index in range(2):
+        assert_covers(sorted((chunk for i, chunk, _ in units if i == index), key=lambda c: c.start), 8, 4)
+
+
+def test_costly_tasks_are_split_and_packed_longest_first():
+    scheduler = get_scheduler({"a": 1.0, "b": 0.25, "c": 0.25})
+    values = numpy.zeros((4, 64))
+    tasks = [(values, {"name": "b"}), (values, {"name": "a"}), (values, {"name": "c"})]
+
+    # The costly task (4 s) is split into 2 chunks of 2 s, the cheap tasks (1 s) are packed next to them
+    schedule, makespan = scheduler.schedule(tasks, 2)
+    assert makespan == pytest.approx(3.0)
+    assert sorted(sum(cost for _, _, cost in units) for units in schedule) == pytest.approx([3.0, 3.0])
+    assert all(units[0][0] == 1 and units[0][2] == pytest.approx(2.0) for units in schedule)
+    chunks = sorted((chunk for index, chunk, _ in sum(schedule, []) if index == 1), key=lambda c: c.start)
+    assert_covers(chunks, 4, 2)
+
+
+def test_unknown_cost_is_mean_of_known_costs():
+    scheduler = get_scheduler({"a": 1.0, "b": 0.5})
+    values = numpy.zeros((2, 64))
+    tasks = [(values, {"name": "a"}), (values, {"name": "b"}), (values, {"name": "x"})]
+
+    # The unknown task (1.5 s) is packed before the cheaper known one (1 s), its cost is not reported
+    schedule, makespan = scheduler.schedule(tasks, 2)
+    assert makespan is None
+    assert [[(index, cost) for index, _, cost in units] for units in schedule] == [
+        [(0, pytest.approx(2.0))],
+        [(2, None), (1, pytest.approx(1.0))]
+    ]
+
+
+def test_ragged_costly_task_is_split_by_volume():
+    scheduler = get_scheduler({"a": 1.0})
+    values = RaggedArray(numpy.zeros(400), get_offsets([100, 100, 100, 100]))
+    cheap = RaggedArray(numpy.zeros(4), get_offsets([1, 1, 1, 1]))
+
+    schedule, makespan = scheduler.schedule([(values, {"name": "a"}), (cheap, {"name": "a"})], 2)
+    chunks = sorted((chunk for index, chunk, _ in sum(schedule, []) if index == 0), key=lambda c: c.start)
+    assert [(chunk.start, chunk.stop) for chunk in chunks] == [(0, 2), (2, 4)]
+    assert makespan == pytest.approx(max(sum(cost for _, _, cost in units) for units in schedule))
+
+
+# -------------------------- #
+# Scheduled extraction tests #
+# -------------------------- #
+
+@pytest.mark.parametrize("known", [False, True], ids=["unknown costs", "known costs"])
+def test_scheduled_extraction_equals_serial(known):
+    pool = FeaturesExtractionPool(
+        LIBRARY_NAME,
+        workers=2,
+        start_method="forkserver",
+        shared_memory_threshold=0,
+        scheduler=get_scheduler({"costly": 1.0, "cheap": 0.01} if known else {}))
+    rectangular = numpy.random.default_rng(0).normal(size=(6, 64))
+    ragged = RaggedArray(numpy.random.default_rng(1).normal(size=300), get_offsets([200, 10, 60, 30]))
+    tasks = [
+        (rectangular, {"name": "costly", "args": {"cost": 3}}),
+        (rectangular, {"name": "cheap", "args": {"width": 2}}),
+        (ragged, {"name": "costly", "args": {"cost": 3}})
+    ]
+    try:
+        assert pool.is_schedulable(tasks)
+        extracted = pool.extract_scheduled(tasks, [], {})
+    finally:
+        pool.shutdown()
+
+    # The features of each of the tasks match the serial extraction
+    for (values, element), result in zip(tasks, extracted):
+        serial = extract_features(FeatureExtractor, values, [], {}, [element])
+        assert result["labels"] == serial["labels"]
+        numpy.testing.assert_array_equal(result["features"], serial["features"])
+    assert pool.scheduler.schedules == 1
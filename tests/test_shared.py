@@ -0,0 +1,162 @@
+import glob
+import os
+import signal
+import threading
+import time
+import numpy
+import pytest
+from api.featurization.execution.pool import FeaturesExtractionPool, FeaturesExtractionPoolBrokenException
+from api.featurization.execution.shared import (
+    SHARED_ARRAY_DIRECTORY,
+    SHARED_ARRAY_PREFIX,
+    attach_shared_array,
+    cleanup_orphaned_shared_arrays,
+    create_shared_array,
+    read_shared_array,
+    release_shared_arrays,
+    unlink_shared_array
+)
+from api.featurization.interface import extract_features
+from api.interfaces.inputs.ragged import RaggedArray
+from benchmarks.synthetic.interface.featurizer import FeatureExtractor
+
+
+# ----------------------------------------- #
+# Shared-memory transport tests definitions #
+# ----------------------------------------- #
+LIBRARY_NAME = "benchmarks.synthetic"
+PIPELINE = [{"name": "mean"}, {"name": "moments", "args": {"width": 2}}]
+
+# The shared-memory segments are exposed in /dev/shm on Linux only
+pytestmark = pytest.mark.skipif(not os.path.isdir(SHARED_ARRAY_DIRECTORY), reason="segments are not exposed")
+
+
+def get_segments():
+    """Returns the names of the existing shared-memory segments of the features extraction"""
+    paths = glob.glob(os.path.join(SHARED_ARRAY_DIRECTORY, f"{SHARED_ARRAY_PREFIX}_*"))
+    return {os.path.basename(path) for path in paths}
+
+
+def wait_for(condition, timeout=30.0):
+    """Waits until the condition is met (returns False if the timeout elapsed)"""
+    started = time.monotonic()
+    while not condition():
+        if time.monotonic() - started > timeout:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def pool():
+    """Returns the pool of the worker processes (all the arrays are shared)"""
+    pool = FeaturesExtractionPool(
+        LIBRARY_NAME,
+        workers=2,
+        chunk_size=1,
+        start_method="forkserver",
+        shared_memory_threshold=0)
+    yield pool
+    pool.shutdown()
+
+
+# ------------------- #
+# Shared arrays tests #
+# ------------------- #
+
+def test_shared_array_is_copied_and_unlinked():
+    values = numpy.arange(24, dtype=numpy.float32).reshape(2, 3, 4)
+    shared = create_shared_array(values)
+    assert shared.name in get_segments()
+
+    # The attached view is read-only
+    view = attach_shared_array(shared)
+    numpy.testing.assert_array_equal(view, values)
+    assert not view.flags.writeable
+    del view
+    release_shared_arrays()
+
+    # The read copies the values and unlinks the segment
+    numpy.testing.assert_array_equal(read_shared_array(shared), values)
+    assert shared.name not in get_segments()
+
+
+def test_orphaned_segments_are_cleaned():
+    process = os.fork()
+    if process == 0:
+        os._exit(0)
+    os.waitpid(process, 0)
+
+    # The segment of the (exited) owner process is orphaned, the segment of the current process is not
+    orphaned = create_shared_array(numpy.ones(8), owner=process)
+    owned = create_shared_array(numpy.ones(8))
+    try:
+        assert cleanup_orphaned_shared_arrays() >= 1
+        assert orphaned.name not in get_segments()
+        assert owned.name in get_segments()
+    finally:
+        unlink_shared_array(orphaned)
+        unlink_shared_array(owned)
+
+
+# ----------------------------- #
+# Shared segments cleanup tests #
+# ----------------------------- #
+
+def test_segments_are_unlinked_after_extraction(pool):
+    values = numpy.random.default_rng(0).normal(size=(5, 100))
+    segments = get_segments()
+
+    extracted = pool.extract(values, [], {}, PIPELINE)
+    serial = extract_features(FeatureExtractor, values, [], {}, PIPELINE)
+    numpy.testing.assert_array_equal(extracted["features"], serial["features"])
+    assert get_segments() == segments
+
+
+def test_segments_are_unlinked_after_failed_chunk(pool):
+    values = numpy.random.default_rng(0).normal(size=(5, 100))
+    segments = get_segments()
+
+    # The chunks fail on the invalid feature argument, the shared sample values are unlinked
+    with pytest.raises(Exception):
+        pool.extract(values, [], {}, PIPELINE + [{"name": "invalid", "args": {"cost": -1}}])
+    assert get_segments() == segments
+
+
+def test_segments_are_unlinked_after_broken_pool(pool):
+    offsets = numpy.array([0, 10, 10 + 2 ** 20])
+    values = RaggedArray(numpy.random.default_rng(0).normal(size=int(offsets[-1])), offsets)
+    pipeline = [{"name": "costly", "args": {"cost": 1000}}]
+    pool.warm_up()
+    segments = get_segments()
+
+    # Extract the features in the background (the first subject is cheap, the second one is costly)
+    result = {}
+
+    def extract():
+        try:
+            result["features"] = pool.extract(values, [], {}, pipeline)
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=extract, daemon=True)
+    thread.start()
+
+    # Kill the worker processes once the features of the cheap subject are shared (and returned to the pool)
+    assert wait_for(lambda: len(get_segments() - segments) >= 2)
+    time.sleep(0.5)
+    for pid in pool.get_worker_pids():
+        os.kill(pid, signal.SIGKILL)
+    thread.join(timeout=30.0)
+
+    # The broken pool is reported, the shared features of the successful chunk are unlinked
+    assert not thread.is_alive()
+    assert isinstance(result.get("error"), FeaturesExtractionPoolBrokenException)
+    assert get_segments() == segments
+
+    # The pool is re-created on the next use
+    cheap = RaggedArray(values.values[:20], numpy.array([0, 10, 20]))
+    extracted = pool.extract(cheap, [], {}, PIPELINE)
+    serial = extract_features(FeatureExtractor, cheap, [], {}, PIPELINE)
+    numpy.testing.assert_array_equal(extracted["features"], serial["features"])
+    assert get_segments() == segments
@@ -0,0 +1,148 @@
+import threading
+import time
+import numpy
+import pytest
+from api.featurization.execution.deadline import (
+    FeaturesExtractionCancelledException,
+    FeaturesExtractionDeadline,
+    FeaturesExtractionStoppedException,
+    FeaturesExtractionTimeoutException
+)
+from api.featurization.execution.supervisor import FeaturesExtractionSupervisor
+from api.featurization.interface import FeaturesExtractorPipeline, extract_features
+from api.interfaces.inputs.interface import FeaturesExtractorConfiguration, FeaturesPipeline, Sample
+from benchmarks.synthetic.interface.featurizer import FeatureExtractor
+
+
+# ------------------------------------------------ #
+# Features extraction supervisor tests definitions #
+# ------------------------------------------------ #
+LIBRARY_NAME = "benchmarks.synthetic"
+FAST = {"name": "fast", "args": {"width": 2}}
+SLOW = {"name": "slow", "args": {"cost": 10 ** 7}}
+
+
+@pytest.fixture
+def supervisor():
+    """Returns the supervisor of the worker processes (the slow feature has the time budget of 0.5 s)"""
+    supervisor = FeaturesExtractionSupervisor(
+        LIBRARY_NAME,
+        workers=2,
+        start_method="forkserver",
+        warm_up_workers=True,
+        timeouts={"slow": 0.5})
+    supervisor.warm_up()
+    yield supervisor
+    supervisor.shutdown()
+
+
+def get_values():
+    """Returns the sample values (4 subjects, 100 samples)"""
+    return numpy.random.default_rng(0).normal(size=(4, 100))
+
+
+def extract_in_background(target):
+    """Runs the extraction in the background thread (returns the thread and its result or error)"""
+    result = {}
+
+    def run():
+        try:
+            result["extracted"] = target()
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, result
+
+
+# ---------------------------------- #
+# Time budgets of the features tests #
+# ---------------------------------- #
+
+def test_timed_out_feature_is_nan_with_error(supervisor):
+    values = get_values()
+    pipeline = FeaturesExtractorPipeline(
+        FeatureExtractor,
+        Sample(values, []),
+        FeaturesExtractorConfiguration({}),
+        supervisor=supervisor)
+
+    started = time.monotonic()
+    extracted = pipeline.extract(FeaturesPipeline([FAST, SLOW, FAST]))
+    assert time.monotonic() - started < 10.0
+
+    # The features of the fast elements are extracted, the slow element is one NaN column
+    serial = extract_features(FeatureExtractor, values, [], {}, [FAST])
+    assert extracted["labels"] == serial["labels"] + ["slow"] + serial["labels"]
+    numpy.testing.assert_array_equal(extracted["values"][:, :2], serial["features"])
+    numpy.testing.assert_array_equal(extracted["values"][:, 3:], serial["features"])
+    assert numpy.isnan(extracted["values"][:, 2]).all()
+
+    # The slow element is annotated by the error
+    assert len(extracted["errors"]) == 1
+    assert extracted["errors"][0]["index"] == 1
+    assert extracted["errors"][0]["feature"] == "slow"
+    assert extracted["errors"][0]["message"]
+
+
+def test_timed_out_worker_is_replaced(supervisor):
+    values = get_values()
+    pids = set(supervisor.get_worker_pids())
+
+    results = supervisor.extract([(values, [SLOW]), (values, [FAST])], [], {})
+    assert isinstance(results[0], FeaturesExtractionTimeoutException)
+    numpy.testing.assert_array_equal(
+        results[1]["features"], extract_features(FeatureExtractor, values, [], {}, [FAST])["features"])
+
+    # The killed worker process is re-started, the supervisor keeps working
+    results = supervisor.extract([(values, [FAST]), (values, [FAST])], [], {})
+    assert all(isinstance(result, dict) for result in results)
+    assert len(supervisor.get_worker_pids()) == 2
+    assert set(supervisor.get_worker_pids()) != pids
+
+
+def test_expired_deadline_times_out_features(supervisor):
+    values = get_values()
+    deadline = FeaturesExtractionDeadline(timeout=0.5)
+
+    started = time.monotonic()
+    results = supervisor.extract([(values, [{"name": "unbudgeted", "args": {"cost": 10 ** 7}}])], [], {}, deadline)
+    assert time.monotonic() - started < 10.0
+    assert isinstance(results[0], FeaturesExtractionTimeoutException)
+
+
+# ------------------------------- #
+# Cancellation and shutdown tests #
+# ------------------------------- #
+
+def test_cancelled_extraction_is_stopped(supervisor):
+    values = get_values()
+    deadline = FeaturesExtractionDeadline()
+    thread, result = extract_in_background(
+        lambda: supervisor.extract([(values, [{"name": "unbudgeted", "args": {"cost": 10 ** 7}}])], [], {}, deadline))
+
+    time.sleep(0.5)
+    deadline.cancel()
+    thread.join(timeout=10.0)
+    assert not thread.is_alive()
+    assert isinstance(result.get("error"), FeaturesExtractionCancelledException)
+
+
+def test_shutdown_stops_in_flight_extraction(supervisor):
+    values = get_values()
+    tasks = [(values, [{"name": "unbudgeted", "args": {"cost": 10 ** 7}}])] * 3
+    thread, result = extract_in_background(lambda: supervisor.extract(tasks, [], {}))
+
+    # The running and the queued tasks are stopped, the worker processes are stopped afterwards
+    time.sleep(0.5)
+    supervisor.shutdown()
+    thread.join(timeout=10.0)
+    assert not thread.is_alive()
+    assert isinstance(result.get("error"), FeaturesExtractionStoppedException)
+    assert supervisor.get_worker_pids() == []
+
+    # The worker processes are created again on the next use
+    results = supervisor.extract([(values, [FAST])], [], {})
+    numpy.testing.assert_array_equal(
+        results[0]["features"], extract_features(FeatureExtractor, values, [], {}, [FAST])["features"])
@@ -0,0 +1,5 @@
+from api import prepare_app
+
+
+# Featurizer API initialization (the background workers are started in each of the server workers)
+app = prepare_app(__name__, start_background_workers=False)